@@ -1,21 +1,32 @@
 from __future__ import annotations
 
 import base64
-import io
+import functools
 import logging
 import os
 import platform
-from typing import TYPE_CHECKING
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
-from browser_use.agent.views import AgentHistoryList
 from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
 from browser_use.config import CONFIG
 
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
 
+	from browser_use.agent.views import AgentHistoryList
+
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_4PX_BYTES = base64.b64decode(PLACEHOLDER_4PX_SCREENSHOT)
+
+# Max number of frames sampled (and the max width they are shrunk to) when building the shared GIF palette
+_PALETTE_SAMPLE_FRAMES = 8
+_PALETTE_SAMPLE_WIDTH = 320
+
 
 def decode_unicode_escapes_to_utf8(text: str) -> str:
 	"""Handle decoding any unicode escape sequences embedded in a string (needed to render non-ASCII languages like chinese or arabic in the GIF overlay text)"""
@@ -32,6 +43,30 @@ def decode_unicode_escapes_to_utf8(text: str) -> str:
 		return text
 
 
+@dataclass(frozen=True)
+class _RenderOptions:
+	"""Rendering settings shared by every frame"""
+
+	canvas_size: tuple[int, int]
+	palette: bytes | None  # shared 256-color palette for GIF output, None for MP4 output
+	duration: int
+	show_goals: bool
+	show_logo: bool
+	font_size: int
+	title_font_size: int
+	goal_font_size: int
+	margin: int
+
+
+@dataclass(frozen=True)
+class _FrameSpec:
+	"""Lightweight reference to a single history frame, the screenshot itself is only decoded inside the renderer"""
+
+	step_number: int
+	screenshot_path: str
+	goal_text: str | None
+
+
 def create_history_gif(
 	task: str,
 	history: AgentHistoryList,
@@ -46,42 +81,228 @@ def create_history_gif(
 	goal_font_size: int = 44,
 	margin: int = 40,
 	line_spacing: float = 1.5,
+	max_workers: int | None = None,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
+	"""Create a GIF (or an MP4 if output_path ends with .mp4) from the agent's history with overlaid task and goal text.
+
+	Frames are streamed: screenshots are lazily decoded from their screenshot_path, overlays are rendered
+	in a thread pool with a bounded number of frames in flight, and each finished frame is written to the
+	output file immediately, so peak memory does not grow with the number of steps.
+	"""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	from PIL import Image, ImageFont
-
-	images = []
+	from PIL import Image
 
-	# if history is empty, we can't create a gif
-	if not history.history:
-		logger.warning('No history to create GIF from')
+	frames = _collect_frame_specs(history)
+	if not frames:
+		logger.warning('No valid screenshots found (all are placeholders or from new tab pages)')
 		return
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
+	with Image.open(frames[0].screenshot_path) as first_image:
+		canvas_size = first_image.size
+
+	output_format = 'mp4' if Path(output_path).suffix.lower() == '.mp4' else 'gif'
+	options = _RenderOptions(
+		canvas_size=canvas_size,
+		palette=_build_shared_palette(frames) if output_format == 'gif' else None,
+		duration=duration,
+		show_goals=show_goals,
+		show_logo=show_logo,
+		font_size=font_size,
+		title_font_size=title_font_size,
+		goal_font_size=goal_font_size,
+		margin=margin,
+	)
+
+	if output_format == 'mp4':
+		writer = _Mp4FrameWriter(output_path, options)
+	else:
+		writer = _GifFrameWriter(output_path, options)
 
-	if not screenshots:
-		logger.warning('No screenshots found in history')
+	if not writer.open():
 		return
 
-	# Find the first non-placeholder screenshot
-	# A screenshot is considered a placeholder if:
-	# 1. It's the exact 4px placeholder for about:blank pages, OR
-	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
-	first_real_screenshot = None
-	for screenshot in screenshots:
-		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
-			first_real_screenshot = screenshot
-			break
-
-	if not first_real_screenshot:
-		logger.warning('No valid screenshots found (all are placeholders or from new tab pages)')
+	frames_written = 0
+	try:
+		# Create task frame if requested
+		if show_task and task:
+			regular_font, title_font, _ = _load_fonts(font_size, title_font_size, goal_font_size)
+			task_frame = _create_task_frame(
+				task,
+				canvas_size,
+				title_font,  # type: ignore
+				regular_font,  # type: ignore
+				_load_logo() if show_logo else None,
+				line_spacing,
+			)
+			writer.write(_encode_frame(task_frame, options))
+			frames_written += 1
+
+		for encoded_frame in _render_frames(frames, options, max_workers):
+			if encoded_frame is not None:
+				writer.write(encoded_frame)
+				frames_written += 1
+	finally:
+		writer.close()
+
+	if frames_written:
+		logger.info(f'Created {output_format.upper()} at {output_path}')
+	else:
+		Path(output_path).unlink(missing_ok=True)
+		logger.warning('No images found in history to create GIF')
+
+
+def _collect_frame_specs(history: AgentHistoryList) -> list[_FrameSpec]:
+	"""Find the history items that should become frames without loading any image data into memory"""
+	from browser_use.utils import is_new_tab_page
+
+	frames: list[_FrameSpec] = []
+	for i, item in enumerate(history.history, 1):
+		screenshot_path = item.state.screenshot_path
+		if not screenshot_path or not os.path.isfile(screenshot_path):
+			continue
+
+		# Skip placeholder screenshots from about:blank pages
+		# These are 4x4 white PNGs, so only files with the exact same size need to be compared byte for byte
+		if os.path.getsize(screenshot_path) == len(_PLACEHOLDER_4PX_BYTES):
+			with open(screenshot_path, 'rb') as f:
+				if f.read() == _PLACEHOLDER_4PX_BYTES:
+					logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
+					continue
+
+		# Skip screenshots from new tab pages
+		if is_new_tab_page(item.state.url):
+			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
+			continue
+
+		goal_text = item.model_output.current_state.next_goal if item.model_output else None
+		frames.append(_FrameSpec(step_number=i, screenshot_path=screenshot_path, goal_text=goal_text))
+
+	return frames
+
+
+def _build_shared_palette(frames: list[_FrameSpec]) -> bytes:
+	"""Build one 256-color palette from a small sample of downscaled frames so every GIF frame can share the global color table"""
+	from PIL import Image
+
+	sample_count = min(len(frames), _PALETTE_SAMPLE_FRAMES)
+	step = len(frames) / sample_count
+	thumbnails: list[Image.Image] = []
+	for n in range(sample_count):
+		with Image.open(frames[int(n * step)].screenshot_path) as image:
+			image = image.convert('RGB')
+			image.thumbnail((_PALETTE_SAMPLE_WIDTH, _PALETTE_SAMPLE_WIDTH * 4))
+			thumbnails.append(image)
+
+	# Reserve room for the pure black / white used by the overlay boxes, text and the task frame
+	swatch_height = 16
+	strip = Image.new(
+		'RGB',
+		(_PALETTE_SAMPLE_WIDTH, sum(t.height for t in thumbnails) + swatch_height),
+		(0, 0, 0),
+	)
+	strip.paste((255, 255, 255), (0, 0, _PALETTE_SAMPLE_WIDTH // 2, swatch_height))
+	y = swatch_height
+	for thumbnail in thumbnails:
+		strip.paste(thumbnail, (0, y))
+		y += thumbnail.height
+
+	palette = strip.quantize(colors=256, method=Image.Quantize.MEDIANCUT).getpalette() or []
+	return bytes(palette[: 256 * 3]).ljust(256 * 3, b'\0')
+
+
+def _render_frames(frames: list[_FrameSpec], options: _RenderOptions, max_workers: int | None):
+	"""Yield encoded frames in history order, rendering them in a thread pool with a bounded window of frames in flight
+
+	Threads instead of processes: this runs inside the agent's process, which has a running event loop and other
+	threads, where forking worker processes is unsafe. Pillow releases the GIL while decoding, resizing and quantizing.
+	"""
+	if max_workers is None:
+		max_workers = min(4, os.cpu_count() or 1)
+
+	# Starting worker threads is not worth it for very short histories
+	if max_workers <= 1 or len(frames) <= 2:
+		for frame in frames:
+			yield _render_frame(frame, options)
 		return
 
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gif_render') as executor:
+		in_flight: deque[Future[bytes | None]] = deque()
+		pending = iter(frames)
+		for frame in pending:
+			in_flight.append(executor.submit(_render_frame, frame, options))
+			if len(in_flight) >= max_workers * 2:
+				break
+
+		while in_flight:
+			yield in_flight.popleft().result()
+			next_frame = next(pending, None)
+			if next_frame is not None:
+				in_flight.append(executor.submit(_render_frame, next_frame, options))
+
+
+def _render_frame(frame: _FrameSpec, options: _RenderOptions) -> bytes | None:
+	"""Decode one screenshot from disk, draw the overlay and return the encoded frame (runs in the worker threads)"""
+	from PIL import Image
+
+	try:
+		with Image.open(frame.screenshot_path) as screenshot:
+			image = screenshot.convert('RGB')
+	except Exception as e:
+		logger.warning(f'Could not load screenshot for step {frame.step_number} from {frame.screenshot_path}: {e}')
+		return None
+
+	if image.size != options.canvas_size:
+		image = image.resize(options.canvas_size, Image.Resampling.LANCZOS)
+
+	if options.show_goals and frame.goal_text is not None:
+		regular_font, title_font, _ = _load_fonts(options.font_size, options.title_font_size, options.goal_font_size)
+		image = _add_overlay_to_image(
+			image=image,
+			step_number=frame.step_number,
+			goal_text=frame.goal_text,
+			regular_font=regular_font,  # type: ignore
+			title_font=title_font,  # type: ignore
+			margin=options.margin,
+			logo=_load_logo() if options.show_logo else None,
+		)
+
+	return _encode_frame(image, options)
+
+
+def _encode_frame(image: Image.Image, options: _RenderOptions) -> bytes:
+	"""Encode a rendered RGB frame: GIF image block using the shared palette, or raw RGB24 pixels for MP4"""
+	if options.palette is None:
+		return image.convert('RGB').tobytes()
+
+	from PIL import GifImagePlugin
+
+	quantized = image.convert('RGB').quantize(palette=_palette_image(options.palette))
+	return b''.join(GifImagePlugin.getdata(quantized, duration=options.duration))
+
+
+@functools.cache
+def _palette_image(palette: bytes) -> Image.Image:
+	from PIL import Image
+
+	palette_image = Image.new('P', (1, 1))
+	palette_image.putpalette(palette)
+	return palette_image
+
+
+@functools.cache
+def _load_fonts(
+	font_size: int, title_font_size: int, goal_font_size: int
+) -> tuple[
+	ImageFont.FreeTypeFont | ImageFont.ImageFont,
+	ImageFont.FreeTypeFont | ImageFont.ImageFont,
+	ImageFont.FreeTypeFont | ImageFont.ImageFont,
+]:
+	"""Load the (regular, title, goal) fonts once"""
+	from PIL import ImageFont
+
 	# Try to load nicer fonts
 	try:
 		# Try different font options in order of preference
@@ -99,7 +320,6 @@ def create_history_gif(
 			'DejaVuSans',
 			'Verdana',
 		]
-		font_loaded = False
 
 		for font_name in font_options:
 			try:
@@ -109,109 +329,121 @@ def create_history_gif(
 				regular_font = ImageFont.truetype(font_name, font_size)
 				title_font = ImageFont.truetype(font_name, title_font_size)
 				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
+				return regular_font, title_font, goal_font
 			except OSError:
 				continue
 
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
+		raise OSError('No preferred fonts found')
 
 	except OSError:
 		regular_font = ImageFont.load_default()
 		title_font = ImageFont.load_default()
+		return regular_font, title_font, regular_font
 
-		goal_font = regular_font
-
-	# Load logo if requested
-	logo = None
-	if show_logo:
-		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
-
-	# Create task frame if requested
-	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
-
-		if first_real_screenshot:
-			task_frame = _create_task_frame(
-				task,
-				first_real_screenshot,
-				title_font,  # type: ignore
-				regular_font,  # type: ignore
-				logo,
-				line_spacing,
-			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
-
-	# Process each history item with its corresponding screenshot
-	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
-		if not screenshot:
-			continue
 
-		# Skip placeholder screenshots from about:blank pages
-		# These are 4x4 white PNGs encoded as a specific base64 string
-		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
-			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
-			continue
+@functools.cache
+def _load_logo() -> Image.Image | None:
+	"""Load the logo once"""
+	from PIL import Image
 
-		# Skip screenshots from new tab pages
-		from browser_use.utils import is_new_tab_page
+	try:
+		logo = Image.open('./static/browser-use.png')
+		# Resize logo to be small (e.g., 40px height)
+		logo_height = 150
+		aspect_ratio = logo.width / logo.height
+		logo_width = int(logo_height * aspect_ratio)
+		return logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
+
+
+class _GifFrameWriter:
+	"""Writes GIF frames incrementally: global header + shared color table first, then one image block per frame"""
+
+	def __init__(self, output_path: str, options: _RenderOptions):
+		self.output_path = output_path
+		self.options = options
+		self._file: BinaryIO | None = None
+
+	def open(self) -> bool:
+		from PIL import GifImagePlugin, Image
+
+		assert self.options.palette is not None
+		header_image = Image.new('P', self.options.canvas_size)
+		header_image.putpalette(self.options.palette)
+		header, _ = GifImagePlugin.getheader(header_image, info={'loop': 0, 'duration': self.options.duration})
+
+		Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+		self._file = open(self.output_path, 'wb')
+		self._file.write(b''.join(header))
+		return True
+
+	def write(self, encoded_frame: bytes) -> None:
+		assert self._file is not None
+		self._file.write(encoded_frame)
+
+	def close(self) -> None:
+		if self._file is not None:
+			self._file.write(b';')  # GIF trailer
+			self._file.close()
+			self._file = None
+
+
+class _Mp4FrameWriter:
+	"""Streams raw RGB frames into an MP4 file using the optional imageio/ffmpeg video dependencies"""
+
+	def __init__(self, output_path: str, options: _RenderOptions):
+		self.output_path = output_path
+		self.options = options
+		self._writer = None
+
+	def open(self) -> bool:
+		from browser_use.browser.profile import ViewportSize
+		from browser_use.browser.video_recorder import IMAGEIO_AVAILABLE, _get_padded_size
+
+		if not IMAGEIO_AVAILABLE:
+			logger.error(
+				'MP4 history output requires optional dependencies. Please install them with: pip install "browser-use[video]"'
+			)
+			return False
+
+		import imageio.v2 as iio  # type: ignore[import-not-found]
+
+		width, height = self.options.canvas_size
+		self.padded_size = _get_padded_size(ViewportSize(width=width, height=height))
+		Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+		self._writer = iio.get_writer(
+			self.output_path,
+			fps=1000 / self.options.duration,
+			codec='libx264',
+			quality=8,
+			pixelformat='yuv420p',
+			macro_block_size=None,
+		)
+		return True
 
-		if is_new_tab_page(item.state.url):
-			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
-			continue
+	def write(self, encoded_frame: bytes) -> None:
+		import numpy as np  # type: ignore[import-not-found]
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(screenshot)
-		image = Image.open(io.BytesIO(img_data))
-
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
+		assert self._writer is not None
+		width, height = self.options.canvas_size
+		frame = np.frombuffer(encoded_frame, dtype=np.uint8).reshape((height, width, 3))
+		pad_bottom = self.padded_size['height'] - height
+		pad_right = self.padded_size['width'] - width
+		if pad_bottom or pad_right:
+			frame = np.pad(frame, ((0, pad_bottom), (0, pad_right), (0, 0)))
+		self._writer.append_data(frame)
 
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
-		)
-		logger.info(f'Created GIF at {output_path}')
-	else:
-		logger.warning('No images found in history to create GIF')
+	def close(self) -> None:
+		if self._writer is not None:
+			self._writer.close()
+			self._writer = None
 
 
 def _create_task_frame(
 	task: str,
-	first_screenshot: str,
+	canvas_size: tuple[int, int],
 	title_font: ImageFont.FreeTypeFont,
 	regular_font: ImageFont.FreeTypeFont,
 	logo: Image.Image | None = None,
@@ -220,9 +452,7 @@ def _create_task_frame(
 	"""Create initial frame showing the task."""
 	from PIL import Image, ImageDraw, ImageFont
 
-	img_data = base64.b64decode(first_screenshot)
-	template = Image.open(io.BytesIO(img_data))
-	image = Image.new('RGB', template.size, (0, 0, 0))
+	image = Image.new('RGB', canvas_size, (0, 0, 0))
 	draw = ImageDraw.Draw(image)
 
 	# Calculate vertical center of image
@@ -0,0 +1,135 @@
+"""
+Token budgeted assembly of the agent state message.
+
+The sections of the state message (interactive elements, agent history, read_state, file system, todo contents and
+screenshots) share a per-model input token budget. Every text section is first given a small floor, then the rest of
+the budget goes to the sections in priority order. Sections that don't fit are truncated, with a note in their text
+of how much was cut, and screenshots that don't fit are left out.
+
+Usage:
+	assembler = ContextAssembler(ContextBudget(max_tokens=32000))
+	texts, report = assembler.assemble(sections, fixed_tokens=estimate_tokens(fixed_text))
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from browser_use.agent.message_manager.views import ContextBudgetReport, ContextSectionBudget
+
+TokenEstimator = Callable[[str], int]
+TruncationMode = Literal['head', 'tail', 'middle']
+
+
+def estimate_tokens(text: str) -> int:
+	"""Rough token count of text, about 4 characters per token for English text and markup"""
+	return (len(text) + 3) // 4
+
+
+@dataclass
+class ContextBudget:
+	"""Input token budget of a step"""
+
+	max_tokens: int
+	estimate_tokens: TokenEstimator = estimate_tokens
+	image_tokens: int = 1500  # tokens counted per screenshot
+	min_section_tokens: int = 200  # floor given to every text section before the budget is shared by priority
+
+
+@dataclass
+class ContextSection:
+	"""A truncatable section of the state message"""
+
+	name: str
+	text: str
+	priority: int  # sections with a higher priority keep their content first
+	truncation: TruncationMode = 'head'  # which part of the text is kept: the start, the end or both ends
+	image_count: int = 0  # image sections are kept or left out as a whole
+
+
+class ContextAssembler:
+	"""Allocates a token budget across the sections of the state message"""
+
+	def __init__(self, budget: ContextBudget):
+		self.budget = budget
+
+	def section_tokens(self, section: ContextSection) -> int:
+		if section.image_count:
+			return section.image_count * self.budget.image_tokens
+		return self.budget.estimate_tokens(section.text) if section.text else 0
+
+	def assemble(self, sections: list[ContextSection], fixed_tokens: int) -> tuple[dict[str, str], ContextBudgetReport]:
+		"""Fit the sections into the budget left after fixed_tokens.
+
+		Returns:
+			The text of every section after truncation ('' for left out image sections) and the budget breakdown
+		"""
+		requested = {section.name: self.section_tokens(section) for section in sections}
+		allocated = dict.fromkeys(requested, 0)
+		by_priority = sorted(sections, key=lambda section: section.priority, reverse=True)
+		remaining = max(self.budget.max_tokens - fixed_tokens, 0)
+
+		# A floor for every text section, so a long high priority section can't push the others out entirely
+		for section in by_priority:
+			if not section.image_count:
+				share = min(requested[section.name], self.budget.min_section_tokens, remaining)
+				allocated[section.name] = share
+				remaining -= share
+
+		for section in by_priority:
+			missing = requested[section.name] - allocated[section.name]
+			if section.image_count:
+				if missing <= remaining:
+					allocated[section.name] = requested[section.name]
+					remaining -= missing
+			else:
+				share = min(missing, remaining)
+				allocated[section.name] += share
+				remaining -= share
+
+		texts: dict[str, str] = {}
+		report = ContextBudgetReport(max_tokens=self.budget.max_tokens, fixed_tokens=fixed_tokens, total_tokens=fixed_tokens)
+		for section in sections:
+			truncated = allocated[section.name] < requested[section.name]
+			if section.image_count:
+				texts[section.name] = '' if truncated else section.text
+				used_tokens = 0 if truncated else requested[section.name]
+			else:
+				texts[section.name] = (
+					self.truncate(section.text, allocated[section.name], section.truncation) if truncated else section.text
+				)
+				used_tokens = self.budget.estimate_tokens(texts[section.name]) if texts[section.name] else 0
+			report.sections[section.name] = ContextSectionBudget(
+				requested_tokens=requested[section.name], allocated_tokens=used_tokens, truncated=truncated
+			)
+			report.total_tokens += used_tokens
+		return texts, report
+
+	def truncate(self, text: str, max_tokens: int, mode: TruncationMode = 'head') -> str:
+		"""Cut text down to max_tokens, replacing the cut part by a note of how many characters were removed"""
+		tokens = self.budget.estimate_tokens(text)
+		if tokens <= max_tokens:
+			return text
+
+		# Estimators aren't linear in the text length, shrink the kept characters until the estimate fits
+		keep_chars = len(text) * max_tokens // max(tokens, 1)
+		for _ in range(5):
+			if keep_chars <= 0:
+				break
+			result = self._cut(text, keep_chars, mode)
+			result_tokens = self.budget.estimate_tokens(result)
+			if result_tokens <= max_tokens:
+				return result
+			keep_chars = keep_chars * max_tokens // result_tokens - 1
+		return ''
+
+	@staticmethod
+	def _cut(text: str, keep_chars: int, mode: TruncationMode) -> str:
+		note = f'... [{len(text) - keep_chars} characters truncated to fit the context budget] ...'
+		if mode == 'head':
+			return f'{text[:keep_chars]}\n{note}'
+		if mode == 'tail':
+			return f'{note}\n{text[len(text) - keep_chars :]}'
+		# The start of the text holds the setup, the end the most recent content
+		head_chars = keep_chars // 4
+		return f'{text[:head_chars]}\n{note}\n{text[len(text) - (keep_chars - head_chars) :]}'
@@ -3,7 +3,9 @@ from __future__ import annotations
 import logging
 from typing import Literal
 
+from browser_use.agent.message_manager.context_budget import ContextBudget, TokenEstimator, estimate_tokens
 from browser_use.agent.message_manager.views import (
+	ContextBudgetReport,
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
@@ -13,6 +15,8 @@ from browser_use.agent.views import (
 	AgentStepInfo,
 	MessageManagerState,
 )
+from browser_use.browser.domain_policy import get_domain_matcher
+from browser_use.browser.sensitive_data import CompiledSensitiveData, get_compiled_sensitive_data
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.messages import (
@@ -22,7 +26,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
-from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
+from browser_use.utils import time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +97,84 @@ def _log_format_message_line(message: BaseMessage, content: str, is_last_message
 # ========== End of Logging Helper Functions ==========
 
 
+class AgentHistoryBuilder:
+	"""Append-only builder of the agent history description.
+
+	Every history item is rendered once when it is added and appended to the running text. When the history outgrows
+	max_history_items, the oldest items (except the first one) are omitted in blocks of compaction_block items
+	instead of one per step. Between compactions the history text only grows at its end, so the prompt prefix stays
+	byte-stable across steps and provider prompt caching keeps hitting.
+	"""
+
+	def __init__(self, max_history_items: int | None = None, compaction_block: int | None = None):
+		self.max_history_items = max_history_items
+		if compaction_block is None:
+			compaction_block = max(1, max_history_items // 5) if max_history_items else 1
+		self.compaction_block = compaction_block
+		self._reset()
+
+	def _reset(self) -> None:
+		self._items: list[HistoryItem] = []
+		self._lines: list[str] = []
+		self._omitted_count = 0
+		self._recent_text = ''  # the visible lines after the first item
+
+	def build(self, items: list[HistoryItem]) -> str:
+		"""Get the history description of items, rendering only the items added since the last call"""
+		self._sync(items)
+		if not self._lines:
+			return ''
+		if len(self._lines) == 1:
+			return self._lines[0]
+		if self._omitted_count == 0:
+			return f'{self._lines[0]}\n{self._recent_text}'
+		return f'{self._lines[0]}\n{self._omitted_line}\n{self._recent_text}'
+
+	def visible_lines(self, items: list[HistoryItem]) -> list[str]:
+		"""The lines of the history description of items, one per shown item (and the omission notice)"""
+		self._sync(items)
+		if not self._lines:
+			return []
+		if self._omitted_count == 0:
+			return list(self._lines)
+		return [self._lines[0], self._omitted_line, *self._lines[1 + self._omitted_count :]]
+
+	@property
+	def _omitted_line(self) -> str:
+		return f'<sys>[... {self._omitted_count} previous steps omitted...]</sys>'
+
+	def _sync(self, items: list[HistoryItem]) -> None:
+		"""Render the items added since the last call"""
+		rendered_count = len(self._items)
+		if rendered_count and (
+			len(items) < rendered_count or items[0] is not self._items[0] or items[rendered_count - 1] is not self._items[-1]
+		):
+			# The history was replaced (e.g. by a restored agent state), start over
+			self._reset()
+			rendered_count = 0
+
+		for item in items[rendered_count:]:
+			self._append(item)
+
+	def _append(self, item: HistoryItem) -> None:
+		line = item.to_string()
+		self._items.append(item)
+		self._lines.append(line)
+		if len(self._lines) == 1:
+			return  # the first item is always shown on its own
+
+		visible_count = len(self._lines) - self._omitted_count  # including the first item
+		if self.max_history_items is not None and visible_count > self.max_history_items:
+			# Omit a whole block at once, the text before the recent items then stays the same for the next steps
+			overflow = visible_count - self.max_history_items
+			self._omitted_count += -(-overflow // self.compaction_block) * self.compaction_block
+			self._recent_text = '\n'.join(self._lines[1 + self._omitted_count :])
+		elif visible_count == 2:
+			self._recent_text = line
+		else:
+			self._recent_text += f'\n{line}'
+
+
 class MessageManager:
 	vision_detail_level: Literal['auto', 'low', 'high']
 
@@ -110,6 +192,9 @@ class MessageManager:
 		include_tool_call_examples: bool = False,
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		message_layout: Literal['default', 'cache_optimized'] = 'default',
+		max_input_tokens: int | None = None,
+		token_estimator: TokenEstimator | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -122,12 +207,22 @@ class MessageManager:
 		self.include_tool_call_examples = include_tool_call_examples
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
+		self.message_layout = message_layout
+		self.context_budget = (
+			ContextBudget(max_tokens=max_input_tokens, estimate_tokens=token_estimator or estimate_tokens)
+			if max_input_tokens is not None
+			else None
+		)
+		self.last_context_budget_report: ContextBudgetReport | None = None
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
+		self._history_builder = AgentHistoryBuilder(max_history_items)
 
 		# Store settings as direct attributes instead of in a settings object
 		self.include_attributes = include_attributes or []
 		self.sensitive_data = sensitive_data
+		# Keeps the compiled secrets of this agent alive for the redaction of every step, they are dropped with the agent
+		self._compiled_sensitive_data: CompiledSensitiveData | None = None
 		self.last_input_messages = []
 		# Only initialize messages if state is empty
 		if len(self.state.history.get_messages()) == 0:
@@ -136,31 +231,7 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		total_items = len(self.state.agent_history_items)
-
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
-
-		# Show first item + omitted message + most recent (max_history_items - 1) items
-		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
-
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+		return self._history_builder.build(self.state.agent_history_items)
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -260,10 +331,15 @@ class MessageManager:
 		# Collect placeholders for sensitive data
 		placeholders: set[str] = set()
 
+		domain_patterns = tuple(key for key, value in sensitive_data.items() if isinstance(value, dict))
+		matched_patterns: frozenset[str] = frozenset()
+		if current_page_url and domain_patterns:
+			matched_patterns = get_domain_matcher(domain_patterns, log_warnings=True).matching_patterns(current_page_url)
+
 		for key, value in sensitive_data.items():
 			if isinstance(value, dict):
 				# New format: {domain: {key: value}}
-				if current_page_url and match_url_with_domain_pattern(current_page_url, key, True):
+				if key in matched_patterns:
 					placeholders.update(value.keys())
 			else:
 				# Old format: {key: value}
@@ -312,10 +388,13 @@ class MessageManager:
 
 		# Create single state message with all content
 		assert browser_state_summary
-		state_message = AgentMessagePrompt(
+		state_prompt = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
 			agent_history_description=self.agent_history_description,
+			agent_history_lines=self._history_builder.visible_lines(self.state.agent_history_items)
+			if self.message_layout == 'cache_optimized'
+			else None,
 			read_state_description=self.state.read_state_description,
 			task=self.task,
 			include_attributes=self.include_attributes,
@@ -327,11 +406,22 @@ class MessageManager:
 			vision_detail_level=self.vision_detail_level,
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
-		).get_user_message(use_vision)
+			message_layout=self.message_layout,
+			context_budget=self.context_budget,
+			reserved_tokens=self._get_reserved_tokens(),
+		)
+		state_message = state_prompt.get_user_message(use_vision)
+		self.last_context_budget_report = state_prompt.context_budget_report
 
 		# Set the state message with caching enabled
 		self._set_message_with_type(state_message, 'state')
 
+	def _get_reserved_tokens(self) -> int:
+		"""Tokens of the system prompt, which count against the context budget of every step"""
+		if self.context_budget is None:
+			return 0
+		return self.context_budget.estimate_tokens(self.system_prompt.text)
+
 	def _log_history_lines(self) -> str:
 		"""Generate a formatted log string of message history for debugging / printing to terminal"""
 		# TODO: fix logging
@@ -401,30 +491,15 @@ class MessageManager:
 			if not self.sensitive_data:
 				return value
 
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
+			# All secret values (legacy and of every domain) are compiled once and replaced in a single pass
+			compiled = self._compiled_sensitive_data = get_compiled_sensitive_data(self.sensitive_data)
 
 			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
+			if compiled.is_empty:
 				logger.warning('No valid entries found in sensitive_data dictionary')
 				return value
 
-			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+			return compiled.redactor.redact(value)
 
 		if isinstance(message.content, str):
 			message.content = replace_sensitive(message.content)
@@ -65,6 +65,27 @@ class HistoryItem(BaseModel):
 </{step_str}>"""
 
 
+class ContextSectionBudget(BaseModel):
+	"""Token budget of one section of the state message"""
+
+	requested_tokens: int
+	allocated_tokens: int
+	truncated: bool = False
+
+
+class ContextBudgetReport(BaseModel):
+	"""How the input token budget of a step was spent across the sections of the prompt"""
+
+	max_tokens: int
+	fixed_tokens: int  # system prompt and the parts of the state message that are never truncated
+	total_tokens: int
+	sections: dict[str, ContextSectionBudget] = Field(default_factory=dict)
+
+	@property
+	def truncated_sections(self) -> list[str]:
+		return [name for name, section in self.sections.items() if section.truncated]
+
+
 class MessageHistory(BaseModel):
 	"""History of messages"""
 
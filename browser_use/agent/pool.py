@@ -0,0 +1,324 @@
+"""
+Run many agent tasks on a fixed set of pre-launched browsers.
+
+Launching Chromium for every task costs seconds and hundreds of MB, and running agents with a bare asyncio.gather lets
+every agent fire LLM calls and launch browsers at once. AgentPool keeps its browsers started in a BrowserSessionPool,
+each with its own temporary profile, and runs the tasks of a queue on them:
+
+- every task leases a browser of its own for the duration of the task, so at most `browsers` agents run at once
+- with contexts_per_browser > 1 these are isolated browser contexts sharing Chromium processes, which fits many more
+  agents into the same memory
+- max_concurrency caps the number of running agents, max_memory_mb holds back new tasks while the memory of the process
+  and its browsers is above the limit
+- LLM calls of all agents go through one LLMScheduler, with the pool's rate limits
+- between tasks the session pool resets the browsers, and launches a browser again that crashed or stopped responding
+
+Results are streamed as the tasks finish, the pool metrics report the throughput in tasks per hour and per CPU core.
+
+Usage:
+	async with AgentPool(llm=ChatOpenAI(model='gpt-4.1-mini'), browsers=4) as pool:
+		async for result in pool.run(['Find the price of ...', 'Find the age of ...']):
+			print(result.task_id, result.success, result.final_result)
+		print(pool.metrics, pool.browser_pool.metrics)
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from typing import Any
+
+import psutil
+from pydantic import BaseModel, ConfigDict, Field
+from uuid_extensions import uuid7str
+
+from browser_use.agent.views import AgentHistoryList
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.pool import BrowserSessionPool
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import release_shared_clients, retain_shared_clients
+from browser_use.llm.scheduler import LLMScheduler, RateLimits, get_llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+_MEMORY_CHECK_INTERVAL = 0.5
+
+
+class AgentPoolTask(BaseModel):
+	"""A task for the pool, plain strings are wrapped in one"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task: str
+	id: str = Field(default_factory=uuid7str)
+	max_steps: int | None = None  # defaults to the max_steps of the pool
+	agent_kwargs: dict[str, Any] = Field(default_factory=dict)  # extra Agent arguments for this task only
+
+
+class AgentPoolResult(BaseModel):
+	"""Outcome and metrics of one task"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task_id: str
+	task: str
+	browser_session_id: str | None = None
+	success: bool | None = None
+	final_result: str | None = None
+	error: str | None = None
+	steps: int = 0
+	queued_seconds: float = 0.0  # from the start of the run until a browser was leased
+	duration_seconds: float = 0.0
+	total_tokens: int = 0
+	total_cost: float = 0.0
+	history: AgentHistoryList | None = Field(default=None, exclude=True)
+
+
+class AgentPoolMetrics(BaseModel):
+	"""Counters of a pool run"""
+
+	tasks_started: int = 0
+	tasks_completed: int = 0
+	tasks_succeeded: int = 0
+	tasks_failed: int = 0  # the agent raised or the task ended without success
+	memory_waits: int = 0  # times a task was held back by max_memory_mb
+	elapsed_seconds: float = 0.0
+	cpu_count: int = Field(default_factory=lambda: os.cpu_count() or 1)
+
+	@property
+	def tasks_per_hour(self) -> float:
+		return self.tasks_completed / self.elapsed_seconds * 3600 if self.elapsed_seconds else 0.0
+
+	@property
+	def tasks_per_hour_per_core(self) -> float:
+		return self.tasks_per_hour / self.cpu_count
+
+
+# A list or async iterable of tasks, or an asyncio.Queue that is read until it yields None
+PoolTasks = Iterable[str | AgentPoolTask] | AsyncIterable[str | AgentPoolTask] | asyncio.Queue[str | AgentPoolTask | None]
+
+
+class AgentPool:
+	"""
+	Runs agent tasks on a pool of pre-launched browsers.
+
+	Args:
+		llm: Chat model of the agents, every agent gets a shallow copy so their token tracking stays separate
+		browsers: Number of browser sessions, each running task has one of its own
+		max_concurrency: Maximum number of agents running at once, defaults to the number of browsers
+		browser_profile: Profile the browsers are launched with, every browser gets its own temporary user data dir
+		llm_scheduler: Scheduler the LLM calls of all agents go through, the process-wide one if rate_limits are set
+		rate_limits: Limits for the provider/model of llm in the scheduler
+		max_memory_mb: Don't start new tasks while the RSS of this process and its browsers is above this
+		max_steps: Default max_steps of the tasks
+		agent_kwargs: Extra Agent arguments for all tasks
+		contexts_per_browser: Run up to this many browser sessions as isolated contexts in one browser process
+		browser_session_factory: Creates the (not yet started) session of a browser, for custom launch setups
+		browser_pool: Session pool to lease the browsers from instead of one created from the arguments above
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		browsers: int = 1,
+		max_concurrency: int | None = None,
+		browser_profile: BrowserProfile | None = None,
+		llm_scheduler: LLMScheduler | None = None,
+		rate_limits: RateLimits | None = None,
+		max_memory_mb: float | None = None,
+		max_steps: int = 100,
+		agent_kwargs: dict[str, Any] | None = None,
+		contexts_per_browser: int = 1,
+		browser_session_factory: Callable[[int], BrowserSession] | None = None,
+		browser_pool: BrowserSessionPool | None = None,
+	):
+		self.browser_pool = browser_pool or BrowserSessionPool(
+			size=browsers,
+			browser_profile=browser_profile,
+			contexts_per_browser=contexts_per_browser,
+			session_factory=browser_session_factory,
+		)
+		self.llm = llm
+		self.browsers = self.browser_pool.size
+		self.max_concurrency = max_concurrency or self.browsers
+		self.max_memory_mb = max_memory_mb
+		self.max_steps = max_steps
+		self.agent_kwargs = agent_kwargs or {}
+
+		self.llm_scheduler = llm_scheduler or (get_llm_scheduler() if rate_limits is not None else None)
+		if self.llm_scheduler is not None:
+			if rate_limits is not None:
+				self.llm_scheduler.set_limits(f'{llm.provider}:{llm.model}', rate_limits)
+			# Registered once here, the copies of the agents share the scheduled ainvoke
+			self.llm_scheduler.register_llm(self.llm, priority='normal')
+
+		self.metrics = AgentPoolMetrics()
+		self._concurrency = asyncio.Semaphore(self.max_concurrency)
+		self._running = 0
+		self._retains_shared_clients = False
+
+	async def __aenter__(self) -> 'AgentPool':
+		await self.start()
+		return self
+
+	async def __aexit__(self, *args: Any) -> None:
+		await self.close()
+
+	async def start(self) -> None:
+		"""Launch all browsers of the pool"""
+		if not self._retains_shared_clients:
+			# The agents of consecutive tasks reuse the LLM connections until the pool is closed
+			retain_shared_clients()
+			self._retains_shared_clients = True
+		await self.browser_pool.start()
+
+	async def close(self) -> None:
+		"""Kill all browsers of the pool and close the shared LLM clients"""
+		await self.browser_pool.close()
+		if self._retains_shared_clients:
+			self._retains_shared_clients = False
+			await release_shared_clients()
+
+	@staticmethod
+	def _get_memory_usage_mb() -> float:
+		"""RSS of this process and all its children (the browsers)"""
+		process = psutil.Process()
+		rss = process.memory_info().rss
+		for child in process.children(recursive=True):
+			try:
+				rss += child.memory_info().rss
+			except psutil.Error:
+				pass
+		return rss / 1024 / 1024
+
+	async def _wait_for_memory(self) -> None:
+		if self.max_memory_mb is None:
+			return
+		waited = False
+		# A task always runs when nothing else does, otherwise the pool would wait forever
+		while self._running and self._get_memory_usage_mb() > self.max_memory_mb:
+			if not waited:
+				self.metrics.memory_waits += 1
+				logger.debug(f'⏳ AgentPool memory above {self.max_memory_mb:.0f}MB, waiting for running tasks')
+				waited = True
+			await asyncio.sleep(_MEMORY_CHECK_INTERVAL)
+
+	async def _run_agent(self, pool_task: AgentPoolTask, browser_session: BrowserSession) -> AgentHistoryList:
+		"""Run the agent of one task on a browser of the pool"""
+		from browser_use.agent.service import Agent
+
+		agent = Agent(
+			task=pool_task.task,
+			# Each agent wraps ainvoke of its llm for token tracking, a copy per task keeps the wrappers from stacking up
+			llm=copy.copy(self.llm),
+			browser_session=browser_session,
+			**{**self.agent_kwargs, **pool_task.agent_kwargs},
+		)
+		return await agent.run(max_steps=pool_task.max_steps or self.max_steps)
+
+	async def _run_task(self, pool_task: AgentPoolTask, run_start_time: float) -> AgentPoolResult:
+		result = AgentPoolResult(task_id=pool_task.id, task=pool_task.task)
+		browser_session: BrowserSession | None = None
+		start_time = time.time()
+
+		try:
+			browser_session = await self.browser_pool.acquire()
+			self.metrics.tasks_started += 1
+			start_time = time.time()
+			result.browser_session_id = browser_session.id
+			result.queued_seconds = start_time - run_start_time
+			history = await self._run_agent(pool_task, browser_session)
+			result.history = history
+			result.success = history.is_successful()
+			result.final_result = history.final_result()
+			result.steps = history.number_of_steps()
+			if history.usage is not None:
+				result.total_tokens = history.usage.total_tokens
+				result.total_cost = history.usage.total_cost
+			if result.success is not True:
+				result.error = next((error for error in reversed(history.errors()) if error), None)
+		except Exception as e:
+			logger.error(f'❌ AgentPool task {pool_task.id} failed: {type(e).__name__}: {e}')
+			result.error = f'{type(e).__name__}: {e}'
+		finally:
+			result.duration_seconds = time.time() - start_time
+			if browser_session is not None:
+				self.browser_pool.release(browser_session)
+
+		self.metrics.tasks_completed += 1
+		if result.success:
+			self.metrics.tasks_succeeded += 1
+		else:
+			self.metrics.tasks_failed += 1
+		return result
+
+	async def _iterate_tasks(self, tasks: PoolTasks) -> AsyncIterator[AgentPoolTask]:
+		if isinstance(tasks, asyncio.Queue):
+			# A queue is read until it yields None
+			while (item := await tasks.get()) is not None:
+				yield item if isinstance(item, AgentPoolTask) else AgentPoolTask(task=item)
+		elif isinstance(tasks, AsyncIterable):
+			async for item in tasks:
+				yield item if isinstance(item, AgentPoolTask) else AgentPoolTask(task=item)
+		else:
+			for item in tasks:
+				yield item if isinstance(item, AgentPoolTask) else AgentPoolTask(task=item)
+
+	async def run(self, tasks: PoolTasks) -> AsyncIterator[AgentPoolResult]:
+		"""
+		Run the tasks and yield their results in the order they finish.
+
+		tasks can be a list, an async iterable or an asyncio.Queue that is read until it yields None.
+		"""
+		await self.start()
+		run_start_time = time.time()
+		elapsed_before = self.metrics.elapsed_seconds
+		results: asyncio.Queue[AgentPoolResult | None] = asyncio.Queue()
+		running: set[asyncio.Task[None]] = set()
+
+		async def run_task(pool_task: AgentPoolTask) -> None:
+			try:
+				results.put_nowait(await self._run_task(pool_task, run_start_time))
+			finally:
+				self._running -= 1
+				self._concurrency.release()
+
+		async def feed() -> None:
+			try:
+				async for pool_task in self._iterate_tasks(tasks):
+					await self._concurrency.acquire()
+					await self._wait_for_memory()
+					# Counted before the task is scheduled, so the memory check of the next task sees it
+					self._running += 1
+					task = asyncio.create_task(run_task(pool_task), name=f'agent_pool_task_{pool_task.id}')
+					running.add(task)
+					task.add_done_callback(running.discard)
+				if running:
+					await asyncio.gather(*running, return_exceptions=True)
+			finally:
+				results.put_nowait(None)
+
+		feeder = asyncio.create_task(feed(), name='agent_pool_feeder')
+		try:
+			while (result := await results.get()) is not None:
+				self.metrics.elapsed_seconds = elapsed_before + time.time() - run_start_time
+				yield result
+			await feeder
+		finally:
+			if not feeder.done():
+				feeder.cancel()
+			for task in list(running):
+				task.cancel()
+			await asyncio.gather(feeder, *running, return_exceptions=True)
+			self.metrics.elapsed_seconds = elapsed_before + time.time() - run_start_time
+			logger.info(
+				f'🏊 AgentPool finished {self.metrics.tasks_completed} tasks ({self.metrics.tasks_succeeded} succeeded) '
+				f'in {self.metrics.elapsed_seconds:.1f}s: {self.metrics.tasks_per_hour:.0f} tasks/hour, '
+				f'{self.metrics.tasks_per_hour_per_core:.0f} tasks/hour/core'
+			)
+
+	async def run_all(self, tasks: PoolTasks) -> list[AgentPoolResult]:
+		"""Run the tasks and return all results in the order they finished"""
+		return [result async for result in self.run(tasks)]
@@ -2,6 +2,8 @@ import importlib.resources
 from datetime import datetime
 from typing import TYPE_CHECKING, Literal, Optional
 
+from browser_use.agent.message_manager.context_budget import ContextAssembler, ContextBudget, ContextSection
+from browser_use.agent.message_manager.views import ContextBudgetReport
 from browser_use.dom.views import NodeType, SimplifiedNode
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 from browser_use.observability import observe_debug
@@ -95,6 +97,10 @@ class AgentMessagePrompt:
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		agent_history_lines: list[str] | None = None,
+		message_layout: Literal['default', 'cache_optimized'] = 'default',
+		context_budget: ContextBudget | None = None,
+		reserved_tokens: int = 0,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -111,11 +117,25 @@ class AgentMessagePrompt:
 		self.vision_detail_level = vision_detail_level
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images or []
+		self.agent_history_lines = agent_history_lines
+		self.message_layout = message_layout
+		# Token budget of the step, reserved_tokens are taken by the other messages (e.g. the system prompt)
+		self.context_budget = context_budget
+		self.reserved_tokens = reserved_tokens
+		self.context_budget_report: ContextBudgetReport | None = None
+		# Section texts, computed on first use and replaced by their truncated versions when a budget applies
+		self._elements_text: str | None = None
+		self._elements_truncation_note = ''
+		self._file_system_description: str | None = None
+		self._todo_contents: str | None = None
+		self._page_stats: dict[str, int] | None = None
 		assert self.browser_state
 
 	def _extract_page_statistics(self) -> dict[str, int]:
 		"""Extract high-level page statistics from DOM tree for LLM context"""
-		stats = {
+		if self._page_stats is not None:
+			return self._page_stats
+		self._page_stats = stats = {
 			'links': 0,
 			'iframes': 0,
 			'shadow_open': 0,
@@ -200,13 +220,8 @@ class AgentMessagePrompt:
 		stats_text += f', {page_stats["total_elements"]} total elements'
 		stats_text += '</page_stats>\n\n'
 
-		elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
-
-		if len(elements_text) > self.max_clickable_elements_length:
-			elements_text = elements_text[: self.max_clickable_elements_length]
-			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
-		else:
-			truncated_text = ''
+		elements_text = self._get_elements_text()
+		truncated_text = self._elements_truncation_note
 
 		has_content_above = False
 		has_content_below = False
@@ -282,7 +297,27 @@ Available tabs:
 """
 		return browser_state
 
-	def _get_agent_state_description(self) -> str:
+	def _get_elements_text(self) -> str:
+		"""Serialized interactive elements, cut to max_clickable_elements_length characters"""
+		if self._elements_text is None:
+			elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
+			if len(elements_text) > self.max_clickable_elements_length:
+				elements_text = elements_text[: self.max_clickable_elements_length]
+				self._elements_truncation_note = f' (truncated to {self.max_clickable_elements_length} characters)'
+			self._elements_text = elements_text
+		return self._elements_text
+
+	def _get_file_system_description(self) -> str:
+		if self._file_system_description is None:
+			self._file_system_description = self.file_system.describe() if self.file_system else 'No file system available'
+		return self._file_system_description
+
+	def _get_todo_contents(self) -> str:
+		if self._todo_contents is None:
+			self._todo_contents = self.file_system.get_todo_contents() if self.file_system else ''
+		return self._todo_contents
+
+	def _get_agent_state_description(self, include_stable_sections: bool = True) -> str:
 		if self.step_info:
 			step_info_description = f'Step {self.step_info.step_number + 1}. Maximum steps: {self.step_info.max_steps}\n'
 		else:
@@ -291,22 +326,21 @@ Available tabs:
 		time_str = datetime.now().strftime('%Y-%m-%d')
 		step_info_description += f'Current date: {time_str}'
 
-		_todo_contents = self.file_system.get_todo_contents() if self.file_system else ''
+		_todo_contents = self._get_todo_contents()
 		if not len(_todo_contents):
 			_todo_contents = '[Current todo.md is empty, fill it with your plan when applicable]'
 
-		agent_state = f"""
-<user_request>
-{self.task}
-</user_request>
+		# The cache optimized layout puts the user request and sensitive data at the start of the message instead
+		agent_state = f'\n<user_request>\n{self.task}\n</user_request>' if include_stable_sections else ''
+		agent_state += f"""
 <file_system>
-{self.file_system.describe() if self.file_system else 'No file system available'}
+{self._get_file_system_description()}
 </file_system>
 <todo_contents>
 {_todo_contents}
 </todo_contents>
 """
-		if self.sensitive_data:
+		if self.sensitive_data and include_stable_sections:
 			agent_state += f'<sensitive_data>\n{self.sensitive_data}\n</sensitive_data>\n'
 
 		agent_state += f'<step_info>\n{step_info_description}\n</step_info>\n'
@@ -327,6 +361,15 @@ Available tabs:
 		):
 			use_vision = False
 
+		if self.context_budget is not None:
+			use_vision = self._apply_context_budget(use_vision)
+
+		return self._build_user_message(use_vision)
+
+	def _build_user_message(self, use_vision: bool) -> UserMessage:
+		if self.message_layout == 'cache_optimized':
+			return self._get_cache_optimized_user_message(use_vision)
+
 		# Build complete state description
 		state_description = (
 			'<agent_history>\n'
@@ -348,32 +391,141 @@ Available tabs:
 		if use_vision is True and self.screenshots:
 			# Start with text description
 			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [ContentPartTextParam(text=state_description)]
+			content_parts.extend(self._get_image_parts())
+			return UserMessage(content=content_parts, cache=True)
 
-			# Add sample images
-			content_parts.extend(self.sample_images)
-
-			# Add screenshots with labels
-			for i, screenshot in enumerate(self.screenshots):
-				if i == len(self.screenshots) - 1:
-					label = 'Current screenshot:'
-				else:
-					# Use simple, accurate labeling since we don't have actual step timing info
-					label = 'Previous screenshot:'
-
-				# Add label as text content
-				content_parts.append(ContentPartTextParam(text=label))
-
-				# Add the screenshot
-				content_parts.append(
-					ContentPartImageParam(
-						image_url=ImageURL(
-							url=f'data:image/png;base64,{screenshot}',
-							media_type='image/png',
-							detail=self.vision_detail_level,
-						),
-					)
+		return UserMessage(content=state_description, cache=True)
+
+	def _apply_context_budget(self, use_vision: bool) -> bool:
+		"""Truncate the sections of the message to fit the context budget and record the breakdown.
+
+		Returns:
+			Whether the screenshots still fit into the budget
+		"""
+		assert self.context_budget is not None
+		history_lines = self.agent_history_lines
+		history_description = self.agent_history_description
+		if history_lines is not None:
+			history_text = '\n'.join(history_lines)
+		else:
+			history_text = history_description.strip('\n') if history_description else ''
+
+		# Higher priority sections keep their content first
+		sections = [
+			ContextSection('todo_contents', self._get_todo_contents(), priority=60),
+			ContextSection('agent_history', history_text, priority=50, truncation='middle'),
+			ContextSection('browser_state', self._get_elements_text(), priority=40),
+			ContextSection('read_state', self.read_state_description or '', priority=20),
+			ContextSection('file_system', self._get_file_system_description(), priority=10),
+		]
+		if use_vision and self.screenshots:
+			sections.append(ContextSection('screenshots', '', priority=30, image_count=len(self.screenshots)))
+
+		image_tokens = len(self.sample_images) * self.context_budget.image_tokens if use_vision and self.screenshots else 0
+		# Everything that is not a budgeted section: the message rendered with all sections empty
+		self._set_section_texts(dict.fromkeys((section.name for section in sections), ''))
+		fixed_tokens = self._count_text_tokens() + image_tokens
+
+		assembler = ContextAssembler(self.context_budget)
+		for _ in range(3):
+			texts, report = assembler.assemble(sections, fixed_tokens)
+			self._set_section_texts(texts)
+			# The tags around non-empty sections and the estimator's rounding aren't part of fixed_tokens, measure the result
+			screenshot_tokens = report.sections['screenshots'].allocated_tokens if 'screenshots' in report.sections else 0
+			used_tokens = self._count_text_tokens() + image_tokens + screenshot_tokens
+			if used_tokens <= self.context_budget.max_tokens:
+				break
+			fixed_tokens += used_tokens - report.total_tokens
+		self.context_budget_report = report
+
+		if not self.context_budget_report.sections['agent_history'].truncated:
+			# Keep the history as it was, one part per item in the cache optimized layout
+			self.agent_history_lines = history_lines
+			self.agent_history_description = history_description
+
+		screenshots = self.context_budget_report.sections.get('screenshots')
+		return use_vision and not (screenshots and screenshots.truncated)
+
+	def _set_section_texts(self, texts: dict[str, str]) -> None:
+		self._todo_contents = texts['todo_contents']
+		self._elements_text = texts['browser_state']
+		self.read_state_description = texts['read_state']
+		self._file_system_description = texts['file_system']
+		self.agent_history_description = texts['agent_history']
+		self.agent_history_lines = None
+
+	def _count_text_tokens(self) -> int:
+		"""Estimated tokens of the text of the message and the reserved tokens, images not included"""
+		assert self.context_budget is not None
+		return self.reserved_tokens + self.context_budget.estimate_tokens(self._build_user_message(use_vision=False).text)
+
+	def _get_image_parts(self) -> list[ContentPartTextParam | ContentPartImageParam]:
+		"""Sample images and labeled screenshots for vision"""
+		# Add sample images
+		content_parts: list[ContentPartTextParam | ContentPartImageParam] = list(self.sample_images)
+
+		# Add screenshots with labels
+		for i, screenshot in enumerate(self.screenshots):
+			if i == len(self.screenshots) - 1:
+				label = 'Current screenshot:'
+			else:
+				# Use simple, accurate labeling since we don't have actual step timing info
+				label = 'Previous screenshot:'
+
+			# Add label as text content
+			content_parts.append(ContentPartTextParam(text=label))
+
+			# Add the screenshot
+			content_parts.append(
+				ContentPartImageParam(
+					image_url=ImageURL(
+						url=f'data:image/png;base64,{screenshot}',
+						media_type='image/png',
+						detail=self.vision_detail_level,
+					),
 				)
+			)
+		return content_parts
 
-			return UserMessage(content=content_parts, cache=True)
+	def _get_cache_optimized_user_message(self, use_vision: bool) -> UserMessage:
+		"""State message ordered strictly from stable to volatile content, for provider prompt caching.
 
-		return UserMessage(content=state_description, cache=True)
+		The user request and sensitive data come first, then the append-only agent history with one part per
+		history item, then everything that changes every step. Anthropic gets a cache breakpoint after the last
+		history item: the next step finds the breakpoint of this step when looking back over its history items.
+		OpenAI and Gemini cache the identical prefix implicitly.
+		"""
+		stable_description = f'<user_request>\n{self.task}\n</user_request>\n'
+		if self.sensitive_data:
+			stable_description += f'<sensitive_data>\n{self.sensitive_data}\n</sensitive_data>\n'
+		stable_description += '<agent_history>\n'
+
+		if self.agent_history_lines is not None:
+			history_lines = self.agent_history_lines
+		else:
+			history_lines = [self.agent_history_description.strip('\n')] if self.agent_history_description else []
+
+		stable_parts = [ContentPartTextParam(text=stable_description)]
+		stable_parts.extend(ContentPartTextParam(text=f'{line}\n') for line in history_lines)
+		stable_parts[-1].cache = True
+		content_parts: list[ContentPartTextParam | ContentPartImageParam] = [*stable_parts]
+
+		volatile_description = '</agent_history>\n\n'
+		if self.page_filtered_actions:
+			volatile_description += f'<page_specific_actions>\n{self.page_filtered_actions}\n</page_specific_actions>\n'
+		volatile_description += (
+			'<agent_state>\n'
+			+ self._get_agent_state_description(include_stable_sections=False).strip('\n')
+			+ '\n</agent_state>\n'
+		)
+		volatile_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
+		read_state_description = self.read_state_description.strip('\n').strip() if self.read_state_description else ''
+		if read_state_description:
+			volatile_description += '<read_state>\n' + read_state_description + '\n</read_state>\n'
+		content_parts.append(ContentPartTextParam(text=volatile_description))
+
+		if use_vision is True and self.screenshots:
+			content_parts.extend(self._get_image_parts())
+
+		# The breakpoint is on the last history part, a message level breakpoint would cache the volatile content
+		return UserMessage(content=content_parts, cache=False)
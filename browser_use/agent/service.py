@@ -23,8 +23,11 @@ from browser_use.agent.cloud_events import (
 )
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import release_shared_clients, retain_shared_clients
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
 from browser_use.llm.openai.chat import ChatOpenAI
+from browser_use.llm.parsing import parse_json_output
+from browser_use.llm.scheduler import LLMScheduler
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
@@ -41,6 +44,7 @@ from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
 from browser_use.agent.prompts import SystemPrompt
+from browser_use.agent.streaming import JSONArrayItemParser, StreamedActions, supports_streaming
 from browser_use.agent.views import (
 	ActionResult,
 	AgentError,
@@ -171,6 +175,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		use_thinking: bool = True,
 		flash_mode: bool = False,
 		max_history_items: int | None = None,
+		message_layout: Literal['default', 'cache_optimized'] = 'default',
+		max_input_tokens: int | None = None,
+		token_estimator: Callable[[str], int] | None = None,
+		pipeline_steps: bool = False,
+		stream_actions: bool = False,
+		screenshot_format: Literal['png', 'webp', 'jpeg'] = 'png',
+		screenshot_quality: int = 80,
 		page_extraction_llm: BaseChatModel | None = None,
 		injected_agent_state: AgentState | None = None,
 		source: str | None = None,
@@ -178,6 +189,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		task_id: str | None = None,
 		cloud_sync: CloudSync | None = None,
 		calculate_cost: bool = False,
+		llm_scheduler: LLMScheduler | None = None,
 		display_files_in_done_text: bool = True,
 		include_tool_call_examples: bool = False,
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
@@ -270,6 +282,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		self.sample_images = sample_images
 		self._last_selector_map_str: str | None = None
+		# Capture of the next browser state started at the end of a step when pipeline_steps is enabled
+		self._next_state_capture: asyncio.Task[tuple[BrowserStateSummary, float]] | None = None
+		# Set by run() when step hooks run between the steps, they may change the page after the capture has started
+		self._has_step_hooks = False
+		# Whether run() holds the shared LLM clients of its event loop open until close()
+		self._retains_shared_clients = False
+		self._stage_durations: dict[str, float] = {}
+		self._executed_results: list[ActionResult] = []  # results of a step's actions that ran before the step failed
 
 		self.settings = AgentSettings(
 			use_vision=use_vision,
@@ -285,6 +305,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			use_thinking=use_thinking,
 			flash_mode=flash_mode,
 			max_history_items=max_history_items,
+			message_layout=message_layout,
+			max_input_tokens=max_input_tokens,
+			token_estimator=token_estimator,
+			pipeline_steps=pipeline_steps,
+			stream_actions=stream_actions,
+			screenshot_format=screenshot_format,
+			screenshot_quality=screenshot_quality,
 			page_extraction_llm=page_extraction_llm,
 			calculate_cost=calculate_cost,
 			include_tool_call_examples=include_tool_call_examples,
@@ -298,6 +325,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.token_cost_service.register_llm(llm)
 		self.token_cost_service.register_llm(page_extraction_llm)
 
+		# Route LLM calls through the shared rate limited scheduler, agent steps before page extraction
+		if llm_scheduler is not None:
+			llm_scheduler.register_llm(llm, priority='normal')
+			llm_scheduler.register_llm(page_extraction_llm, priority='low')
+
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
 
@@ -374,6 +406,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_attributes=self.settings.include_attributes,
 			sensitive_data=sensitive_data,
 			max_history_items=self.settings.max_history_items,
+			message_layout=self.settings.message_layout,
+			max_input_tokens=self.settings.max_input_tokens,
+			token_estimator=self.settings.token_estimator,
 			vision_detail_level=self.settings.vision_detail_level,
 			include_tool_call_examples=self.settings.include_tool_call_examples,
 			include_recent_events=self.include_recent_events,
@@ -564,7 +599,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(
+				self.agent_directory, image_format=self.settings.screenshot_format, quality=self.settings.screenshot_quality
+			)
 			logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -603,24 +640,30 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	def _setup_action_models(self) -> None:
 		"""Setup dynamic action models from tools registry"""
+		# Output models by action model, the registry returns the same action model for the same set of actions
+		self._agent_output_models: dict[type[ActionModel], type[AgentOutput]] = {}
+
 		# Initially only include actions with no filters
 		self.ActionModel = self.tools.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'])
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
+
+	def _get_agent_output_model(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""Get the output model for action_model, created once per action model"""
+		output_model = self._agent_output_models.get(action_model)
+		if output_model is None:
+			if self.settings.flash_mode:
+				output_model = AgentOutput.type_with_custom_actions_flash_mode(action_model)
+			elif self.settings.use_thinking:
+				output_model = AgentOutput.type_with_custom_actions(action_model)
+			else:
+				output_model = AgentOutput.type_with_custom_actions_no_thinking(action_model)
+			self._agent_output_models[action_model] = output_model
+		return output_model
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -659,6 +702,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		self._stage_durations = {}
+		self._executed_results = []
 
 		browser_state_summary = None
 
@@ -667,12 +712,24 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			browser_state_summary = await self._prepare_context(step_info)
 
 			# Phase 2: Get model output and execute actions
-			await self._get_next_action(browser_state_summary)
-			await self._execute_actions()
+			if self.settings.stream_actions and supports_streaming(self.llm):
+				await self._get_next_action_and_execute_streamed(browser_state_summary)
+			else:
+				stage_start_time = time.time()
+				await self._get_next_action(browser_state_summary)
+				self._stage_durations['model_output'] = time.time() - stage_start_time
+
+				stage_start_time = time.time()
+				await self._execute_actions()
+				self._stage_durations['actions'] = time.time() - stage_start_time
 
 			# Phase 3: Post-processing
 			await self._post_process()
 
+			if self.settings.pipeline_steps and not self._has_step_hooks:
+				# The page has settled after the actions, capture the next state while this step is finalized
+				self._start_next_state_capture(step_info)
+
 		except Exception as e:
 			# Handle ALL exceptions in one place
 			await self._handle_step_error(e)
@@ -689,10 +746,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
 		# Always take screenshots for all steps
 		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
-		browser_state_summary = await self.browser_session.get_browser_state_summary(
-			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
-			include_recent_events=self.include_recent_events,
-		)
+		browser_state_summary = await self._get_browser_state()
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -737,6 +791,51 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self._force_done_after_failure()
 		return browser_state_summary
 
+	async def _capture_browser_state(self) -> BrowserStateSummary:
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		return await self.browser_session.get_browser_state_summary(
+			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
+			include_recent_events=self.include_recent_events,
+		)
+
+	async def _timed_capture_browser_state(self) -> tuple[BrowserStateSummary, float]:
+		capture_start_time = time.time()
+		browser_state_summary = await self._capture_browser_state()
+		return browser_state_summary, time.time() - capture_start_time
+
+	def _start_next_state_capture(self, step_info: AgentStepInfo | None = None) -> None:
+		"""Start capturing the browser state of the next step, it runs while the history, events and file system state
+		of this step are written"""
+		if self.state.last_result and self.state.last_result[-1].is_done:
+			return
+		if step_info is not None and step_info.step_number + 1 >= step_info.max_steps:
+			return
+		self._cancel_next_state_capture()
+		self._next_state_capture = asyncio.create_task(self._timed_capture_browser_state(), name='agent_next_state_capture')
+
+	def _cancel_next_state_capture(self) -> None:
+		if self._next_state_capture is not None:
+			self._next_state_capture.cancel()
+			self._next_state_capture = None
+
+	async def _get_browser_state(self) -> BrowserStateSummary:
+		"""Browser state of the step, from the capture started by the previous step if there is one"""
+		capture, self._next_state_capture = self._next_state_capture, None
+		wait_start_time = time.time()
+		if capture is not None:
+			try:
+				browser_state_summary, capture_duration = await capture
+				waited = time.time() - wait_start_time
+				self._stage_durations['browser_state'] = waited
+				self._stage_durations['browser_state_overlap'] = max(capture_duration - waited, 0.0)
+				return browser_state_summary
+			except Exception as e:
+				self.logger.debug(f'Capturing the browser state ahead failed, capturing it again: {type(e).__name__}: {e}')
+
+		browser_state_summary = await self._capture_browser_state()
+		self._stage_durations['browser_state'] = time.time() - wait_start_time
+		return browser_state_summary
+
 	@observe_debug(ignore_input=True, name='get_next_action')
 	async def _get_next_action(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Execute LLM interaction with retry logic and handle callbacks"""
@@ -773,6 +872,73 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# check again if Ctrl+C was pressed before we commit the output to history
 		await self._raise_if_stopped_or_paused()
 
+	async def _get_next_action_and_execute_streamed(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Stream the model output and execute its actions while it is generated
+
+		Pause and stop are checked before every action. The new step callback and the conversation are only saved
+		once the generation has finished, after the first actions may have run.
+		"""
+		input_messages = self._message_manager.get_messages()
+		self.logger.debug(
+			f'🤖 Step {self.state.n_steps}: Streaming LLM output with {len(input_messages)} messages (model: {self.llm.model})...'
+		)
+
+		streamed = StreamedActions()
+		model_output: AgentOutput | None = None
+		stage_start_time = time.time()
+		generation = asyncio.create_task(
+			asyncio.wait_for(self.get_model_output_streamed(input_messages, streamed), timeout=self.settings.llm_timeout)
+		)
+		execution = asyncio.create_task(self.multi_act(streamed))
+
+		try:
+			try:
+				model_output = await generation
+			except TimeoutError:
+				raise TimeoutError(
+					f'LLM call timed out after {self.settings.llm_timeout} seconds. Keep your thinking and output short.'
+				)
+			self._stage_durations['model_output'] = time.time() - stage_start_time
+
+			self.state.last_model_output = model_output
+			await self._raise_if_stopped_or_paused()
+			await self._handle_post_llm_processing(browser_state_summary, input_messages)
+			await self._raise_if_stopped_or_paused()
+
+			result = await execution
+		except Exception:
+			# Don't start any more actions of an output that failed, but let the running one finish
+			streamed.close()
+			generation.cancel()
+			await asyncio.gather(generation, execution, return_exceptions=True)
+			if streamed.executed:
+				# Record what ran with the error of the step, the model would repeat the actions otherwise
+				if model_output is None:
+					self.state.last_model_output = self.AgentOutput(action=list(streamed.executed))
+				else:
+					model_output.action = list(streamed.executed)
+				self._executed_results = list(streamed.results)
+				self.logger.debug(f'⚠️ Step {self.state.n_steps}: Failed after {len(streamed.executed)} streamed actions ran')
+			raise
+		except BaseException:
+			generation.cancel()
+			execution.cancel()
+			await asyncio.gather(generation, execution, return_exceptions=True)
+			raise
+
+		if not model_output.action:
+			# Nothing was executed, retry without streaming like an empty non-streamed output
+			model_output = await asyncio.wait_for(
+				self._retry_empty_model_output(input_messages, model_output), timeout=self.settings.llm_timeout
+			)
+			self.state.last_model_output = model_output
+			result = await self.multi_act(model_output.action)
+
+		if 'first_action' in self._stage_durations:
+			self._stage_durations['actions'] = time.time() - stage_start_time - self._stage_durations['first_action']
+		self.logger.debug(f'✅ Step {self.state.n_steps}: Actions completed')
+		self.state.last_result = result
+
 	async def _execute_actions(self) -> None:
 		"""Execute the actions from model output"""
 		if self.state.last_model_output is None:
@@ -838,7 +1004,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		else:
 			self.logger.error(f'{prefix}{error_msg}')
 
-		self.state.last_result = [ActionResult(error=error_msg)]
+		# Keep the results of the actions that already ran, so the model does not repeat them
+		self.state.last_result = [*self._executed_results, ActionResult(error=error_msg)]
 		return None
 
 	async def _finalize(self, browser_state_summary: BrowserStateSummary | None) -> None:
@@ -852,6 +1019,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				context_budget=self._message_manager.last_context_budget_report,
+				stage_durations=dict(self._stage_durations),
 			)
 
 			# Use _make_history_item like main branch
@@ -883,6 +1052,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				)
 				self.eventbus.dispatch(step_event)
 
+		if self._stage_durations:
+			stages = ', '.join(f'{stage} {duration:.2f}s' for stage, duration in self._stage_durations.items())
+			self.logger.debug(f'⏱️ Step {self.state.n_steps} stages: {stages}, finalize {time.time() - step_end_time:.2f}s')
+
 		# Increment step counter after step is fully completed
 		self.state.n_steps += 1
 
@@ -917,7 +1090,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(
 			f'✅ Step {self.state.n_steps}: Got LLM response with {len(model_output.action) if model_output.action else 0} actions'
 		)
+		return await self._retry_empty_model_output(input_messages, model_output)
 
+	async def _retry_empty_model_output(self, input_messages: list[BaseMessage], model_output: AgentOutput) -> AgentOutput:
+		"""Ask the model again if its output has no action, inserts a failed done action if it still has none"""
 		if (
 			not model_output.action
 			or not isinstance(model_output.action, list)
@@ -1212,6 +1388,44 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Just re-raise - Pydantic's validation errors are already descriptive
 			raise
 
+	async def get_model_output_streamed(self, input_messages: list[BaseMessage], streamed: StreamedActions) -> AgentOutput:
+		"""Stream the next action from the LLM, every action is put into `streamed` as soon as its JSON is complete"""
+		urls_replaced = self._process_messsages_and_replace_long_urls_shorter_ones(input_messages)
+		parser = JSONArrayItemParser('action')
+		# On forced done steps only the done action may run, validate against the done-only model before executing
+		action_model = self.DoneActionModel if self.AgentOutput is self.DoneAgentOutput else self.ActionModel
+		start_time = time.time()
+
+		try:
+			async for chunk in self.llm.astream(input_messages, output_format=self.AgentOutput):  # type: ignore[attr-defined]
+				for item in parser.feed(chunk.delta):
+					if len(streamed.actions) >= self.settings.max_actions_per_step:
+						continue
+					action = action_model.model_validate(item)
+					if not action.model_dump(exclude_unset=True):
+						continue
+					if urls_replaced:
+						self._recursive_process_all_strings_inside_pydantic_model(action, urls_replaced)
+					if not streamed.actions:
+						self._stage_durations['first_action'] = time.time() - start_time
+					streamed.put(action)
+
+			parsed = parse_json_output(self.AgentOutput, parser.text)
+			if urls_replaced:
+				self._recursive_process_all_strings_inside_pydantic_model(parsed, urls_replaced)
+			# The output refers to the actions that were executed
+			parsed.action = list(streamed.actions)
+		finally:
+			streamed.finish()
+
+		self.logger.debug(f'✅ Step {self.state.n_steps}: Streamed LLM response with {len(parsed.action)} actions')
+		if not (hasattr(self.state, 'paused') and (self.state.paused or self.state.stopped)):
+			log_response(parsed, self.tools.registry.registry, self.logger)
+
+		self._log_next_action_summary(parsed)
+		cl_log_debug_llm_decision(parsed, selector_map_str=self._last_selector_map_str)
+		return parsed
+
 	async def _log_agent_run(self) -> None:
 		"""Log the agent run"""
 		# Blue color for task
@@ -1368,6 +1582,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		if self.history.is_done():
 			await self.log_completion()
+			await self.screenshot_service.flush()
 			if self.register_done_callback:
 				if inspect.iscoroutinefunction(self.register_done_callback):
 					await self.register_done_callback(self.history)
@@ -1448,6 +1663,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			exit_on_second_int=True,
 		)
 		signal_handler.register()
+		self._has_step_hooks = on_step_start is not None or on_step_end is not None
+
+		if not self._retains_shared_clients:
+			retain_shared_clients()
+			self._retains_shared_clients = True
 
 		try:
 			await self._log_agent_run()
@@ -1531,6 +1751,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				if self.history.is_done():
 					self.logger.debug(f'🎯 Task completed after {step + 1} steps!')
 					await self.log_completion()
+					await self.screenshot_service.flush()
 
 					if self.register_done_callback:
 						if inspect.iscoroutinefunction(self.register_done_callback):
@@ -1585,6 +1806,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			raise e
 
 		finally:
+			self._cancel_next_state_capture()
+
 			# Log token usage summary
 			await self.token_cost_service.log_usage_summary()
 
@@ -1608,6 +1831,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.enable_cloud_sync:
 				self.eventbus.dispatch(UpdateAgentTaskEvent.from_agent(self))
 
+			# Make sure all screenshots referenced by the history are on disk
+			await self.screenshot_service.flush()
+
 			# Generate GIF if needed before stopping event bus
 			if self.settings.generate_gif:
 				output_path: str = 'agent_history.gif'
@@ -1645,13 +1871,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	@time_execution_async('--multi_act')
 	async def multi_act(
 		self,
-		actions: list[ActionModel],
+		actions: list[ActionModel] | StreamedActions,
 		check_for_new_elements: bool = True,
 	) -> list[ActionResult]:
-		"""Execute multiple actions"""
-		results: list[ActionResult] = []
+		"""Execute multiple actions, streamed actions are executed as soon as they are generated"""
 		time_elapsed = 0
-		total_actions = len(actions)
+		streamed = actions if isinstance(actions, StreamedActions) else StreamedActions(actions, finished=True)
+		results = streamed.results
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		try:
@@ -1669,11 +1895,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			cached_selector_map = {}
 			cached_element_hashes = set()
 
-		for i, action in enumerate(actions):
+		i = -1
+		async for action in streamed:
+			i += 1
 			if i > 0:
 				# ONLY ALLOW TO CALL `done` IF IT IS A SINGLE ACTION
 				if action.model_dump(exclude_unset=True).get('done') is not None:
-					msg = f'Done action is allowed only as a single action - stopped after action {i} / {total_actions}.'
+					msg = f'Done action is allowed only as a single action - stopped after action {i} / {streamed.total}.'
 					self.logger.debug(msg)
 					break
 
@@ -1702,7 +1930,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				if orig_target_hash != new_target_hash:
 					# Get names of remaining actions that won't be executed
-					remaining_actions_str = get_remaining_actions_str(actions, i)
+					remaining_actions_str = get_remaining_actions_str(await streamed.wait_finished(), i)
 					msg = f'Page changed after action: actions {remaining_actions_str} are not yet executed'
 					logger.info(msg)
 					results.append(
@@ -1720,8 +1948,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					# next action requires index but there are new elements on the page
 					# log difference in len debug
 					self.logger.debug(f'New elements: {abs(len(new_element_hashes) - len(cached_element_hashes))}')
-					remaining_actions_str = get_remaining_actions_str(actions, i)
-					msg = f'Something new appeared after action {i} / {total_actions}: actions {remaining_actions_str} were not executed'
+					remaining_actions_str = get_remaining_actions_str(await streamed.wait_finished(), i)
+					msg = f'Something new appeared after action {i} / {streamed.total}: actions {remaining_actions_str} were not executed'
 					logger.info(msg)
 					results.append(
 						ActionResult(
@@ -1754,7 +1982,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				action_params = str(action_params)
 				action_params = f'{action_params[:522]}...' if len(action_params) > 528 else action_params
 				time_start = time.time()
-				self.logger.info(f'  🦾 {blue}[ACTION {i + 1}/{total_actions}]{reset} {action_params}')
+				self.logger.info(f'  🦾 {blue}[ACTION {i + 1}/{streamed.total}]{reset} {action_params}')
 
 				result = await self.tools.act(
 					action=action,
@@ -1767,10 +1995,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				time_end = time.time()
 				time_elapsed = time_end - time_start
+				streamed.executed.append(action)
 				results.append(result)
 
 				self.logger.debug(
-					f'☑️ Executed action {i + 1}/{total_actions}: {green}{action_params}{reset} in {time_elapsed:.2f}s'
+					f'☑️ Executed action {i + 1}/{streamed.total}: {green}{action_params}{reset} in {time_elapsed:.2f}s'
 				)
 
 				try:
@@ -1778,7 +2007,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				except Exception:
 					pass
 
-				if results[-1].is_done or results[-1].error or i == total_actions - 1:
+				if results[-1].is_done or results[-1].error:
 					break
 
 			except Exception as e:
@@ -1989,6 +2218,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		print('\n\n⏸️ Paused the agent and left the browser open.\n\tPress [Enter] to resume or [Ctrl+C] again to quit.')
 		self.state.paused = True
 		self._external_pause_event.clear()
+		# The page can change while paused
+		self._cancel_next_state_capture()
 
 	def resume(self) -> None:
 		"""Resume the agent"""
@@ -2002,6 +2233,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		"""Stop the agent"""
 		self.logger.info('⏹️ Agent stopping')
 		self.state.stopped = True
+		self._cancel_next_state_capture()
 
 		# Signal pause event to unblock any waiting code so it can check the stopped state
 		self._external_pause_event.set()
@@ -2048,6 +2280,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			self._cancel_next_state_capture()
+			await self.screenshot_service.flush()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -2055,6 +2290,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					# stops the EventBus with clear=True, and recreates a fresh EventBus
 					await self.browser_session.kill()
 
+			# Close the connection pools of the shared LLM clients once no other agent on this loop uses them
+			if self._retains_shared_clients:
+				self._retains_shared_clients = False
+				await release_shared_clients()
+
 			# Force garbage collection
 			gc.collect()
 
@@ -2081,23 +2321,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def _update_action_models_for_page(self, page_url: str) -> None:
 		"""Update action models with page-specific actions"""
 		# Create new action model with current page's filtered actions
+		# (cached by the set of available actions, so steps on the same site reuse the same classes and schemas)
 		self.ActionModel = self.tools.registry.create_action_model(page_url=page_url)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
 
 	def get_trace_object(self) -> dict[str, Any]:
 		"""Get the trace and trace_details objects for the agent"""
@@ -0,0 +1,139 @@
+"""
+Incremental parsing of streamed agent output, so actions can be executed while the model is still generating.
+
+The model streams the JSON of AgentOutput. JSONArrayItemParser yields every item of the top-level `action` array as
+soon as its object is complete, StreamedActions hands the validated actions to multi_act while generation continues.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from browser_use.agent.views import ActionResult
+from browser_use.llm.base import BaseChatModel
+from browser_use.tools.registry.views import ActionModel
+
+
+def supports_streaming(llm: BaseChatModel) -> bool:
+	"""Whether the chat model can stream its completion with `astream`"""
+	return callable(getattr(llm, 'astream', None))
+
+
+class JSONArrayItemParser:
+	"""
+	Parses a streamed JSON object and returns the complete items of one of its top-level array fields.
+
+	Only the array of `key` at the top level of the object is parsed, objects nested inside other fields are skipped.
+	"""
+
+	def __init__(self, key: str):
+		self.key = key
+		self.text = ''
+
+		self._pos = 0
+		self._depth = 0
+		self._in_string = False
+		self._escape = False
+		self._string_start = 0
+		self._last_string: str | None = None
+		self._current_key: str | None = None
+		self._array_depth: int | None = None  # depth of the items of the array, while it is parsed
+		self._array_done = False
+		self._item_start: int | None = None
+
+	def feed(self, delta: str) -> list[Any]:
+		"""Add streamed text, returns the items of the array that were completed by it"""
+		self.text += delta
+		text = self.text
+		items: list[Any] = []
+
+		for pos in range(self._pos, len(text)):
+			char = text[pos]
+
+			if self._in_string:
+				if self._escape:
+					self._escape = False
+				elif char == '\\':
+					self._escape = True
+				elif char == '"':
+					self._in_string = False
+					if self._depth == 1:
+						self._last_string = json.loads(text[self._string_start : pos + 1])
+				continue
+
+			if char == '"':
+				self._in_string = True
+				self._string_start = pos
+			elif char == ':' and self._depth == 1:
+				self._current_key = self._last_string
+			elif char == ',' and self._depth == 1:
+				self._current_key = None
+			elif char in '{[':
+				if char == '[' and self._depth == 1 and self._current_key == self.key and not self._array_done:
+					self._array_depth = self._depth + 1
+				elif char == '{' and self._array_depth is not None and self._depth == self._array_depth:
+					self._item_start = pos
+				self._depth += 1
+			elif char in '}]':
+				self._depth -= 1
+				if self._array_depth is None:
+					continue
+				if self._item_start is not None and self._depth == self._array_depth:
+					items.append(json.loads(text[self._item_start : pos + 1]))
+					self._item_start = None
+				elif self._depth < self._array_depth:
+					self._array_depth = None
+					self._array_done = True
+
+		self._pos = len(text)
+		return items
+
+
+class StreamedActions:
+	"""Actions of a model output that is still being generated, iterating waits for the next action or the end"""
+
+	def __init__(self, actions: list[ActionModel] | None = None, finished: bool = False):
+		self.actions: list[ActionModel] = list(actions or [])
+		self.finished = finished
+		self.closed = False
+		# Filled in by multi_act, so the actions that ran are known even if the step fails halfway
+		self.executed: list[ActionModel] = []
+		self.results: list[ActionResult] = []
+		self._changed = asyncio.Event()
+
+	@property
+	def total(self) -> str:
+		"""Number of actions for logging, unknown until the generation has finished"""
+		return str(len(self.actions)) if self.finished else '?'
+
+	def put(self, action: ActionModel) -> None:
+		self.actions.append(action)
+		self._changed.set()
+
+	def finish(self) -> None:
+		self.finished = True
+		self._changed.set()
+
+	def close(self) -> None:
+		"""Stop handing out actions, an action that is already running still finishes"""
+		self.closed = True
+		self.finish()
+
+	async def wait_finished(self) -> list[ActionModel]:
+		while not self.finished:
+			self._changed.clear()
+			await self._changed.wait()
+		return self.actions
+
+	async def __aiter__(self) -> AsyncIterator[ActionModel]:
+		index = 0
+		while not self.closed:
+			if index < len(self.actions):
+				yield self.actions[index]
+				index += 1
+			elif self.finished:
+				return
+			else:
+				self._changed.clear()
+				await self._changed.wait()
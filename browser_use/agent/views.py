@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import traceback
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Generic, Literal
@@ -12,7 +13,8 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
 from typing_extensions import TypeVar
 from uuid_extensions import uuid7str
 
-from browser_use.agent.message_manager.views import MessageManagerState
+from browser_use.agent.message_manager.views import ContextBudgetReport, MessageManagerState
+from browser_use.browser.sensitive_data import get_compiled_sensitive_data
 from browser_use.browser.views import BrowserStateHistory
 from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, DOMInteractedElement, DOMSelectorMap
 
@@ -46,6 +48,20 @@ class AgentSettings(BaseModel):
 	use_thinking: bool = True
 	flash_mode: bool = False  # If enabled, disables evaluation_previous_goal and next_goal, and sets use_thinking = False
 	max_history_items: int | None = None
+	# cache_optimized orders the state message from stable to volatile content and sets provider cache breakpoints
+	message_layout: Literal['default', 'cache_optimized'] = 'default'
+	# Input token budget of a step, the state message sections are truncated by priority to fit it
+	max_input_tokens: int | None = None
+	token_estimator: Callable[[str], int] | None = Field(default=None, exclude=True)  # defaults to about 4 characters per token
+	# Capture the next browser state as soon as the actions of a step are done, while the step is finalized.
+	# Not done in runs with on_step_start or on_step_end hooks, those may change the page between the steps
+	pipeline_steps: bool = False
+	# Stream the model output and execute every action as soon as it is generated, for models that support streaming.
+	# The step callback then runs after the first actions have started, pause and stop are still checked before every action
+	stream_actions: bool = False
+	# Format the step screenshots are stored in on disk, webp/jpeg re-encode them with screenshot_quality to save space
+	screenshot_format: Literal['png', 'webp', 'jpeg'] = 'png'
+	screenshot_quality: int = Field(default=80, ge=1, le=100)
 
 	page_extraction_llm: BaseChatModel | None = None
 	calculate_cost: bool = False
@@ -132,6 +148,9 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	context_budget: ContextBudgetReport | None = None  # set when the agent runs with max_input_tokens
+	# Seconds spent in the stages of the step, browser_state_overlap is the capture time hidden behind the previous step
+	stage_durations: dict[str, float] = Field(default_factory=dict)
 
 	@property
 	def duration_seconds(self) -> float:
@@ -273,29 +292,8 @@ class AgentHistory(BaseModel):
 		if not sensitive_data:
 			return value
 
-		# Collect all sensitive values, immediately converting old format to new format
-		sensitive_values: dict[str, str] = {}
-
-		# Process all sensitive data entries
-		for key_or_domain, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# Already in new format: {domain: {key: value}}
-				for key, val in content.items():
-					if val:  # Skip empty values
-						sensitive_values[key] = val
-			elif content:  # Old format: {key: value} - convert to new format internally
-				# We treat this as if it was {'http*://*': {key_or_domain: content}}
-				sensitive_values[key_or_domain] = content
-
-		# If there are no valid sensitive data entries, just return the original value
-		if not sensitive_values:
-			return value
-
-		# Replace all valid sensitive data values with their placeholder tags
-		for key, val in sensitive_values.items():
-			value = value.replace(val, f'<secret>{key}</secret>')
-
-		return value
+		# Replace all valid sensitive data values (legacy and of every domain) with their placeholder tags
+		return get_compiled_sensitive_data(sensitive_data).redactor.redact(value)
 
 	def _filter_sensitive_data_from_dict(
 		self, data: dict[str, Any], sensitive_data: dict[str, str | dict[str, str]] | None
@@ -523,7 +521,7 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 				return [h.state.screenshot_path for h in self.history[-n_last:] if h.state.screenshot_path is not None]
 
 	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
-		"""Get all screenshots from history as base64 strings"""
+		"""Get all screenshots from history as base64 strings (see BrowserStateHistory.screenshot_media_type for their format)"""
 		if n_last == 0:
 			return []
 
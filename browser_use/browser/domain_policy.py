@@ -0,0 +1,335 @@
+"""
+Compiled domain pattern matchers for allowed_domains / prohibited_domains, sensitive_data domain routing and action domains.
+
+Checking a URL against a list of patterns one by one costs a urlparse and often an fnmatch per pattern, on every
+navigation, new tab and agent step. The matchers here compile a pattern list once instead:
+
+- exact and wildcard hosts go into a trie keyed by reversed host labels (www.example.com -> com, example, www)
+- URL prefix rules (https://example.com, brave://*) go into hash tables grouped by prefix length
+- the rare remaining glob patterns are precompiled to regexes
+
+A lookup is one urlparse, one trie step per host label and one set lookup per distinct prefix length, independent of
+how many patterns there are, and recent URL decisions are kept in a small LRU.
+
+The matching rules are the same as the pattern-by-pattern implementations they replace: DomainPolicy follows the
+allowed_domains semantics of SecurityWatchdog, DomainPatternMatcher follows match_url_with_domain_pattern.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from fnmatch import translate
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from browser_use.utils import is_new_tab_page
+
+logger = logging.getLogger(__name__)
+
+# None means any scheme is accepted
+SchemeRule = frozenset[str] | re.Pattern[str] | None
+
+# Internal browser pages that are always allowed, whatever the policy says
+ALWAYS_ALLOWED_URLS = frozenset({'about:blank', 'chrome://new-tab-page/', 'chrome://new-tab-page', 'chrome://newtab/'})
+
+_GLOB_CHARS = re.compile(r'[*?\[]')
+_HTTP_SCHEMES = frozenset({'http', 'https'})
+
+
+def _scheme_rule(pattern_scheme: str) -> SchemeRule:
+	"""Compile a scheme pattern (https, http*) to a set of schemes or a regex"""
+	if _GLOB_CHARS.search(pattern_scheme):
+		return re.compile(translate(pattern_scheme))
+	return frozenset({pattern_scheme})
+
+
+def _scheme_matches(rule: SchemeRule, scheme: str) -> bool:
+	if rule is None:
+		return True
+	if isinstance(rule, frozenset):
+		return scheme in rule
+	return rule.match(scheme) is not None
+
+
+def is_root_domain(domain: str) -> bool:
+	"""Only domains with exactly 1 dot (domain.tld) are treated as root domains that also allow www."""
+	if '*' in domain or '://' in domain:
+		return False
+	return domain.count('.') == 1
+
+
+class _HostTrieNode:
+	__slots__ = ('children', 'exact', 'wildcard', 'subdomains')
+
+	def __init__(self) -> None:
+		self.children: dict[str, _HostTrieNode] = {}
+		self.exact: list[tuple[SchemeRule, str]] = []  # host is exactly this node
+		self.wildcard: list[tuple[SchemeRule, str]] = []  # host is this node or any subdomain of it
+		self.subdomains: list[tuple[SchemeRule, str]] = []  # host is a strict subdomain of this node
+
+
+class _CompiledPatterns:
+	"""A set of domain patterns compiled into a host trie, URL prefix tables and glob regexes"""
+
+	def __init__(self) -> None:
+		self._root = _HostTrieNode()
+		self._any_host: list[tuple[SchemeRule, str]] = []
+		self._prefixes: dict[int, dict[str, str]] = {}  # prefix length -> {prefix: pattern}
+		self._host_globs: list[tuple[SchemeRule, re.Pattern[str], str]] = []  # matched against the host
+		self._url_globs: list[tuple[re.Pattern[str], str]] = []  # matched against scheme://host
+
+	def add_host(self, host: str, kind: str, scheme_rule: SchemeRule, pattern: str) -> None:
+		node = self._root
+		for label in reversed(host.split('.')):
+			node = node.children.setdefault(label, _HostTrieNode())
+		getattr(node, kind).append((scheme_rule, pattern))
+
+	def add_any_host(self, scheme_rule: SchemeRule, pattern: str) -> None:
+		self._any_host.append((scheme_rule, pattern))
+
+	def add_prefix(self, prefix: str, pattern: str) -> None:
+		self._prefixes.setdefault(len(prefix), {}).setdefault(prefix, pattern)
+
+	def add_host_glob(self, host_glob: str, scheme_rule: SchemeRule, pattern: str) -> None:
+		self._host_globs.append((scheme_rule, re.compile(translate(host_glob)), pattern))
+
+	def add_url_glob(self, url_glob: str, pattern: str) -> None:
+		self._url_globs.append((re.compile(translate(url_glob)), pattern))
+
+	def iter_matches(self, url: str, scheme: str, host: str) -> Iterator[str]:
+		"""Yield every pattern that matches the URL (a pattern may be yielded more than once)"""
+		labels = host.split('.')
+		node = self._root
+		remaining = len(labels)
+		for label in reversed(labels):
+			child = node.children.get(label)
+			if child is None:
+				break
+			node = child
+			remaining -= 1
+			candidates = node.wildcard
+			if remaining:
+				candidates = candidates + node.subdomains
+			elif node.exact:
+				candidates = candidates + node.exact
+			for scheme_rule, pattern in candidates:
+				if _scheme_matches(scheme_rule, scheme):
+					yield pattern
+
+		for scheme_rule, pattern in self._any_host:
+			if _scheme_matches(scheme_rule, scheme):
+				yield pattern
+
+		for length, prefixes in self._prefixes.items():
+			pattern = prefixes.get(url[:length])
+			if pattern is not None:
+				yield pattern
+
+		for scheme_rule, host_regex, pattern in self._host_globs:
+			if _scheme_matches(scheme_rule, scheme) and host_regex.match(host):
+				yield pattern
+
+		if self._url_globs:
+			full_url = f'{scheme}://{host}'
+			for url_regex, pattern in self._url_globs:
+				if url_regex.match(full_url):
+					yield pattern
+
+
+class _DecisionCache(OrderedDict):
+	"""Small LRU of recent URL -> decision lookups"""
+
+	def __init__(self, maxsize: int) -> None:
+		super().__init__()
+		self.maxsize = maxsize
+
+	def put(self, url: str, decision) -> None:
+		if self.maxsize <= 0:
+			return
+		self[url] = decision
+		self.move_to_end(url)
+		while len(self) > self.maxsize:
+			self.popitem(last=False)
+
+
+class DomainPolicy:
+	"""Compiled allowed_domains / prohibited_domains policy used for navigation, tab and request checks.
+
+	Pattern rules:
+	- example.com matches that host on any scheme, root domains (one dot) also match www.example.com
+	- *.example.com matches example.com and all its subdomains, on http/https only
+	- https://example.com (no wildcard) matches URLs starting with it
+	- brave://* matches URLs starting with brave://
+	- anything else with a wildcard is an fnmatch glob against the host, or against scheme://host if it has a scheme
+
+	When allowed_domains is non-empty it decides on its own, otherwise prohibited_domains blocks its matches.
+	"""
+
+	def __init__(
+		self,
+		allowed_domains: Iterable[str] | None = None,
+		prohibited_domains: Iterable[str] | None = None,
+		cache_size: int = 1024,
+	):
+		self.allowed_domains = list(allowed_domains or [])
+		self.prohibited_domains = list(prohibited_domains or [])
+
+		# allowed_domains takes precedence, so only one of the two lists ever needs to be compiled
+		self._allowlist = bool(self.allowed_domains)
+		active_patterns = self.allowed_domains if self._allowlist else self.prohibited_domains
+		self.has_glob_patterns = any('*' in pattern for pattern in active_patterns)
+		self._patterns = _CompiledPatterns()
+		for pattern in active_patterns:
+			self._add_pattern(pattern)
+
+		self._cache = _DecisionCache(cache_size)
+
+	def _add_pattern(self, pattern: str) -> None:
+		if '*' in pattern:
+			if pattern.startswith('*.'):
+				self._patterns.add_host(pattern[2:].lower(), 'wildcard', _HTTP_SCHEMES, pattern)
+			elif pattern.endswith('/*'):
+				self._patterns.add_prefix(pattern[:-1], pattern)
+			elif '://' in pattern:
+				scheme, _, host_glob = pattern.partition('://')
+				if host_glob.startswith('*.') and not _GLOB_CHARS.search(scheme + host_glob[2:]):
+					# https://*.example.com only matches strict subdomains, on that exact scheme
+					self._patterns.add_host(host_glob[2:].lower(), 'subdomains', frozenset({scheme}), pattern)
+				else:
+					self._patterns.add_url_glob(pattern, pattern)
+			else:
+				self._patterns.add_host_glob(pattern, None, pattern)
+		elif '://' in pattern:
+			self._patterns.add_prefix(pattern, pattern)
+		else:
+			domain = pattern.lower()
+			self._patterns.add_host(domain, 'exact', None, pattern)
+			if is_root_domain(domain):
+				self._patterns.add_host(f'www.{domain}', 'exact', None, pattern)
+
+	def is_allowed(self, url: str) -> bool:
+		"""Check if a URL is allowed by the policy"""
+		if not self.allowed_domains and not self.prohibited_domains:
+			return True
+
+		if url in ALWAYS_ALLOWED_URLS:
+			return True
+
+		cached = self._cache.get(url)
+		if cached is not None:
+			self._cache.move_to_end(url)
+			return cached
+
+		allowed = self._check(url)
+		self._cache.put(url, allowed)
+		return allowed
+
+	def _check(self, url: str) -> bool:
+		try:
+			parsed = urlparse(url)
+			host = parsed.hostname
+		except Exception:
+			# Invalid URL
+			return False
+
+		if not host:
+			return False
+
+		matched = next(self._patterns.iter_matches(url, parsed.scheme, host), None) is not None
+		return matched if self._allowlist else not matched
+
+
+class DomainPatternMatcher:
+	"""Compiled domain patterns, answers which of the patterns apply to a URL (sensitive_data domains, action domains).
+
+	Follows the rules of match_url_with_domain_pattern: patterns are case-insensitive, default to the https scheme,
+	the scheme may be a glob (http*://), ports are ignored, *.example.com also matches example.com, and unsafe
+	wildcard patterns (*.*.com, example.*, g*e.com) never match. New tab pages never match any pattern.
+	"""
+
+	def __init__(self, domain_patterns: Iterable[str], log_warnings: bool = False, cache_size: int = 256):
+		self.domain_patterns = tuple(domain_patterns)
+		self._patterns = _CompiledPatterns()
+		for domain_pattern in self.domain_patterns:
+			self._add_pattern(domain_pattern, log_warnings)
+
+		self._cache = _DecisionCache(cache_size)
+
+	def _add_pattern(self, domain_pattern: str, log_warnings: bool) -> None:
+		normalized = domain_pattern.lower()
+		if '://' in normalized:
+			pattern_scheme, pattern_domain = normalized.split('://', 1)
+		else:
+			pattern_scheme = 'https'  # Default to matching only https for security
+			pattern_domain = normalized
+
+		# Ports are stripped since only the hostname of the URL is compared
+		if ':' in pattern_domain and not pattern_domain.startswith(':'):
+			pattern_domain = pattern_domain.split(':', 1)[0]
+
+		scheme_rule = _scheme_rule(pattern_scheme)
+
+		if pattern_domain == '*':
+			self._patterns.add_any_host(scheme_rule, domain_pattern)
+			return
+
+		if '*' not in pattern_domain:
+			self._patterns.add_host(pattern_domain, 'exact', scheme_rule, domain_pattern)
+			return
+
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			if log_warnings:
+				logger.error(f'⛔️ Multiple wildcards in pattern=[{normalized}] are not supported')
+			return
+		if pattern_domain.endswith('.*'):
+			if log_warnings:
+				logger.error(f'⛔️ Wildcard TLDs like in pattern=[{normalized}] are not supported for security')
+			return
+		if '*' in pattern_domain.replace('*.', ''):
+			if log_warnings:
+				logger.error(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{normalized}]')
+			return
+
+		if pattern_domain.startswith('*.') and not _GLOB_CHARS.search(pattern_domain[2:]):
+			# *.google.com matches google.com and all of its subdomains
+			self._patterns.add_host(pattern_domain[2:], 'wildcard', scheme_rule, domain_pattern)
+		else:
+			if pattern_domain.startswith('*.'):
+				self._patterns.add_host_glob(pattern_domain[2:], scheme_rule, domain_pattern)
+			self._patterns.add_host_glob(pattern_domain, scheme_rule, domain_pattern)
+
+	def matching_patterns(self, url: str) -> frozenset[str]:
+		"""Return the domain patterns that match the URL"""
+		cached = self._cache.get(url)
+		if cached is not None:
+			self._cache.move_to_end(url)
+			return cached
+
+		matches = self._match(url)
+		self._cache.put(url, matches)
+		return matches
+
+	def _match(self, url: str) -> frozenset[str]:
+		# Note: new tab pages never match, they have to be handled at the callsite
+		if is_new_tab_page(url):
+			return frozenset()
+
+		try:
+			parsed = urlparse(url)
+			scheme = parsed.scheme.lower() if parsed.scheme else ''
+			host = parsed.hostname.lower() if parsed.hostname else ''
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with domain patterns: {type(e).__name__}: {e}')
+			return frozenset()
+
+		if not scheme or not host:
+			return frozenset()
+
+		return frozenset(self._patterns.iter_matches(url, scheme, host))
+
+
+@lru_cache(maxsize=32)
+def get_domain_matcher(domain_patterns: tuple[str, ...], log_warnings: bool = False) -> DomainPatternMatcher:
+	"""Get the compiled matcher for a set of domain patterns, compiled once and reused across steps"""
+	return DomainPatternMatcher(domain_patterns, log_warnings=log_warnings)
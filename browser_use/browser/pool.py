@@ -0,0 +1,371 @@
+"""
+Pool of launched, connected and watchdog-ready browser sessions.
+
+BrowserSession.start() launches Chromium, polls for its CDP url, connects, attaches the watchdogs and opens the first
+tab, which takes 1-3 seconds and dominates short tasks. BrowserSessionPool starts its sessions once and leases them out:
+
+- acquire() hands out a free session after a quick CDP health check, a session that crashed or hangs is launched again
+- release() prepares the session for its next lease in the background: the tabs of the lease are replaced by a single
+  about:blank tab, cookies and the storage of the visited origins are cleared and the cached browser state is dropped
+- after max_leases_per_session leases a session is killed and launched again, so state the reset misses (HTTP cache,
+  leaked memory of the renderer) can't pile up
+
+With contexts_per_browser > 1 the sessions are isolated_context sessions: each runs in a browser context of its own
+(cookies, storage, cache, permissions and downloads are separate, like incognito windows) and up to contexts_per_browser
+of them share one Chromium process. That costs a renderer per agent instead of a whole browser, see
+tests/scripts/benchmark_browser_contexts.py for the memory per agent of both modes. Such a session is reset by
+replacing its context with a new one, which takes tens of milliseconds.
+
+Usage:
+	async with BrowserSessionPool(size=4) as pool:
+		async with pool.lease() as browser_session:
+			agent = Agent(task='...', llm=llm, browser_session=browser_session)
+			await agent.run()
+		print(pool.metrics)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+from browser_use.browser.events import CloseTabEvent, NavigationCompleteEvent, SwitchTabEvent, TabCreatedEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+
+logger = logging.getLogger(__name__)
+
+_HEALTH_CHECK_TIMEOUT = 5.0
+
+
+def _get_origin(url: str) -> str | None:
+	parsed = urlparse(url)
+	if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+		return None
+	return f'{parsed.scheme}://{parsed.netloc}'
+
+
+class BrowserSessionPoolMetrics(BaseModel):
+	"""Counters of a session pool"""
+
+	leases: int = 0
+	launches: int = 0
+	browser_launches: int = 0  # browser processes launched to host the isolated contexts of contexts_per_browser > 1
+	restarts: int = 0  # sessions launched again after failing the health check
+	recycles: int = 0  # sessions launched again after max_leases_per_session leases
+	resets: int = 0
+	reset_failures: int = 0  # sessions launched again because their reset failed
+	lease_wait_seconds: float = 0.0  # total time acquire() waited for a free session
+	launch_seconds: float = 0.0
+	reset_seconds: float = 0.0
+
+	@property
+	def average_lease_wait_seconds(self) -> float:
+		return self.lease_wait_seconds / self.leases if self.leases else 0.0
+
+	@property
+	def average_launch_seconds(self) -> float:
+		return self.launch_seconds / self.launches if self.launches else 0.0
+
+	@property
+	def average_reset_seconds(self) -> float:
+		return self.reset_seconds / self.resets if self.resets else 0.0
+
+
+class BrowserSessionPool:
+	"""
+	Keeps browser sessions started and leases them out one at a time.
+
+	Args:
+		size: Number of sessions to keep started
+		browser_profile: Profile the sessions are launched with, every session gets its own temporary user data dir
+		max_leases_per_session: Launch a session again after this many leases, never if None
+		reset_between_leases: Close the tabs and clear the cookies and storage of a session before its next lease
+		contexts_per_browser: Run up to this many sessions as isolated browser contexts in one browser process
+		session_factory: Creates the (not yet started) session at an index of the pool, for custom launch setups
+	"""
+
+	def __init__(
+		self,
+		size: int = 1,
+		browser_profile: BrowserProfile | None = None,
+		max_leases_per_session: int | None = None,
+		reset_between_leases: bool = True,
+		contexts_per_browser: int = 1,
+		session_factory: Callable[[int], BrowserSession] | None = None,
+	):
+		if size < 1:
+			raise ValueError('BrowserSessionPool needs at least one session')
+		if max_leases_per_session is not None and max_leases_per_session < 1:
+			raise ValueError('max_leases_per_session must be at least 1')
+		if contexts_per_browser < 1:
+			raise ValueError('contexts_per_browser must be at least 1')
+
+		self.size = size
+		self.browser_profile = browser_profile or BrowserProfile()
+		self.max_leases_per_session = max_leases_per_session
+		self.reset_between_leases = reset_between_leases
+		self.contexts_per_browser = contexts_per_browser
+		self.session_factory = session_factory or self._create_session
+
+		self.metrics = BrowserSessionPoolMetrics()
+		self._sessions: list[BrowserSession | None] = [None] * size
+		self._lease_counts: list[int] = [0] * size
+		self._visited_origins: list[set[str]] = [set() for _ in range(size)]
+		self._free: asyncio.Queue[int] = asyncio.Queue()
+		self._leased: dict[str, int] = {}  # session id -> index
+		self._preparing: set[asyncio.Task[None]] = set()
+		# Browsers hosting the isolated contexts of the sessions, unused with contexts_per_browser=1
+		self._browsers: list[BrowserSession | None] = [None] * -(-size // contexts_per_browser)
+		self._browser_locks = [asyncio.Lock() for _ in self._browsers]
+		self._start_lock = asyncio.Lock()
+		self._started = False
+
+	async def __aenter__(self) -> 'BrowserSessionPool':
+		await self.start()
+		return self
+
+	async def __aexit__(self, *args: Any) -> None:
+		await self.close()
+
+	@property
+	def available(self) -> int:
+		"""Number of sessions ready to be leased right now"""
+		return self._free.qsize()
+
+	@property
+	def _isolated_contexts(self) -> bool:
+		return self.contexts_per_browser > 1
+
+	def _create_browser(self, processes: int) -> BrowserSession:
+		if processes > 1 and self.browser_profile.user_data_dir is not None:
+			logger.warning(
+				f'⚠️ BrowserSessionPool browsers can not share user_data_dir={self.browser_profile.user_data_dir}, '
+				'using temporary profiles'
+			)
+		# keep_alive stops agents from killing the browser when they finish
+		profile = self.browser_profile.model_copy(update={'keep_alive': True})
+		if processes > 1:
+			profile.user_data_dir = None  # a new temporary profile for every browser
+		return BrowserSession(browser_profile=profile)
+
+	def _create_session(self, index: int) -> BrowserSession:
+		if not self._isolated_contexts:
+			return self._create_browser(self.size)
+
+		browser = self._browsers[index // self.contexts_per_browser]
+		assert browser is not None and browser.cdp_url, 'The browser of the session must be started first'
+		profile = self.browser_profile.model_copy(update={'keep_alive': True, 'isolated_context': True})
+		return BrowserSession(browser_profile=profile, cdp_url=browser.cdp_url)
+
+	async def _get_healthy_browser(self, browser_index: int) -> BrowserSession:
+		"""The browser hosting the contexts of the sessions at browser_index, launched again if it stopped responding"""
+		async with self._browser_locks[browser_index]:
+			browser = self._browsers[browser_index]
+			if browser is not None and await self._is_healthy(browser):
+				return browser
+
+			if browser is not None:
+				logger.warning(f'🔁 Browser {browser_index} of the pool is not responding, restarting it')
+				self._browsers[browser_index] = None
+				await self._kill_session(browser)
+			browser = self._create_browser(len(self._browsers))
+			await browser.start()
+			self._browsers[browser_index] = browser
+			self.metrics.browser_launches += 1
+			return browser
+
+	async def start(self) -> None:
+		"""Start all sessions of the pool"""
+		async with self._start_lock:
+			if self._started:
+				return
+			results = await asyncio.gather(*(self._launch_session(index) for index in range(self.size)), return_exceptions=True)
+			if errors := [result for result in results if isinstance(result, BaseException)]:
+				# Kill the sessions that did launch, the next start() launches all of them again
+				await self.close()
+				raise errors[0]
+			for index in range(self.size):
+				self._free.put_nowait(index)
+			self._started = True
+		logger.info(
+			f'🏊 BrowserSessionPool started {self.size} sessions in {self.metrics.launch_seconds / self.size:.1f}s on average'
+		)
+
+	async def close(self) -> None:
+		"""Kill all sessions of the pool, including leased ones"""
+		if self._preparing:
+			await asyncio.gather(*self._preparing, return_exceptions=True)
+		sessions = [session for session in self._sessions if session is not None]
+		browsers = [browser for browser in self._browsers if browser is not None]
+		self._sessions = [None] * self.size
+		self._browsers = [None] * len(self._browsers)
+		self._free = asyncio.Queue()
+		self._leased.clear()
+		self._started = False
+		await asyncio.gather(*(self._kill_session(session) for session in sessions))
+		await asyncio.gather(*(self._kill_session(browser) for browser in browsers))
+
+	async def acquire(self) -> BrowserSession:
+		"""Wait for a free session and lease it, it must be handed back with release()"""
+		await self.start()
+		wait_start = time.monotonic()
+		index = await self._free.get()
+		self.metrics.lease_wait_seconds += time.monotonic() - wait_start
+
+		try:
+			session = await self._get_healthy_session(index)
+		except BaseException:
+			self._free.put_nowait(index)
+			raise
+
+		self._lease_counts[index] += 1
+		self._leased[session.id] = index
+		self.metrics.leases += 1
+		return session
+
+	def release(self, session: BrowserSession) -> None:
+		"""Hand a leased session back, it is prepared for its next lease in the background"""
+		index = self._leased.pop(session.id, None)
+		if index is None:
+			raise ValueError(f'{session} is not leased from this pool')
+		task = asyncio.create_task(self._prepare_for_next_lease(index), name=f'browser_session_pool_prepare_{index}')
+		self._preparing.add(task)
+		task.add_done_callback(self._preparing.discard)
+
+	@asynccontextmanager
+	async def lease(self) -> AsyncIterator[BrowserSession]:
+		"""Lease a session for the duration of the block"""
+		session = await self.acquire()
+		try:
+			yield session
+		finally:
+			self.release(session)
+
+	async def _launch_session(self, index: int) -> BrowserSession:
+		start_time = time.monotonic()
+		if self._isolated_contexts:
+			await self._get_healthy_browser(index // self.contexts_per_browser)
+		session = self.session_factory(index)
+		try:
+			await session.start()
+		except BaseException:
+			await self._kill_session(session)  # a half started session may have launched its browser already
+			raise
+		self.metrics.launch_seconds += time.monotonic() - start_time
+		self.metrics.launches += 1
+
+		visited_origins = self._visited_origins[index] = set()
+
+		def track_origin(event: NavigationCompleteEvent) -> None:
+			if origin := _get_origin(event.url):
+				visited_origins.add(origin)
+
+		session.event_bus.on(NavigationCompleteEvent, track_origin)
+		self._sessions[index] = session
+		self._lease_counts[index] = 0
+		return session
+
+	async def _relaunch_session(self, index: int) -> BrowserSession:
+		session = self._sessions[index]
+		self._sessions[index] = None
+		if session is not None:
+			await self._kill_session(session)
+		return await self._launch_session(index)
+
+	@staticmethod
+	async def _kill_session(session: BrowserSession) -> None:
+		try:
+			await session.kill()
+		except Exception as e:
+			logger.debug(f'Failed to kill browser session {session.id}: {type(e).__name__}: {e}')
+
+	@staticmethod
+	async def _is_healthy(session: BrowserSession) -> bool:
+		try:
+			await asyncio.wait_for(session.cdp_client.send.Browser.getVersion(), timeout=_HEALTH_CHECK_TIMEOUT)
+			return True
+		except Exception:
+			return False
+
+	async def _get_healthy_session(self, index: int) -> BrowserSession:
+		"""The session at index, launched again if it crashed or stopped responding"""
+		session = self._sessions[index]
+		if session is not None and await self._is_healthy(session):
+			return session
+
+		if session is not None:
+			logger.warning(f'🔁 Browser session {index} of the pool is not responding, restarting it')
+			self.metrics.restarts += 1
+		return await self._relaunch_session(index)
+
+	async def _prepare_for_next_lease(self, index: int) -> None:
+		try:
+			session = self._sessions[index]
+			if session is None:
+				return  # launched on its next lease
+			if self.max_leases_per_session is not None and self._lease_counts[index] >= self.max_leases_per_session:
+				logger.debug(f'♻️ Browser session {index} reached {self.max_leases_per_session} leases, launching it again')
+				self.metrics.recycles += 1
+				await self._relaunch_session(index)
+			elif self.reset_between_leases:
+				start_time = time.monotonic()
+				try:
+					if self._isolated_contexts:
+						# A new context is cleaner than any reset and just as fast
+						await self._relaunch_session(index)
+					else:
+						await self.reset_session(session, self._visited_origins[index])
+				except Exception as e:
+					logger.warning(f'⚠️ Failed to reset browser session {index}, launching it again: {type(e).__name__}: {e}')
+					self.metrics.reset_failures += 1
+					await self._relaunch_session(index)
+				else:
+					self.metrics.resets += 1
+					self.metrics.reset_seconds += time.monotonic() - start_time
+		except Exception as e:
+			# The health check of the next lease launches it again
+			logger.warning(f'⚠️ Failed to prepare browser session {index} for its next lease: {type(e).__name__}: {e}')
+		finally:
+			if self._started:
+				self._free.put_nowait(index)
+
+	async def reset_session(self, session: BrowserSession, visited_origins: set[str]) -> None:
+		"""Bring a session back to a single about:blank tab without cookies, storage or cached state of the last lease"""
+		pages = await session._cdp_get_all_pages(include_chrome=True)
+
+		# Origins of the open tabs, including pages that were left through links and not through NavigateToUrlEvent
+		for page in pages:
+			if origin := _get_origin(page['url']):
+				visited_origins.add(origin)
+			try:
+				cdp_session = await session.get_or_create_cdp_session(page['targetId'], focus=False, new_socket=False)
+				history = await cdp_session.cdp_client.send.Page.getNavigationHistory(session_id=cdp_session.session_id)
+				visited_origins.update(origin for entry in history['entries'] if (origin := _get_origin(entry['url'])))
+			except Exception as e:
+				logger.debug(f'Failed to get the navigation history of tab {page["targetId"][-4:]}: {type(e).__name__}: {e}')
+
+		# A new tab instead of navigating an old one, so the next agent can't go back into the last lease
+		target_id = await session._cdp_create_new_page('about:blank')
+		await session.event_bus.dispatch(TabCreatedEvent(target_id=target_id, url='about:blank'))
+		switch_event = session.event_bus.dispatch(SwitchTabEvent(target_id=target_id))
+		await switch_event
+		await switch_event.event_result(raise_if_any=True, raise_if_none=False)
+		for page in pages:
+			await session.event_bus.dispatch(CloseTabEvent(target_id=page['targetId']))
+
+		await session.cdp_client.send.Storage.clearCookies()
+		for origin in visited_origins:
+			await session.cdp_client.send.Storage.clearDataForOrigin(params={'origin': origin, 'storageTypes': 'all'})
+		visited_origins.clear()
+
+		session._cached_browser_state_summary = None
+		session._cached_selector_map.clear()
+		session._downloaded_files.clear()
+		if session._dom_watchdog:
+			session._dom_watchdog.clear_cache()
@@ -1,3 +1,5 @@
+import json
+import shutil
 import sys
 import tempfile
 from collections.abc import Iterable
@@ -7,11 +9,17 @@ from pathlib import Path
 from typing import Annotated, Any, Literal, Self
 from urllib.parse import urlparse
 
+from cdp_use.cdp.network import ResourceType
 from pydantic import AfterValidator, AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from browser_use.config import CONFIG
 from browser_use.utils import _log_pretty_path, logger
 
+# Written into an extracted extension once it is verified and patched, see BrowserProfile._ensure_default_extensions_downloaded
+EXTENSION_MARKER_FILE = '.browser_use_verified.json'
+# Extension paths already verified by this process, by extensions cache directory and cookie whitelist
+_VERIFIED_EXTENSION_PATHS: dict[tuple[str, tuple[str, ...]], list[str]] = {}
+
 CHROME_DEBUG_PORT = 9242  # use a non-default port to avoid conflicts with other tools / devs using 9222
 CHROME_DISABLED_COMPONENTS = [
 	# Playwright defaults: https://github.com/microsoft/playwright/blob/41008eeddd020e2dee1c540f7c0cdfa337e99637/packages/playwright-core/src/server/chromium/chromiumSwitches.ts#L76
@@ -102,6 +110,11 @@ CHROME_DETERMINISTIC_RENDERING_ARGS = [
 	'--force-color-profile=srgb',
 ]
 
+CHROME_FAST_RENDER_ARGS = [
+	'--force-prefers-reduced-motion',
+	'--disable-smooth-scrolling',
+]
+
 CHROME_DEFAULT_ARGS = [
 	# # provided by playwright by default: https://github.com/microsoft/playwright/blob/41008eeddd020e2dee1c540f7c0cdfa337e99637/packages/playwright-core/src/server/chromium/chromiumSwitches.ts#L76
 	'--disable-field-trial-config',  # https://source.chromium.org/chromium/chromium/src/+/main:testing/variations/README.md
@@ -326,6 +339,12 @@ class BrowserContextArgs(BaseModel):
 	record_har_content: RecordHarContent = RecordHarContent.EMBED
 	record_har_mode: RecordHarMode = RecordHarMode.FULL
 	record_har_path: str | Path | None = Field(default=None, validation_alias=AliasChoices('save_har_path', 'record_har_path'))
+	record_har_omit_content: bool = Field(
+		default=False, description='Leave the response bodies out of the HAR, like record_har_content="omit".'
+	)
+	record_har_url_filter: str | None = Field(
+		default=None, description='Only record requests whose URL matches this glob, e.g. "*example.com*".'
+	)
 	record_video_dir: str | Path | None = Field(
 		default=None, validation_alias=AliasChoices('save_recording_path', 'record_video_dir')
 	)
@@ -524,6 +543,60 @@ class ProxySettings(BaseModel):
 		return getattr(self, key)
 
 
+class ResourceBlockingRules(BaseModel):
+	"""Requests to block (fail) or stub (answer with an empty response) before the browser sends them.
+
+	- resource_types: CDP resource types to block, e.g. ["Image", "Media", "Font"]
+	- url_patterns: URL globs to block, e.g. ["*.mp4", "https://example.com/ads/*"]
+	- domains: domain patterns to block, same syntax as prohibited_domains, e.g. ["*.doubleclick.net"]
+	- stub_resource_types: requests of these types matched by the rules above get an empty 200 response instead of failing,
+	  so pages whose scripts wait for e.g. an analytics script keep working
+	"""
+
+	resource_types: list[ResourceType] = Field(
+		default_factory=list, description='Resource types to block, e.g. Image, Media, Font'
+	)
+	url_patterns: list[str] = Field(default_factory=list, description='URL globs to block, e.g. *.mp4')
+	domains: list[str] = Field(default_factory=list, description='Domain patterns to block, e.g. *.doubleclick.net')
+	stub_resource_types: list[ResourceType] = Field(
+		default_factory=list, description='Resource types answered with an empty response instead of failing'
+	)
+
+
+# Ad, analytics and tracking hosts blocked by the 'fast' preset
+AD_AND_TRACKER_DOMAINS = [
+	'*.doubleclick.net',
+	'*.googlesyndication.com',
+	'*.googleadservices.com',
+	'*.google-analytics.com',
+	'*.googletagmanager.com',
+	'*.googletagservices.com',
+	'*.adnxs.com',
+	'*.criteo.com',
+	'*.taboola.com',
+	'*.outbrain.com',
+	'*.scorecardresearch.com',
+	'*.hotjar.com',
+	'*.clarity.ms',
+	'*.segment.io',
+	'*.mixpanel.com',
+	'*.amplitude.com',
+	'*.nr-data.net',
+	'connect.facebook.net',
+]
+
+RESOURCE_BLOCKING_PRESETS: dict[str, ResourceBlockingRules] = {
+	# Images, video, audio and web fonts, the page layout and scripts stay intact
+	'no-media': ResourceBlockingRules(resource_types=['Image', 'Media', 'Font']),
+	# no-media plus ads and analytics, whose scripts are stubbed so pages waiting for them still load
+	'fast': ResourceBlockingRules(
+		resource_types=['Image', 'Media', 'Font'],
+		domains=AD_AND_TRACKER_DOMAINS,
+		stub_resource_types=['Script'],
+	),
+}
+
+
 class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, BrowserLaunchArgs, BrowserNewContextArgs):
 	"""
 	A BrowserProfile is a static template collection of kwargs that can be passed to:
@@ -554,6 +627,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=False,
 		description='Use browser-use cloud browser service instead of local browser',
 	)
+	isolated_context: bool = Field(
+		default=False,
+		description='Run the session in a browser context of its own (like an incognito window) inside the browser, so many isolated sessions can share one browser process via the same cdp_url',
+	)
 
 	@property
 	def cloud_browser(self) -> bool:
@@ -563,6 +640,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	# custom options we provide that aren't native playwright kwargs
 	disable_security: bool = Field(default=False, description='Disable browser security features.')
 	deterministic_rendering: bool = Field(default=False, description='Enable deterministic rendering flags.')
+	fast_render: bool = Field(
+		default=False,
+		description='Disable CSS animations, transitions and smooth scrolling and emulate prefers-reduced-motion, so pages settle right after loads, scrolls and clicks. Pages that keep changing are detected and not waited for again.',
+	)
 	allowed_domains: list[str] | None = Field(
 		default=None,
 		description='List of allowed domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]',
@@ -572,6 +653,18 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		description='List of prohibited domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Allowed domains take precedence over prohibited domains.',
 	)
 	keep_alive: bool | None = Field(default=None, description='Keep browser alive after agent run.')
+	replay_har_path: str | Path | None = Field(
+		default=None,
+		description='Answer requests with the responses recorded in this HAR file (see record_har_path) instead of loading them from the network.',
+	)
+	replay_har_not_found: Literal['abort', 'fallback'] = Field(
+		default='abort',
+		description='What to do with requests the HAR has no response for: abort them (offline replay) or load them from the network.',
+	)
+	user_data_dir_template: str | Path | None = Field(
+		default=None,
+		description='Pre-created user data dir that is copied into a fresh temporary user_data_dir for every launch, which skips the first run setup of an empty profile. Create one by running a session once with user_data_dir=<template path>.',
+	)
 
 	# --- Proxy settings ---
 	# New consolidated proxy config (typed)
@@ -587,6 +680,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default_factory=lambda: ['nature.com', 'qatarairways.com'],
 		description='List of domains to whitelist in the "I still don\'t care about cookies" extension, preventing automatic cookie banner handling on these sites.',
 	)
+	resource_blocking: ResourceBlockingRules | None = Field(
+		default=None,
+		description=f'Block or stub requests by resource type, URL pattern or domain, or the name of a preset: {", ".join(RESOURCE_BLOCKING_PRESETS)}. Blocking images also removes them from screenshots.',
+	)
 
 	window_size: ViewportSize | None = Field(
 		default=None,
@@ -618,6 +715,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
+	virtual_time_budget: float | None = Field(
+		default=None,
+		description='Seconds of virtual time to fast-forward page timers by after each page load (with fast_render), e.g. to skip intro animations and delayed content. Afterwards timers keep fast-forwarding while the page is idle.',
+	)
 
 	# --- UI/viewport/DOM ---
 
@@ -725,6 +826,16 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 			)
 		return self
 
+	@field_validator('resource_blocking', mode='before')
+	@classmethod
+	def resolve_resource_blocking_preset(cls, v: Any) -> Any:
+		"""Replace the name of a resource blocking preset with its rules."""
+		if isinstance(v, str):
+			if v not in RESOURCE_BLOCKING_PRESETS:
+				raise ValueError(f'Unknown resource_blocking preset {v!r}, use one of: {", ".join(RESOURCE_BLOCKING_PRESETS)}')
+			return RESOURCE_BLOCKING_PRESETS[v].model_copy(deep=True)
+		return v
+
 	@model_validator(mode='after')
 	def validate_proxy_settings(self) -> Self:
 		"""Ensure proxy configuration is consistent."""
@@ -758,6 +869,7 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 			*(CHROME_HEADLESS_ARGS if self.headless else []),
 			*(CHROME_DISABLE_SECURITY_ARGS if self.disable_security else []),
 			*(CHROME_DETERMINISTIC_RENDERING_ARGS if self.deterministic_rendering else []),
+			*(CHROME_FAST_RENDER_ARGS if self.fast_render else []),
 			*(
 				[f'--window-size={self.window_size["width"]},{self.window_size["height"]}']
 				if self.window_size
@@ -876,18 +988,26 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 
 		# Create extensions cache directory
 		cache_dir = CONFIG.BROWSER_USE_EXTENSIONS_DIR
-		cache_dir.mkdir(parents=True, exist_ok=True)
 		# logger.debug(f'📁 Extensions cache directory: {_log_pretty_path(cache_dir)}')
 
+		# The extensions are downloaded, verified and patched once per machine, later launches only check their marker files
+		cache_key = (str(cache_dir), tuple(self.cookie_whitelist_domains))
+		if cache_key in _VERIFIED_EXTENSION_PATHS:
+			return list(_VERIFIED_EXTENSION_PATHS[cache_key])
+
+		cache_dir.mkdir(parents=True, exist_ok=True)
+
 		extension_paths = []
 		loaded_extension_names = []
 
 		for ext in extensions:
 			ext_dir = cache_dir / ext['id']
 			crx_file = cache_dir / f'{ext["id"]}.crx'
+			# Only the cookie extension is patched, with the whitelist of this profile
+			patch = self.cookie_whitelist_domains if ext['name'] == "I still don't care about cookies" else None
 
-			# Check if extension is already extracted
-			if ext_dir.exists() and (ext_dir / 'manifest.json').exists():
+			# Check if extension is already extracted, verified and patched the same way
+			if self._read_extension_marker(ext_dir) == {'crx': crx_file.name, 'patch': patch}:
 				# logger.debug(f'✅ Using cached {ext["name"]} extension from {_log_pretty_path(ext_dir)}')
 				extension_paths.append(str(ext_dir))
 				loaded_extension_names.append(ext['name'])
@@ -901,9 +1021,31 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 				else:
 					logger.debug(f'📦 Found cached {ext["name"]} .crx file')
 
-				# Extract extension
+				# Extract, verify and patch the extension next to the cache, then move it into place in one step so
+				# that concurrent launches never load a half extracted extension
 				logger.info(f'📂 Extracting {ext["name"]} extension...')
-				self._extract_extension(crx_file, ext_dir)
+				staging_dir = Path(tempfile.mkdtemp(prefix=f'.{ext["id"]}-', dir=cache_dir))
+				try:
+					try:
+						self._extract_extension(crx_file, staging_dir)
+						json.loads((staging_dir / 'manifest.json').read_text(encoding='utf-8'))
+					except Exception:
+						# A truncated or corrupt download is downloaded again by the next launch
+						crx_file.unlink(missing_ok=True)
+						raise
+					if patch is not None:
+						self._apply_minimal_extension_patch(staging_dir, patch)
+					(staging_dir / EXTENSION_MARKER_FILE).write_text(json.dumps({'crx': crx_file.name, 'patch': patch}))
+
+					shutil.rmtree(ext_dir, ignore_errors=True)
+					try:
+						staging_dir.rename(ext_dir)
+					except OSError:
+						# Another launch moved its copy into place first
+						if self._read_extension_marker(ext_dir) != {'crx': crx_file.name, 'patch': patch}:
+							raise
+				finally:
+					shutil.rmtree(staging_dir, ignore_errors=True)
 
 				extension_paths.append(str(ext_dir))
 				loaded_extension_names.append(ext['name'])
@@ -912,18 +1054,25 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 				logger.warning(f'⚠️ Failed to setup {ext["name"]} extension: {e}')
 				continue
 
-		# Apply minimal patch to cookie extension with configurable whitelist
-		for i, path in enumerate(extension_paths):
-			if loaded_extension_names[i] == "I still don't care about cookies":
-				self._apply_minimal_extension_patch(Path(path), self.cookie_whitelist_domains)
-
 		if extension_paths:
 			logger.debug(f'[BrowserProfile] 🧩 Extensions loaded ({len(extension_paths)}): [{", ".join(loaded_extension_names)}]')
 		else:
 			logger.warning('[BrowserProfile] ⚠️ No default extensions could be loaded')
 
+		# Failed extensions are tried again by the next launch
+		if len(extension_paths) == len(extensions):
+			_VERIFIED_EXTENSION_PATHS[cache_key] = list(extension_paths)
+
 		return extension_paths
 
+	@staticmethod
+	def _read_extension_marker(ext_dir: Path) -> dict[str, Any] | None:
+		"""Read the marker written once an extension is extracted, verified and patched, None if there is none."""
+		try:
+			return json.loads((ext_dir / EXTENSION_MARKER_FILE).read_text())
+		except (OSError, ValueError):
+			return None
+
 	def _apply_minimal_extension_patch(self, ext_dir: Path, whitelist_domains: list[str]) -> None:
 		"""Minimal patch: pre-populate chrome.storage.local with configurable domain whitelist."""
 		try:
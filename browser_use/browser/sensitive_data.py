@@ -0,0 +1,194 @@
+"""
+Compiled redaction and substitution of sensitive_data secrets.
+
+Redacting secrets by calling str.replace once per secret costs a full pass over the text for every secret, which
+adds up with per-domain credentials for hundreds of sites and long page state messages. Here all secret values of a
+sensitive_data dict are compiled once into a single trie-shaped regex (the prefix sharing of an Aho-Corasick
+automaton, run by the C regex engine), so redacting a text is a single pass that replaces the leftmost-longest
+secret at every position. Placeholder substitution is a single pass over the <secret>key</secret> tags.
+
+Usage:
+	compiled = get_compiled_sensitive_data(sensitive_data)
+	text, matched_keys = compiled.redactor.redact_with_matches(text)
+	secrets = compiled.applicable_secrets(current_url)
+"""
+
+import hashlib
+import re
+import weakref
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from browser_use.browser.domain_policy import get_domain_matcher
+from browser_use.utils import is_new_tab_page
+
+SECRET_PLACEHOLDER_PATTERN = re.compile(r'<secret>(.*?)</secret>')
+
+_END = ''  # trie key marking the end of a secret value
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+	"""Regex source matching exactly the strings of the trie below node, preferring the longest match"""
+	alternatives: list[str] = []
+	single_chars: list[str] = []
+	for char, child in node.items():
+		if char == _END:
+			continue
+		# Follow chains of single children iteratively, so long secrets don't nest one group per character
+		run = char
+		while len(child) == 1 and _END not in child:
+			next_char, child = next(iter(child.items()))
+			run += next_char
+		if child.keys() == {_END}:
+			if len(run) == 1:
+				single_chars.append(re.escape(run))
+			else:
+				alternatives.append(re.escape(run))
+		else:
+			alternatives.append(re.escape(run) + _trie_pattern(child))
+
+	if single_chars:
+		alternatives.append(single_chars[0] if len(single_chars) == 1 else f'[{"".join(single_chars)}]')
+
+	pattern = alternatives[0] if len(alternatives) == 1 else f'(?:{"|".join(alternatives)})'
+	if _END in node:
+		# A secret ends here, the rest is optional. Greedy, so a longer secret sharing this prefix wins
+		pattern = f'(?:{pattern})?'
+	return pattern
+
+
+def compile_secret_values(values: list[str]) -> re.Pattern[str]:
+	"""Compile secret values into one regex that matches the longest secret at every position"""
+	root: dict[str, Any] = {}
+	for value in values:
+		node = root
+		for char in value:
+			node = node.setdefault(char, {})
+		node[_END] = {}
+	return re.compile(_trie_pattern(root))
+
+
+class SecretRedactor:
+	"""Replaces secret values in text with their <secret>key</secret> placeholders in a single pass"""
+
+	def __init__(self, secrets: Mapping[str, str] | Iterable[tuple[str, str]]):
+		# A value used for several keys is shown as the first of them
+		self.key_by_value: dict[str, str] = {}
+		for key, value in secrets.items() if isinstance(secrets, Mapping) else secrets:
+			if value:
+				self.key_by_value.setdefault(value, key)
+		self._pattern = compile_secret_values(list(self.key_by_value)) if self.key_by_value else None
+
+	def redact(self, text: str) -> str:
+		"""Text with every secret value replaced by its placeholder"""
+		if self._pattern is None or not text:
+			return text
+		return self._pattern.sub(lambda match: f'<secret>{self.key_by_value[match.group(0)]}</secret>', text)
+
+	def redact_with_matches(self, text: str) -> tuple[str, set[str]]:
+		"""Redacted text and the keys of the secrets found in it"""
+		matched_keys: set[str] = set()
+		if self._pattern is None or not text:
+			return text, matched_keys
+
+		def replace(match: re.Match[str]) -> str:
+			key = self.key_by_value[match.group(0)]
+			matched_keys.add(key)
+			return f'<secret>{key}</secret>'
+
+		return self._pattern.sub(replace, text), matched_keys
+
+
+def substitute_secret_placeholders(
+	text: str, secrets: Mapping[str, str], resolve: Callable[[str, str], str] | None = None
+) -> tuple[str, set[str], set[str]]:
+	"""Replace the <secret>key</secret> placeholders in text with the secret values in a single pass.
+
+	resolve(key, value) can turn a secret into the value to insert (e.g. a TOTP code for a 2FA secret).
+	Placeholders of unknown or empty secrets are kept as they are.
+
+	Returns:
+		The text, the keys that were replaced and the keys that are missing from secrets
+	"""
+	replaced_keys: set[str] = set()
+	missing_keys: set[str] = set()
+	if '<secret>' not in text:
+		return text, replaced_keys, missing_keys
+
+	def replace(match: re.Match[str]) -> str:
+		key = match.group(1)
+		value = secrets.get(key)
+		if not value:
+			missing_keys.add(key)
+			return match.group(0)
+		replaced_keys.add(key)
+		return resolve(key, value) if resolve else value
+
+	return SECRET_PLACEHOLDER_PATTERN.sub(replace, text), replaced_keys, missing_keys
+
+
+class CompiledSensitiveData:
+	"""A sensitive_data dict compiled for redaction and domain scoped lookups.
+
+	Supports the legacy format {key: value}, available on all domains, and the domain scoped format
+	{domain_pattern: {key: value}}, where secrets are only available on URLs matching the domain pattern.
+	"""
+
+	def __init__(self, sensitive_data: Mapping[str, str | Mapping[str, str]]):
+		self.sensitive_data = sensitive_data
+		self.domain_patterns = tuple(key for key, content in sensitive_data.items() if isinstance(content, Mapping))
+
+		# Redaction hides every secret no matter which domain it belongs to, the same key can hold a different value per domain
+		secret_pairs: list[tuple[str, str]] = []
+		for key_or_domain, content in sensitive_data.items():
+			if isinstance(content, Mapping):
+				secret_pairs.extend(content.items())
+			else:
+				secret_pairs.append((key_or_domain, content))
+		self.redactor = SecretRedactor(secret_pairs)
+
+	@property
+	def is_empty(self) -> bool:
+		"""True if there is no non-empty secret to redact"""
+		return not self.redactor.key_by_value
+
+	def applicable_secrets(self, url: str | None) -> dict[str, str]:
+		"""Non-empty secrets available on url: the legacy ones plus those of the domain patterns matching url"""
+		matched_patterns: frozenset[str] = frozenset()
+		if url and not is_new_tab_page(url) and self.domain_patterns:
+			# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+			matched_patterns = get_domain_matcher(self.domain_patterns).matching_patterns(url)
+
+		secrets: dict[str, str] = {}
+		for key_or_domain, content in self.sensitive_data.items():
+			if isinstance(content, Mapping):
+				if key_or_domain in matched_patterns:
+					secrets.update(content)
+			else:
+				secrets[key_or_domain] = content
+		return {key: value for key, value in secrets.items() if value}
+
+
+# Compiled sensitive_data by a digest of its secrets. Weak values: a compiled form lives as long as an owner (the message
+# manager of an agent) holds it, so secrets don't outlive the agents that use them and are never kept as cache keys
+_compiled_by_digest: weakref.WeakValueDictionary[str, CompiledSensitiveData] = weakref.WeakValueDictionary()
+
+
+def _digest(sensitive_data: Mapping[str, str | Mapping[str, str]]) -> str:
+	frozen = tuple(
+		(key, tuple(content.items()) if isinstance(content, Mapping) else content) for key, content in sensitive_data.items()
+	)
+	return hashlib.sha256(repr(frozen).encode()).hexdigest()
+
+
+def get_compiled_sensitive_data(sensitive_data: Mapping[str, str | Mapping[str, str]]) -> CompiledSensitiveData:
+	"""Get the compiled form of a sensitive_data dict, compiled once per distinct set of secrets while an owner holds it"""
+	digest = _digest(sensitive_data)
+	compiled = _compiled_by_digest.get(digest)
+	if compiled is None:
+		# A copy, so changes to the caller's dict can't change an existing compiled form
+		compiled = CompiledSensitiveData(
+			{key: dict(content) if isinstance(content, Mapping) else content for key, content in sensitive_data.items()}
+		)
+		_compiled_by_digest[digest] = compiled
+	return compiled
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from collections.abc import Iterable
 from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Self, Union, cast
@@ -12,6 +13,7 @@ from cdp_use import CDPClient
 from cdp_use.cdp.fetch import AuthRequiredEvent, RequestPausedEvent
 from cdp_use.cdp.network import Cookie
 from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
+from cdp_use.cdp.target.commands import CreateBrowserContextParameters, CreateTargetParameters
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
 
@@ -38,7 +40,7 @@ from browser_use.browser.events import (
 	TabClosedEvent,
 	TabCreatedEvent,
 )
-from browser_use.browser.profile import BrowserProfile, ProxySettings
+from browser_use.browser.profile import BrowserProfile, ProxySettings, ResourceBlockingRules
 from browser_use.browser.views import BrowserStateSummary, TabInfo
 from browser_use.dom.views import EnhancedDOMTreeNode, TargetInfo
 from browser_use.observability import observe_debug
@@ -46,6 +48,7 @@ from browser_use.utils import _log_pretty_url, is_new_tab_page
 
 if TYPE_CHECKING:
 	from browser_use.actor.page import Page
+	from browser_use.browser.watchdogs.resource_blocking_watchdog import ResourceBlockingStats
 
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
@@ -248,6 +251,8 @@ class BrowserSession(BaseModel):
 		record_har_content: str | None = None,
 		record_har_mode: str | None = None,
 		record_har_path: str | Path | None = None,
+		record_har_omit_content: bool | None = None,
+		record_har_url_filter: str | None = None,
 		record_video_dir: str | Path | None = None,
 		record_video_framerate: int | None = None,
 		record_video_size: dict | None = None,
@@ -258,8 +263,10 @@ class BrowserSession(BaseModel):
 		# BrowserProfile specific fields
 		use_cloud: bool | None = None,
 		cloud_browser: bool | None = None,  # Backward compatibility alias
+		isolated_context: bool | None = None,
 		disable_security: bool | None = None,
 		deterministic_rendering: bool | None = None,
+		fast_render: bool | None = None,
 		allowed_domains: list[str] | None = None,
 		keep_alive: bool | None = None,
 		proxy: ProxySettings | None = None,
@@ -269,10 +276,13 @@ class BrowserSession(BaseModel):
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
 		wait_between_actions: float | None = None,
+		virtual_time_budget: float | None = None,
 		filter_highlight_ids: bool | None = None,
 		auto_download_pdfs: bool | None = None,
 		profile_directory: str | None = None,
 		cookie_whitelist_domains: list[str] | None = None,
+		resource_blocking: ResourceBlockingRules | str | None = None,
+		replay_har_path: str | Path | None = None,
 		# DOM extraction layer configuration
 		cross_origin_iframes: bool | None = None,
 		highlight_elements: bool | None = None,
@@ -334,6 +344,11 @@ class BrowserSession(BaseModel):
 		"""Whether to use cloud browser service from browser profile."""
 		return self.browser_profile.use_cloud
 
+	@property
+	def browser_context_id(self) -> str | None:
+		"""ID of the browser context the session runs in with isolated_context=True, None for the default context."""
+		return self._browser_context_id
+
 	# Main shared event bus for all browser session + all watchdogs
 	event_bus: EventBus = Field(default_factory=EventBus)
 
@@ -342,6 +357,7 @@ class BrowserSession(BaseModel):
 
 	# Mutable private state shared between watchdogs
 	_cdp_client_root: CDPClient | None = PrivateAttr(default=None)
+	_browser_context_id: str | None = PrivateAttr(default=None)
 	_cdp_session_pool: dict[str, CDPSession] = PrivateAttr(default_factory=dict)
 	_cached_browser_state_summary: Any = PrivateAttr(default=None)
 	_cached_selector_map: dict[int, EnhancedDOMTreeNode] = PrivateAttr(default_factory=dict)
@@ -359,6 +375,9 @@ class BrowserSession(BaseModel):
 	_screenshot_watchdog: Any | None = PrivateAttr(default=None)
 	_permissions_watchdog: Any | None = PrivateAttr(default=None)
 	_recording_watchdog: Any | None = PrivateAttr(default=None)
+	_resource_blocking_watchdog: Any | None = PrivateAttr(default=None)
+	_har_recorder_watchdog: Any | None = PrivateAttr(default=None)
+	_fast_render_watchdog: Any | None = PrivateAttr(default=None)
 
 	_logger: Any = PrivateAttr(default=None)
 
@@ -407,6 +426,7 @@ class BrowserSession(BaseModel):
 		self._cdp_session_pool.clear()
 
 		self._cdp_client_root = None  # type: ignore
+		self._browser_context_id = None
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
 		self._downloaded_files.clear()
@@ -426,6 +446,9 @@ class BrowserSession(BaseModel):
 		self._screenshot_watchdog = None
 		self._permissions_watchdog = None
 		self._recording_watchdog = None
+		self._resource_blocking_watchdog = None
+		self._har_recorder_watchdog = None
+		self._fast_render_watchdog = None
 
 	def model_post_init(self, __context) -> None:
 		"""Register event handlers after model initialization."""
@@ -719,8 +742,7 @@ class BrowserSession(BaseModel):
 			else:
 				# no pages open at all, create a new one (handles switching to it automatically)
 				assert self._cdp_client_root is not None, 'CDP client root not initialized - browser may not be connected yet'
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				# do not await! these may circularly trigger SwitchTabEvent and could deadlock, dispatch to enqueue and return
 				self.event_bus.dispatch(TabCreatedEvent(url='about:blank', target_id=target_id))
 				self.event_bus.dispatch(AgentFocusChangedEvent(target_id=target_id, url='about:blank'))
@@ -881,6 +903,9 @@ class BrowserSession(BaseModel):
 				except Exception as e:
 					self.logger.debug(f'Failed to cleanup cloud browser session: {e}')
 
+			# Close the tabs of an isolated context, the browser itself may be shared with other sessions
+			await self._dispose_browser_context()
+
 			# Clear CDP session cache before stopping
 			await self.reset()
 
@@ -911,12 +936,7 @@ class BrowserSession(BaseModel):
 
 	async def new_page(self, url: str | None = None) -> 'Page':
 		"""Create a new page (tab)."""
-		from cdp_use.cdp.target.commands import CreateTargetParameters
-
-		params: CreateTargetParameters = {'url': url or 'about:blank'}
-		result = await self.cdp_client.send.Target.createTarget(params)
-
-		target_id = result['targetId']
+		target_id = await self._cdp_create_new_page(url or 'about:blank')
 
 		# Import here to avoid circular import
 		from browser_use.actor.page import Page as Target
@@ -975,6 +995,11 @@ class BrowserSession(BaseModel):
 		"""Get cookies, optionally filtered by URLs."""
 		from cdp_use.cdp.network.library import GetCookiesParameters
 
+		if self._browser_context_id and not urls:
+			# Network cookies of the browser target belong to the default context
+			storage_result = await self.cdp_client.send.Storage.getCookies(params={'browserContextId': self._browser_context_id})
+			return storage_result['cookies']
+
 		params: GetCookiesParameters = {}
 		if urls:
 			params['urls'] = urls
@@ -984,6 +1009,9 @@ class BrowserSession(BaseModel):
 
 	async def clear_cookies(self) -> None:
 		"""Clear all cookies."""
+		if self._browser_context_id:
+			await self.cdp_client.send.Storage.clearCookies(params={'browserContextId': self._browser_context_id})
+			return
 		await self.cdp_client.send.Network.clearBrowserCookies()
 
 	async def get_or_create_cdp_session(
@@ -1121,10 +1149,13 @@ class BrowserSession(BaseModel):
 		from browser_use.browser.watchdogs.default_action_watchdog import DefaultActionWatchdog
 		from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
 		from browser_use.browser.watchdogs.downloads_watchdog import DownloadsWatchdog
+		from browser_use.browser.watchdogs.fast_render_watchdog import FastRenderWatchdog
+		from browser_use.browser.watchdogs.har_recorder_watchdog import HarRecorderWatchdog
 		from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
 		from browser_use.browser.watchdogs.permissions_watchdog import PermissionsWatchdog
 		from browser_use.browser.watchdogs.popups_watchdog import PopupsWatchdog
 		from browser_use.browser.watchdogs.recording_watchdog import RecordingWatchdog
+		from browser_use.browser.watchdogs.resource_blocking_watchdog import ResourceBlockingWatchdog
 		from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog
 		from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
 		from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
@@ -1161,7 +1192,7 @@ class BrowserSession(BaseModel):
 				browser_session=self,
 				# More conservative defaults when auto-enabled
 				auto_save_interval=60.0,  # 1 minute instead of 30 seconds
-				save_on_change=False,  # Only save on shutdown by default
+				save_on_change=False,  # Batch tracked changes into at most one save per auto_save_interval (plus one on shutdown)
 			)
 			self._storage_state_watchdog.attach_to_session()
 			self.logger.debug(
@@ -1242,6 +1273,24 @@ class BrowserSession(BaseModel):
 		self._recording_watchdog = RecordingWatchdog(event_bus=self.event_bus, browser_session=self)
 		self._recording_watchdog.attach_to_session()
 
+		# Initialize ResourceBlockingWatchdog conditionally (blocks or stubs requests via the Fetch domain)
+		if self.browser_profile.resource_blocking:
+			ResourceBlockingWatchdog.model_rebuild()
+			self._resource_blocking_watchdog = ResourceBlockingWatchdog(event_bus=self.event_bus, browser_session=self)
+			self._resource_blocking_watchdog.attach_to_session()
+
+		# Initialize HarRecorderWatchdog conditionally (records requests into a HAR file or replays them from one)
+		if self.browser_profile.record_har_path or self.browser_profile.replay_har_path:
+			HarRecorderWatchdog.model_rebuild()
+			self._har_recorder_watchdog = HarRecorderWatchdog(event_bus=self.event_bus, browser_session=self)
+			self._har_recorder_watchdog.attach_to_session()
+
+		# Initialize FastRenderWatchdog conditionally (disables animations, transitions and smooth scrolling)
+		if self.browser_profile.fast_render:
+			FastRenderWatchdog.model_rebuild()
+			self._fast_render_watchdog = FastRenderWatchdog(event_bus=self.event_bus, browser_session=self)
+			self._fast_render_watchdog.attach_to_session()
+
 		# Mark watchdogs as attached to prevent duplicate attachment
 		self._watchdogs_attached = True
 
@@ -1286,6 +1335,9 @@ class BrowserSession(BaseModel):
 			)
 			self.logger.debug('CDP client connected successfully')
 
+			if self.browser_profile.isolated_context:
+				await self._create_browser_context()
+
 			# Get browser targets to find available contexts/pages
 			targets = await self._cdp_client_root.send.Target.getTargets()
 
@@ -1293,7 +1345,8 @@ class BrowserSession(BaseModel):
 			page_targets: list[TargetInfo] = [
 				t
 				for t in targets['targetInfos']
-				if self._is_valid_target(
+				if self._is_target_in_context(t)
+				and self._is_valid_target(
 					t, include_http=True, include_about=True, include_pages=True, include_iframes=False, include_workers=False
 				)
 			]
@@ -1334,9 +1387,11 @@ class BrowserSession(BaseModel):
 
 			if not page_targets:
 				# No pages found, create a new one
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				self.logger.debug(f'📄 Created new blank page with target ID: {target_id}')
+				# Announced to the watchdogs below like an initial tab
+				target_info = await self._cdp_client_root.send.Target.getTargetInfo(params={'targetId': target_id})
+				page_targets = [target_info['targetInfo']]
 			else:
 				# Use the first available page
 				target_id = [page for page in page_targets if page.get('type') == 'page'][0]['targetId']
@@ -1391,6 +1446,15 @@ class BrowserSession(BaseModel):
 
 		return self
 
+	def _fetch_handles_proxy_auth(self, cdp_client: CDPClient) -> bool:
+		"""Whether Fetch.enable calls on this client must keep handleAuthRequests for _setup_proxy_auth.
+
+		Enabling Fetch again replaces the settings _setup_proxy_auth enabled on the same CDP session, and the proxy auth
+		handler is only registered on the root client.
+		"""
+		proxy = self.browser_profile.proxy
+		return bool(proxy and proxy.username and proxy.password) and cdp_client is self._cdp_client_root
+
 	async def _setup_proxy_auth(self) -> None:
 		"""Enable CDP Fetch auth handling for authenticated proxy, if credentials provided.
 
@@ -1503,7 +1567,7 @@ class BrowserSession(BaseModel):
 			# Auto-enable Fetch on every newly attached target to ensure auth callbacks fire
 			def _on_attached(event: AttachedToTargetEvent, session_id: SessionID | None = None):
 				sid = event.get('sessionId') or event.get('session_id') or session_id
-				if not sid:
+				if not sid or not self._is_target_in_context(event['targetInfo']):
 					return
 
 				async def _enable():
@@ -1701,7 +1765,7 @@ class BrowserSession(BaseModel):
 		all_targets = await self.cdp_client.send.Target.getTargets()
 		# Filter for valid page/tab targets only
 		for target in all_targets.get('targetInfos', []):
-			if target['targetId'].endswith(tab_id) and target.get('type') == 'page':
+			if target['targetId'].endswith(tab_id) and target.get('type') == 'page' and self._is_target_in_context(target):
 				return target['targetId']
 
 		raise ValueError(f'No TargetID found ending in tab_id=...{tab_id}')
@@ -1716,21 +1780,20 @@ class BrowserSession(BaseModel):
 
 	async def get_target_id_from_url(self, url: str) -> TargetID:
 		"""Get the TargetID from a URL."""
-		all_targets = await self.cdp_client.send.Target.getTargets()
-		for target in all_targets.get('targetInfos', []):
-			if target['url'] == url and target['type'] == 'page':
+		all_targets = [target for target in await self._cdp_get_all_pages() if target['type'] == 'page']
+		for target in all_targets:
+			if target['url'] == url:
 				return target['targetId']
 
 		# still not found, try substring match as fallback
-		for target in all_targets.get('targetInfos', []):
-			if url in target['url'] and target['type'] == 'page':
+		for target in all_targets:
+			if url in target['url']:
 				return target['targetId']
 
 		raise ValueError(f'No TargetID found for url={url}')
 
 	async def get_most_recently_opened_target_id(self) -> TargetID:
 		"""Get the most recently opened target ID."""
-		all_targets = await self.cdp_client.send.Target.getTargets()
 		return (await self._cdp_get_all_pages())[-1]['targetId']
 
 	def is_file_input(self, element: Any) -> bool:
@@ -1846,6 +1909,11 @@ class BrowserSession(BaseModel):
 		"""
 		return self._downloaded_files.copy()
 
+	@property
+	def resource_blocking_stats(self) -> 'ResourceBlockingStats | None':
+		"""Counters of the requests blocked by BrowserProfile.resource_blocking, None if it is not set."""
+		return self._resource_blocking_watchdog.stats if self._resource_blocking_watchdog else None
+
 	# endregion - ========== Helper Methods ==========
 
 	# region - ========== CDP-based replacements for browser_context operations ==========
@@ -1866,11 +1934,12 @@ class BrowserSession(BaseModel):
 		if not self._cdp_client_root:
 			return []
 		targets = await self.cdp_client.send.Target.getTargets()
-		# Filter for valid page/tab targets only
+		# Filter for valid page/tab targets of this session's browser context only
 		return [
 			t
 			for t in targets.get('targetInfos', [])
-			if self._is_valid_target(
+			if self._is_target_in_context(t)
+			and self._is_valid_target(
 				t,
 				include_http=include_http,
 				include_about=include_about,
@@ -1883,18 +1952,51 @@ class BrowserSession(BaseModel):
 			)
 		]
 
+	def _is_target_in_context(self, target: TargetInfo) -> bool:
+		"""Whether a target belongs to this session, always True unless the session runs in an isolated context."""
+		return self._browser_context_id is None or target.get('browserContextId') == self._browser_context_id
+
+	async def _create_browser_context(self) -> None:
+		"""Create the browser context an isolated_context session keeps all its tabs in.
+
+		A context shares the browser process, its GPU and network processes with the other contexts, but has its own
+		cookies, storage, cache and permissions, which makes it far cheaper than a browser per session.
+		"""
+		assert self._cdp_client_root is not None, 'CDP client not initialized - browser may not be connected yet'
+		# Without keep_alive the context goes away with our connection, even if the session is never stopped
+		params: CreateBrowserContextParameters = {'disposeOnDetach': not self.browser_profile.keep_alive}
+		proxy = self.browser_profile.proxy
+		if proxy and proxy.server:
+			# Unlike launch args, the proxy of a context only applies to this session
+			params['proxyServer'] = proxy.server
+			if proxy.bypass:
+				params['proxyBypassList'] = proxy.bypass
+		result = await self._cdp_client_root.send.Target.createBrowserContext(params=params)
+		self._browser_context_id = result['browserContextId']
+		self.logger.debug(f'🧳 Created isolated browser context {self._browser_context_id}')
+
+	async def _dispose_browser_context(self) -> None:
+		"""Close all tabs of the isolated context and drop its cookies and storage, the browser keeps running."""
+		if not self._browser_context_id or not self._cdp_client_root:
+			return
+		try:
+			await self._cdp_client_root.send.Target.disposeBrowserContext(params={'browserContextId': self._browser_context_id})
+			self.logger.debug(f'🧳 Disposed isolated browser context {self._browser_context_id}')
+		except Exception as e:
+			self.logger.debug(f'Failed to dispose browser context {self._browser_context_id}: {type(e).__name__}: {e}')
+		self._browser_context_id = None
+
 	async def _cdp_create_new_page(self, url: str = 'about:blank', background: bool = False, new_window: bool = False) -> str:
 		"""Create a new page/tab using CDP Target.createTarget. Returns target ID."""
+		params: CreateTargetParameters = {'url': url, 'newWindow': new_window, 'background': background}
+		if self._browser_context_id:
+			params['browserContextId'] = self._browser_context_id
 		# Use the root CDP client to create tabs at the browser level
 		if self._cdp_client_root:
-			result = await self._cdp_client_root.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self._cdp_client_root.send.Target.createTarget(params=params)
 		else:
 			# Fallback to using cdp_client if root is not available
-			result = await self.cdp_client.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self.cdp_client.send.Target.createTarget(params=params)
 		return result['targetId']
 
 	async def _cdp_close_page(self, target_id: TargetID) -> None:
@@ -1903,6 +2005,13 @@ class BrowserSession(BaseModel):
 
 	async def _cdp_get_cookies(self) -> list[Cookie]:
 		"""Get cookies using CDP Network.getCookies."""
+		if self._browser_context_id:
+			# Storage commands scoped to a browser context are handled by the browser target, not by page sessions
+			result = await asyncio.wait_for(
+				self.cdp_client.send.Storage.getCookies(params={'browserContextId': self._browser_context_id}), timeout=8.0
+			)
+			return result.get('cookies', [])
+
 		cdp_session = await self.get_or_create_cdp_session(target_id=None, new_socket=False)
 		result = await asyncio.wait_for(
 			cdp_session.cdp_client.send.Storage.getCookies(session_id=cdp_session.session_id), timeout=8.0
@@ -1914,6 +2023,12 @@ class BrowserSession(BaseModel):
 		if not self.agent_focus or not cookies:
 			return
 
+		if self._browser_context_id:
+			await self.cdp_client.send.Storage.setCookies(
+				params={'cookies': cookies, 'browserContextId': self._browser_context_id}  # type: ignore[arg-type]
+			)
+			return
+
 		cdp_session = await self.get_or_create_cdp_session(target_id=None, new_socket=False)
 		# Storage.setCookies expects params dict with 'cookies' key
 		await cdp_session.cdp_client.send.Storage.setCookies(
@@ -1923,6 +2038,10 @@ class BrowserSession(BaseModel):
 
 	async def _cdp_clear_cookies(self) -> None:
 		"""Clear all cookies using CDP Network.clearBrowserCookies."""
+		if self._browser_context_id:
+			await self.cdp_client.send.Storage.clearCookies(params={'browserContextId': self._browser_context_id})
+			return
+
 		cdp_session = await self.get_or_create_cdp_session()
 		await cdp_session.cdp_client.send.Storage.clearCookies(session_id=cdp_session.session_id)
 
@@ -1998,8 +2117,15 @@ class BrowserSession(BaseModel):
 			session_id=cdp_session.session_id,
 		)
 
-	async def _cdp_get_origins(self) -> list[dict[str, Any]]:
-		"""Get origins with localStorage and sessionStorage using CDP."""
+	async def _cdp_get_origins(
+		self, only_origins: Iterable[str] | None = None, keep_enabled: bool = False
+	) -> list[dict[str, Any]]:
+		"""Get origins with localStorage and sessionStorage using CDP.
+
+		Args:
+			only_origins: Only read these origins instead of every origin in the current frame tree
+			keep_enabled: Leave the DOMStorage domain enabled afterwards (when something is listening to its events)
+		"""
 		origins = []
 		cdp_session = await self.get_or_create_cdp_session(target_id=None, new_socket=False)
 
@@ -2008,9 +2134,6 @@ class BrowserSession(BaseModel):
 			await cdp_session.cdp_client.send.DOMStorage.enable(session_id=cdp_session.session_id)
 
 			try:
-				# Get all frames to find unique origins
-				frames_result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
-
 				# Extract unique origins from frames
 				unique_origins = set()
 
@@ -2044,7 +2167,12 @@ class BrowserSession(BaseModel):
 						self.logger.debug(f'Failed to get {storage_type} for {origin}: {e}')
 						return None
 
-				_extract_origins(frames_result.get('frameTree', {}))
+				if only_origins is None:
+					# Get all frames to find unique origins
+					frames_result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+					_extract_origins(frames_result.get('frameTree', {}))
+				else:
+					unique_origins.update(only_origins)
 
 				# For each unique origin, get localStorage and sessionStorage
 				for origin in unique_origins:
@@ -2065,8 +2193,9 @@ class BrowserSession(BaseModel):
 						origins.append(origin_data)
 
 			finally:
-				# Always disable DOMStorage tracking when done
-				await cdp_session.cdp_client.send.DOMStorage.disable(session_id=cdp_session.session_id)
+				# Disable DOMStorage tracking when done, unless its events are being watched
+				if not keep_enabled:
+					await cdp_session.cdp_client.send.DOMStorage.disable(session_id=cdp_session.session_id)
 
 		except Exception as e:
 			self.logger.warning(f'Failed to get origins: {e}')
@@ -96,8 +96,16 @@ class BrowserStateHistory:
 	interacted_element: list[DOMInteractedElement | None] | list[None]
 	screenshot_path: str | None = None
 
+	@property
+	def screenshot_media_type(self) -> str | None:
+		"""Media type of the stored screenshot, which is PNG unless the agent stored webp or jpeg screenshots"""
+		if not self.screenshot_path:
+			return None
+		extension = self.screenshot_path.rsplit('.', 1)[-1].lower()
+		return {'webp': 'image/webp', 'jpeg': 'image/jpeg', 'jpg': 'image/jpeg'}.get(extension, 'image/png')
+
 	def get_screenshot(self) -> str | None:
-		"""Load screenshot from disk and return as base64 string"""
+		"""Load screenshot from disk and return as base64 string, in the format given by screenshot_media_type"""
 		if not self.screenshot_path:
 			return None
 
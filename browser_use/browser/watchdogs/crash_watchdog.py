@@ -305,7 +305,7 @@ class CrashWatchdog(BaseWatchdog):
 				)
 
 			for target in (await self.browser_session.cdp_client.send.Target.getTargets()).get('targetInfos', []):
-				if target.get('type') == 'page':
+				if target.get('type') == 'page' and self.browser_session._is_target_in_context(target):
 					cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target.get('targetId'))
 					if self._is_new_tab_page(target.get('url')) and target.get('url') != 'about:blank':
 						self.logger.debug(
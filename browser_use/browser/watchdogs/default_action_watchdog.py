@@ -222,8 +222,9 @@ class DefaultActionWatchdog(BaseWatchdog):
 						# Note: We don't clear cached state here - let multi_act handle DOM change detection
 						# by explicitly rebuilding and comparing when needed
 
-						# Wait a bit for the scroll to settle and DOM to update
-						await asyncio.sleep(0.2)
+						# Wait a bit for the scroll to settle and DOM to update (scrolling is instant with fast_render)
+						if not self.browser_session.browser_profile.fast_render:
+							await asyncio.sleep(0.2)
 
 					return None
 
@@ -456,7 +457,8 @@ class DefaultActionWatchdog(BaseWatchdog):
 				await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
 					params={'backendNodeId': backend_node_id}, session_id=session_id
 				)
-				await asyncio.sleep(0.05)  # Wait for scroll to complete
+				if not self.browser_session.browser_profile.fast_render:
+					await asyncio.sleep(0.05)  # Wait for scroll to complete
 			except Exception as e:
 				self.logger.debug(f'Failed to scroll element into view: {e}')
 
@@ -456,6 +456,10 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.debug(f'⏳ Network idle wait: {network_idle_wait}s')
 			await asyncio.sleep(network_idle_wait)
 
+		# With fast rendering, wait for leftover layout shifts and animations to end
+		if self.browser_session._fast_render_watchdog:
+			await self.browser_session._fast_render_watchdog.wait_for_visual_stability()
+
 		elapsed = time.time() - start_time
 		self.logger.debug(f'✅ Page stability wait completed in {elapsed:.2f}s')
 
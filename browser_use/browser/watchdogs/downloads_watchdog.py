@@ -11,6 +11,7 @@ from urllib.parse import urlparse
 import anyio
 from bubus import BaseEvent
 from cdp_use.cdp.browser import DownloadProgressEvent, DownloadWillBeginEvent
+from cdp_use.cdp.browser.commands import SetDownloadBehaviorParameters
 from cdp_use.cdp.target import SessionID, TargetID
 from pydantic import PrivateAttr
 
@@ -57,6 +58,7 @@ class DownloadsWatchdog(BaseWatchdog):
 	_cdp_downloads_info: dict[str, dict[str, Any]] = PrivateAttr(default_factory=dict)  # Map guid -> info
 	_use_js_fetch_for_local: bool = PrivateAttr(default=False)  # Guard JS fetch path for local regular downloads
 	_session_pdf_urls: dict[str, str] = PrivateAttr(default_factory=dict)  # URL -> path for PDFs downloaded this session
+	_download_filenames: set[str] | None = PrivateAttr(default=None)  # In-memory index of file names in the downloads dir
 
 	async def on_BrowserLaunchEvent(self, event: BrowserLaunchEvent) -> None:
 		self.logger.debug(f'[DownloadsWatchdog] Received BrowserLaunchEvent, EventBus ID: {id(self.event_bus)}')
@@ -125,6 +127,8 @@ class DownloadsWatchdog(BaseWatchdog):
 		self._active_downloads.clear()
 		self._pdf_viewer_cache.clear()
 		self._session_pdf_urls.clear()
+		self._cdp_downloads_info.clear()
+		self._download_filenames = None
 
 	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
 		"""Check for PDFs after navigation completes."""
@@ -144,7 +148,7 @@ class DownloadsWatchdog(BaseWatchdog):
 		target_id = event.target_id
 		self.logger.debug(f'[DownloadsWatchdog] Got target_id={target_id} for tab #{event.target_id[-4:]}')
 
-		is_pdf = await self.check_for_pdf_viewer(target_id)
+		is_pdf = await self.check_for_pdf_viewer(target_id, url=event.url)
 		if is_pdf:
 			self.logger.debug(f'[DownloadsWatchdog] 📄 PDF detected at {event.url}, triggering auto-download...')
 			download_path = await self.trigger_pdf_download(target_id)
@@ -161,67 +165,67 @@ class DownloadsWatchdog(BaseWatchdog):
 		# Define CDP event handlers outside of try to avoid indentation/scope issues
 		async def download_will_begin_handler(event: DownloadWillBeginEvent, session_id: SessionID | None):
 			self.logger.debug(f'[DownloadsWatchdog] Download will begin: {event}')
-			# Cache info for later completion event handling (esp. remote browsers)
+			if self.browser_session.is_local:
+				# The index must predate the finished file, or a download without filePath can't be told apart from it
+				self._get_download_filenames()
+			# Cache info for the completion event, which only carries the guid
 			guid = event.get('guid', '')
-			try:
-				suggested_filename = event.get('suggestedFilename')
-				assert suggested_filename, 'CDP DownloadWillBegin missing suggestedFilename'
-				self._cdp_downloads_info[guid] = {
-					'url': event.get('url', ''),
-					'suggested_filename': suggested_filename,
-					'handled': False,
-				}
-			except (AssertionError, KeyError):
-				pass
-			# Create and track the task
-			task = asyncio.create_task(self._handle_cdp_download(event, target_id, session_id))
-			self._cdp_event_tasks.add(task)
-			# Remove from set when done
-			task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
+			self._cdp_downloads_info[guid] = {
+				'url': event.get('url', ''),
+				'suggested_filename': event.get('suggestedFilename') or 'download',
+				'handled': False,
+			}
+
+			# Completion is signalled by Browser.downloadProgress, a task is only needed for the JS fetch fallback
+			if self.browser_session.is_local and self._use_js_fetch_for_local:
+				task = asyncio.create_task(self._handle_cdp_download(event, target_id, session_id))
+				self._cdp_event_tasks.add(task)
+				# Remove from set when done
+				task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
 
 		async def download_progress_handler(event: DownloadProgressEvent, session_id: SessionID | None):
-			# Check if download is complete
-			if event.get('state') == 'completed':
-				file_path = event.get('filePath')
-				guid = event.get('guid', '')
-				if self.browser_session.is_local:
-					if file_path:
-						self.logger.debug(f'[DownloadsWatchdog] Download completed: {file_path}')
-						# Track the download
-						self._track_download(file_path)
-						# Mark as handled to prevent fallback duplicate dispatch
-						try:
-							if guid in self._cdp_downloads_info:
-								self._cdp_downloads_info[guid]['handled'] = True
-						except (KeyError, AttributeError):
-							pass
-					else:
-						# No local file path provided, local polling in _handle_cdp_download will handle it
-						self.logger.debug(
-							'[DownloadsWatchdog] No filePath in progress event (local); polling will handle detection'
-						)
+			state = event.get('state')
+			if state == 'canceled':
+				info = self._cdp_downloads_info.pop(event.get('guid', ''), {})
+				self.logger.debug(f'[DownloadsWatchdog] Download canceled: {info.get("url", "")[:100]}')
+				return
+			if state != 'completed':
+				return
+
+			guid = event.get('guid', '')
+			info = self._cdp_downloads_info.pop(guid, {})
+			if info.get('handled'):
+				# Already saved and dispatched by the JS fetch fallback
+				return
+
+			file_path = event.get('filePath')
+			suggested_filename = info.get('suggested_filename') or (Path(file_path).name if file_path else 'download')
+			if self.browser_session.is_local:
+				if not file_path:
+					file_path = self._find_completed_download(suggested_filename)
+				if file_path:
+					self.logger.debug(f'[DownloadsWatchdog] Download completed: {file_path}')
+					self._track_download(file_path, url=info.get('url') or None)
 				else:
-					# Remote browser: do not touch local filesystem. Fallback to downloadPath+suggestedFilename
-					info = self._cdp_downloads_info.get(guid, {})
-					try:
-						suggested_filename = info.get('suggested_filename') or (Path(file_path).name if file_path else 'download')
-						downloads_path = str(self.browser_session.browser_profile.downloads_path or '')
-						effective_path = file_path or str(Path(downloads_path) / suggested_filename)
-						file_name = Path(effective_path).name
-						file_ext = Path(file_name).suffix.lower().lstrip('.')
-						self.event_bus.dispatch(
-							FileDownloadedEvent(
-								url=info.get('url', ''),
-								path=str(effective_path),
-								file_name=file_name,
-								file_size=0,
-								file_type=file_ext if file_ext else None,
-							)
-						)
-						self.logger.debug(f'[DownloadsWatchdog] ✅ (remote) Download completed: {effective_path}')
-					finally:
-						if guid in self._cdp_downloads_info:
-							del self._cdp_downloads_info[guid]
+					self.logger.warning(
+						f'[DownloadsWatchdog] Download completed but file could not be located: {suggested_filename}'
+					)
+			else:
+				# Remote browser: do not touch local filesystem. Fallback to downloadPath+suggestedFilename
+				downloads_path = str(self.browser_session.browser_profile.downloads_path or '')
+				effective_path = file_path or str(Path(downloads_path) / suggested_filename)
+				file_name = Path(effective_path).name
+				file_ext = Path(file_name).suffix.lower().lstrip('.')
+				self.event_bus.dispatch(
+					FileDownloadedEvent(
+						url=info.get('url', ''),
+						path=str(effective_path),
+						file_name=file_name,
+						file_size=0,
+						file_type=file_ext if file_ext else None,
+					)
+				)
+				self.logger.debug(f'[DownloadsWatchdog] ✅ (remote) Download completed: {effective_path}')
 
 		try:
 			downloads_path_raw = self.browser_session.browser_profile.downloads_path
@@ -251,13 +255,18 @@ class DownloadsWatchdog(BaseWatchdog):
 					return
 				# Ensure path is properly expanded (~ -> absolute path)
 				expanded_downloads_path = Path(downloads_path).expanduser().resolve()
-				await cdp_client.send.Browser.setDownloadBehavior(
-					params={
-						'behavior': 'allow',
-						'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
-						'eventsEnabled': True,
-					}
-				)
+				download_behavior: SetDownloadBehaviorParameters = {
+					'behavior': 'allow',
+					'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
+					'eventsEnabled': True,
+				}
+				if self.browser_session.browser_context_id:
+					# Only downloads of the session's own context, the browser may be shared
+					download_behavior['browserContextId'] = self.browser_session.browser_context_id
+				await cdp_client.send.Browser.setDownloadBehavior(params=download_behavior)
+				if self.browser_session.is_local:
+					# Snapshot the downloads dir before the first download can land in it
+					self._get_download_filenames()
 
 				# Register the handlers with CDP
 				cdp_client.register.Browser.downloadWillBegin(download_will_begin_handler)  # type: ignore[arg-type]
@@ -272,40 +281,41 @@ class DownloadsWatchdog(BaseWatchdog):
 		except Exception as e:
 			self.logger.warning(f'[DownloadsWatchdog] Failed to set up CDP download listener for target {target_id}: {e}')
 
-	def _track_download(self, file_path: str) -> None:
+	def _track_download(self, file_path: str, url: str | None = None) -> None:
 		"""Track a completed download and dispatch the appropriate event.
 
 		Args:
 			file_path: The path to the downloaded file
+			url: The URL the file was downloaded from (defaults to the file path)
 		"""
 		try:
 			# Get file info
 			path = Path(file_path)
-			if path.exists():
-				file_size = path.stat().st_size
-				self.logger.debug(f'[DownloadsWatchdog] Tracked download: {path.name} ({file_size} bytes)')
+			file_size = path.stat().st_size
+		except OSError:
+			self.logger.warning(f'[DownloadsWatchdog] Downloaded file not found: {file_path}')
+			return
 
-				# Dispatch download event
-				from browser_use.browser.events import FileDownloadedEvent
+		try:
+			self.logger.debug(f'[DownloadsWatchdog] Tracked download: {path.name} ({file_size} bytes)')
+			self._get_download_filenames().add(path.name)
 
-				self.event_bus.dispatch(
-					FileDownloadedEvent(
-						url=str(path),  # Use the file path as URL for local files
-						path=str(path),
-						file_name=path.name,
-						file_size=file_size,
-					)
+			# Dispatch download event
+			file_ext = path.suffix.lower().lstrip('.')
+			self.event_bus.dispatch(
+				FileDownloadedEvent(
+					url=url or str(path),  # Use the file path as URL if the source URL is unknown
+					path=str(path),
+					file_name=path.name,
+					file_size=file_size,
+					file_type=file_ext if file_ext else None,
 				)
-			else:
-				self.logger.warning(f'[DownloadsWatchdog] Downloaded file not found: {file_path}')
+			)
 		except Exception as e:
 			self.logger.error(f'[DownloadsWatchdog] Error tracking download: {e}')
 
-	async def _handle_cdp_download(
-		self, event: DownloadWillBeginEvent, target_id: TargetID, session_id: SessionID | None
-	) -> None:
-		"""Handle a CDP Page.downloadWillBegin event."""
-		downloads_dir = (
+	def _get_downloads_dir(self) -> Path:
+		return (
 			Path(
 				self.browser_session.browser_profile.downloads_path
 				or f'{tempfile.gettempdir()}/browser_use_downloads.{str(self.browser_session.id)[-4:]}'
@@ -314,6 +324,52 @@ class DownloadsWatchdog(BaseWatchdog):
 			.resolve()
 		)  # Ensure path is properly expanded
 
+	def _get_download_filenames(self) -> set[str]:
+		"""In-memory index of the file names in the downloads dir, built with a single listdir when the download
+		listeners are set up and extended with every download tracked since."""
+		if self._download_filenames is None:
+			try:
+				self._download_filenames = set(os.listdir(self._get_downloads_dir()))
+			except OSError:
+				self._download_filenames = set()
+		return self._download_filenames
+
+	def _find_completed_download(self, suggested_filename: str) -> str | None:
+		"""Locate a finished download when the browser did not report its filePath.
+
+		Chrome saves to the suggested file name, or a ' (n)' variant of it if that name was taken, so the
+		first name not yet in the in-memory index is the new file. One listdir is done as a last resort.
+		"""
+		downloads_dir = self._get_downloads_dir()
+		known_filenames = self._get_download_filenames()
+
+		base, ext = os.path.splitext(suggested_filename)
+		candidate, counter = suggested_filename, 1
+		while candidate in known_filenames:
+			candidate = f'{base} ({counter}){ext}'
+			counter += 1
+		if (downloads_dir / candidate).is_file():
+			known_filenames.add(candidate)
+			return str(downloads_dir / candidate)
+
+		try:
+			new_files = [name for name in os.listdir(downloads_dir) if name not in known_filenames and not name.startswith('.')]
+		except OSError:
+			return None
+		known_filenames.update(new_files)
+		new_files = [name for name in new_files if not name.endswith('.crdownload')]
+		return str(downloads_dir / new_files[0]) if len(new_files) == 1 else None
+
+	async def _handle_cdp_download(
+		self, event: DownloadWillBeginEvent, target_id: TargetID, session_id: SessionID | None
+	) -> None:
+		"""Download a file via JS fetch for a CDP Browser.downloadWillBegin event.
+
+		Only used when the JS fetch fallback is enabled for local browsers. If it fails, the native browser
+		download is picked up by the Browser.downloadProgress handler when it completes.
+		"""
+		downloads_dir = self._get_downloads_dir()
+
 		# Initialize variables that may be used outside try blocks
 		unique_filename = None
 		file_size = 0
@@ -327,16 +383,8 @@ class DownloadsWatchdog(BaseWatchdog):
 			self.logger.debug(f'[DownloadsWatchdog] ⬇️ File download starting: {suggested_filename} from {download_url[:100]}...')
 			self.logger.debug(f'[DownloadsWatchdog] Full CDP event: {event}')
 
-			# Since Browser.setDownloadBehavior is already configured, the browser will download the file
-			# We just need to wait for it to appear in the downloads directory
 			expected_path = downloads_dir / suggested_filename
 
-			# Debug: List current directory contents
-			self.logger.debug(f'[DownloadsWatchdog] Downloads directory: {downloads_dir}')
-			if downloads_dir.exists():
-				files_before = list(downloads_dir.iterdir())
-				self.logger.debug(f'[DownloadsWatchdog] Files before download: {[f.name for f in files_before]}')
-
 			# Try manual JavaScript fetch as a fallback for local browsers (disabled for regular local downloads)
 			if self.browser_session.is_local and self._use_js_fetch_for_local:
 				self.logger.debug(f'[DownloadsWatchdog] Attempting JS fetch fallback for {download_url}')
@@ -389,7 +437,7 @@ class DownloadsWatchdog(BaseWatchdog):
 						file_size = len(file_data)
 
 						# Ensure unique filename
-						unique_filename = await self._get_unique_filename(str(downloads_dir), suggested_filename)
+						unique_filename = self._get_unique_filename(str(downloads_dir), suggested_filename)
 						final_path = downloads_dir / unique_filename
 
 						# Write the file
@@ -431,72 +479,11 @@ class DownloadsWatchdog(BaseWatchdog):
 				except Exception as fetch_error:
 					self.logger.error(f'[DownloadsWatchdog] ❌ Failed to download file via fetch: {fetch_error}')
 
-			# For remote browsers, don't poll local filesystem; downloadProgress handler will emit the event
-			if not self.browser_session.is_local:
-				return
 		except Exception as e:
 			self.logger.error(f'[DownloadsWatchdog] ❌ Error handling CDP download: {type(e).__name__} {e}')
 
-		# If we reach here, the fetch method failed, so wait for native download
-		# Poll the downloads directory for new files
-		self.logger.debug(f'[DownloadsWatchdog] Checking if browser auto-download saved the file for us: {suggested_filename}')
-
-		# Get initial list of files in downloads directory
-		initial_files = set()
-		if Path(downloads_dir).exists():
-			for f in Path(downloads_dir).iterdir():
-				if f.is_file() and not f.name.startswith('.'):
-					initial_files.add(f.name)
-
-		# Poll for new files
-		max_wait = 20  # seconds
-		start_time = asyncio.get_event_loop().time()
-
-		while asyncio.get_event_loop().time() - start_time < max_wait:
-			await asyncio.sleep(5.0)  # Check every 5 seconds
-
-			if Path(downloads_dir).exists():
-				for file_path in Path(downloads_dir).iterdir():
-					# Skip hidden files and files that were already there
-					if file_path.is_file() and not file_path.name.startswith('.') and file_path.name not in initial_files:
-						# Check if file has content (> 4 bytes)
-						try:
-							file_size = file_path.stat().st_size
-							if file_size > 4:
-								# Found a new download!
-								self.logger.debug(
-									f'[DownloadsWatchdog] ✅ Found downloaded file: {file_path} ({file_size} bytes)'
-								)
-
-								# Determine file type from extension
-								file_ext = file_path.suffix.lower().lstrip('.')
-								file_type = file_ext if file_ext else None
-
-								# Dispatch download event
-								# Skip if already handled by progress/JS fetch
-								info = self._cdp_downloads_info.get(guid, {})
-								if info.get('handled'):
-									return
-								self.event_bus.dispatch(
-									FileDownloadedEvent(
-										url=download_url,
-										path=str(file_path),
-										file_name=file_path.name,
-										file_size=file_size,
-										file_type=file_type,
-									)
-								)
-								# Mark as handled after dispatch
-								try:
-									if guid in self._cdp_downloads_info:
-										self._cdp_downloads_info[guid]['handled'] = True
-								except (KeyError, AttributeError):
-									pass
-								return
-						except Exception as e:
-							self.logger.debug(f'[DownloadsWatchdog] Error checking file {file_path}: {e}')
-
-		self.logger.warning(f'[DownloadsWatchdog] Download did not complete within {max_wait} seconds')
+		# If we reach here, the fetch method failed, the native download will be reported by Browser.downloadProgress
+		self.logger.debug(f'[DownloadsWatchdog] Waiting for native browser download of {suggested_filename}')
 
 	async def _handle_download(self, download: Any) -> None:
 		"""Handle a download event."""
@@ -539,7 +526,7 @@ class DownloadsWatchdog(BaseWatchdog):
 			else:
 				current_step = 'generating_unique_filename'
 				# Ensure unique filename
-				unique_filename = await self._get_unique_filename(downloads_dir, suggested_filename)
+				unique_filename = self._get_unique_filename(downloads_dir, suggested_filename)
 				download_path = Path(downloads_dir) / unique_filename
 
 				self.logger.debug(f'[DownloadsWatchdog] Download started: {unique_filename} from {url[:100]}...')
@@ -607,23 +594,26 @@ class DownloadsWatchdog(BaseWatchdog):
 			if download_id in self._active_downloads:
 				del self._active_downloads[download_id]
 
-	async def check_for_pdf_viewer(self, target_id: TargetID) -> bool:
-		"""Check if the current target is a PDF using network-based detection.
+	async def check_for_pdf_viewer(self, target_id: TargetID, url: str | None = None) -> bool:
+		"""Check if the current target is a PDF using URL-based detection.
 
 		This method avoids JavaScript execution that can crash WebSocket connections.
+		Pass the url if it is already known (e.g. from a NavigationCompleteEvent) to skip the Target.getTargets lookup.
 		Returns True if a PDF is detected and should be downloaded.
 		"""
 		self.logger.debug(f'[DownloadsWatchdog] Checking if target {target_id} is PDF viewer...')
 
-		# Get target info to get URL
-		cdp_client = self.browser_session.cdp_client
-		targets = await cdp_client.send.Target.getTargets()
-		target_info = next((t for t in targets['targetInfos'] if t['targetId'] == target_id), None)
-		if not target_info:
-			self.logger.warning(f'[DownloadsWatchdog] No target info found for {target_id}')
-			return False
+		page_url = url
+		if not page_url:
+			# Get target info to get URL
+			cdp_client = self.browser_session.cdp_client
+			targets = await cdp_client.send.Target.getTargets()
+			target_info = next((t for t in targets['targetInfos'] if t['targetId'] == target_id), None)
+			if not target_info:
+				self.logger.warning(f'[DownloadsWatchdog] No target info found for {target_id}')
+				return False
 
-		page_url = target_info.get('url', '')
+			page_url = target_info.get('url', '')
 
 		# Check cache first
 		if page_url in self._pdf_viewer_cache:
@@ -639,14 +629,7 @@ class DownloadsWatchdog(BaseWatchdog):
 				self._pdf_viewer_cache[page_url] = True
 				return True
 
-			# Method 2: Check network response headers via CDP (safer than JavaScript)
-			header_is_pdf = await self._check_network_headers_for_pdf(target_id)
-			if header_is_pdf:
-				self.logger.debug(f'[DownloadsWatchdog] PDF detected via network headers: {page_url}')
-				self._pdf_viewer_cache[page_url] = True
-				return True
-
-			# Method 3: Check Chrome's PDF viewer specific URLs
+			# Method 2: Check Chrome's PDF viewer specific URLs
 			chrome_pdf_viewer = self._is_chrome_pdf_viewer_url(page_url)
 			if chrome_pdf_viewer:
 				self.logger.debug(f'[DownloadsWatchdog] Chrome PDF viewer detected: {page_url}')
@@ -708,39 +691,6 @@ class DownloadsWatchdog(BaseWatchdog):
 
 		return False
 
-	async def _check_network_headers_for_pdf(self, target_id: TargetID) -> bool:
-		"""Infer PDF via navigation history/URL; headers are not available post-navigation in this context."""
-		try:
-			import asyncio
-
-			# Get CDP session
-			temp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
-
-			# Get navigation history to find the main resource
-			history = await asyncio.wait_for(
-				temp_session.cdp_client.send.Page.getNavigationHistory(session_id=temp_session.session_id), timeout=3.0
-			)
-
-			current_entry = history.get('entries', [])
-			if current_entry:
-				current_index = history.get('currentIndex', 0)
-				if 0 <= current_index < len(current_entry):
-					current_url = current_entry[current_index].get('url', '')
-
-					# Check if the URL itself suggests PDF
-					if self._check_url_for_pdf(current_url):
-						return True
-
-			# Note: CDP doesn't easily expose response headers for completed navigations
-			# For more complex cases, we'd need to set up Network.responseReceived listeners
-			# before navigation, but that's overkill for most PDF detection cases
-
-			return False
-
-		except Exception as e:
-			self.logger.debug(f'[DownloadsWatchdog] Network headers check failed (non-critical): {e}')
-			return False
-
 	async def trigger_pdf_download(self, target_id: TargetID) -> str | None:
 		"""Trigger download of a PDF from Chrome's PDF viewer.
 
@@ -813,15 +763,8 @@ class DownloadsWatchdog(BaseWatchdog):
 			# Generate unique filename if file exists from previous run
 			downloads_dir = str(self.browser_session.browser_profile.downloads_path)
 			os.makedirs(downloads_dir, exist_ok=True)
-			final_filename = pdf_filename
-			existing_files = os.listdir(downloads_dir)
-			if pdf_filename in existing_files:
-				# Generate unique name with (1), (2), etc.
-				base, ext = os.path.splitext(pdf_filename)
-				counter = 1
-				while f'{base} ({counter}){ext}' in existing_files:
-					counter += 1
-				final_filename = f'{base} ({counter}){ext}'
+			final_filename = self._get_unique_filename(downloads_dir, pdf_filename)
+			if final_filename != pdf_filename:
 				self.logger.debug(f'[DownloadsWatchdog] File exists, using: {final_filename}')
 
 			self.logger.debug(f'[DownloadsWatchdog] Starting PDF download from: {pdf_url[:100]}...')
@@ -934,15 +877,26 @@ class DownloadsWatchdog(BaseWatchdog):
 			self.logger.error(f'[DownloadsWatchdog] Error in PDF download: {type(e).__name__}: {e}')
 			return None
 
-	@staticmethod
-	async def _get_unique_filename(directory: str, filename: str) -> str:
-		"""Generate a unique filename for downloads by appending (1), (2), etc., if a file already exists."""
+	def _get_unique_filename(self, directory: str, filename: str) -> str:
+		"""Generate a unique filename for downloads by appending (1), (2), etc., if a file already exists.
+
+		Names in the in-memory index of the downloads dir are skipped without touching the disk, and the returned name is
+		reserved in it. The disk is still checked for the final candidate, as other processes may write to the directory.
+		"""
+		directory_path = Path(directory).expanduser().resolve()
+		if directory_path == self._get_downloads_dir():
+			existing_filenames = self._get_download_filenames()
+		else:
+			existing_filenames = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
 		base, ext = os.path.splitext(filename)
 		counter = 1
 		new_filename = filename
-		while os.path.exists(os.path.join(directory, new_filename)):
+		while new_filename in existing_filenames or os.path.lexists(directory_path / new_filename):
+			existing_filenames.add(new_filename)
 			new_filename = f'{base} ({counter}){ext}'
 			counter += 1
+		existing_filenames.add(new_filename)
 		return new_filename
 
 
@@ -0,0 +1,266 @@
+"""Fast render watchdog for disabling animations, transitions and smooth scrolling in every tab."""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from bubus import BaseEvent
+from pydantic import BaseModel, Field, PrivateAttr
+
+from browser_use.browser.events import BrowserConnectedEvent, BrowserStopEvent, NavigationCompleteEvent, TabCreatedEvent
+from browser_use.browser.watchdog_base import BaseWatchdog
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+# Speeds up the Web Animations the stylesheet can't reach (element.animate() and friends)
+ANIMATION_PLAYBACK_RATE = 100
+
+# A page is visually stable when nothing moved, animated or changed in the DOM during the last STABILITY_WINDOW_MS
+STABILITY_WINDOW_MS = 250
+MAX_STABLE_LAYOUT_SHIFT = 0.01
+MAX_STABLE_MUTATIONS = 5
+STABILITY_TIMEOUT_SECONDS = 1.0
+STABILITY_POLL_SECONDS = 0.1
+# Pages that kept changing are remembered by URL, the least recently seen are forgotten beyond this many
+MAX_UNSTABLE_URLS = 1000
+
+# 1ms instead of 0s: a transition without duration never starts, so pages waiting for its transitionend would hang
+FAST_RENDER_CSS = """
+*, *::before, *::after {
+	animation-duration: 0.001s !important;
+	animation-delay: 0s !important;
+	animation-iteration-count: 1 !important;
+	transition-duration: 0.001s !important;
+	transition-delay: 0s !important;
+	scroll-behavior: auto !important;
+}
+"""
+
+# Runs in every document before the page's own scripts
+FAST_RENDER_SCRIPT = """
+(() => {
+	if (window.__browserUseFastRender) return;
+	const state = window.__browserUseFastRender = {layoutShifts: [], mutations: []};
+
+	const addStyle = () => {
+		const style = document.createElement('style');
+		style.id = 'browser-use-fast-render';
+		style.textContent = %s;
+		(document.head || document.documentElement).appendChild(style);
+		new MutationObserver(records => {
+			const now = performance.now();
+			for (let i = 0; i < records.length; i++) state.mutations.push(now);
+			if (state.mutations.length > 100) state.mutations = state.mutations.slice(-50);
+		}).observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+	};
+	if (document.documentElement) {
+		addStyle();
+	} else {
+		new MutationObserver((_, observer) => {
+			if (!document.documentElement) return;
+			observer.disconnect();
+			addStyle();
+		}).observe(document, {childList: true});
+	}
+
+	// scroll-behavior only covers CSS, scripts ask for smooth scrolling per call
+	const instant = original => function (...args) {
+		if (args[0] && typeof args[0] === 'object') args[0] = {...args[0], behavior: 'instant'};
+		return original.apply(this, args);
+	};
+	for (const target of [window, Element.prototype]) {
+		for (const name of ['scroll', 'scrollTo', 'scrollBy']) {
+			if (typeof target[name] === 'function') target[name] = instant(target[name]);
+		}
+	}
+	Element.prototype.scrollIntoView = instant(Element.prototype.scrollIntoView);
+
+	try {
+		new PerformanceObserver(list => {
+			for (const entry of list.getEntries()) {
+				if (!entry.hadRecentInput) state.layoutShifts.push([entry.startTime, entry.value]);
+			}
+			if (state.layoutShifts.length > 100) state.layoutShifts = state.layoutShifts.slice(-50);
+		}).observe({type: 'layout-shift', buffered: true});
+	} catch (e) {}
+})();
+""" % json.dumps(FAST_RENDER_CSS.strip())
+
+STABILITY_SCRIPT = (
+	"""
+(() => {
+	const state = window.__browserUseFastRender;
+	const since = performance.now() - %d;
+	return {
+		layout_shift: state ? state.layoutShifts.filter(([time]) => time >= since).reduce((sum, [, value]) => sum + value, 0) : 0,
+		running_animations: document.getAnimations().filter(animation => animation.playState === 'running').length,
+		recent_mutations: state ? state.mutations.filter(time => time >= since).length : 0,
+	};
+})()
+"""
+	% STABILITY_WINDOW_MS
+)
+
+
+class VisualStability(BaseModel):
+	"""What changed on a page during the last STABILITY_WINDOW_MS"""
+
+	layout_shift: float = 0.0  # sum of the layout shift scores, like Cumulative Layout Shift
+	running_animations: int = 0
+	recent_mutations: int = 0
+
+	@property
+	def is_stable(self) -> bool:
+		return (
+			self.layout_shift < MAX_STABLE_LAYOUT_SHIFT
+			and self.running_animations == 0
+			and self.recent_mutations < MAX_STABLE_MUTATIONS
+		)
+
+
+class FastRenderWatchdog(BaseWatchdog):
+	"""Makes pages render their final state right away for BrowserProfile.fast_render.
+
+	Every tab gets a stylesheet that cuts CSS animations and transitions to 1ms, prefers-reduced-motion emulation,
+	instant script scrolling and a fast Web Animations playback rate. With BrowserProfile.virtual_time_budget the page
+	timers are fast-forwarded after each load. Pages that keep changing anyway are remembered by URL, so the stability
+	wait before capturing their state is only paid once.
+	"""
+
+	# Event contracts
+	LISTENS_TO: ClassVar[list[type[BaseEvent[Any]]]] = [
+		BrowserConnectedEvent,
+		BrowserStopEvent,
+		TabCreatedEvent,
+		NavigationCompleteEvent,
+	]
+	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = []
+
+	unstable_urls: OrderedDict[str, None] = Field(default_factory=OrderedDict)  # used as an LRU set
+
+	# Private state
+	_enabled_session_ids: set[str] = PrivateAttr(default_factory=set)
+	_budget_expired: dict[str, asyncio.Future] = PrivateAttr(default_factory=dict)
+	_budgeted_pages: dict[str, str] = PrivateAttr(default_factory=dict)
+
+	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
+		"""Speed up rendering in the first tab."""
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=False)
+			await self._enable_fast_render(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[FastRenderWatchdog] Could not enable fast rendering: {e}')
+
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Speed up rendering in new tabs."""
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(event.target_id, focus=False)
+			await self._enable_fast_render(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[FastRenderWatchdog] Could not enable fast rendering in tab #{event.target_id[-4:]}: {e}')
+
+	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
+		"""Fast-forward the timers of a loaded page by the virtual time budget."""
+		budget = self.browser_session.browser_profile.virtual_time_budget
+		# Tab switches complete a navigation too, the page was fast-forwarded when it loaded
+		if not budget or event.error_message or self._budgeted_pages.get(event.target_id) == event.url:
+			return
+		self._budgeted_pages[event.target_id] = event.url
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(event.target_id, focus=False)
+			await self._run_virtual_time_budget(cdp_session, budget)
+		except Exception as e:
+			self.logger.debug(f'[FastRenderWatchdog] Could not fast-forward tab #{event.target_id[-4:]}: {type(e).__name__}: {e}')
+
+	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
+		"""Forget the sessions, they end with the browser."""
+		self._enabled_session_ids.clear()
+		self._budgeted_pages.clear()
+		for future in self._budget_expired.values():
+			future.cancel()
+		self._budget_expired.clear()
+
+	async def _enable_fast_render(self, cdp_session: 'CDPSession') -> None:
+		if cdp_session.session_id in self._enabled_session_ids:
+			return
+		self._enabled_session_ids.add(cdp_session.session_id)
+
+		cdp_client = cdp_session.cdp_client
+		session_id = cdp_session.session_id
+		cdp_client.register.Emulation.virtualTimeBudgetExpired(self._on_virtual_time_budget_expired)
+		await asyncio.gather(
+			cdp_client.send.Page.addScriptToEvaluateOnNewDocument(
+				params={'source': FAST_RENDER_SCRIPT, 'runImmediately': True}, session_id=session_id
+			),
+			cdp_client.send.Emulation.setEmulatedMedia(
+				params={'features': [{'name': 'prefers-reduced-motion', 'value': 'reduce'}]}, session_id=session_id
+			),
+			cdp_client.send.Animation.enable(session_id=session_id),
+		)
+		await cdp_client.send.Animation.setPlaybackRate(params={'playbackRate': ANIMATION_PLAYBACK_RATE}, session_id=session_id)
+		self.logger.debug(f'[FastRenderWatchdog] ⚡ Fast rendering enabled in tab #{cdp_session.target_id[-4:]}')
+
+	async def _run_virtual_time_budget(self, cdp_session: 'CDPSession', budget: float) -> None:
+		"""Let virtual time run ahead of the wall clock until the page's timers used up the budget."""
+		session_id = cdp_session.session_id
+		expired = asyncio.get_running_loop().create_future()
+		self._budget_expired[session_id] = expired
+		start_time = time.monotonic()
+		try:
+			await cdp_session.cdp_client.send.Emulation.setVirtualTimePolicy(
+				params={'policy': 'pauseIfNetworkFetchesPending', 'budget': budget * 1000}, session_id=session_id
+			)
+			# Network fetches pause virtual time, give them the budget in real time too
+			await asyncio.wait_for(expired, timeout=max(budget, STABILITY_TIMEOUT_SECONDS))
+			self.logger.debug(
+				f'[FastRenderWatchdog] ⏩ Fast-forwarded tab #{cdp_session.target_id[-4:]} by {budget}s '
+				f'in {time.monotonic() - start_time:.2f}s'
+			)
+		except TimeoutError:
+			self.logger.debug(f'[FastRenderWatchdog] Virtual time budget of {budget}s did not run out in time')
+		finally:
+			self._budget_expired.pop(session_id, None)
+			# Virtual time stays paused once the budget ran out, keep the page running
+			await cdp_session.cdp_client.send.Emulation.setVirtualTimePolicy(params={'policy': 'advance'}, session_id=session_id)
+
+	def _on_virtual_time_budget_expired(self, event: Any, session_id: str | None) -> None:
+		expired = self._budget_expired.get(session_id or '')
+		if expired and not expired.done():
+			expired.set_result(None)
+
+	async def get_visual_stability(self, cdp_session: 'CDPSession | None' = None) -> VisualStability:
+		"""What changed on the page of a CDP session (default: the focused tab) during the last STABILITY_WINDOW_MS."""
+		cdp_session = cdp_session or await self.browser_session.get_or_create_cdp_session()
+		result = await cdp_session.cdp_client.send.Runtime.evaluate(
+			params={'expression': STABILITY_SCRIPT, 'returnByValue': True}, session_id=cdp_session.session_id
+		)
+		return VisualStability(**result['result'].get('value', {}))
+
+	async def wait_for_visual_stability(self, timeout: float = STABILITY_TIMEOUT_SECONDS) -> bool:
+		"""Wait until the focused page stops changing, or return False for pages that keep changing."""
+		url = await self.browser_session.get_current_page_url()
+		if url in self.unstable_urls:
+			self.unstable_urls.move_to_end(url)
+			return False
+
+		deadline = time.monotonic() + timeout
+		while True:
+			stability = await self.get_visual_stability()
+			if stability.is_stable:
+				return True
+			if time.monotonic() >= deadline:
+				break
+			await asyncio.sleep(STABILITY_POLL_SECONDS)
+
+		self.unstable_urls[url] = None
+		if len(self.unstable_urls) > MAX_UNSTABLE_URLS:
+			self.unstable_urls.popitem(last=False)
+		self.logger.info(
+			f'[FastRenderWatchdog] 🌀 Page keeps changing after {timeout}s (layout shift {stability.layout_shift:.3f}, '
+			f'{stability.running_animations} animations, {stability.recent_mutations} DOM changes in {STABILITY_WINDOW_MS}ms), '
+			f'not waiting for it to settle again: {url}'
+		)
+		return False
@@ -0,0 +1,465 @@
+"""HAR recorder watchdog for recording the network traffic of a session into a HAR file and replaying it offline."""
+
+import asyncio
+import base64
+import hashlib
+import json
+import mimetypes
+from datetime import UTC, datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
+from urllib.parse import parse_qsl, urldefrag, urlparse
+
+from bubus import BaseEvent
+from cdp_use.cdp.fetch.events import RequestPausedEvent
+from cdp_use.cdp.network.events import LoadingFailedEvent, LoadingFinishedEvent, RequestWillBeSentEvent, ResponseReceivedEvent
+from cdp_use.cdp.network.types import Response
+from pydantic import PrivateAttr
+
+from browser_use.browser.events import BrowserConnectedEvent, BrowserStopEvent, TabCreatedEvent
+from browser_use.browser.profile import RecordHarContent, RecordHarMode
+from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.utils import get_browser_use_version
+
+if TYPE_CHECKING:
+	from cdp_use import CDPClient
+
+	from browser_use.browser.session import CDPSession
+
+# Headers that describe how the recorded body was transferred, the replayed body is the decoded one
+REPLAY_SKIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+# Response bodies the browser no longer has when they are fetched after loadingFinished are left out of the HAR
+BODY_TIMEOUT_SECONDS = 10.0
+
+
+def _har_headers(headers: dict[str, Any]) -> list[dict[str, str]]:
+	# CDP joins repeated headers (e.g. Set-Cookie) with newlines
+	return [{'name': name, 'value': value} for name, values in headers.items() for value in str(values).split('\n')]
+
+
+def _header(headers: list[dict[str, str]], name: str) -> str:
+	return next((header['value'] for header in headers if header['name'].lower() == name), '')
+
+
+def _ms(seconds: float) -> float:
+	return round(seconds * 1000, 3)
+
+
+class HarRecorderWatchdog(BaseWatchdog):
+	"""Records requests into BrowserProfile.record_har_path and answers requests from BrowserProfile.replay_har_path.
+
+	Recording listens to the Network domain events of every tab. Replaying pauses every request through the Fetch domain
+	and fulfills it with the recorded response, so replayed pages load at full speed, without network access and with
+	the same responses every run. Requests are matched by method and URL (and the POST body where it differs), repeated
+	requests get the recorded responses in order.
+	"""
+
+	# Event contracts
+	LISTENS_TO: ClassVar[list[type[BaseEvent[Any]]]] = [
+		BrowserConnectedEvent,
+		BrowserStopEvent,
+		TabCreatedEvent,
+	]
+	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = []
+
+	replayed_requests: int = 0
+	not_found_requests: int = 0
+
+	# Private state for recording
+	_recording: bool = PrivateAttr(default=False)
+	_recorded_session_ids: set[str] = PrivateAttr(default_factory=set)
+	_entries: list[dict[str, Any]] = PrivateAttr(default_factory=list)
+	# (CDP session id, request id) -> entry of a request that has not finished loading and its start timestamp
+	_pending: dict[tuple[str | None, str], tuple[dict[str, Any], float]] = PrivateAttr(default_factory=dict)
+	_body_tasks: set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+	# Private state for replaying
+	_replaying: bool = PrivateAttr(default=False)
+	_replayed_session_ids: set[str] = PrivateAttr(default_factory=set)
+	_replay_entries: dict[tuple[str, str], list[dict[str, Any]]] = PrivateAttr(default_factory=dict)
+	_replay_counts: dict[tuple[str, str], int] = PrivateAttr(default_factory=dict)
+	_replay_files: dict[str, bytes] = PrivateAttr(default_factory=dict)
+	_pending_tasks: set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
+		"""Load the HAR to replay and start recording and replaying in the first tab."""
+		profile = self.browser_session.browser_profile
+
+		if profile.replay_har_path:
+			har = await asyncio.to_thread(self._load_har, Path(profile.replay_har_path))
+			self._index_replay_entries(har)
+			self._replaying = True
+			self.logger.debug(
+				f'[HarRecorderWatchdog] 🎞️ Replaying {sum(len(entries) for entries in self._replay_entries.values())} '
+				f'responses from {profile.replay_har_path}'
+			)
+
+		self._recording = bool(profile.record_har_path)
+
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=False)
+			await self._attach(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[HarRecorderWatchdog] Could not attach to the first tab: {e}')
+
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Record and replay the requests of new tabs."""
+		if not (self._recording or self._replaying):
+			return
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(event.target_id, focus=False)
+			await self._attach(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[HarRecorderWatchdog] Could not attach to tab #{event.target_id[-4:]}: {e}')
+
+	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
+		"""Write the recorded HAR, the CDP sessions end with the browser."""
+		if self._recording:
+			try:
+				await self.save_har()
+			except Exception as e:
+				self.logger.error(
+					f'[HarRecorderWatchdog] ❌ Failed to save HAR to {self.browser_session.browser_profile.record_har_path}: {e}'
+				)
+		self._recording = self._replaying = False
+		self._recorded_session_ids.clear()
+		self._replayed_session_ids.clear()
+
+	async def _attach(self, cdp_session: 'CDPSession') -> None:
+		if self._recording and cdp_session.session_id not in self._recorded_session_ids:
+			self._recorded_session_ids.add(cdp_session.session_id)
+			await self._enable_recording(cdp_session)
+		if self._replaying and cdp_session.session_id not in self._replayed_session_ids:
+			self._replayed_session_ids.add(cdp_session.session_id)
+			await self._enable_replay(cdp_session)
+
+	# region - Recording
+
+	async def _enable_recording(self, cdp_session: 'CDPSession') -> None:
+		"""Listen to the request lifecycle events of a CDP session."""
+		cdp_client = cdp_session.cdp_client
+		cdp_client.register.Network.requestWillBeSent(self._on_request_will_be_sent)
+		cdp_client.register.Network.responseReceived(self._on_response_received)
+		cdp_client.register.Network.loadingFinished(
+			lambda event, session_id: self._on_loading_finished(cdp_client, event, session_id)  # type: ignore[arg-type]
+		)
+		cdp_client.register.Network.loadingFailed(self._on_loading_failed)
+		await cdp_client.send.Network.enable(session_id=cdp_session.session_id)
+
+	def _on_request_will_be_sent(self, event: RequestWillBeSentEvent, session_id: str | None) -> None:
+		key = (session_id, event['requestId'])
+
+		# A redirect reuses the request id, the redirect response ends the entry of the previous request
+		if redirect_response := event.get('redirectResponse'):
+			if key in self._pending:
+				entry, started = self._pending.pop(key)
+				self._set_response(entry, redirect_response)
+				entry['time'] = _ms(event['timestamp'] - started)
+
+		request = event['request']
+		url = urldefrag(request['url']).url
+		url_filter = self.browser_session.browser_profile.record_har_url_filter
+		if not url.startswith(('http:', 'https:')) or (url_filter and not fnmatch(url, url_filter)):
+			return
+
+		headers = _har_headers(request.get('headers', {}))
+		entry: dict[str, Any] = {
+			'startedDateTime': datetime.fromtimestamp(event['wallTime'], UTC).isoformat().replace('+00:00', 'Z'),
+			'time': 0,
+			'request': {
+				'method': request['method'],
+				'url': url,
+				'httpVersion': 'HTTP/1.1',
+				'headers': headers,
+				'queryString': [
+					{'name': name, 'value': value} for name, value in parse_qsl(urlparse(url).query, keep_blank_values=True)
+				],
+				'cookies': [],
+				'headersSize': -1,
+				'bodySize': 0,
+			},
+			'response': None,
+			'cache': {},
+			'timings': {'send': 0, 'wait': 0, 'receive': 0},
+			'_resourceType': event.get('type', 'Other'),
+		}
+		post_data = request.get('postData')
+		if post_data is None and request.get('postDataEntries'):
+			post_data = b''.join(base64.b64decode(part.get('bytes', '')) for part in request['postDataEntries']).decode(
+				errors='replace'
+			)
+		if post_data is not None:
+			entry['request']['postData'] = {'mimeType': _header(headers, 'content-type'), 'text': post_data}
+			entry['request']['bodySize'] = len(post_data.encode())
+
+		self._entries.append(entry)
+		self._pending[key] = (entry, event['timestamp'])
+
+	def _on_response_received(self, event: ResponseReceivedEvent, session_id: str | None) -> None:
+		pending = self._pending.get((session_id, event['requestId']))
+		if pending:
+			self._set_response(pending[0], event['response'])
+
+	def _set_response(self, entry: dict[str, Any], response: Response) -> None:
+		headers = _har_headers(response.get('headers', {}))
+		entry['response'] = {
+			'status': response['status'],
+			'statusText': response.get('statusText', ''),
+			'httpVersion': (response.get('protocol') or 'http/1.1').upper(),
+			'headers': headers,
+			'cookies': [],
+			'content': {'size': 0, 'mimeType': response.get('mimeType', '')},
+			'redirectURL': _header(headers, 'location'),
+			'headersSize': -1,
+			'bodySize': int(response.get('encodedDataLength', -1)),
+		}
+		if remote_ip := response.get('remoteIPAddress'):
+			entry['serverIPAddress'] = remote_ip
+
+		if timing := response.get('timing'):
+			entry['timings'] = {
+				'blocked': -1,
+				'dns': _ms((timing['dnsEnd'] - timing['dnsStart']) / 1000) if timing['dnsStart'] >= 0 else -1,
+				'connect': _ms((timing['connectEnd'] - timing['connectStart']) / 1000) if timing['connectStart'] >= 0 else -1,
+				'ssl': _ms((timing['sslEnd'] - timing['sslStart']) / 1000) if timing['sslStart'] >= 0 else -1,
+				'send': max(timing['sendEnd'] - timing['sendStart'], 0),
+				'wait': max(timing['receiveHeadersEnd'] - timing['sendEnd'], 0),
+				'receive': 0,
+			}
+			entry['_responseTimestamp'] = timing['requestTime'] + timing['receiveHeadersEnd'] / 1000
+
+	def _on_loading_finished(self, cdp_client: 'CDPClient', event: LoadingFinishedEvent, session_id: str | None) -> None:
+		pending = self._pending.pop((session_id, event['requestId']), None)
+		if not pending:
+			return
+		entry, started = pending
+		entry['time'] = _ms(event['timestamp'] - started)
+		if entry['response'] is None:
+			return
+		entry['response']['bodySize'] = int(event.get('encodedDataLength', -1))
+		if response_timestamp := entry.pop('_responseTimestamp', None):
+			entry['timings']['receive'] = max(_ms(event['timestamp'] - response_timestamp), 0)
+
+		# The body has to be fetched now, the browser drops it once the page navigates away
+		if self._content_mode != RecordHarContent.OMIT and entry['response']['status'] not in (204, 304):
+			task = asyncio.create_task(self._record_body(cdp_client, event['requestId'], session_id, entry))
+			self._body_tasks.add(task)
+			task.add_done_callback(self._body_tasks.discard)
+
+	def _on_loading_failed(self, event: LoadingFailedEvent, session_id: str | None) -> None:
+		pending = self._pending.pop((session_id, event['requestId']), None)
+		if not pending:
+			return
+		entry, started = pending
+		entry['time'] = _ms(event['timestamp'] - started)
+		if entry['response'] is None:
+			entry['response'] = {
+				'status': 0,
+				'statusText': '',
+				'httpVersion': '',
+				'headers': [],
+				'cookies': [],
+				'content': {'size': 0, 'mimeType': ''},
+				'redirectURL': '',
+				'headersSize': -1,
+				'bodySize': -1,
+			}
+		entry['response']['_failureText'] = event.get('errorText', '')
+
+	@property
+	def _content_mode(self) -> RecordHarContent:
+		profile = self.browser_session.browser_profile
+		return RecordHarContent.OMIT if profile.record_har_omit_content else RecordHarContent(profile.record_har_content)
+
+	async def _record_body(self, cdp_client: 'CDPClient', request_id: str, session_id: str | None, entry: dict[str, Any]) -> None:
+		try:
+			result = await asyncio.wait_for(
+				cdp_client.send.Network.getResponseBody(params={'requestId': request_id}, session_id=session_id),
+				BODY_TIMEOUT_SECONDS,
+			)
+		except Exception as e:
+			self.logger.debug(f'[HarRecorderWatchdog] No body recorded for {entry["request"]["url"]}: {type(e).__name__}: {e}')
+			return
+
+		body = base64.b64decode(result['body']) if result['base64Encoded'] else result['body'].encode()
+		content = entry['response']['content']
+		content['size'] = len(body)
+		if self._content_mode == RecordHarContent.ATTACH:
+			content['_file'] = await asyncio.to_thread(self._write_attachment, body, content['mimeType'])
+		elif result['base64Encoded']:
+			content['text'] = result['body']
+			content['encoding'] = 'base64'
+		else:
+			content['text'] = result['body']
+
+	def _write_attachment(self, body: bytes, mime_type: str) -> str:
+		"""Write a response body next to the HAR, named by its hash so repeated bodies are stored once."""
+		har_path = Path(self.browser_session.browser_profile.record_har_path or '')
+		resources_dir = har_path.parent / f'{har_path.stem}-resources'
+		resources_dir.mkdir(parents=True, exist_ok=True)
+		extension = mimetypes.guess_extension(mime_type.split(';')[0].strip()) or '.bin'
+		file_name = f'{hashlib.sha1(body).hexdigest()}{extension}'
+		if not (resources_dir / file_name).exists():
+			(resources_dir / file_name).write_bytes(body)
+		return f'{resources_dir.name}/{file_name}'
+
+	def get_har(self) -> dict[str, Any]:
+		"""The requests recorded so far as a HAR log, requests still loading are left out."""
+		minimal = self.browser_session.browser_profile.record_har_mode == RecordHarMode.MINIMAL
+		entries = []
+		for entry in self._entries:
+			if entry['response'] is None:
+				continue
+			entry = {key: value for key, value in entry.items() if key != '_responseTimestamp'}
+			if minimal:
+				# Only what replaying needs, like Playwright's minimal mode
+				entry = {key: value for key, value in entry.items() if key not in ('serverIPAddress', '_resourceType')}
+				entry['time'] = 0
+				entry['timings'] = {'send': 0, 'wait': 0, 'receive': 0}
+			entries.append(entry)
+		return {
+			'log': {
+				'version': '1.2',
+				'creator': {'name': 'browser-use', 'version': get_browser_use_version()},
+				'pages': [],
+				'entries': entries,
+			}
+		}
+
+	async def save_har(self, path: str | Path | None = None) -> Path:
+		"""Write the recorded requests to path (default: BrowserProfile.record_har_path) once their bodies are recorded."""
+		har_path = path or self.browser_session.browser_profile.record_har_path
+		assert har_path, 'No path to save the HAR to, set BrowserProfile.record_har_path'
+		if self._body_tasks:
+			await asyncio.wait(list(self._body_tasks), timeout=BODY_TIMEOUT_SECONDS)
+		har = self.get_har()
+
+		def write() -> Path:
+			path = Path(har_path).expanduser()
+			path.parent.mkdir(parents=True, exist_ok=True)
+			temp_path = path.with_name(f'{path.name}.tmp')
+			temp_path.write_text(json.dumps(har, ensure_ascii=False))
+			temp_path.replace(path)
+			return path
+
+		saved_path = await asyncio.to_thread(write)
+		self.logger.info(f'[HarRecorderWatchdog] 🎞️ Saved HAR with {len(har["log"]["entries"])} requests to {saved_path}')
+		return saved_path
+
+	# endregion
+
+	# region - Replaying
+
+	@staticmethod
+	def _load_har(path: Path) -> dict[str, Any]:
+		har = json.loads(path.expanduser().read_text())
+		# Attached bodies are read relative to the HAR file
+		har['_directory'] = str(path.expanduser().resolve().parent)
+		return har
+
+	def _index_replay_entries(self, har: dict[str, Any]) -> None:
+		self._replay_entries.clear()
+		self._replay_counts.clear()
+		self._replay_files.clear()
+		for entry in har['log']['entries']:
+			if not entry.get('response'):
+				continue
+			entry['_directory'] = har['_directory']
+			key = (entry['request']['method'], urldefrag(entry['request']['url']).url)
+			self._replay_entries.setdefault(key, []).append(entry)
+
+	async def _enable_replay(self, cdp_session: 'CDPSession') -> None:
+		"""Pause every request of a CDP session to answer it from the HAR."""
+		cdp_client = cdp_session.cdp_client
+		# The only requestPaused handler of the client, it also applies BrowserProfile.resource_blocking
+		cdp_client.register.Fetch.requestPaused(
+			lambda event, session_id: self._on_request_paused(cdp_client, event, session_id)  # type: ignore[arg-type]
+		)
+		await cdp_client.send.Fetch.enable(
+			params={
+				'patterns': [{'urlPattern': '*'}],
+				'handleAuthRequests': self.browser_session._fetch_handles_proxy_auth(cdp_client),
+			},
+			session_id=cdp_session.session_id,
+		)
+
+	def find_entry(self, method: str, url: str, post_data: str | None = None) -> dict[str, Any] | None:
+		"""The recorded entry to answer a request with, repeated requests get the recorded responses in order."""
+		key = (method, urldefrag(url).url)
+		candidates = self._replay_entries.get(key)
+		if not candidates:
+			return None
+		matching_body = [entry for entry in candidates if entry['request'].get('postData', {}).get('text') == post_data]
+		if matching_body and len(matching_body) < len(candidates):
+			candidates = matching_body
+			key = (*key, post_data or '')  # type: ignore[assignment]
+		index = self._replay_counts.get(key, 0)
+		self._replay_counts[key] = index + 1
+		# Requests repeated more often than recorded keep getting the last response
+		return candidates[min(index, len(candidates) - 1)]
+
+	def _on_request_paused(self, cdp_client: 'CDPClient', event: RequestPausedEvent, session_id: str | None) -> None:
+		task = asyncio.create_task(self._handle_request_paused(cdp_client, event, session_id))
+		self._pending_tasks.add(task)
+		task.add_done_callback(self._pending_tasks.discard)
+
+	async def _handle_request_paused(self, cdp_client: 'CDPClient', event: RequestPausedEvent, session_id: str | None) -> None:
+		"""Answer a paused request with its recorded response."""
+		request_id = event['requestId']
+		request = event['request']
+		try:
+			blocking_watchdog = self.browser_session._resource_blocking_watchdog
+			if blocking_watchdog and blocking_watchdog.is_blocked(request['url'], event.get('resourceType', 'Other')):
+				await blocking_watchdog.block_request(cdp_client, event, session_id)
+				return
+
+			entry = self.find_entry(request['method'], request['url'], request.get('postData'))
+			if entry is None:
+				self.not_found_requests += 1
+				if self.browser_session.browser_profile.replay_har_not_found == 'fallback':
+					await cdp_client.send.Fetch.continueRequest(params={'requestId': request_id}, session_id=session_id)
+				else:
+					self.logger.debug(f'[HarRecorderWatchdog] No recorded response for {request["method"]} {request["url"]}')
+					await cdp_client.send.Fetch.failRequest(
+						params={'requestId': request_id, 'errorReason': 'InternetDisconnected'}, session_id=session_id
+					)
+				return
+
+			self.replayed_requests += 1
+			response = entry['response']
+			if not response['status']:
+				# The request failed when it was recorded
+				await cdp_client.send.Fetch.failRequest(
+					params={'requestId': request_id, 'errorReason': 'Failed'}, session_id=session_id
+				)
+				return
+
+			body = await self._get_recorded_body(entry)
+			params: dict[str, Any] = {
+				'requestId': request_id,
+				'responseCode': response['status'],
+				'responseHeaders': [
+					header for header in response['headers'] if header['name'].lower() not in REPLAY_SKIPPED_HEADERS
+				],
+				'body': base64.b64encode(body).decode(),
+			}
+			if response.get('statusText'):
+				params['responsePhrase'] = response['statusText']
+			await cdp_client.send.Fetch.fulfillRequest(params=params, session_id=session_id)  # type: ignore[arg-type]
+		except Exception as e:
+			# The request is gone when its tab was closed or navigated away meanwhile
+			self.logger.debug(f'[HarRecorderWatchdog] Could not answer paused request {request_id}: {type(e).__name__}: {e}')
+
+	async def _get_recorded_body(self, entry: dict[str, Any]) -> bytes:
+		content = entry['response'].get('content', {})
+		if file_name := content.get('_file'):
+			file_path = str(Path(entry['_directory']) / file_name)
+			if file_path not in self._replay_files:
+				self._replay_files[file_path] = await asyncio.to_thread(Path(file_path).read_bytes)
+			return self._replay_files[file_path]
+		text = content.get('text', '')
+		return base64.b64decode(text) if content.get('encoding') == 'base64' else text.encode()
+
+	# endregion
@@ -2,6 +2,7 @@
 
 import asyncio
 import os
+import re
 import shutil
 import tempfile
 from pathlib import Path
@@ -23,6 +24,9 @@ from browser_use.observability import observe_debug
 if TYPE_CHECKING:
 	pass
 
+# Printed on stderr by Chromium once its CDP server listens, e.g. DevTools listening on ws://127.0.0.1:39123/devtools/browser/<id>
+DEVTOOLS_URL_PATTERN = re.compile(r'DevTools listening on (ws://\S+)')
+
 
 class LocalBrowserWatchdog(BaseWatchdog):
 	"""Manages local browser subprocess lifecycle."""
@@ -42,6 +46,8 @@ class LocalBrowserWatchdog(BaseWatchdog):
 	_owns_browser_resources: bool = PrivateAttr(default=True)
 	_temp_dirs_to_cleanup: list[Path] = PrivateAttr(default_factory=list)
 	_original_user_data_dir: str | None = PrivateAttr(default=None)
+	_template_copy_dir: Path | None = PrivateAttr(default=None)
+	_output_drain_task: asyncio.Task | None = PrivateAttr(default=None)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='browser_launch_event')
 	async def on_BrowserLaunchEvent(self, event: BrowserLaunchEvent) -> BrowserLaunchResult:
@@ -68,10 +74,17 @@ class LocalBrowserWatchdog(BaseWatchdog):
 			await self._cleanup_process(self._subprocess)
 			self._subprocess = None
 
+		if self._output_drain_task:
+			self._output_drain_task.cancel()
+			self._output_drain_task = None
+
 		# Clean up temp directories if any were created
 		for temp_dir in self._temp_dirs_to_cleanup:
 			self._cleanup_temp_dir(temp_dir)
 		self._temp_dirs_to_cleanup.clear()
+		if self._template_copy_dir:
+			self._cleanup_temp_dir(self._template_copy_dir)
+			self._template_copy_dir = None
 
 		# Restore original user_data_dir if it was modified
 		if self._original_user_data_dir is not None:
@@ -101,16 +114,23 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		self._original_user_data_dir = str(profile.user_data_dir) if profile.user_data_dir else None
 		self._temp_dirs_to_cleanup = []
 
+		# Start from a copy of the profile template instead of an empty profile
+		if profile.user_data_dir_template:
+			self._template_copy_dir = await asyncio.to_thread(self._copy_profile_template, Path(profile.user_data_dir_template))
+			profile.user_data_dir = str(self._template_copy_dir)
+			self.logger.debug(
+				f'[LocalBrowserWatchdog] 📋 Copied profile template {profile.user_data_dir_template} to user_data_dir= {self._template_copy_dir}'
+			)
+
 		for attempt in range(max_retries):
 			try:
-				# Get launch args from profile
-				launch_args = profile.get_args()
+				# Get launch args from profile, off the event loop as the first launch on a machine downloads the extensions
+				launch_args = await asyncio.to_thread(profile.get_args)
 
-				# Add debugging port
-				debug_port = self._find_free_port()
+				# Let the browser pick a free debugging port, it prints the DevTools URL on stderr once it listens
 				launch_args.extend(
 					[
-						f'--remote-debugging-port={debug_port}',
+						'--remote-debugging-port=0',
 					]
 				)
 				assert '--user-data-dir' in str(launch_args), (
@@ -141,18 +161,28 @@ class LocalBrowserWatchdog(BaseWatchdog):
 				subprocess = await asyncio.create_subprocess_exec(
 					browser_path,
 					*launch_args,
-					stdout=asyncio.subprocess.PIPE,
+					stdout=asyncio.subprocess.DEVNULL,
 					stderr=asyncio.subprocess.PIPE,
 				)
-				self.logger.debug(
-					f'[LocalBrowserWatchdog] 🎭 Browser running with browser_pid= {subprocess.pid} 🔗 listening on CDP port :{debug_port}'
-				)
+				assert subprocess.stderr is not None
 
 				# Convert to psutil.Process
 				process = psutil.Process(subprocess.pid)
 
 				# Wait for CDP to be ready and get the URL
-				cdp_url = await self._wait_for_cdp_url(debug_port)
+				try:
+					cdp_url = await self._read_devtools_url(subprocess.stderr)
+				except Exception:
+					if subprocess.returncode is None:
+						subprocess.kill()
+						await subprocess.wait()
+					raise
+				self.logger.debug(
+					f'[LocalBrowserWatchdog] 🎭 Browser running with browser_pid= {subprocess.pid} 🔗 listening on {cdp_url}'
+				)
+
+				# Keep reading stderr, the browser blocks once the pipe is full
+				self._output_drain_task = asyncio.create_task(self._drain_output(subprocess.stderr))
 
 				# Success! Clean up any temp dirs we created but didn't use
 				for tmp_dir in self._temp_dirs_to_cleanup:
@@ -167,7 +197,16 @@ class LocalBrowserWatchdog(BaseWatchdog):
 				error_str = str(e).lower()
 
 				# Check if this is a user_data_dir related error
-				if any(err in error_str for err in ['singletonlock', 'user data directory', 'cannot create', 'already in use']):
+				if any(
+					err in error_str
+					for err in [
+						'singletonlock',
+						'user data directory',
+						'cannot create',
+						'already in use',
+						'existing browser session',
+					]
+				):
 					self.logger.warning(f'Browser launch failed (attempt {attempt + 1}/{max_retries}): {e}')
 
 					if attempt < max_retries - 1:
@@ -189,11 +228,13 @@ class LocalBrowserWatchdog(BaseWatchdog):
 					profile.user_data_dir = self._original_user_data_dir
 
 				# Clean up any temp dirs we created
-				for tmp_dir in self._temp_dirs_to_cleanup:
+				for tmp_dir in [*self._temp_dirs_to_cleanup, self._template_copy_dir]:
 					try:
-						shutil.rmtree(tmp_dir, ignore_errors=True)
+						if tmp_dir:
+							shutil.rmtree(tmp_dir, ignore_errors=True)
 					except Exception:
 						pass
+				self._template_copy_dir = None
 
 				raise
 
@@ -344,38 +385,44 @@ class LocalBrowserWatchdog(BaseWatchdog):
 			raise RuntimeError(f'Error getting browser path: {e}')
 
 	@staticmethod
-	def _find_free_port() -> int:
-		"""Find a free port for the debugging interface."""
-		import socket
+	async def _read_devtools_url(stderr: asyncio.StreamReader, timeout: float = 30) -> str:
+		"""Wait for the browser to start and return the DevTools WebSocket URL it prints on stderr."""
+		output: list[str] = []
+
+		async def read_url() -> str:
+			while line := await stderr.readline():
+				text = line.decode(errors='replace').strip()
+				if match := DEVTOOLS_URL_PATTERN.search(text):
+					return match.group(1)
+				output.append(text)
+			# Keep the reason the browser exited, e.g. a locked user_data_dir, for the retry in _launch_browser
+			raise RuntimeError('Browser exited before its CDP server started: ' + ' '.join(output[-10:]))
 
-		with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-			s.bind(('127.0.0.1', 0))
-			s.listen(1)
-			port = s.getsockname()[1]
-		return port
+		try:
+			return await asyncio.wait_for(read_url(), timeout)
+		except TimeoutError:
+			raise TimeoutError(f'Browser did not start within {timeout} seconds') from None
 
 	@staticmethod
-	async def _wait_for_cdp_url(port: int, timeout: float = 30) -> str:
-		"""Wait for the browser to start and return the CDP URL."""
-		import aiohttp
-
-		start_time = asyncio.get_event_loop().time()
-
-		while asyncio.get_event_loop().time() - start_time < timeout:
-			try:
-				async with aiohttp.ClientSession() as session:
-					async with session.get(f'http://localhost:{port}/json/version') as resp:
-						if resp.status == 200:
-							# Chrome is ready
-							return f'http://localhost:{port}/'
-						else:
-							# Chrome is starting up and returning 502/500 errors
-							await asyncio.sleep(0.1)
-			except Exception:
-				# Connection error - Chrome might not be ready yet
-				await asyncio.sleep(0.1)
+	async def _drain_output(stream: asyncio.StreamReader) -> None:
+		"""Read and discard the browser output until it exits."""
+		while await stream.read(64 * 1024):
+			pass
 
-		raise TimeoutError(f'Browser did not start within {timeout} seconds')
+	@staticmethod
+	def _copy_profile_template(template: Path) -> Path:
+		"""Copy a profile template into a new temporary user data dir, without the locks of the browser that created it."""
+		if not template.is_dir():
+			raise FileNotFoundError(f'Profile template user_data_dir_template={template} does not exist')
+		copy_dir = Path(tempfile.mkdtemp(prefix='browseruse-tmp-profile-'))
+		shutil.copytree(
+			template,
+			copy_dir,
+			ignore=shutil.ignore_patterns('Singleton*', 'lockfile', 'DevToolsActivePort'),
+			dirs_exist_ok=True,
+			symlinks=True,
+		)
+		return copy_dir
 
 	@staticmethod
 	async def _cleanup_process(process: psutil.Process) -> None:
@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, ClassVar
 
 from bubus import BaseEvent
+from cdp_use.cdp.browser.commands import GrantPermissionsParameters
 
 from browser_use.browser.events import BrowserConnectedEvent
 from browser_use.browser.watchdog_base import BaseWatchdog
@@ -34,9 +35,10 @@ class PermissionsWatchdog(BaseWatchdog):
 			# Grant permissions using CDP Browser.grantPermissions
 			# origin=None means grant to all origins
 			# Browser domain commands don't use session_id
-			await self.browser_session.cdp_client.send.Browser.grantPermissions(
-				params={'permissions': permissions}  # type: ignore
-			)
+			params: GrantPermissionsParameters = {'permissions': permissions}  # type: ignore
+			if self.browser_session.browser_context_id:
+				params['browserContextId'] = self.browser_session.browser_context_id
+			await self.browser_session.cdp_client.send.Browser.grantPermissions(params=params)
 			self.logger.debug(f'✅ Successfully granted permissions: {permissions}')
 		except Exception as e:
 			self.logger.error(f'❌ Failed to grant permissions: {str(e)}')
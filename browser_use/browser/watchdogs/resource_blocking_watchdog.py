@@ -0,0 +1,216 @@
+"""Resource blocking watchdog for blocking or stubbing requests through the CDP Fetch domain."""
+
+import asyncio
+import base64
+import re
+from fnmatch import translate
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from bubus import BaseEvent
+from cdp_use.cdp.fetch.events import RequestPausedEvent
+from cdp_use.cdp.fetch.types import RequestPattern
+from pydantic import BaseModel, Field, PrivateAttr
+
+from browser_use.browser.domain_policy import DomainPolicy, is_root_domain
+from browser_use.browser.events import BrowserConnectedEvent, BrowserStopEvent, TabCreatedEvent
+from browser_use.browser.profile import ResourceBlockingRules
+from browser_use.browser.watchdog_base import BaseWatchdog
+
+if TYPE_CHECKING:
+	from cdp_use import CDPClient
+
+	from browser_use.browser.session import CDPSession
+
+# Rough median size of a single response per resource type on the web, the blocked responses are never loaded so the bytes
+# saved can only be estimated
+TYPICAL_RESPONSE_BYTES = {
+	'Image': 20_000,
+	'Media': 500_000,
+	'Font': 30_000,
+	'Script': 20_000,
+	'Stylesheet': 10_000,
+}
+DEFAULT_RESPONSE_BYTES = 5_000
+
+STUB_CONTENT_TYPES = {
+	'Script': 'application/javascript',
+	'Stylesheet': 'text/css',
+	'Document': 'text/html',
+	'XHR': 'application/json',
+	'Fetch': 'application/json',
+}
+
+
+class ResourceBlockingStats(BaseModel):
+	"""Counters of the requests blocked in a session"""
+
+	requests_blocked: int = 0  # failed with BlockedByClient
+	requests_stubbed: int = 0  # answered with an empty response
+	by_resource_type: dict[str, int] = Field(default_factory=dict)
+	estimated_bytes_saved: int = 0  # from typical response sizes per resource type
+
+
+def get_interception_patterns(rules: ResourceBlockingRules) -> list[RequestPattern]:
+	"""Fetch.enable patterns that pause the requests the rules may block, so the other requests are never paused.
+
+	The patterns may pause more than the rules block, every paused request is checked against the rules again.
+	"""
+	if rules.url_patterns and any('[' in pattern for pattern in rules.url_patterns):
+		return [{'urlPattern': '*'}]
+
+	url_patterns = list(rules.url_patterns)
+	for domain in rules.domains:
+		if domain.startswith('*.') and '*' not in domain[2:] and '://' not in domain:
+			url_patterns += [f'*://{domain[2:]}*', f'*://*.{domain[2:]}*']
+		elif '*' not in domain and '://' not in domain:
+			url_patterns.append(f'*://{domain}*')
+			if is_root_domain(domain):
+				url_patterns.append(f'*://www.{domain}*')
+		else:
+			return [{'urlPattern': '*'}]
+
+	patterns: list[RequestPattern] = [{'urlPattern': pattern} for pattern in url_patterns]
+	patterns += [{'urlPattern': '*', 'resourceType': resource_type} for resource_type in rules.resource_types]
+	return patterns
+
+
+class ResourceBlockingWatchdog(BaseWatchdog):
+	"""Blocks or stubs the requests matched by BrowserProfile.resource_blocking before the browser sends them."""
+
+	# Event contracts
+	LISTENS_TO: ClassVar[list[type[BaseEvent[Any]]]] = [
+		BrowserConnectedEvent,
+		BrowserStopEvent,
+		TabCreatedEvent,
+	]
+	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = []
+
+	stats: ResourceBlockingStats = Field(default_factory=ResourceBlockingStats)
+
+	# Private state
+	_rules: ResourceBlockingRules | None = PrivateAttr(default=None)
+	_domain_policy: DomainPolicy | None = PrivateAttr(default=None)
+	_url_regex: re.Pattern[str] | None = PrivateAttr(default=None)
+	_intercepted_session_ids: set[str] = PrivateAttr(default_factory=set)
+	_pending_tasks: set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
+		"""Compile the rules and start intercepting the requests of the first tab."""
+		rules = self.browser_session.browser_profile.resource_blocking
+		if not rules or not (rules.resource_types or rules.url_patterns or rules.domains):
+			return
+
+		self._rules = rules
+		self._domain_policy = DomainPolicy(prohibited_domains=rules.domains) if rules.domains else None
+		self._url_regex = (
+			re.compile('|'.join(translate(pattern) for pattern in rules.url_patterns)) if rules.url_patterns else None
+		)
+		self.logger.debug(
+			f'[ResourceBlockingWatchdog] 🚫 Blocking resource types {rules.resource_types}, '
+			f'{len(rules.url_patterns)} URL patterns and {len(rules.domains)} domains'
+		)
+
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=False)
+			await self._enable_interception(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[ResourceBlockingWatchdog] Could not enable request interception: {e}')
+
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Intercept the requests of new tabs."""
+		if not self._rules:
+			return
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(event.target_id, focus=False)
+			await self._enable_interception(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[ResourceBlockingWatchdog] Could not intercept requests in tab #{event.target_id[-4:]}: {e}')
+
+	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
+		"""Forget the intercepted sessions, they end with the browser."""
+		self._intercepted_session_ids.clear()
+		self._rules = None
+
+	async def _enable_interception(self, cdp_session: 'CDPSession') -> None:
+		"""Pause the requests of a CDP session that the rules may block."""
+		assert self._rules is not None
+		# HAR replay pauses every request and applies the blocking rules itself, see HarRecorderWatchdog
+		if self.browser_session.browser_profile.replay_har_path:
+			return
+		if cdp_session.session_id in self._intercepted_session_ids:
+			return
+		self._intercepted_session_ids.add(cdp_session.session_id)
+
+		# There is only one requestPaused handler per CDP client, it answers the requests paused by the proxy auth
+		# handling of BrowserSession._setup_proxy_auth too
+		cdp_client = cdp_session.cdp_client
+		cdp_client.register.Fetch.requestPaused(
+			lambda event, session_id: self._on_request_paused(cdp_client, event, session_id)  # type: ignore[arg-type]
+		)
+
+		# Auth challenges are only reported for paused requests, so with proxy auth every request is paused
+		handle_auth = self.browser_session._fetch_handles_proxy_auth(cdp_client)
+		patterns: list[RequestPattern] = [{'urlPattern': '*'}] if handle_auth else get_interception_patterns(self._rules)
+		await cdp_client.send.Fetch.enable(
+			params={'patterns': patterns, 'handleAuthRequests': handle_auth},
+			session_id=cdp_session.session_id,
+		)
+
+	def is_blocked(self, url: str, resource_type: str) -> bool:
+		"""Check if a request is matched by the blocking rules."""
+		if not self._rules:
+			return False
+		if resource_type in self._rules.resource_types:
+			return True
+		if self._url_regex and self._url_regex.match(url):
+			return True
+		# data:, blob: and other URLs without a host never match a domain
+		if self._domain_policy and url.startswith(('http:', 'https:', 'ws:', 'wss:')):
+			return not self._domain_policy.is_allowed(url)
+		return False
+
+	def _on_request_paused(self, cdp_client: 'CDPClient', event: RequestPausedEvent, session_id: str | None) -> None:
+		task = asyncio.create_task(self._handle_request_paused(cdp_client, event, session_id))
+		self._pending_tasks.add(task)
+		task.add_done_callback(self._pending_tasks.discard)
+
+	async def _handle_request_paused(self, cdp_client: 'CDPClient', event: RequestPausedEvent, session_id: str | None) -> None:
+		"""Fail or stub a blocked request, let every other paused request continue."""
+		try:
+			if self.is_blocked(event['request']['url'], event.get('resourceType', 'Other')):
+				await self.block_request(cdp_client, event, session_id)
+			else:
+				await cdp_client.send.Fetch.continueRequest(params={'requestId': event['requestId']}, session_id=session_id)
+		except Exception as e:
+			# The request is gone when its tab was closed or navigated away meanwhile
+			self.logger.debug(
+				f'[ResourceBlockingWatchdog] Could not answer paused request {event["requestId"]}: {type(e).__name__}: {e}'
+			)
+
+	async def block_request(self, cdp_client: 'CDPClient', event: RequestPausedEvent, session_id: str | None) -> None:
+		"""Fail a paused request that is_blocked() matched, or answer it with an empty response if its type is stubbed."""
+		assert self._rules is not None
+		request_id = event['requestId']
+		resource_type = event.get('resourceType', 'Other')
+		if resource_type in self._rules.stub_resource_types:
+			content_type = STUB_CONTENT_TYPES.get(resource_type, 'text/plain')
+			await cdp_client.send.Fetch.fulfillRequest(
+				params={
+					'requestId': request_id,
+					'responseCode': 200,
+					'responseHeaders': [
+						{'name': 'Content-Type', 'value': content_type},
+						{'name': 'Access-Control-Allow-Origin', 'value': '*'},
+					],
+					'body': base64.b64encode(b'').decode(),
+				},
+				session_id=session_id,
+			)
+			self.stats.requests_stubbed += 1
+		else:
+			await cdp_client.send.Fetch.failRequest(
+				params={'requestId': request_id, 'errorReason': 'BlockedByClient'}, session_id=session_id
+			)
+			self.stats.requests_blocked += 1
+		self.stats.by_resource_type[resource_type] = self.stats.by_resource_type.get(resource_type, 0) + 1
+		self.stats.estimated_bytes_saved += TYPICAL_RESPONSE_BYTES.get(resource_type, DEFAULT_RESPONSE_BYTES)
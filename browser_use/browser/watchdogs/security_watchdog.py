@@ -3,7 +3,9 @@
 from typing import TYPE_CHECKING, ClassVar
 
 from bubus import BaseEvent
+from pydantic import PrivateAttr
 
+from browser_use.browser.domain_policy import DomainPolicy, is_root_domain
 from browser_use.browser.events import (
 	BrowserErrorEvent,
 	NavigateToUrlEvent,
@@ -32,6 +34,10 @@ class SecurityWatchdog(BaseWatchdog):
 		BrowserErrorEvent,
 	]
 
+	# Compiled policy and the identity of the profile lists it was compiled from
+	_domain_policy: DomainPolicy | None = PrivateAttr(default=None)
+	_domain_policy_source: tuple[tuple[str, ...] | None, tuple[str, ...] | None] | None = PrivateAttr(default=None)
+
 	async def on_NavigateToUrlEvent(self, event: NavigateToUrlEvent) -> None:
 		"""Check if navigation URL is allowed before navigation starts."""
 		# Security check BEFORE navigation
@@ -102,11 +108,7 @@ class SecurityWatchdog(BaseWatchdog):
 		Returns:
 			True if it's a simple root domain, False otherwise
 		"""
-		# Skip if it contains wildcards or protocol
-		if '*' in domain or '://' in domain:
-			return False
-
-		return domain.count('.') == 1
+		return is_root_domain(domain)
 
 	def _log_glob_warning(self) -> None:
 		"""Log a warning about glob patterns in allowed_domains."""
@@ -118,6 +120,19 @@ class SecurityWatchdog(BaseWatchdog):
 				'Note: Patterns like "*.example.com" will match both subdomains AND the main domain.'
 			)
 
+	def _get_domain_policy(self) -> DomainPolicy:
+		"""Get the compiled allowed_domains / prohibited_domains policy, recompiled only when the profile lists change."""
+		profile = self.browser_session.browser_profile
+		allowed, prohibited = profile.allowed_domains, profile.prohibited_domains
+		# The contents and not the identity of the lists, they may be edited in place
+		source = (tuple(allowed) if allowed is not None else None, tuple(prohibited) if prohibited is not None else None)
+		if self._domain_policy is None or self._domain_policy_source != source:
+			self._domain_policy = DomainPolicy(allowed, prohibited)
+			self._domain_policy_source = source
+			if self._domain_policy.has_glob_patterns:
+				self._log_glob_warning()
+		return self._domain_policy
+
 	def _is_url_allowed(self, url: str) -> bool:
 		"""Check if a URL is allowed based on the allowed_domains configuration.
 
@@ -135,85 +150,4 @@ class SecurityWatchdog(BaseWatchdog):
 		):
 			return True
 
-		# Always allow internal browser targets
-		if url in ['about:blank', 'chrome://new-tab-page/', 'chrome://new-tab-page', 'chrome://newtab/']:
-			return True
-
-		# Parse the URL to extract components
-		from urllib.parse import urlparse
-
-		try:
-			parsed = urlparse(url)
-		except Exception:
-			# Invalid URL
-			return False
-
-		# Get the actual host (domain)
-		host = parsed.hostname
-		if not host:
-			return False
-
-		# Check each allowed domain pattern
-		if self.browser_session.browser_profile.allowed_domains:
-			for pattern in self.browser_session.browser_profile.allowed_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return True
-
-			return False
-
-		# Check each prohibited domain pattern
-		if self.browser_session.browser_profile.prohibited_domains:
-			for pattern in self.browser_session.browser_profile.prohibited_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return False
-
-			return True
-
-		return True
-
-	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
-		"""Check if a URL matches a pattern."""
-
-		# Full URL for matching (scheme + host)
-		full_url_pattern = f'{scheme}://{host}'
-
-		# Handle glob patterns
-		if '*' in pattern:
-			self._log_glob_warning()
-			import fnmatch
-
-			# Check if pattern matches the host
-			if pattern.startswith('*.'):
-				# Pattern like *.example.com should match subdomains and main domain
-				domain_part = pattern[2:]  # Remove *.
-				if host == domain_part or host.endswith('.' + domain_part):
-					# Only match http/https URLs for domain-only patterns
-					if scheme in ['http', 'https']:
-						return True
-			elif pattern.endswith('/*'):
-				# Pattern like brave://* should match any brave:// URL
-				prefix = pattern[:-1]  # Remove the * at the end
-				if url.startswith(prefix):
-					return True
-			else:
-				# Use fnmatch for other glob patterns
-				if fnmatch.fnmatch(
-					full_url_pattern if '://' in pattern else host,
-					pattern,
-				):
-					return True
-		else:
-			# Exact match
-			if '://' in pattern:
-				# Full URL pattern
-				if url.startswith(pattern):
-					return True
-			else:
-				# Domain-only pattern (case-insensitive comparison)
-				if host.lower() == pattern.lower():
-					return True
-				# If pattern is a root domain, also check www subdomain
-				if self._is_root_domain(pattern) and host.lower() == f'www.{pattern.lower()}':
-					return True
-
-		return False
+		return self._get_domain_policy().is_allowed(url)
@@ -6,8 +6,11 @@ import os
 from pathlib import Path
 from typing import Any, ClassVar
 
+import portalocker
 from bubus import BaseEvent
+from cdp_use.cdp.domstorage.events import DomStorageItemAddedEvent
 from cdp_use.cdp.network import Cookie
+from cdp_use.cdp.network.events import ResponseReceivedExtraInfoEvent
 from pydantic import Field, PrivateAttr
 
 from browser_use.browser.events import (
@@ -17,9 +20,17 @@ from browser_use.browser.events import (
 	SaveStorageStateEvent,
 	StorageStateLoadedEvent,
 	StorageStateSavedEvent,
+	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
 
+# Seconds to wait for another session that is writing the same storage_state.json
+STORAGE_STATE_LOCK_TIMEOUT = 10.0
+
+
+def _cookie_key(cookie: Cookie | dict[str, Any]) -> tuple[str, str, str]:
+	return (cookie.get('name', ''), cookie.get('domain', ''), cookie.get('path', ''))
+
 
 class StorageStateWatchdog(BaseWatchdog):
 	"""Monitors and persists browser storage state including cookies and localStorage."""
@@ -28,6 +39,7 @@ class StorageStateWatchdog(BaseWatchdog):
 	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [
 		BrowserConnectedEvent,
 		BrowserStopEvent,
+		TabCreatedEvent,
 		SaveStorageStateEvent,
 		LoadStorageStateEvent,
 	]
@@ -37,13 +49,25 @@ class StorageStateWatchdog(BaseWatchdog):
 	]
 
 	# Configuration
-	auto_save_interval: float = Field(default=30.0)  # Auto-save every 30 seconds
-	save_on_change: bool = Field(default=True)  # Save immediately when cookies change
+	auto_save_interval: float = Field(default=30.0)  # Minimum seconds between automatic saves of tracked changes
+	save_on_change: bool = Field(default=True)  # Save changes as soon as they settle instead of once per auto_save_interval
+	save_debounce: float = Field(default=1.0)  # Wait until no storage/cookie events arrived for this long before saving
 
 	# Private state
 	_monitoring_task: asyncio.Task | None = PrivateAttr(default=None)
 	_last_cookie_state: list[dict] = PrivateAttr(default_factory=list)
 	_save_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+	_cdp_listeners_registered: bool = PrivateAttr(default=False)
+	_tracked_session_ids: set[str] = PrivateAttr(default_factory=set)
+	_cookies_dirty: bool = PrivateAttr(default=False)
+	_dirty_origins: set[str] = PrivateAttr(default_factory=set)
+	_last_change_at: float = PrivateAttr(default=0.0)
+	_last_save_at: float = PrivateAttr(default=0.0)
+	# In-memory copy of what is persisted on disk, so incremental saves only touch what changed
+	_persisted_path: Path | None = PrivateAttr(default=None)
+	_persisted_mtime: int | None = PrivateAttr(default=None)  # st_mtime_ns of the file when it was last read or written
+	_persisted_cookies: dict[tuple[str, str, str], dict[str, Any]] = PrivateAttr(default_factory=dict)
+	_persisted_origins: dict[str, dict[str, Any]] = PrivateAttr(default_factory=dict)
 
 	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
 		"""Start monitoring when browser starts."""
@@ -60,6 +84,16 @@ class StorageStateWatchdog(BaseWatchdog):
 		self.logger.debug('[StorageStateWatchdog] Stopping storage_state monitoring')
 		await self._stop_monitoring()
 
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Track cookie and storage changes in new tabs."""
+		if not self._cdp_listeners_registered:
+			return
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(event.target_id, focus=False)
+			await self._enable_change_tracking(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[StorageStateWatchdog] Could not track storage changes in tab #{event.target_id[-4:]}: {e}')
+
 	async def on_SaveStorageStateEvent(self, event: SaveStorageStateEvent) -> None:
 		"""Handle storage state save request."""
 		# Use provided path or fall back to profile default
@@ -85,17 +119,26 @@ class StorageStateWatchdog(BaseWatchdog):
 		await self._load_storage_state(path)
 
 	async def _start_monitoring(self) -> None:
-		"""Start the monitoring task."""
-		if self._monitoring_task and not self._monitoring_task.done():
-			return
-
+		"""Start listening for cookie and storage change events."""
 		assert self.browser_session.cdp_client is not None
 
-		self._monitoring_task = asyncio.create_task(self._monitor_storage_changes())
-		# self.logger'[StorageStateWatchdog] Started storage monitoring task')
+		if not self._cdp_listeners_registered:
+			cdp_client = self.browser_session.cdp_client
+			cdp_client.register.Network.responseReceivedExtraInfo(self._on_response_received_extra_info)
+			cdp_client.register.DOMStorage.domStorageItemAdded(self._on_dom_storage_changed)  # type: ignore[arg-type]
+			cdp_client.register.DOMStorage.domStorageItemUpdated(self._on_dom_storage_changed)  # type: ignore[arg-type]
+			cdp_client.register.DOMStorage.domStorageItemRemoved(self._on_dom_storage_changed)  # type: ignore[arg-type]
+			cdp_client.register.DOMStorage.domStorageItemsCleared(self._on_dom_storage_changed)  # type: ignore[arg-type]
+			self._cdp_listeners_registered = True
+
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, new_socket=False)
+			await self._enable_change_tracking(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'[StorageStateWatchdog] Could not enable storage change tracking: {e}')
 
 	async def _stop_monitoring(self) -> None:
-		"""Stop the monitoring task."""
+		"""Stop the pending save task."""
 		if self._monitoring_task and not self._monitoring_task.done():
 			self._monitoring_task.cancel()
 			try:
@@ -103,111 +146,211 @@ class StorageStateWatchdog(BaseWatchdog):
 			except asyncio.CancelledError:
 				pass
 			# self.logger.debug('[StorageStateWatchdog] Stopped storage monitoring task')
+		self._monitoring_task = None
+		self._tracked_session_ids.clear()
+		self._cdp_listeners_registered = False
 
-	async def _check_for_cookie_changes_cdp(self, event: dict) -> None:
-		"""Check if a CDP network event indicates cookie changes.
+	async def _enable_change_tracking(self, cdp_session) -> None:
+		"""Enable the CDP domains whose events report cookie (Set-Cookie headers) and DOM storage changes."""
+		if cdp_session.session_id in self._tracked_session_ids:
+			return
+		self._tracked_session_ids.add(cdp_session.session_id)
+		await cdp_session.cdp_client.send.Network.enable(session_id=cdp_session.session_id)
+		await cdp_session.cdp_client.send.DOMStorage.enable(session_id=cdp_session.session_id)
+
+	def _on_response_received_extra_info(self, event: ResponseReceivedExtraInfoEvent, session_id: str | None) -> None:
+		"""Mark cookies dirty when a response sets cookies."""
+		headers = event.get('headers', {})
+		if 'set-cookie' in headers or 'Set-Cookie' in headers:
+			self._cookies_dirty = True
+			self._schedule_save()
+
+	def _on_dom_storage_changed(self, event: DomStorageItemAddedEvent, session_id: str | None) -> None:
+		"""Mark the origin of a localStorage/sessionStorage change dirty."""
+		origin = event.get('storageId', {}).get('securityOrigin')
+		if origin and origin != 'null':
+			self._dirty_origins.add(origin)
+			self._schedule_save()
+
+	def _schedule_save(self) -> None:
+		"""Debounce saving of the accumulated changes into a single background task."""
+		self._last_change_at = asyncio.get_running_loop().time()
+		if self._monitoring_task is None or self._monitoring_task.done():
+			self._monitoring_task = asyncio.create_task(self._monitor_storage_changes())
 
-		This would be called by Network.responseReceivedExtraInfo events
-		if we set up CDP event listeners.
-		"""
+	async def _monitor_storage_changes(self) -> None:
+		"""Wait for changes to settle and the minimum save interval to pass, then save only what changed."""
+		min_interval = self.save_debounce if self.save_on_change else self.auto_save_interval
+		loop = asyncio.get_running_loop()
 		try:
-			# Check for Set-Cookie headers in the response
-			headers = event.get('headers', {})
-			if 'set-cookie' in headers or 'Set-Cookie' in headers:
-				self.logger.debug('[StorageStateWatchdog] Cookie change detected via CDP')
-
-				# If save on change is enabled, trigger save immediately
-				if self.save_on_change:
-					await self._save_storage_state()
+			while self._cookies_dirty or self._dirty_origins:
+				save_at = max(self._last_change_at + self.save_debounce, self._last_save_at + min_interval)
+				if save_at > loop.time():
+					await asyncio.sleep(save_at - loop.time())
+					continue
+
+				self.logger.debug('[StorageStateWatchdog] Detected changes to sync with storage_state.json')
+				await self._save_changes()
+		except asyncio.CancelledError:
+			pass
 		except Exception as e:
-			self.logger.warning(f'[StorageStateWatchdog] Error checking for cookie changes: {e}')
-
-	async def _monitor_storage_changes(self) -> None:
-		"""Periodically check for storage changes and auto-save."""
-		while True:
-			try:
-				await asyncio.sleep(self.auto_save_interval)
+			self.logger.error(f'[StorageStateWatchdog] Error saving storage changes: {e}')
 
-				# Check if cookies have changed
-				if await self._have_cookies_changed():
-					self.logger.debug('[StorageStateWatchdog] Detected changes to sync with storage_state.json')
-					await self._save_storage_state()
+	def _get_save_path(self, path: str | None = None) -> Path | None:
+		"""Resolve the storage_state.json path to save to, None if saving to a file is not configured."""
+		save_path = path or self.browser_session.browser_profile.storage_state
+		if not save_path:
+			return None
 
-			except asyncio.CancelledError:
-				break
-			except Exception as e:
-				self.logger.error(f'[StorageStateWatchdog] Error in monitoring loop: {e}')
+		# Skip saving if the storage state is already a dict (indicates it was loaded from memory)
+		# We only save to file if it started as a file path
+		if isinstance(save_path, dict):
+			self.logger.debug('[StorageStateWatchdog] Storage state is already a dict, skipping file save')
+			return None
 
-	async def _have_cookies_changed(self) -> bool:
-		"""Check if cookies have changed since last save."""
-		if not self.browser_session.cdp_client:
-			return False
+		return Path(save_path).expanduser().resolve()
 
+	def _read_persisted_state(self, json_path: Path) -> None:
+		"""Read the on-disk state into memory, unless it is unchanged since it was last read or written."""
 		try:
-			# Get current cookies using CDP
-			current_cookies = await self.browser_session._cdp_get_cookies()
+			mtime = json_path.stat().st_mtime_ns
+		except OSError:
+			mtime = None
+		if self._persisted_path == json_path and self._persisted_mtime == mtime:
+			return
 
-			# Convert to comparable format, using .get() for optional fields
-			current_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in current_cookies
+		self._persisted_path = json_path
+		self._persisted_mtime = mtime
+		self._persisted_cookies = {}
+		self._persisted_origins = {}
+		if mtime is not None:
+			try:
+				existing_state = json.loads(json_path.read_text())
+				self._persisted_cookies = {_cookie_key(c): c for c in existing_state.get('cookies', [])}
+				self._persisted_origins = {o['origin']: o for o in existing_state.get('origins', [])}
+			except Exception as e:
+				self.logger.error(f'[StorageStateWatchdog] Failed to merge with existing state: {e}')
+
+	def _write_changes(
+		self,
+		json_path: Path,
+		cookies: dict[tuple[str, str, str], dict[str, Any]],
+		origins: dict[str, dict[str, Any] | None],
+		backup: bool,
+	) -> dict[str, Any]:
+		"""Merge the changed cookies/origins (None = removed) into the file and write it atomically via temp file + rename.
+
+		Sessions may share a storage_state.json, so under a file lock the file is re-read if another session wrote it
+		since, and only this session's changes are applied on top of it.
+		"""
+		json_path.parent.mkdir(parents=True, exist_ok=True)
+		with portalocker.Lock(str(json_path.with_suffix('.json.lock')), timeout=STORAGE_STATE_LOCK_TIMEOUT):
+			self._read_persisted_state(json_path)
+			self._persisted_cookies.update(cookies)
+			for origin, origin_state in origins.items():
+				if origin_state is None:
+					self._persisted_origins.pop(origin, None)
+				else:
+					self._persisted_origins[origin] = origin_state
+			state = {
+				'cookies': list(self._persisted_cookies.values()),
+				'origins': list(self._persisted_origins.values()),
 			}
 
-			last_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in self._last_cookie_state
-			}
+			# Write atomically
+			temp_path = json_path.with_suffix('.json.tmp')
+			temp_path.write_text(json.dumps(state, indent=4))
 
-			return current_cookie_set != last_cookie_set
-		except Exception as e:
-			self.logger.debug(f'[StorageStateWatchdog] Error comparing cookies: {e}')
-			return False
+			# Backup existing file
+			if backup and json_path.exists():
+				backup_path = json_path.with_suffix('.json.bak')
+				json_path.replace(backup_path)
+
+			# Move temp to final
+			temp_path.replace(json_path)
+			self._persisted_mtime = json_path.stat().st_mtime_ns
+		return state
+
+	async def _save_changes(self) -> None:
+		"""Incrementally save only the cookies/origins that changed since the last save."""
+		async with self._save_lock:
+			json_path = self._get_save_path()
+			cookies_dirty, dirty_origins = self._cookies_dirty, self._dirty_origins
+			self._cookies_dirty, self._dirty_origins = False, set()
+			if json_path is None or not (cookies_dirty or dirty_origins):
+				return
+
+			try:
+				await asyncio.to_thread(self._read_persisted_state, json_path)
+				changed_cookies: dict[tuple[str, str, str], dict[str, Any]] = {}
+				changed_origins: dict[str, dict[str, Any] | None] = {}
+
+				if cookies_dirty:
+					cookies = await self.browser_session._cdp_get_cookies()
+					self._last_cookie_state = [dict(c) for c in cookies]
+					for cookie in cookies:
+						key = _cookie_key(cookie)
+						if self._persisted_cookies.get(key) != cookie:
+							changed_cookies[key] = dict(cookie)
+
+				if dirty_origins:
+					fresh_origins = {
+						o['origin']: o
+						for o in await self.browser_session._cdp_get_origins(only_origins=dirty_origins, keep_enabled=True)
+					}
+					for origin in dirty_origins:
+						# None if all storage of this origin was removed/cleared
+						changed_origins[origin] = fresh_origins.get(origin)
+
+				changed = len(changed_cookies) + len(changed_origins)
+				if not changed:
+					return
+
+				state = await asyncio.to_thread(self._write_changes, json_path, changed_cookies, changed_origins, False)
+				self._last_save_at = asyncio.get_running_loop().time()
+				self.event_bus.dispatch(
+					StorageStateSavedEvent(
+						path=str(json_path),
+						cookies_count=len(state['cookies']),
+						origins_count=len(state['origins']),
+					)
+				)
+				self.logger.debug(
+					f'[StorageStateWatchdog] Saved {changed} changed cookies/origins to {json_path} '
+					f'({len(state["cookies"])} cookies, {len(state["origins"])} origins)'
+				)
+			except Exception as e:
+				self.logger.error(f'[StorageStateWatchdog] Failed to save storage state changes: {e}')
 
 	async def _save_storage_state(self, path: str | None = None) -> None:
-		"""Save browser storage state to file."""
+		"""Save the full browser storage state to file."""
 		async with self._save_lock:
 			# Check if CDP client is available
 			assert await self.browser_session.get_or_create_cdp_session(target_id=None, new_socket=False)
 
-			save_path = path or self.browser_session.browser_profile.storage_state
-			if not save_path:
-				return
-
-			# Skip saving if the storage state is already a dict (indicates it was loaded from memory)
-			# We only save to file if it started as a file path
-			if isinstance(save_path, dict):
-				self.logger.debug('[StorageStateWatchdog] Storage state is already a dict, skipping file save')
+			json_path = self._get_save_path(path)
+			if json_path is None:
 				return
 
 			try:
 				# Get current storage state using CDP
-				storage_state = await self.browser_session._cdp_get_storage_state()
-
-				# Update our last known state
-				self._last_cookie_state = storage_state.get('cookies', []).copy()
-
-				# Convert path to Path object
-				json_path = Path(save_path).expanduser().resolve()
-				json_path.parent.mkdir(parents=True, exist_ok=True)
-
-				# Merge with existing state if file exists
-				merged_state = storage_state
-				if json_path.exists():
-					try:
-						existing_state = json.loads(json_path.read_text())
-						merged_state = self._merge_storage_states(existing_state, dict(storage_state))
-					except Exception as e:
-						self.logger.error(f'[StorageStateWatchdog] Failed to merge with existing state: {e}')
-
-				# Write atomically
-				temp_path = json_path.with_suffix('.json.tmp')
-				temp_path.write_text(json.dumps(merged_state, indent=4))
-
-				# Backup existing file
-				if json_path.exists():
-					backup_path = json_path.with_suffix('.json.bak')
-					json_path.replace(backup_path)
-
-				# Move temp to final
-				temp_path.replace(json_path)
+				cookies = await self.browser_session._cdp_get_cookies()
+				origins = await self.browser_session._cdp_get_origins(keep_enabled=bool(self._tracked_session_ids))
+
+				# Update our last known state, everything is about to be persisted
+				self._last_cookie_state = [dict(c) for c in cookies]
+				self._cookies_dirty = False
+				self._dirty_origins.clear()
+
+				# Merge with existing state, new values taking precedence
+				merged_state = await asyncio.to_thread(
+					self._write_changes,
+					json_path,
+					{_cookie_key(cookie): dict(cookie) for cookie in cookies},
+					{origin['origin']: origin for origin in origins},
+					True,
+				)
+				self._last_save_at = asyncio.get_running_loop().time()
 
 				# Emit success event
 				self.event_bus.dispatch(
@@ -244,6 +387,12 @@ class StorageStateWatchdog(BaseWatchdog):
 			content = await anyio.Path(str(load_path)).read_text()
 			storage = json.loads(content)
 
+			# Remember what is on disk so later incremental saves only re-read the file if another session wrote it
+			self._persisted_path = Path(str(load_path)).expanduser().resolve()
+			self._persisted_mtime = (await anyio.Path(self._persisted_path).stat()).st_mtime_ns
+			self._persisted_cookies = {_cookie_key(c): c for c in storage.get('cookies', [])}
+			self._persisted_origins = {o['origin']: o for o in storage.get('origins', [])}
+
 			# Apply cookies if present
 			if 'cookies' in storage and storage['cookies']:
 				await self.browser_session._cdp_set_cookies(storage['cookies'])
@@ -282,30 +431,6 @@ class StorageStateWatchdog(BaseWatchdog):
 		except Exception as e:
 			self.logger.error(f'[StorageStateWatchdog] Failed to load storage state: {e}')
 
-	@staticmethod
-	def _merge_storage_states(existing: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
-		"""Merge two storage states, with new values taking precedence."""
-		merged = existing.copy()
-
-		# Merge cookies
-		existing_cookies = {(c['name'], c['domain'], c['path']): c for c in existing.get('cookies', [])}
-
-		for cookie in new.get('cookies', []):
-			key = (cookie['name'], cookie['domain'], cookie['path'])
-			existing_cookies[key] = cookie
-
-		merged['cookies'] = list(existing_cookies.values())
-
-		# Merge origins
-		existing_origins = {origin['origin']: origin for origin in existing.get('origins', [])}
-
-		for origin in new.get('origins', []):
-			existing_origins[origin['origin']] = origin
-
-		merged['origins'] = list(existing_origins.values())
-
-		return merged
-
 	async def get_current_cookies(self) -> list[dict[str, Any]]:
 		"""Get current cookies using CDP."""
 		if not self.browser_session.cdp_client:
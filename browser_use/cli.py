@@ -22,6 +22,7 @@ from typing import Any
 from dotenv import load_dotenv
 
 from browser_use.llm.anthropic.chat import ChatAnthropic
+from browser_use.llm.clients import aclose_shared_clients
 from browser_use.llm.google.chat import ChatGoogle
 from browser_use.llm.openai.chat import ChatOpenAI
 
@@ -1459,6 +1460,9 @@ async def run_prompt_mode(prompt: str, ctx: click.Context, debug: bool = False):
 		# Ensure telemetry is flushed
 		telemetry.flush()
 
+		# Close the connection pools of the shared LLM clients
+		await aclose_shared_clients()
+
 		# Give a brief moment for cleanup to complete
 		await asyncio.sleep(0.1)
 
@@ -1587,6 +1591,9 @@ async def textual_interface(config: dict[str, Any]):
 		# Note: We don't close the browser session here to avoid duplicate stop() calls
 		# The browser session will be cleaned up by its __del__ method if needed
 		raise
+	finally:
+		# Close the connection pools of the shared LLM clients
+		await aclose_shared_clients()
 
 
 async def run_auth_command():
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 # Lightweight imports that are commonly used
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import aclose_shared_clients, configure_http_clients
 from browser_use.llm.messages import (
 	AssistantMessage,
 	BaseMessage,
@@ -23,6 +24,7 @@ from browser_use.llm.messages import (
 from browser_use.llm.messages import (
 	ContentPartTextParam as ContentText,
 )
+from browser_use.llm.scheduler import LLMScheduler, RateLimits, get_llm_scheduler
 
 # Type stubs for lazy imports
 if TYPE_CHECKING:
@@ -33,9 +35,11 @@ if TYPE_CHECKING:
 	from browser_use.llm.deepseek.chat import ChatDeepSeek
 	from browser_use.llm.google.chat import ChatGoogle
 	from browser_use.llm.groq.chat import ChatGroq
+	from browser_use.llm.hedging import ChatHedged
 	from browser_use.llm.ollama.chat import ChatOllama
 	from browser_use.llm.openai.chat import ChatOpenAI
 	from browser_use.llm.openrouter.chat import ChatOpenRouter
+	from browser_use.llm.replay import ChatReplay
 
 	# Type stubs for model instances - enables IDE autocomplete
 	openai_gpt_4o: ChatOpenAI
@@ -81,9 +85,11 @@ _LAZY_IMPORTS = {
 	'ChatDeepSeek': ('browser_use.llm.deepseek.chat', 'ChatDeepSeek'),
 	'ChatGoogle': ('browser_use.llm.google.chat', 'ChatGoogle'),
 	'ChatGroq': ('browser_use.llm.groq.chat', 'ChatGroq'),
+	'ChatHedged': ('browser_use.llm.hedging', 'ChatHedged'),
 	'ChatOllama': ('browser_use.llm.ollama.chat', 'ChatOllama'),
 	'ChatOpenAI': ('browser_use.llm.openai.chat', 'ChatOpenAI'),
 	'ChatOpenRouter': ('browser_use.llm.openrouter.chat', 'ChatOpenRouter'),
+	'ChatReplay': ('browser_use.llm.replay', 'ChatReplay'),
 }
 
 # Cache for model instances - only created when accessed
@@ -143,4 +149,13 @@ __all__ = [
 	'ChatAzureOpenAI',
 	'ChatOllama',
 	'ChatOpenRouter',
+	'ChatHedged',
+	'ChatReplay',
+	# Shared HTTP clients
+	'configure_http_clients',
+	'aclose_shared_clients',
+	# Request scheduling
+	'LLMScheduler',
+	'RateLimits',
+	'get_llm_scheduler',
 ]
@@ -21,6 +21,7 @@ from pydantic import BaseModel
 
 from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import create_http_client, get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
@@ -98,13 +99,17 @@ class ChatAnthropic(BaseChatModel):
 
 	def get_client(self) -> AsyncAnthropic:
 		"""
-		Returns an AsyncAnthropic client.
+		Returns the shared AsyncAnthropic client for this configuration.
 
 		Returns:
 			AsyncAnthropic: An instance of the AsyncAnthropic client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncAnthropic(**client_params)
+		return get_shared_client(
+			self.provider,
+			client_params,
+			lambda: AsyncAnthropic(**client_params, http_client=create_http_client()),
+		)
 
 	@property
 	def name(self) -> str:
@@ -124,6 +129,23 @@ class ChatAnthropic(BaseChatModel):
 		)
 		return usage
 
+	@staticmethod
+	def _build_output_tool(output_format: type[BaseModel]) -> ToolParam:
+		"""Tool that represents the output format, cached per output model by ainvoke"""
+		tool_name = output_format.__name__
+		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+
+		# Remove title from schema if present (Anthropic doesn't like it in parameters)
+		if 'title' in schema:
+			del schema['title']
+
+		return ToolParam(
+			name=tool_name,
+			description=f'Extract information in the format of {tool_name}',
+			input_schema=schema,
+			cache_control=CacheControlEphemeralParam(type='ephemeral'),
+		)
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -172,17 +194,8 @@ class ChatAnthropic(BaseChatModel):
 				# Use tool calling for structured output
 				# Create a tool that represents the output format
 				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
-
-				tool = ToolParam(
-					name=tool_name,
-					description=f'Extract information in the format of {tool_name}',
-					input_schema=schema,
-					cache_control=CacheControlEphemeralParam(type='ephemeral'),
+				tool = SchemaOptimizer.get_request_template(
+					output_format, ('anthropic', 'tool'), lambda: self._build_output_tool(output_format)
 				)
 
 				# Force the model to use this tool
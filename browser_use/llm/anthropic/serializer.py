@@ -100,7 +100,7 @@ class AnthropicMessageSerializer:
 		serialized_blocks: list[TextBlockParam] = []
 		for part in content:
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache or part.cache))
 
 		return serialized_blocks
 
@@ -119,7 +119,7 @@ class AnthropicMessageSerializer:
 		serialized_blocks: list[TextBlockParam | ImageBlockParam] = []
 		for part in content:
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache or part.cache))
 			elif part.type == 'image_url':
 				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_image(part))
 
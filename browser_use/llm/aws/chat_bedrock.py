@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 from browser_use.llm.aws.serializer import AWSBedrockMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
@@ -70,7 +71,18 @@ class ChatAWSBedrock(BaseChatModel):
 			)
 
 		if self.session:
-			return self.session.client('bedrock-runtime')
+			session = self.session
+			# Keyed by what the client authenticates with, an id() of the session could be reused by another session
+			credentials = session.get_credentials()
+			frozen_credentials = credentials.get_frozen_credentials() if credentials else None
+			session_params = {
+				'profile': session.profile_name,
+				'region': session.region_name,
+				'aws_access_key_id': frozen_credentials.access_key if frozen_credentials else None,
+				'aws_secret_access_key': frozen_credentials.secret_key if frozen_credentials else None,
+				'aws_session_token': frozen_credentials.token if frozen_credentials else None,
+			}
+			return get_shared_client(self.provider, session_params, lambda: session.client('bedrock-runtime'))
 
 		# Get credentials from environment or instance parameters
 		access_key = self.aws_access_key_id or getenv('AWS_ACCESS_KEY_ID')
@@ -79,7 +91,11 @@ class ChatAWSBedrock(BaseChatModel):
 		region = self.aws_region or getenv('AWS_REGION') or getenv('AWS_DEFAULT_REGION')
 
 		if self.aws_sso_auth:
-			return AwsClient(service_name='bedrock-runtime', region_name=region)
+			return get_shared_client(
+				self.provider,
+				{'sso': True, 'region': region},
+				lambda: AwsClient(service_name='bedrock-runtime', region_name=region),
+			)
 		else:
 			if not access_key or not secret_key:
 				raise ModelProviderError(
@@ -87,13 +103,14 @@ class ChatAWSBedrock(BaseChatModel):
 					model=self.name,
 				)
 
-			return AwsClient(
-				service_name='bedrock-runtime',
-				region_name=region,
-				aws_access_key_id=access_key,
-				aws_secret_access_key=secret_key,
-				aws_session_token=session_token,
-			)
+			client_params = {
+				'service_name': 'bedrock-runtime',
+				'region_name': region,
+				'aws_access_key_id': access_key,
+				'aws_secret_access_key': secret_key,
+				'aws_session_token': session_token,
+			}
+			return get_shared_client(self.provider, client_params, lambda: AwsClient(**client_params))
 
 	@property
 	def name(self) -> str:
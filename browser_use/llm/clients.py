@@ -0,0 +1,163 @@
+"""
+Process-wide registry of long-lived LLM SDK clients.
+
+Creating a new SDK client per request means a new connection pool, a fresh TCP + TLS handshake for every call and,
+under high concurrency, ephemeral port exhaustion. Chat models fetch their client from here instead: clients are
+created once per (provider, client params, proxy environment, event loop) and reused for every later call.
+
+Clients are kept per event loop because pooled connections are bound to the loop they were opened on.
+Long-lived users (a running Agent, an AgentPool) call `retain_shared_clients()` when they start and
+`release_shared_clients()` when they close, the clients of a loop are closed once its last user released them.
+Call `aclose_shared_clients()` from the loop that used them on shutdown to close them right away.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import weakref
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass, replace
+from importlib.util import find_spec
+from typing import Any, TypeVar
+
+import httpx
+
+from browser_use.llm.scheduler import observe_rate_limit_headers
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_PROXY_ENV_VARS = ('HTTPS_PROXY', 'https_proxy', 'HTTP_PROXY', 'http_proxy', 'ALL_PROXY', 'all_proxy', 'NO_PROXY', 'no_proxy')
+
+
+@dataclass(frozen=True)
+class HttpClientSettings:
+	"""Connection pool settings for the httpx clients shared by the chat models"""
+
+	max_connections: int = 100
+	max_keepalive_connections: int = 20
+	keepalive_expiry: float = 60.0  # seconds an idle connection is kept open for reuse
+	http2: bool = True  # only used when the optional `h2` package is installed (pip install "browser-use[http2]")
+
+
+_settings = HttpClientSettings()
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, Any]]' = weakref.WeakKeyDictionary()
+_users: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]' = weakref.WeakKeyDictionary()
+
+
+def configure_http_clients(**settings: Any) -> HttpClientSettings:
+	"""Update the pool settings (max_connections, max_keepalive_connections, keepalive_expiry, http2).
+
+	Only clients created afterwards use the new settings.
+	"""
+	global _settings
+	_settings = replace(_settings, **settings)
+	return _settings
+
+
+def create_http_client(**kwargs: Any) -> httpx.AsyncClient:
+	"""Create an httpx client with the shared pool limits, keep-alive and HTTP/2 settings"""
+	kwargs.setdefault(
+		'limits',
+		httpx.Limits(
+			max_connections=_settings.max_connections,
+			max_keepalive_connections=_settings.max_keepalive_connections,
+			keepalive_expiry=_settings.keepalive_expiry,
+		),
+	)
+	kwargs.setdefault('http2', _settings.http2 and find_spec('h2') is not None)
+	kwargs.setdefault('follow_redirects', True)
+	# Lets the LLMScheduler see the rate limit headers of successful responses
+	event_hooks = dict(kwargs.pop('event_hooks', None) or {})
+	event_hooks['response'] = [*event_hooks.get('response', []), _observe_rate_limit_headers]
+	return httpx.AsyncClient(event_hooks=event_hooks, **kwargs)
+
+
+def with_http_client(client_params: Mapping[str, Any]) -> dict[str, Any]:
+	"""client_params with a pooled http_client from create_http_client(), only created when the caller passed none"""
+	params = dict(client_params)
+	if 'http_client' not in params:
+		params['http_client'] = create_http_client()
+	return params
+
+
+async def _observe_rate_limit_headers(response: httpx.Response) -> None:
+	observe_rate_limit_headers(response.headers)
+
+
+def _freeze(value: Any) -> Hashable:
+	"""Turn client params into a hashable cache key"""
+	if isinstance(value, Mapping):
+		return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+	if isinstance(value, list | tuple | set | frozenset):
+		return tuple(_freeze(v) for v in value)
+	try:
+		hash(value)
+	except TypeError:
+		# e.g. httpx.Timeout, which is not hashable but has a stable repr
+		return repr(value)
+	return value
+
+
+def get_shared_client(provider: str, client_params: Mapping[str, Any], factory: Callable[[], T]) -> T:
+	"""Get the shared client for these params on the running event loop, creating it with factory() on first use.
+
+	Outside of an event loop a new client is created every time, as there is no loop its connections could live on.
+	"""
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		return factory()
+
+	key = (provider, _freeze(client_params), tuple(os.environ.get(var) for var in _PROXY_ENV_VARS))
+	loop_clients = _clients.setdefault(loop, {})
+	client = loop_clients.get(key)
+	if client is None:
+		client = factory()
+		loop_clients[key] = client
+		logger.debug(f'Created shared {provider} client ({len(loop_clients)} shared LLM clients on this event loop)')
+	return client
+
+
+def shared_client_count() -> int:
+	"""Number of shared clients on the running event loop"""
+	try:
+		return len(_clients.get(asyncio.get_running_loop(), {}))
+	except RuntimeError:
+		return 0
+
+
+async def aclose_shared_clients() -> None:
+	"""Close all shared clients of the running event loop and their connection pools"""
+	loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+	for client in loop_clients.values():
+		# genai.Client keeps its async API (and connections) on .aio
+		closers = (getattr(getattr(client, 'aio', None), 'aclose', None), getattr(client, 'close', None))
+		for close in closers:
+			if close is None:
+				continue
+			try:
+				result = close()
+				if inspect.isawaitable(result):
+					await result
+			except Exception as e:
+				logger.debug(f'Failed to close shared LLM client {type(client).__name__}: {type(e).__name__}: {e}')
+
+
+def retain_shared_clients() -> None:
+	"""Keep the shared clients of the running event loop open until the matching release_shared_clients()"""
+	loop = asyncio.get_running_loop()
+	_users[loop] = _users.get(loop, 0) + 1
+
+
+async def release_shared_clients() -> None:
+	"""Release the shared clients of the running event loop, they are closed when no other user retains them"""
+	loop = asyncio.get_running_loop()
+	users = _users.get(loop, 0) - 1
+	if users > 0:
+		_users[loop] = users
+		return
+	_users.pop(loop, None)
+	await aclose_shared_clients()
@@ -16,9 +16,11 @@ from openai import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client, with_http_client
 from browser_use.llm.deepseek.serializer import DeepSeekMessageSerializer
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeCompletion
 
@@ -48,17 +50,39 @@ class ChatDeepSeek(BaseChatModel):
 		return 'deepseek'
 
 	def _client(self) -> AsyncOpenAI:
-		return AsyncOpenAI(
-			api_key=self.api_key,
-			base_url=self.base_url,
-			timeout=self.timeout,
+		client_params = {
+			'api_key': self.api_key,
+			'base_url': self.base_url,
+			'timeout': self.timeout,
 			**(self.client_params or {}),
+		}
+		return get_shared_client(
+			self.provider,
+			client_params,
+			lambda: AsyncOpenAI(**with_http_client(client_params)),
 		)
 
 	@property
 	def name(self) -> str:
 		return self.model
 
+	@staticmethod
+	def _build_output_tools(output_format: type[BaseModel]) -> list[dict[str, Any]]:
+		"""Function tool that represents the output format, cached per output model by ainvoke"""
+		tool_name = output_format.__name__
+		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+		schema.pop('title', None)
+		return [
+			{
+				'type': 'function',
+				'function': {
+					'name': tool_name,
+					'description': f'Return a JSON object of type {tool_name}',
+					'parameters': schema,
+				},
+			}
+		]
+
 	@overload
 	async def ainvoke(
 		self,
@@ -138,18 +162,9 @@ class ChatDeepSeek(BaseChatModel):
 				tool_choice = None
 				if output_format is not None and hasattr(output_format, 'model_json_schema'):
 					tool_name = output_format.__name__
-					schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-					schema.pop('title', None)
-					call_tools = [
-						{
-							'type': 'function',
-							'function': {
-								'name': tool_name,
-								'description': f'Return a JSON object of type {tool_name}',
-								'parameters': schema,
-							},
-						}
-					]
+					call_tools = SchemaOptimizer.get_request_template(
+						output_format, ('deepseek', 'tools'), lambda: self._build_output_tools(output_format)
+					)
 					tool_choice = {'type': 'function', 'function': {'name': tool_name}}
 				resp = await client.chat.completions.create(  # type: ignore
 					model=self.model,
@@ -197,7 +212,7 @@ class ChatDeepSeek(BaseChatModel):
 				content = resp.choices[0].message.content
 				if not content:
 					raise ModelProviderError('Empty JSON content in DeepSeek response', model=self.name)
-				parsed = output_format.model_validate_json(content)
+				parsed = parse_json_output(output_format, content)
 				return ChatInvokeCompletion(
 					completion=parsed,
 					usage=None,
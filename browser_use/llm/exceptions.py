@@ -27,3 +27,12 @@ class ModelRateLimitError(ModelProviderError):
 		model: str | None = None,
 	):
 		super().__init__(message, status_code, model)
+
+
+class ModelCacheMissError(ModelError):
+	"""Exception raised when a replayed model has no recorded response for a request."""
+
+	def __init__(self, message: str, model: str | None = None):
+		super().__init__(message)
+		self.message = message
+		self.model = model
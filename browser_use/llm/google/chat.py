@@ -12,9 +12,11 @@ from google.genai.types import MediaModality
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 
@@ -118,13 +120,13 @@ class ChatGoogle(BaseChatModel):
 
 	def get_client(self) -> genai.Client:
 		"""
-		Returns a genai.Client instance.
+		Returns the shared genai.Client instance for this configuration.
 
 		Returns:
 			genai.Client: An instance of the Google genai client.
 		"""
 		client_params = self._get_client_params()
-		return genai.Client(**client_params)
+		return get_shared_client(self.provider, client_params, lambda: genai.Client(**client_params))
 
 	@property
 	def name(self) -> str:
@@ -246,9 +248,11 @@ class ChatGoogle(BaseChatModel):
 						self.logger.debug(f'🔧 Requesting structured output for {output_format.__name__}')
 						config['response_mime_type'] = 'application/json'
 						# Convert Pydantic model to Gemini-compatible schema
-						optimized_schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-						gemini_schema = self._fix_gemini_schema(optimized_schema)
+						gemini_schema = SchemaOptimizer.get_request_template(
+							output_format,
+							('google', 'response_schema'),
+							lambda: self._fix_gemini_schema(SchemaOptimizer.create_optimized_json_schema(output_format)),
+						)
 						config['response_schema'] = gemini_schema
 
 						response = await self.get_client().aio.models.generate_content(
@@ -268,19 +272,9 @@ class ChatGoogle(BaseChatModel):
 							# When using response_schema, Gemini returns JSON as text
 							if response.text:
 								try:
-									# Handle JSON wrapped in markdown code blocks (common Gemini behavior)
-									text = response.text.strip()
-									if text.startswith('```json') and text.endswith('```'):
-										text = text[7:-3].strip()
-										self.logger.debug('🔧 Stripped ```json``` wrapper from response')
-									elif text.startswith('```') and text.endswith('```'):
-										text = text[3:-3].strip()
-										self.logger.debug('🔧 Stripped ``` wrapper from response')
-
-									# Parse the JSON text and validate with the Pydantic model
-									parsed_data = json.loads(text)
+									# Handles JSON wrapped in markdown code blocks (common Gemini behavior)
 									return ChatInvokeCompletion(
-										completion=output_format.model_validate(parsed_data),
+										completion=parse_json_output(output_format, response.text),
 										usage=usage,
 									)
 								except (json.JSONDecodeError, ValueError) as e:
@@ -319,7 +313,13 @@ class ChatGoogle(BaseChatModel):
 
 						# Add JSON instruction to the last message
 						if modified_messages and isinstance(modified_messages[-1].content, str):
-							json_instruction = f'\n\nPlease respond with a valid JSON object that matches this schema: {SchemaOptimizer.create_optimized_json_schema(output_format)}'
+							json_instruction = SchemaOptimizer.get_request_template(
+								output_format,
+								('google', 'json_instruction'),
+								lambda: (
+									f'\n\nPlease respond with a valid JSON object that matches this schema: {SchemaOptimizer.create_optimized_json_schema(output_format)}'
+								),
+							)
 							modified_messages[-1].content += json_instruction
 
 						# Re-serialize with modified messages
@@ -346,19 +346,9 @@ class ChatGoogle(BaseChatModel):
 						# Try to extract JSON from the text response
 						if response.text:
 							try:
-								# Try to find JSON in the response
-								text = response.text.strip()
-
-								# Common patterns: JSON wrapped in markdown code blocks
-								if text.startswith('```json') and text.endswith('```'):
-									text = text[7:-3].strip()
-								elif text.startswith('```') and text.endswith('```'):
-									text = text[3:-3].strip()
-
-								# Parse and validate
-								parsed_data = json.loads(text)
+								# Find the JSON in the response, e.g. wrapped in markdown code blocks
 								return ChatInvokeCompletion(
-									completion=output_format.model_validate(parsed_data),
+									completion=parse_json_output(output_format, response.text),
 									usage=usage,
 								)
 							except (json.JSONDecodeError, ValueError) as e:
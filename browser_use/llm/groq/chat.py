@@ -20,10 +20,12 @@ from httpx import URL
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel, ChatInvokeCompletion
+from browser_use.llm.clients import create_http_client, get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.groq.parser import try_parse_groq_failed_generation
 from browser_use.llm.groq.serializer import GroqMessageSerializer
 from browser_use.llm.messages import BaseMessage
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeUsage
 
@@ -74,7 +76,17 @@ class ChatGroq(BaseChatModel):
 	max_retries: int = 10  # Increase default retries for automation reliability
 
 	def get_client(self) -> AsyncGroq:
-		return AsyncGroq(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout, max_retries=self.max_retries)
+		client_params = {
+			'api_key': self.api_key,
+			'base_url': self.base_url,
+			'timeout': self.timeout,
+			'max_retries': self.max_retries,
+		}
+		return get_shared_client(
+			self.provider,
+			client_params,
+			lambda: AsyncGroq(**client_params, http_client=create_http_client()),
+		)
 
 	@property
 	def provider(self) -> str:
@@ -164,7 +176,9 @@ class ChatGroq(BaseChatModel):
 
 	async def _invoke_structured_output(self, groq_messages, output_format: type[T]) -> ChatInvokeCompletion[T]:
 		"""Handle structured output using either tool calling or JSON schema."""
-		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+		schema = SchemaOptimizer.get_request_template(
+			output_format, ('groq', 'schema'), lambda: SchemaOptimizer.create_optimized_json_schema(output_format)
+		)
 
 		if self.model in ToolCallingModels:
 			response = await self._invoke_with_tool_calling(groq_messages, output_format, schema)
@@ -178,7 +192,7 @@ class ChatGroq(BaseChatModel):
 				model=self.name,
 			)
 
-		parsed_response = output_format.model_validate_json(response.choices[0].message.content)
+		parsed_response = parse_json_output(output_format, response.choices[0].message.content)
 		usage = self._get_usage(response)
 
 		return ChatInvokeCompletion(
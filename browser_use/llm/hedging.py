@@ -0,0 +1,185 @@
+"""
+Hedged and fallback invocation for chat models.
+
+A single slow completion at the tail of the latency distribution can take many times the median and stalls the whole
+agent step. ChatHedged wraps a chat model and, when a call has not finished after a latency threshold, sends a hedged
+duplicate of the request (to the same model or another provider/model). The first valid response wins and the
+other request is cancelled. When a call fails, the fallback models are tried in order.
+
+Usage:
+	llm = ChatHedged(
+		llm=ChatOpenAI(model='gpt-4.1-mini'),
+		hedge_llm=ChatAnthropic(model='claude-sonnet-4-0'),
+		fallback_llms=[ChatGoogle(model='gemini-2.5-flash')],
+	)
+	agent = Agent(task=..., llm=llm)
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, overload
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion
+
+T = TypeVar('T', bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeStats(BaseModel):
+	"""Counters of how hedged calls played out"""
+
+	calls: int = 0
+	hedges_sent: int = 0
+	hedge_wins: int = 0  # the hedged request answered first
+	primary_wins: int = 0  # the hedged request was sent, but the original one still answered first
+	fallbacks_used: int = 0
+	failures: int = 0  # calls where every model failed
+
+
+@dataclass
+class ChatHedged(BaseChatModel):
+	"""
+	Wraps a chat model with hedged requests and an ordered fallback chain.
+
+	Args:
+		llm: The primary model
+		hedge_llm: Model the hedged duplicate request is sent to, defaults to the primary model
+		hedge_after: Seconds to wait for the primary before sending the hedged request. When None, the threshold
+			is the hedge_percentile of recent primary latencies (no hedging until min_samples calls were made)
+		fallback_llms: Models tried in order when the primary (and its hedge) failed
+	"""
+
+	llm: BaseChatModel
+	hedge_llm: BaseChatModel | None = None
+	hedge_after: float | None = None
+	hedge_percentile: float = 0.9
+	min_samples: int = 10
+	min_hedge_after: float = 1.0
+	fallback_llms: list[BaseChatModel] = field(default_factory=list)
+
+	stats: HedgeStats = field(default_factory=HedgeStats)
+	_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=100), init=False, repr=False)
+
+	@property
+	def model(self) -> str:  # type: ignore[override]
+		return self.llm.model
+
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	@property
+	def name(self) -> str:
+		return self.llm.name
+
+	def get_hedge_threshold(self) -> float | None:
+		"""Seconds after which a hedged request is sent, None if hedging is not active yet"""
+		if self.hedge_after is not None:
+			return self.hedge_after
+		if len(self._latencies) < self.min_samples:
+			return None
+		cut_points = statistics.quantiles(self._latencies, n=100)
+		return max(self.min_hedge_after, cut_points[int(self.hedge_percentile * 100) - 1])
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		self.stats.calls += 1
+		try:
+			return await self._invoke_hedged(messages, output_format)
+		except Exception as primary_error:
+			last_error: Exception = primary_error
+			failed_llm = self.llm
+			for fallback_llm in self.fallback_llms:
+				logger.warning(
+					f'⚠️ {failed_llm.name} failed ({type(last_error).__name__}: {last_error}), falling back to {fallback_llm.name}'
+				)
+				self.stats.fallbacks_used += 1
+				try:
+					return await fallback_llm.ainvoke(messages, output_format)
+				except Exception as e:
+					last_error = e
+					failed_llm = fallback_llm
+
+			self.stats.failures += 1
+			raise last_error
+
+	async def _invoke_hedged(self, messages: list[BaseMessage], output_format: type[T] | None) -> Any:
+		"""Run the primary request, racing it against a hedged duplicate once it is slower than the threshold"""
+		started_at = time.monotonic()
+		primary = asyncio.create_task(self.llm.ainvoke(messages, output_format))
+		hedge: asyncio.Task | None = None
+		pending: set[asyncio.Task] = {primary}
+		errors: list[Exception] = []
+
+		try:
+			while pending:
+				threshold = self.get_hedge_threshold() if hedge is None else None
+				timeout = None if threshold is None else max(0.0, started_at + threshold - time.monotonic())
+				done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+				if not done:
+					# The primary is slower than the threshold, race it against a hedged duplicate
+					hedge_llm = self.hedge_llm or self.llm
+					logger.debug(
+						f'🏁 {self.llm.name} is slower than {threshold:.1f}s, sending a hedged request to {hedge_llm.name}'
+					)
+					self.stats.hedges_sent += 1
+					hedge = asyncio.create_task(hedge_llm.ainvoke(messages, output_format))
+					pending.add(hedge)
+					continue
+
+				for task in done:
+					if task.cancelled():
+						# Cancelled from inside the model call, task.exception() would raise the CancelledError
+						errors.append(RuntimeError(f'{"The hedged" if task is hedge else "The"} request was cancelled'))
+						continue
+					error = task.exception()
+					if error is not None:
+						assert isinstance(error, Exception)
+						errors.append(error)
+						continue
+					result = task.result()
+					if output_format is not None and not isinstance(result.completion, output_format):
+						errors.append(ValueError(f'Invalid completion of type {type(result.completion).__name__}'))
+						continue
+
+					if task is primary:
+						self._latencies.append(time.monotonic() - started_at)
+						if hedge is not None:
+							self.stats.primary_wins += 1
+					else:
+						self.stats.hedge_wins += 1
+						if not primary.done():
+							# The primary took at least this long, leaving the slow calls out would pull the threshold down
+							self._latencies.append(time.monotonic() - started_at)
+					return result
+
+				# A request failed while no hedge was sent yet, send it right away instead of waiting for the threshold
+				if not pending and hedge is None and self.hedge_llm is not None:
+					self.stats.hedges_sent += 1
+					hedge = asyncio.create_task(self.hedge_llm.ainvoke(messages, output_format))
+					pending.add(hedge)
+		finally:
+			# Cancel the losing request
+			for task in pending:
+				task.cancel()
+			if pending:
+				await asyncio.gather(*pending, return_exceptions=True)
+
+		raise errors[0]
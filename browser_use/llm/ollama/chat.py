@@ -8,9 +8,11 @@ from ollama import Options
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.views import ChatInvokeCompletion
 
 T = TypeVar('T', bound=BaseModel)
@@ -49,9 +51,13 @@ class ChatOllama(BaseChatModel):
 
 	def get_client(self) -> OllamaAsyncClient:
 		"""
-		Returns an OllamaAsyncClient client.
+		Returns the shared OllamaAsyncClient client for this configuration.
 		"""
-		return OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {})
+		return get_shared_client(
+			self.provider,
+			self._get_client_params(),
+			lambda: OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {}),
+		)
 
 	@property
 	def name(self) -> str:
@@ -89,7 +95,7 @@ class ChatOllama(BaseChatModel):
 
 				completion = response.message.content or ''
 				if output_format is not None:
-					completion = output_format.model_validate_json(completion)
+					completion = parse_json_output(output_format, completion)
 
 				return ChatInvokeCompletion(completion=completion, usage=None)
 
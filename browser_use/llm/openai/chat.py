@@ -1,4 +1,4 @@
-from collections.abc import Iterable, Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
@@ -6,17 +6,20 @@ import httpx
 from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
 from openai.types.chat import ChatCompletionContentPartTextParam
 from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.shared.chat_model import ChatModel
 from openai.types.shared_params.reasoning_effort import ReasoningEffort
 from openai.types.shared_params.response_format_json_schema import JSONSchema, ResponseFormatJSONSchema
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client, with_http_client
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage, ChatStreamChunk
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -101,19 +104,23 @@ class ChatOpenAI(BaseChatModel):
 
 	def get_client(self) -> AsyncOpenAI:
 		"""
-		Returns an AsyncOpenAI client.
+		Returns the shared AsyncOpenAI client for this configuration.
 
 		Returns:
 			AsyncOpenAI: An instance of the AsyncOpenAI client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncOpenAI(**client_params)
+		return get_shared_client(
+			self.provider,
+			client_params,
+			lambda: AsyncOpenAI(**with_http_client(client_params)),
+		)
 
 	@property
 	def name(self) -> str:
 		return str(self.model)
 
-	def _get_usage(self, response: ChatCompletion) -> ChatInvokeUsage | None:
+	def _get_usage(self, response: ChatCompletion | ChatCompletionChunk) -> ChatInvokeUsage | None:
 		if response.usage is not None:
 			completion_tokens = response.usage.completion_tokens
 			completion_token_details = response.usage.completion_tokens_details
@@ -138,6 +145,95 @@ class ChatOpenAI(BaseChatModel):
 
 		return usage
 
+	def _get_model_params(self) -> dict[str, Any]:
+		model_params: dict[str, Any] = {}
+
+		if self.temperature is not None:
+			model_params['temperature'] = self.temperature
+
+		if self.frequency_penalty is not None:
+			model_params['frequency_penalty'] = self.frequency_penalty
+
+		if self.max_completion_tokens is not None:
+			model_params['max_completion_tokens'] = self.max_completion_tokens
+
+		if self.top_p is not None:
+			model_params['top_p'] = self.top_p
+
+		if self.seed is not None:
+			model_params['seed'] = self.seed
+
+		if self.service_tier is not None:
+			model_params['service_tier'] = self.service_tier
+
+		if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
+			model_params['reasoning_effort'] = self.reasoning_effort
+			model_params.pop('temperature', None)
+			model_params.pop('frequency_penalty', None)
+
+		return model_params
+
+	def _get_response_format(self, openai_messages: list[Any], output_format: type[BaseModel]) -> ResponseFormatJSONSchema:
+		"""Structured output response format, also adds the JSON schema to the system prompt if requested"""
+		response_format: JSONSchema = SchemaOptimizer.get_request_template(
+			output_format,
+			('openai', 'response_format'),
+			lambda: {
+				'name': 'agent_output',
+				'strict': True,
+				'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
+			},
+		)
+
+		# Add JSON schema to system prompt if requested
+		if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
+			schema_text = SchemaOptimizer.get_request_template(
+				output_format, ('openai', 'schema_prompt'), lambda: f'\n<json_schema>\n{response_format}\n</json_schema>'
+			)
+			if isinstance(openai_messages[0]['content'], str):
+				openai_messages[0]['content'] += schema_text
+			elif isinstance(openai_messages[0]['content'], Iterable):
+				openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
+					ChatCompletionContentPartTextParam(text=schema_text, type='text')
+				]
+
+		return ResponseFormatJSONSchema(json_schema=response_format, type='json_schema')
+
+	def _get_provider_error(self, error: Exception) -> ModelProviderError:
+		"""Convert an OpenAI SDK error into a ModelProviderError"""
+		if isinstance(error, ModelProviderError):
+			return error
+
+		if isinstance(error, RateLimitError):
+			error_message = error.response.json().get('error', {})
+			error_message = (
+				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
+			)
+			return ModelProviderError(
+				message=error_message,
+				status_code=error.response.status_code,
+				model=self.name,
+			)
+
+		if isinstance(error, APIConnectionError):
+			return ModelProviderError(message=str(error), model=self.name)
+
+		if isinstance(error, APIStatusError):
+			try:
+				error_message = error.response.json().get('error', {})
+			except Exception:
+				error_message = error.response.text
+			error_message = (
+				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
+			)
+			return ModelProviderError(
+				message=error_message,
+				status_code=error.response.status_code,
+				model=self.name,
+			)
+
+		return ModelProviderError(message=str(error), model=self.name)
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -161,30 +257,7 @@ class ChatOpenAI(BaseChatModel):
 		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
 
 		try:
-			model_params: dict[str, Any] = {}
-
-			if self.temperature is not None:
-				model_params['temperature'] = self.temperature
-
-			if self.frequency_penalty is not None:
-				model_params['frequency_penalty'] = self.frequency_penalty
-
-			if self.max_completion_tokens is not None:
-				model_params['max_completion_tokens'] = self.max_completion_tokens
-
-			if self.top_p is not None:
-				model_params['top_p'] = self.top_p
-
-			if self.seed is not None:
-				model_params['seed'] = self.seed
-
-			if self.service_tier is not None:
-				model_params['service_tier'] = self.service_tier
-
-			if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
-				model_params['reasoning_effort'] = self.reasoning_effort
-				del model_params['temperature']
-				del model_params['frequency_penalty']
+			model_params = self._get_model_params()
 
 			if output_format is None:
 				# Return string response
@@ -201,27 +274,11 @@ class ChatOpenAI(BaseChatModel):
 				)
 
 			else:
-				response_format: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
-				}
-
-				# Add JSON schema to system prompt if requested
-				if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
-					schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
-					if isinstance(openai_messages[0]['content'], str):
-						openai_messages[0]['content'] += schema_text
-					elif isinstance(openai_messages[0]['content'], Iterable):
-						openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
-							ChatCompletionContentPartTextParam(text=schema_text, type='text')
-						]
-
 				# Return structured response
 				response = await self.get_client().chat.completions.create(
 					model=self.model,
 					messages=openai_messages,
-					response_format=ResponseFormatJSONSchema(json_schema=response_format, type='json_schema'),
+					response_format=self._get_response_format(openai_messages, output_format),
 					**model_params,
 				)
 
@@ -234,40 +291,43 @@ class ChatOpenAI(BaseChatModel):
 
 				usage = self._get_usage(response)
 
-				parsed = output_format.model_validate_json(response.choices[0].message.content)
+				parsed = parse_json_output(output_format, response.choices[0].message.content)
 
 				return ChatInvokeCompletion(
 					completion=parsed,
 					usage=usage,
 				)
 
-		except RateLimitError as e:
-			error_message = e.response.json().get('error', {})
-			error_message = (
-				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
-			)
-			raise ModelProviderError(
-				message=error_message,
-				status_code=e.response.status_code,
-				model=self.name,
-			) from e
+		except Exception as e:
+			raise self._get_provider_error(e) from e
 
-		except APIConnectionError as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[BaseModel] | None = None
+	) -> AsyncIterator[ChatStreamChunk]:
+		"""
+		Stream the completion text of the model as it is generated.
 
-		except APIStatusError as e:
-			try:
-				error_message = e.response.json().get('error', {})
-			except Exception:
-				error_message = e.response.text
-			error_message = (
-				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
+		With an output_format, the text is the JSON of the structured output. The last chunk carries the usage.
+		"""
+		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
+
+		try:
+			request_params = self._get_model_params()
+			if output_format is not None:
+				request_params['response_format'] = self._get_response_format(openai_messages, output_format)
+
+			stream = await self.get_client().chat.completions.create(
+				model=self.model,
+				messages=openai_messages,
+				stream=True,
+				stream_options={'include_usage': True},
+				**request_params,
 			)
-			raise ModelProviderError(
-				message=error_message,
-				status_code=e.response.status_code,
-				model=self.name,
-			) from e
+			async for chunk in stream:
+				delta = chunk.choices[0].delta.content if chunk.choices else None
+				usage = self._get_usage(chunk) if chunk.usage is not None else None
+				if delta or usage:
+					yield ChatStreamChunk(delta=delta or '', usage=usage)
 
 		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+			raise self._get_provider_error(e) from e
@@ -12,9 +12,11 @@ from openai.types.shared_params.response_format_json_schema import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.clients import get_shared_client, with_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openrouter.serializer import OpenRouterMessageSerializer
+from browser_use.llm.parsing import parse_json_output
 from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 
@@ -85,10 +87,12 @@ class ChatOpenRouter(BaseChatModel):
 		Returns:
 		    AsyncOpenAI: An instance of the AsyncOpenAI client with OpenRouter base URL.
 		"""
-		if not hasattr(self, '_client'):
-			client_params = self._get_client_params()
-			self._client = AsyncOpenAI(**client_params)
-		return self._client
+		client_params = self._get_client_params()
+		return get_shared_client(
+			self.provider,
+			client_params,
+			lambda: AsyncOpenAI(**with_http_client(client_params)),
+		)
 
 	@property
 	def name(self) -> str:
@@ -158,13 +162,15 @@ class ChatOpenRouter(BaseChatModel):
 
 			else:
 				# Create a JSON schema for structured output
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				response_format_schema: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': schema,
-				}
+				response_format_schema: JSONSchema = SchemaOptimizer.get_request_template(
+					output_format,
+					('openrouter', 'response_format'),
+					lambda: {
+						'name': 'agent_output',
+						'strict': True,
+						'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
+					},
+				)
 
 				# Return structured response
 				response = await self.get_client().chat.completions.create(
@@ -188,7 +194,7 @@ class ChatOpenRouter(BaseChatModel):
 					)
 				usage = self._get_usage(response)
 
-				parsed = output_format.model_validate_json(response.choices[0].message.content)
+				parsed = parse_json_output(output_format, response.choices[0].message.content)
 
 				return ChatInvokeCompletion(
 					completion=parsed,
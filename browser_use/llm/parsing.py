@@ -0,0 +1,105 @@
+"""
+Validation of the JSON text of structured model outputs.
+
+Models sometimes wrap their JSON in markdown code fences or add a sentence around it, and some leave a trailing comma
+or a raw newline inside a string. parse_json_output strips the wrapper before validating, which costs nothing when the
+output is clean, and only repairs the JSON itself when the strict parser rejects it. The TypeAdapter of every output
+type is built once and reused for every step.
+"""
+
+import functools
+import logging
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+_ESCAPED_CONTROL_CHARACTERS = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+@functools.lru_cache(maxsize=256)
+def get_type_adapter(output_type: Any) -> TypeAdapter[Any]:
+	"""Cached TypeAdapter of a type, building one validates the whole schema of the type again"""
+	return TypeAdapter(output_type)
+
+
+def extract_json(text: str) -> str:
+	"""Strip markdown code fences and text around the JSON object of a model output"""
+	text = text.strip()
+	if text.startswith('{') and text.endswith('}'):
+		return text
+
+	if text.startswith('```'):
+		# Drop the opening fence together with its language tag, e.g. ```json
+		text = text.split('\n', 1)[1] if '\n' in text else text[3:]
+		text = text.rstrip()
+		if text.endswith('```'):
+			text = text[:-3]
+		text = text.strip()
+
+	start = text.find('{')
+	end = text.rfind('}')
+	if start != -1 and end > start:
+		return text[start : end + 1]
+	return text
+
+
+def repair_json(text: str) -> str:
+	"""Remove trailing commas and escape raw control characters inside strings"""
+	repaired: list[str] = []
+	in_string = False
+	escape = False
+
+	for char in text:
+		if in_string:
+			if escape:
+				escape = False
+			elif char == '\\':
+				escape = True
+			elif char == '"':
+				in_string = False
+			elif char in _ESCAPED_CONTROL_CHARACTERS:
+				repaired.append(_ESCAPED_CONTROL_CHARACTERS[char])
+				continue
+			repaired.append(char)
+			continue
+
+		if char == '"':
+			in_string = True
+		elif char in '}]':
+			end = len(repaired) - 1
+			while end >= 0 and repaired[end].isspace():
+				end -= 1
+			if end >= 0 and repaired[end] == ',':
+				del repaired[end]
+		repaired.append(char)
+
+	return ''.join(repaired)
+
+
+def parse_json_output(output_format: type[T], text: str) -> T:
+	"""
+	Validate the JSON text of a structured model output.
+
+	Raises the ValidationError of the original text if the JSON can't be repaired.
+	"""
+	adapter = get_type_adapter(output_format)
+	text = extract_json(text)
+
+	try:
+		return adapter.validate_json(text)
+	except ValidationError as e:
+		if not any(error['type'] == 'json_invalid' for error in e.errors()):
+			raise
+		repaired = repair_json(text)
+		if repaired == text:
+			raise
+		try:
+			parsed = adapter.validate_json(repaired)
+		except ValidationError:
+			raise e
+		logger.debug('🔧 Repaired malformed JSON in model output')
+		return parsed
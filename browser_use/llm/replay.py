@@ -0,0 +1,205 @@
+"""
+Deterministic record/replay cache for chat models.
+
+Re-running an agent task for debugging, regression tests or benchmarks pays the full latency and cost of every LLM
+call again. ChatReplay wraps a chat model and stores its responses in a local SQLite file, keyed on the normalized
+request: the model, the messages and the schema of the output format. Replayed responses keep their original usage,
+so TokenCost accounting reports the same tokens as the recorded run.
+
+Modes:
+	record: always call the model and store the response, replacing a stored one
+	replay: only answer from the cache, a request that was not recorded raises ModelCacheMissError
+	record_missing: answer from the cache, call the model and store the response for requests that were not recorded
+
+Usage:
+	llm = ChatReplay(llm=ChatOpenAI(model='gpt-4.1-mini'), cache_path='llm_cache.sqlite', mode='record_missing')
+	agent = Agent(task=..., llm=llm)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal, TypeVar, overload
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelCacheMissError
+from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam
+from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.views import ChatInvokeCompletion
+
+T = TypeVar('T', bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+ReplayMode = Literal['record', 'replay', 'record_missing']
+
+# The agent state message contains the current date, which would make every recording expire the next day
+_CURRENT_DATE_PATTERN = re.compile(r'Current date: \d{4}-\d{2}-\d{2}')
+
+
+def normalize_text(text: str) -> str:
+	"""Default normalization of message text for the cache key: masks the current date and trailing whitespace"""
+	text = _CURRENT_DATE_PATTERN.sub('Current date: <date>', text)
+	return '\n'.join(line.rstrip() for line in text.strip().splitlines())
+
+
+class ReplayStats(BaseModel):
+	"""Counters of how requests were answered"""
+
+	calls: int = 0
+	hits: int = 0  # answered from the cache
+	misses: int = 0  # not in the cache
+	recorded: int = 0  # responses stored
+
+
+@dataclass
+class ChatReplay(BaseChatModel):
+	"""
+	Wraps a chat model with a local record/replay cache of its responses.
+
+	Args:
+		llm: The model to call for requests that are recorded
+		cache_path: SQLite file the responses are stored in, created if it doesn't exist
+		mode: 'record', 'replay' or 'record_missing'
+		ignore_images: Leave images out of the cache key, so recordings replay although screenshots differ
+		normalize: Normalization applied to every text of the request before it is hashed, None to hash texts as is
+	"""
+
+	llm: BaseChatModel
+	cache_path: str | Path = 'llm_cache.sqlite'
+	mode: ReplayMode = 'record_missing'
+	ignore_images: bool = False
+	normalize: Callable[[str], str] | None = normalize_text
+
+	stats: ReplayStats = field(default_factory=ReplayStats)
+	_connection: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+	# The queries run in worker threads off the event loop, one at a time on the shared connection
+	_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+	@property
+	def model(self) -> str:  # type: ignore[override]
+		return self.llm.model
+
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	@property
+	def name(self) -> str:
+		return self.llm.name
+
+	def _get_connection(self) -> sqlite3.Connection:
+		if self._connection is None:
+			Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+			self._connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+			self._connection.execute('PRAGMA journal_mode=WAL')
+			self._connection.execute(
+				'CREATE TABLE IF NOT EXISTS responses ('
+				'key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)'
+			)
+		return self._connection
+
+	def close(self) -> None:
+		with self._lock:
+			if self._connection is not None:
+				self._connection.close()
+				self._connection = None
+
+	def get_cache_key(self, messages: list[BaseMessage], output_format: type[BaseModel] | None = None) -> str:
+		"""Hash of the normalized request"""
+		request = {
+			'provider': self.llm.provider,
+			'model': self.llm.model,
+			'messages': [self._normalize_message(message) for message in messages],
+			'output_schema': self._get_schema_hash(output_format) if output_format is not None else None,
+		}
+		return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+	@staticmethod
+	def _get_schema_hash(output_format: type[BaseModel]) -> str:
+		return SchemaOptimizer.get_request_template(
+			output_format,
+			('replay', 'schema_hash'),
+			lambda: hashlib.sha256(json.dumps(output_format.model_json_schema(), sort_keys=True).encode()).hexdigest(),
+		)
+
+	def _normalize_text(self, text: str) -> str:
+		return self.normalize(text) if self.normalize else text
+
+	def _normalize_message(self, message: BaseMessage) -> dict[str, Any]:
+		# Cache breakpoints don't change the answer
+		data = message.model_dump(mode='json', exclude_none=True, exclude={'cache'})
+		content = getattr(message, 'content', None)
+		if isinstance(content, str):
+			data['content'] = self._normalize_text(content)
+		elif isinstance(content, list):
+			parts: list[Any] = []
+			for part in content:
+				if isinstance(part, ContentPartTextParam):
+					parts.append(self._normalize_text(part.text))
+				elif isinstance(part, ContentPartImageParam):
+					if not self.ignore_images:
+						parts.append({'image': hashlib.sha256(part.image_url.url.encode()).hexdigest()})
+				else:
+					parts.append(part.model_dump(mode='json', exclude_none=True))
+			data['content'] = parts
+		return data
+
+	def _load(self, key: str, output_format: type[T] | None) -> ChatInvokeCompletion[Any] | None:
+		with self._lock:
+			row = self._get_connection().execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+		if row is None:
+			return None
+		data = json.loads(row[0])
+		completion = output_format.model_validate(data['completion']) if output_format is not None else data['completion']
+		return ChatInvokeCompletion(**{**data, 'completion': completion})
+
+	def _store(self, key: str, response: ChatInvokeCompletion[Any]) -> None:
+		data = response.model_dump(mode='json')
+		with self._lock:
+			connection = self._get_connection()
+			connection.execute(
+				'INSERT OR REPLACE INTO responses (key, model, response, created_at) VALUES (?, ?, ?, ?)',
+				(key, self.llm.model, json.dumps(data, ensure_ascii=False), time.time()),
+			)
+			connection.commit()
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		self.stats.calls += 1
+		key = self.get_cache_key(messages, output_format)
+
+		if self.mode != 'record':
+			# SQLite reads and the commits of _store block, they run in a worker thread instead of on the event loop
+			cached = await asyncio.to_thread(self._load, key, output_format)
+			if cached is not None:
+				self.stats.hits += 1
+				logger.debug(f'💾 Replaying recorded {self.llm.name} response {key[:12]}')
+				return cached
+			self.stats.misses += 1
+			if self.mode == 'replay':
+				raise ModelCacheMissError(
+					f'No recorded response for request {key[:12]} in {self.cache_path}', model=self.llm.model
+				)
+
+		response = await self.llm.ainvoke(messages, output_format)
+		await asyncio.to_thread(self._store, key, response)
+		self.stats.recorded += 1
+		return response
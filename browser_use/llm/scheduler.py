@@ -0,0 +1,500 @@
+"""
+Central scheduler for LLM requests shared by all agents in a process.
+
+Without coordination every agent fires its LLM calls independently, so a fleet of agents bursts past the provider's
+rate limits and every agent then backs off on its own. The scheduler queues calls per provider/model lane and only
+lets them through when:
+
+- the lane's requests/minute and tokens/minute token buckets have capacity (tokens estimated from the messages,
+  then corrected with the real usage once the response arrives)
+- fewer than max_concurrency calls of the lane are in flight
+
+Queued calls are served by priority lane (high before normal before low), FIFO within a priority.
+When a call is rate limited (429) the lane pauses for the provider's retry-after / x-ratelimit-reset headers and its
+rate and concurrency are halved, recovering gradually with every successful call. The rate limit headers of successful
+responses (x-ratelimit-remaining-*, anthropic-ratelimit-*-remaining) are read too, so a lane slows down while the
+provider reports its limit as nearly used up and pauses until the reset when nothing is left, before any 429 arrives.
+
+Usage:
+	scheduler = get_llm_scheduler()
+	scheduler.set_limits('openai:gpt-4.1-mini', RateLimits(requests_per_minute=500, tokens_per_minute=200_000))
+	agent = Agent(task=..., llm=llm, llm_scheduler=scheduler)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.messages import BaseMessage, ContentPartImageParam
+
+logger = logging.getLogger(__name__)
+
+Priority = Literal['high', 'normal', 'low']
+_PRIORITY_RANK: dict[str, int] = {'high': 0, 'normal': 1, 'low': 2}
+
+# Rough token costs used for the pre-call estimate, corrected with the real usage afterwards
+_CHARS_PER_TOKEN = 4
+_TOKENS_PER_MESSAGE = 4
+_TOKENS_PER_IMAGE = 850
+
+_MIN_SLOWDOWN = 1 / 16
+_SLOWDOWN_RECOVERY = 1.1  # multiplicative recovery per successful call
+_DEFAULT_RATE_LIMIT_PAUSE = 5.0  # seconds a lane pauses after a 429 without usable headers
+_MAX_RATE_LIMIT_PAUSE = 120.0
+_LOW_HEADROOM = 0.1  # share of the provider's limit left below which a lane slows down
+_LOW_HEADROOM_SLOWDOWN = 0.8  # multiplicative slowdown per successful call while the headroom is low
+
+# (limit, remaining, reset) headers of the providers' requests and tokens limits
+_RATE_LIMIT_HEADERS = [
+	(f'x-ratelimit-limit-{kind}', f'x-ratelimit-remaining-{kind}', f'x-ratelimit-reset-{kind}') for kind in ('requests', 'tokens')
+] + [
+	(f'anthropic-ratelimit-{kind}-limit', f'anthropic-ratelimit-{kind}-remaining', f'anthropic-ratelimit-{kind}-reset')
+	for kind in ('requests', 'tokens', 'input-tokens', 'output-tokens')
+]
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+@dataclass
+class RateLimits:
+	"""Limits of one provider/model lane, None means unlimited"""
+
+	requests_per_minute: float | None = None
+	tokens_per_minute: float | None = None
+	max_concurrency: int | None = None
+
+
+class SchedulerLaneStats(BaseModel):
+	"""Queue depth and wait time metrics of one provider/model lane"""
+
+	lane: str
+	queue_depth: int
+	in_flight: int
+	requests: int
+	rate_limited: int
+	total_wait_seconds: float
+	max_wait_seconds: float
+	slowdown: float  # 1.0 = configured rate, lower after rate limit errors
+
+	@property
+	def avg_wait_seconds(self) -> float:
+		return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+def estimate_tokens(messages: list[BaseMessage]) -> int:
+	"""Cheap estimate of the prompt tokens of the messages (about 4 characters per token plus a flat cost per image)"""
+	tokens = 0
+	for message in messages:
+		tokens += _TOKENS_PER_MESSAGE + len(message.text) // _CHARS_PER_TOKEN
+		if isinstance(message.content, list):
+			tokens += _TOKENS_PER_IMAGE * sum(isinstance(part, ContentPartImageParam) for part in message.content)
+	return tokens
+
+
+def _parse_duration(value: str) -> float | None:
+	"""Parse rate limit reset durations like '20ms', '1.5s' or '6m0s' into seconds"""
+	try:
+		return float(value)
+	except ValueError:
+		pass
+	parts = _DURATION_PART.findall(value)
+	if not parts:
+		return None
+	multipliers = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+	return sum(float(amount) * multipliers[unit] for amount, unit in parts)
+
+
+def _retry_after_from_headers(headers: Any) -> float | None:
+	"""Seconds until the provider accepts requests again according to the rate limit response headers"""
+	if value := headers.get('retry-after-ms'):
+		try:
+			return float(value) / 1000
+		except ValueError:
+			pass
+
+	if value := headers.get('retry-after'):
+		try:
+			return float(value)
+		except ValueError:
+			try:
+				return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+			except (TypeError, ValueError):
+				pass
+
+	resets = [
+		_parse_duration(value)
+		for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+		if (value := headers.get(name))
+	]
+	resets = [reset for reset in resets if reset is not None]
+	return max(resets) if resets else None
+
+
+def _parse_reset(value: str) -> float | None:
+	"""Seconds until a rate limit resets, from a duration (OpenAI, Groq) or an RFC 3339 timestamp (Anthropic)"""
+	seconds = _parse_duration(value)
+	if seconds is not None:
+		return seconds
+	try:
+		return max(0.0, datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() - time.time())
+	except ValueError:
+		return None
+
+
+def _headroom_from_headers(headers: Any) -> tuple[float | None, float | None]:
+	"""Smallest share of a rate limit the provider reports as remaining, and the seconds until it resets if it is used up"""
+	headroom = None
+	exhausted_for = None
+	for limit_header, remaining_header, reset_header in _RATE_LIMIT_HEADERS:
+		try:
+			limit, remaining = float(headers[limit_header]), float(headers[remaining_header])
+		except (KeyError, ValueError):
+			continue
+		if limit <= 0:
+			continue
+		headroom = min(headroom if headroom is not None else 1.0, remaining / limit)
+		if remaining <= 0 and (reset := headers.get(reset_header)):
+			reset_in = _parse_reset(reset)
+			if reset_in is not None:
+				exhausted_for = max(exhausted_for or 0.0, reset_in)
+	return headroom, exhausted_for
+
+
+def _rate_limit_info(error: BaseException) -> tuple[bool, float | None]:
+	"""Whether the error is a rate limit error, and the retry-after from the SDK error it was raised from"""
+	is_rate_limited = isinstance(error, ModelProviderError) and error.status_code == 429
+	retry_after = None
+
+	# Provider wrappers raise ModelProviderError from the SDK error, which carries the HTTP response
+	current: BaseException | None = error
+	while current is not None:
+		response = getattr(current, 'response', None)
+		if response is not None and getattr(response, 'status_code', None) == 429:
+			is_rate_limited = True
+			headers = getattr(response, 'headers', None)
+			if headers is not None:
+				retry_after = _retry_after_from_headers(headers)
+			break
+		current = current.__cause__ or current.__context__
+
+	return is_rate_limited, retry_after
+
+
+class _TokenBucket:
+	"""Token bucket holding up to one minute worth of capacity, may go into debt when usage was underestimated"""
+
+	def __init__(self, per_minute: float) -> None:
+		self.per_minute = per_minute
+		self.level = per_minute
+		self.updated_at = time.monotonic()
+
+	def _refill(self, now: float, slowdown: float) -> None:
+		self.level = min(self.per_minute, self.level + (now - self.updated_at) * self.per_minute * slowdown / 60)
+		self.updated_at = now
+
+	def wait_time(self, amount: float, now: float, slowdown: float) -> float:
+		self._refill(now, slowdown)
+		# Requests larger than the whole bucket are let through once it is full instead of waiting forever
+		missing = min(amount, self.per_minute) - self.level
+		return max(0.0, missing * 60 / (self.per_minute * slowdown))
+
+	def consume(self, amount: float, now: float, slowdown: float) -> None:
+		self._refill(now, slowdown)
+		self.level -= amount
+
+
+@dataclass(order=True)
+class _Waiter:
+	rank: int
+	seq: int
+	tokens: int = field(compare=False)
+	event: asyncio.Event | None = field(default=None, compare=False)
+
+	def wake(self) -> None:
+		if self.event is not None:
+			self.event.set()
+
+
+class _Lane:
+	def __init__(self, name: str, limits: RateLimits) -> None:
+		self.name = name
+		self.limits = limits
+		self.requests_bucket = _TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+		self.tokens_bucket = _TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+		self.queue: list[_Waiter] = []
+		self.in_flight = 0
+		self.slowdown = 1.0
+		self.paused_until = 0.0
+		self.headroom: float | None = None  # share of the provider's limit left, from the last response headers
+
+		self.requests = 0
+		self.rate_limited = 0
+		self.total_wait = 0.0
+		self.max_wait = 0.0
+
+	@property
+	def max_concurrency(self) -> int | None:
+		if self.limits.max_concurrency is None:
+			return None
+		return max(1, int(self.limits.max_concurrency * self.slowdown))
+
+	def ready_in(self, waiter: _Waiter, now: float) -> float | None:
+		"""Seconds until the waiter may start, None if it has to wait for another call to finish first"""
+		if self.queue[0] is not waiter:
+			return None
+		max_concurrency = self.max_concurrency
+		if max_concurrency is not None and self.in_flight >= max_concurrency:
+			return None
+
+		delay = self.paused_until - now
+		if self.requests_bucket is not None:
+			delay = max(delay, self.requests_bucket.wait_time(1, now, self.slowdown))
+		if self.tokens_bucket is not None:
+			delay = max(delay, self.tokens_bucket.wait_time(waiter.tokens, now, self.slowdown))
+		return max(0.0, delay)
+
+	def start(self, waiter: _Waiter, now: float) -> None:
+		heapq.heappop(self.queue)
+		self.in_flight += 1
+		if self.requests_bucket is not None:
+			self.requests_bucket.consume(1, now, self.slowdown)
+		if self.tokens_bucket is not None:
+			self.tokens_bucket.consume(waiter.tokens, now, self.slowdown)
+		self.wake_next()
+
+	def remove(self, waiter: _Waiter) -> None:
+		if waiter in self.queue:
+			self.queue.remove(waiter)
+			heapq.heapify(self.queue)
+		self.wake_next()
+
+	def wake_next(self) -> None:
+		if self.queue:
+			self.queue[0].wake()
+
+	def stats(self) -> SchedulerLaneStats:
+		return SchedulerLaneStats(
+			lane=self.name,
+			queue_depth=len(self.queue),
+			in_flight=self.in_flight,
+			requests=self.requests,
+			rate_limited=self.rate_limited,
+			total_wait_seconds=self.total_wait,
+			max_wait_seconds=self.max_wait,
+			slowdown=self.slowdown,
+		)
+
+
+# Lane of the scheduled call running in the current task, for the response hook of the shared HTTP clients
+_current_lane: ContextVar[_Lane | None] = ContextVar('llm_scheduler_lane', default=None)
+
+
+def observe_rate_limit_headers(headers: Any) -> None:
+	"""Record the rate limit headers of a provider response on the lane of the scheduled call it belongs to"""
+	lane = _current_lane.get()
+	if lane is None:
+		return
+	headroom, exhausted_for = _headroom_from_headers(headers)
+	if headroom is None:
+		return
+	lane.headroom = headroom if lane.headroom is None else min(lane.headroom, headroom)
+	if exhausted_for is not None:
+		pause = min(_MAX_RATE_LIMIT_PAUSE, exhausted_for)
+		lane.paused_until = max(lane.paused_until, time.monotonic() + pause)
+		logger.warning(f'🚦 Rate limit of {lane.name} used up, pausing the lane for {pause:.1f}s until it resets')
+
+
+class LLMScheduler:
+	"""Schedules the ainvoke and astream calls of registered LLMs through rate limited, prioritized provider/model lanes"""
+
+	def __init__(self, default_limits: RateLimits | None = None, limits: dict[str, RateLimits] | None = None):
+		"""
+		Args:
+			default_limits: Limits for lanes without a specific entry in limits
+			limits: Limits by 'provider:model' or by 'provider', the more specific key wins
+		"""
+		self.default_limits = default_limits or RateLimits()
+		self.limits: dict[str, RateLimits] = dict(limits or {})
+		self._lanes: dict[str, _Lane] = {}
+		# By id, chat models are unhashable dataclasses. Weak, so the id of a collected llm can be reused
+		self._registered_llms: weakref.WeakValueDictionary[int, BaseChatModel] = weakref.WeakValueDictionary()
+		self._seq = itertools.count()
+
+	def set_limits(self, key: str, limits: RateLimits) -> None:
+		"""Set the limits for a 'provider:model' or 'provider' key, resets the affected lanes"""
+		self.limits[key] = limits
+		for lane_name in list(self._lanes):
+			if lane_name == key or lane_name.startswith(f'{key}:'):
+				lane = self._lanes[lane_name]
+				if not lane.queue and not lane.in_flight:
+					del self._lanes[lane_name]
+
+	def _get_lane(self, provider: str, model: str) -> _Lane:
+		name = f'{provider}:{model}'
+		lane = self._lanes.get(name)
+		if lane is None:
+			limits = self.limits.get(name) or self.limits.get(provider) or self.default_limits
+			lane = self._lanes[name] = _Lane(name, limits)
+		return lane
+
+	async def _acquire(self, lane: _Lane, tokens: int, priority: Priority) -> None:
+		waiter = _Waiter(_PRIORITY_RANK[priority], next(self._seq), tokens)
+		heapq.heappush(lane.queue, waiter)
+		enqueued_at = time.monotonic()
+		try:
+			while True:
+				now = time.monotonic()
+				delay = lane.ready_in(waiter, now)
+				if delay == 0:
+					lane.start(waiter, now)
+					break
+				waiter.event = asyncio.Event()
+				try:
+					await asyncio.wait_for(waiter.event.wait(), timeout=delay)
+				except TimeoutError:
+					pass
+		except BaseException:
+			lane.remove(waiter)
+			raise
+
+		wait = time.monotonic() - enqueued_at
+		lane.requests += 1
+		lane.total_wait += wait
+		lane.max_wait = max(lane.max_wait, wait)
+		if wait > 1:
+			logger.debug(f'⏳ LLM call waited {wait:.1f}s in scheduler lane {lane.name} ({len(lane.queue)} still queued)')
+
+	def _release(self, lane: _Lane, estimated_tokens: int, result: Any = None, error: BaseException | None = None) -> None:
+		lane.in_flight -= 1
+		now = time.monotonic()
+
+		if error is not None:
+			is_rate_limited, retry_after = _rate_limit_info(error)
+			if is_rate_limited:
+				lane.rate_limited += 1
+				lane.slowdown = max(_MIN_SLOWDOWN, lane.slowdown / 2)
+				pause = min(_MAX_RATE_LIMIT_PAUSE, retry_after if retry_after is not None else _DEFAULT_RATE_LIMIT_PAUSE)
+				lane.paused_until = max(lane.paused_until, now + pause)
+				logger.warning(
+					f'🚦 Rate limited on {lane.name}, pausing the lane for {pause:.1f}s and slowing it down to {lane.slowdown:.0%}'
+				)
+		else:
+			if lane.headroom is not None and lane.headroom < _LOW_HEADROOM:
+				# The provider reports its limit as nearly used up, slow down before it answers with 429s
+				lane.slowdown = max(_MIN_SLOWDOWN, lane.slowdown * _LOW_HEADROOM_SLOWDOWN)
+				logger.debug(
+					f'🚦 {lane.headroom:.0%} of the rate limit of {lane.name} left, slowing the lane down to {lane.slowdown:.0%}'
+				)
+			else:
+				lane.slowdown = min(1.0, lane.slowdown * _SLOWDOWN_RECOVERY)
+			usage = getattr(result, 'usage', None)
+			if usage is not None and lane.tokens_bucket is not None:
+				# Correct the token bucket with the real usage, the estimate only covered the prompt
+				lane.tokens_bucket.consume(usage.total_tokens - estimated_tokens, now, lane.slowdown)
+
+		lane.headroom = None
+		lane.wake_next()
+
+	async def run(
+		self, llm: BaseChatModel, ainvoke: Any, messages: list[BaseMessage], output_format: Any, priority: Priority
+	) -> Any:
+		"""Run one ainvoke call through the lane of the llm"""
+		lane = self._get_lane(llm.provider, str(llm.model))
+		tokens = estimate_tokens(messages)
+		await self._acquire(lane, tokens, priority)
+		token = _current_lane.set(lane)
+		try:
+			result = await ainvoke(messages, output_format)
+		except BaseException as e:
+			self._release(lane, tokens, error=e)
+			raise
+		finally:
+			_current_lane.reset(token)
+		self._release(lane, tokens, result=result)
+		return result
+
+	async def stream(
+		self, llm: BaseChatModel, astream: Any, messages: list[BaseMessage], output_format: Any, priority: Priority
+	) -> AsyncIterator[Any]:
+		"""Run one astream call through the lane of the llm, the call counts as in flight until the stream ends"""
+		lane = self._get_lane(llm.provider, str(llm.model))
+		tokens = estimate_tokens(messages)
+		await self._acquire(lane, tokens, priority)
+		usage_chunk = None
+		chunks = astream(messages, output_format).__aiter__()
+		try:
+			while True:
+				# Only while the stream is read, the consumer runs between the chunks
+				token = _current_lane.set(lane)
+				try:
+					chunk = await chunks.__anext__()
+				except StopAsyncIteration:
+					break
+				finally:
+					_current_lane.reset(token)
+				if chunk.usage is not None:
+					usage_chunk = chunk
+				yield chunk
+		except BaseException as e:
+			self._release(lane, tokens, error=e)
+			raise
+		self._release(lane, tokens, result=usage_chunk)
+
+	def register_llm(self, llm: BaseChatModel, priority: Priority = 'normal') -> BaseChatModel:
+		"""
+		Route all ainvoke and astream calls of the llm through the scheduler
+
+		@dev Guarantees that the same instance is not registered multiple times
+		"""
+		if self._registered_llms.get(id(llm)) is llm:
+			return llm
+		self._registered_llms[id(llm)] = llm
+
+		original_ainvoke = llm.ainvoke
+		scheduler = self
+
+		async def scheduled_ainvoke(messages, output_format=None):
+			return await scheduler.run(llm, original_ainvoke, messages, output_format, priority)
+
+		# Using setattr to avoid type checking issues with overloaded methods
+		setattr(llm, 'ainvoke', scheduled_ainvoke)
+
+		original_astream = getattr(llm, 'astream', None)
+		if original_astream is not None:
+
+			async def scheduled_astream(messages, output_format=None):
+				async for chunk in scheduler.stream(llm, original_astream, messages, output_format, priority):
+					yield chunk
+
+			setattr(llm, 'astream', scheduled_astream)
+
+		return llm
+
+	def get_stats(self) -> list[SchedulerLaneStats]:
+		"""Queue depth, in-flight calls and wait times of every lane"""
+		return [lane.stats() for lane in self._lanes.values()]
+
+
+_default_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+	"""The process-wide scheduler, so that all agents in a process share the same lanes"""
+	global _default_scheduler
+	if _default_scheduler is None:
+		_default_scheduler = LLMScheduler()
+	return _default_scheduler
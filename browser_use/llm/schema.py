@@ -1,25 +1,86 @@
 """
 Utilities for creating optimized Pydantic schemas for LLM usage.
+
+Walking the JSON schema of the dynamic AgentOutput model gets expensive with many registered actions, and the output
+model stays the same for every step of an agent. The optimized schema and the provider-specific request payloads built
+from it (tool params, response formats, schema prompt text) are therefore cached per output model class.
 """
 
-from typing import Any
+import copy
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
 
 from pydantic import BaseModel
 
+T = TypeVar('T')
+
+
+class SchemaCacheStats(BaseModel):
+	"""Hit/miss counters of the schema and request template cache"""
+
+	hits: int = 0
+	misses: int = 0
+
+
+# Keyed by the output model class, so the entries of dynamic AgentOutput models go away together with the model
+_template_cache: 'weakref.WeakKeyDictionary[type[BaseModel], dict[Hashable, Any]]' = weakref.WeakKeyDictionary()
+_cache_stats = SchemaCacheStats()
+
+
+def get_schema_cache_stats() -> SchemaCacheStats:
+	"""Copy of the current cache counters"""
+	return _cache_stats.model_copy()
+
+
+def clear_schema_cache() -> None:
+	"""Drop all cached schemas and request templates and reset the counters"""
+	global _cache_stats
+	_template_cache.clear()
+	_cache_stats = SchemaCacheStats()
+
 
 class SchemaOptimizer:
+	@staticmethod
+	def get_request_template(model: type[BaseModel], key: Hashable, build: Callable[[], T]) -> T:
+		"""
+		Get a cached value derived from the schema of model, creating it with build() on first use.
+
+		Providers use this for their request payloads, e.g. key=('openai', 'response_format').
+		The returned object is shared between calls and must not be modified.
+		"""
+		templates = _template_cache.setdefault(model, {})
+		if key in templates:
+			_cache_stats.hits += 1
+			return templates[key]
+
+		_cache_stats.misses += 1
+		value = build()
+		templates[key] = value
+		return value
+
 	@staticmethod
 	def create_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		"""
 		Create the most optimized schema by flattening all $ref/$defs while preserving
 		FULL descriptions and ALL action definitions. Also ensures OpenAI strict mode compatibility.
 
+		The schema is only computed once per model, every call returns a fresh copy that can be modified.
+
 		Args:
 			model: The Pydantic model to optimize
 
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		schema = SchemaOptimizer.get_request_template(
+			model, 'optimized_schema', lambda: SchemaOptimizer._build_optimized_json_schema(model)
+		)
+		return copy.deepcopy(schema)
+
+	@staticmethod
+	def _build_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+		"""Build the optimized schema of create_optimized_json_schema without the cache"""
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
@@ -43,3 +43,15 @@ class ChatInvokeCompletion(BaseModel, Generic[T]):
 
 	usage: ChatInvokeUsage | None
 	"""The usage of the response."""
+
+
+class ChatStreamChunk(BaseModel):
+	"""
+	A chunk of a streamed chat model completion.
+	"""
+
+	delta: str = ''
+	"""The text generated since the previous chunk."""
+
+	usage: ChatInvokeUsage | None = None
+	"""The usage of the whole response, only set on the last chunk."""
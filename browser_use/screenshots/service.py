@@ -2,45 +2,103 @@
 Screenshot storage service for browser-use agents.
 """
 
+import asyncio
 import base64
+import hashlib
+import io
+import logging
+from collections import OrderedDict
 from pathlib import Path
+from typing import Literal
 
 import anyio
 
 from browser_use.observability import observe_debug
 
+logger = logging.getLogger(__name__)
+
+ScreenshotFormat = Literal['png', 'webp', 'jpeg']
+
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Content-addressed screenshot store that saves screenshots to disk.
+
+	Screenshots are named by the hash of their content, so identical consecutive screenshots (idle pages, retries)
+	are only written once and every step just references the same file. Writes happen in a background task in
+	batches, off the step's critical path, and recently used base64 payloads are kept in a small in-memory LRU.
+	"""
 
-	def __init__(self, agent_directory: str | Path):
-		"""Initialize with agent directory path"""
+	def __init__(
+		self,
+		agent_directory: str | Path,
+		image_format: ScreenshotFormat = 'png',
+		quality: int = 80,
+		cache_size: int = 16,
+	):
+		"""Initialize with agent directory path
+
+		Args:
+			agent_directory: Directory the screenshots/ subdirectory is created in
+			image_format: Format screenshots are stored in, webp/jpeg re-encode the PNG screenshot to save disk space
+			quality: Encoder quality (1-100) used for webp/jpeg
+			cache_size: Number of recently used base64 payloads kept in memory
+		"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.image_format: ScreenshotFormat = image_format
+		self.quality = quality
+		self.cache_size = cache_size
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+		# step number -> path of the (possibly shared) screenshot file for that step
+		self.step_screenshots: dict[int, str] = {}
+
+		self._cache: OrderedDict[str, str] = OrderedDict()
+		self._pending: dict[str, str] = {}  # path -> base64 PNG payload waiting to be written
+		self._written: set[str] = set()
+		self._writer_task: asyncio.Task | None = None
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
+		"""Queue screenshot to be written to disk and return the full path as string
+
+		The file is written in the background, call flush() before reading it directly from disk.
+		"""
+		digest = hashlib.sha256(screenshot_b64.encode()).hexdigest()[:32]
+		screenshot_path = str(self.screenshots_dir / f'{digest}.{self.image_format}')
+		self.step_screenshots[step_number] = screenshot_path
 
-		# Decode base64 and save to disk
-		screenshot_data = base64.b64decode(screenshot_b64)
+		if screenshot_path in self._written or screenshot_path in self._pending:
+			logger.debug(f'📸 Screenshot for step {step_number} is identical to an already stored one, reusing {screenshot_path}')
+			return screenshot_path
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
-			await f.write(screenshot_data)
+		self._pending[screenshot_path] = screenshot_b64
+		if self.image_format == 'png':
+			# The stored file will be byte-identical to the payload, so it can be served from memory right away
+			self._cache_put(screenshot_path, screenshot_b64)
 
-		return str(screenshot_path)
+		if self._writer_task is None or self._writer_task.done():
+			self._writer_task = asyncio.create_task(self._write_pending(), name='screenshot_service_writer')
+
+		return screenshot_path
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_screenshot_from_disk')
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
-		"""Load screenshot from disk path and return as base64"""
+		"""Load screenshot from memory or disk path and return as base64"""
 		if not screenshot_path:
 			return None
 
+		cached = self._cache.get(screenshot_path)
+		if cached is not None:
+			self._cache.move_to_end(screenshot_path)
+			return cached
+
+		pending = self._pending.get(screenshot_path)
+		if pending is not None:
+			return pending
+
 		path = Path(screenshot_path)
 		if not path.exists():
 			return None
@@ -49,4 +107,64 @@ class ScreenshotService:
 		async with await anyio.open_file(path, 'rb') as f:
 			screenshot_data = await f.read()
 
-		return base64.b64encode(screenshot_data).decode('utf-8')
+		screenshot_b64 = base64.b64encode(screenshot_data).decode('utf-8')
+		self._cache_put(screenshot_path, screenshot_b64)
+		return screenshot_b64
+
+	async def flush(self) -> None:
+		"""Wait until all queued screenshots have been written to disk"""
+		while self._writer_task is not None and not self._writer_task.done():
+			await asyncio.shield(self._writer_task)
+
+	async def _write_pending(self) -> None:
+		"""Write everything queued so far as one batch in a worker thread, repeating until the queue is drained"""
+		while self._pending:
+			batch = dict(self._pending)
+			try:
+				encoded = await asyncio.to_thread(self._write_batch, batch)
+			except Exception as e:
+				logger.error(f'📸 Failed to write {len(batch)} screenshot(s) to disk: {type(e).__name__}: {e}')
+				encoded = {}
+
+			for screenshot_path in batch:
+				self._pending.pop(screenshot_path, None)
+				if screenshot_path in encoded:
+					self._written.add(screenshot_path)
+					if self.image_format != 'png':
+						self._cache_put(screenshot_path, encoded[screenshot_path])
+
+	def _write_batch(self, batch: dict[str, str]) -> dict[str, str]:
+		"""Encode and write a batch of screenshots, returns path -> base64 of the bytes written (runs in a worker thread)"""
+		written: dict[str, str] = {}
+		for screenshot_path, screenshot_b64 in batch.items():
+			try:
+				screenshot_data = self._encode(base64.b64decode(screenshot_b64))
+				Path(screenshot_path).write_bytes(screenshot_data)
+			except Exception as e:
+				logger.error(f'📸 Failed to write screenshot {screenshot_path}: {type(e).__name__}: {e}')
+				continue
+			written[screenshot_path] = (
+				screenshot_b64 if self.image_format == 'png' else base64.b64encode(screenshot_data).decode('utf-8')
+			)
+		return written
+
+	def _encode(self, png_data: bytes) -> bytes:
+		"""Re-encode the PNG screenshot into the configured storage format"""
+		if self.image_format == 'png':
+			return png_data
+
+		from PIL import Image
+
+		with Image.open(io.BytesIO(png_data)) as image:
+			output = io.BytesIO()
+			if self.image_format == 'jpeg':
+				image.convert('RGB').save(output, format='JPEG', quality=self.quality, optimize=True)
+			else:
+				image.save(output, format='WEBP', quality=self.quality, method=4)
+			return output.getvalue()
+
+	def _cache_put(self, screenshot_path: str, screenshot_b64: str) -> None:
+		self._cache[screenshot_path] = screenshot_b64
+		self._cache.move_to_end(screenshot_path)
+		while len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
@@ -338,6 +338,23 @@ class TokenCost:
 		# Using setattr to avoid type checking issues with overloaded methods
 		setattr(llm, 'ainvoke', tracked_ainvoke)
 
+		# Streaming models report the usage on the last chunk
+		original_astream = getattr(llm, 'astream', None)
+		if original_astream is not None:
+
+			async def tracked_astream(messages, output_format=None):
+				async for chunk in original_astream(messages, output_format):
+					if chunk.usage:
+						usage = token_cost_service.add_usage(llm.model, chunk.usage)
+
+						logger.debug(f'Token cost service: {usage}')
+
+						asyncio.create_task(token_cost_service._log_usage(llm.model, usage))
+
+					yield chunk
+
+			setattr(llm, 'astream', tracked_astream)
+
 		return llm
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
@@ -380,6 +397,7 @@ class TokenCost:
 		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
 		total_tokens = total_prompt + total_completion
 		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
+		total_prompt_cache_creation = sum(u.usage.prompt_cache_creation_tokens or 0 for u in filtered_usage)
 		models = list({u.model for u in filtered_usage})
 
 		# Calculate per-model stats with record-by-record cost calculation
@@ -394,6 +412,8 @@ class TokenCost:
 
 			stats = model_stats[entry.model]
 			stats.prompt_tokens += entry.usage.prompt_tokens
+			stats.prompt_cached_tokens += entry.usage.prompt_cached_tokens or 0
+			stats.prompt_cache_creation_tokens += entry.usage.prompt_cache_creation_tokens or 0
 			stats.completion_tokens += entry.usage.completion_tokens
 			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
 			stats.invocations += 1
@@ -411,12 +431,16 @@ class TokenCost:
 		for stats in model_stats.values():
 			if stats.invocations > 0:
 				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+			if stats.prompt_tokens > 0:
+				stats.prompt_cache_hit_rate = stats.prompt_cached_tokens / stats.prompt_tokens
 
 		return UsageSummary(
 			total_prompt_tokens=total_prompt,
 			total_prompt_cost=total_prompt_cost,
 			total_prompt_cached_tokens=total_prompt_cached,
 			total_prompt_cached_cost=total_prompt_cached_cost,
+			total_prompt_cache_creation_tokens=total_prompt_cache_creation,
+			prompt_cache_hit_rate=total_prompt_cached / total_prompt if total_prompt else 0.0,
 			total_completion_tokens=total_completion,
 			total_completion_cost=total_completion_cost,
 			total_tokens=total_tokens,
@@ -515,6 +539,10 @@ class TokenCost:
 				prompt_part = f'{C_YELLOW}{model_prompt_fmt}{C_RESET}'
 				completion_part = f'{C_GREEN}{model_completion_fmt}{C_RESET}'
 
+			# Share of the input read from the provider's prompt cache
+			if stats.prompt_cached_tokens:
+				prompt_part += f' {C_BLUE}💾 {stats.prompt_cache_hit_rate:.0%} cached{C_RESET}'
+
 			cost_logger.debug(
 				f'  🤖 {C_CYAN}{model}{C_RESET}: {C_BLUE}{model_total_fmt} tokens{C_RESET}{cost_part} | '
 				f'⬅️ {prompt_part} | ➡️ {completion_part} | '
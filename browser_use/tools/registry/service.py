@@ -2,16 +2,17 @@ import asyncio
 import functools
 import inspect
 import logging
-import re
 from collections.abc import Callable
 from inspect import Parameter, iscoroutinefunction, signature
 from types import UnionType
-from typing import Any, Generic, Optional, TypeVar, Union, get_args, get_origin
+from typing import Annotated, Any, Generic, Optional, TypeVar, Union, get_args, get_origin
 
 import pyotp
-from pydantic import BaseModel, Field, RootModel, create_model
+from pydantic import BaseModel, Discriminator, Field, GetJsonSchemaHandler, RootModel, Tag, create_model
+from pydantic_core import CoreSchema
 
 from browser_use.browser import BrowserSession
+from browser_use.browser.sensitive_data import get_compiled_sensitive_data, substitute_secret_placeholders
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.observability import observe_debug
@@ -22,13 +23,22 @@ from browser_use.tools.registry.views import (
 	RegisteredAction,
 	SpecialActionParameters,
 )
-from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import is_new_tab_page, time_execution_async
 
 Context = TypeVar('Context')
 
 logger = logging.getLogger(__name__)
 
 
+def _get_action_name(value: Any) -> str | None:
+	"""Discriminator of the action union: the name of the action in an action dict like {'click_element_by_index': {...}}"""
+	if isinstance(value, dict):
+		return next(iter(value), None)
+	if isinstance(value, BaseModel):
+		return next(iter(value.model_fields_set or type(value).model_fields), None)
+	return None
+
+
 class Registry(Generic[Context]):
 	"""Service for registering and managing actions"""
 
@@ -36,6 +46,8 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# Generated action models by the ids of their actions. The actions are kept in the entry so their ids stay unique
+		self._action_model_cache: dict[tuple[int, ...], tuple[list[RegisteredAction], type[ActionModel]]] = {}
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -410,51 +422,28 @@ class Registry(Generic[Context]):
 		Returns:
 			BaseModel: The parameter object with placeholders replaced by actual values
 		"""
-		secret_pattern = re.compile(r'<secret>(.*?)</secret>')
-
 		# Set to track all missing placeholders across the full object
 		all_missing_placeholders = set()
 		# Set to track successfully replaced placeholders
 		replaced_placeholders = set()
 
-		# Process sensitive data based on format and current URL
-		applicable_secrets = {}
-
-		for domain_or_key, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# New format: {domain_pattern: {key: value}}
-				# Only include secrets for domains that match the current URL
-				if current_url and not is_new_tab_page(current_url):
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
-			else:
-				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
-				applicable_secrets[domain_or_key] = content
+		# Legacy {key: value} secrets are exposed to all domains (only allowed for legacy reasons),
+		# {domain_pattern: {key: value}} secrets only to URLs matching the domain pattern
+		applicable_secrets = get_compiled_sensitive_data(sensitive_data).applicable_secrets(current_url)
 
-		# Filter out empty values
-		applicable_secrets = {k: v for k, v in applicable_secrets.items() if v}
+		def resolve_secret(placeholder: str, secret: str) -> str:
+			# generate a totp code if secret is a 2fa secret
+			if 'bu_2fa_code' in placeholder:
+				return pyotp.TOTP(secret, digits=6).now()
+			return secret
 
 		def recursively_replace_secrets(value: str | dict | list) -> str | dict | list:
 			if isinstance(value, str):
-				matches = secret_pattern.findall(value)
 				# check if the placeholder key, like x_password is in the output parameters of the LLM and replace it with the sensitive data
-				for placeholder in matches:
-					if placeholder in applicable_secrets:
-						# generate a totp code if secret is a 2fa secret
-						if 'bu_2fa_code' in placeholder:
-							totp = pyotp.TOTP(applicable_secrets[placeholder], digits=6)
-							replacement_value = totp.now()
-						else:
-							replacement_value = applicable_secrets[placeholder]
-
-						value = value.replace(f'<secret>{placeholder}</secret>', replacement_value)
-						replaced_placeholders.add(placeholder)
-					else:
-						# Keep track of missing placeholders
-						all_missing_placeholders.add(placeholder)
-						# Don't replace the tag, keep it as is
-
+				# (unknown placeholders are kept as they are)
+				value, replaced, missing = substitute_secret_placeholders(value, applicable_secrets, resolve_secret)
+				replaced_placeholders.update(replaced)
+				all_missing_placeholders.update(missing)
 				return value
 			elif isinstance(value, dict):
 				return {k: recursively_replace_secrets(v) for k, v in value.items()}
@@ -481,9 +470,10 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Models are cached by the set of available actions, so every step on pages with the same
+		domain-filtered actions gets the identical class (and downstream schema caches keep hitting).
+		"""
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
 		#   if page_url is provided, only include actions that match the URL
@@ -506,8 +496,22 @@ class Registry(Generic[Context]):
 			if domain_is_allowed:
 				available_actions[name] = action
 
+		cache_key = tuple(id(action) for action in available_actions.values())
+		cached = self._action_model_cache.get(cache_key)
+		if cached is not None:
+			return cached[1]
+
+		action_model = self._build_action_model(available_actions)
+		self._action_model_cache[cache_key] = (list(available_actions.values()), action_model)
+		return action_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		"""Create the action model for create_action_model without the cache"""
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
+		action_names: list[str] = []
 
 		for name, action in available_actions.items():
 			# Create an individual model for each action that contains only one field
@@ -522,6 +526,7 @@ class Registry(Generic[Context]):
 				},
 			)
 			individual_action_models.append(individual_model)
+			action_names.append(name)
 
 		# If no actions available, return empty ActionModel
 		if not individual_action_models:
@@ -534,12 +539,27 @@ class Registry(Generic[Context]):
 
 		# Meaning the length is more than 1
 		else:
-			# Create a Union type using RootModel that properly delegates ActionModel methods
-			union_type = Union[tuple(individual_action_models)]  # type: ignore : Typing doesn't understand that the length is >= 2 (by design)
+			# Create a Union type using RootModel that properly delegates ActionModel methods.
+			# The union is tagged by the action name, so validation goes straight to the one matching model
+			# instead of trying every action model in turn (and reporting an error for each of them)
+			union_type = Annotated[
+				Union[tuple(Annotated[model, Tag(name)] for name, model in zip(action_names, individual_action_models))],  # type: ignore : Typing doesn't understand that the length is >= 2 (by design)
+				Discriminator(_get_action_name),
+			]
 
 			class ActionModelUnion(RootModel[union_type]):  # type: ignore
 				"""Union of all available action models that maintains ActionModel interface"""
 
+				@classmethod
+				def __get_pydantic_json_schema__(cls, core_schema: CoreSchema, handler: GetJsonSchemaHandler) -> dict[str, Any]:
+					# Tagged unions are rendered as oneOf, which structured output APIs (e.g. OpenAI strict mode) don't support.
+					# Every action has its own required key, so anyOf describes the same outputs
+					json_schema = handler(core_schema)
+					union_schema = handler.resolve_ref_schema(json_schema)
+					if 'oneOf' in union_schema:
+						union_schema['anyOf'] = union_schema.pop('oneOf')
+					return json_schema
+
 				def get_index(self) -> int | None:
 					"""Delegate get_index to the underlying action model"""
 					if hasattr(self.root, 'get_index'):
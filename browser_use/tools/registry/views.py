@@ -1,9 +1,10 @@
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from browser_use.browser import BrowserSession
+from browser_use.browser.domain_policy import get_domain_matcher
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 
@@ -76,6 +77,9 @@ class ActionRegistry(BaseModel):
 
 	actions: dict[str, RegisteredAction] = {}
 
+	# Prompt descriptions by the ids of the described actions. The actions are kept in the entry so their ids stay unique
+	_prompt_description_cache: dict[tuple[int, ...], tuple[list[RegisteredAction], str]] = PrivateAttr(default_factory=dict)
+
 	@staticmethod
 	def _match_domains(domains: list[str] | None, url: str) -> bool:
 		"""
@@ -92,13 +96,8 @@ class ActionRegistry(BaseModel):
 		if domains is None or not url:
 			return True
 
-		# Use the centralized URL matching logic from utils
-		from browser_use.utils import match_url_with_domain_pattern
-
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		# Same rules as match_url_with_domain_pattern, but the patterns are compiled once and decisions are cached
+		return bool(get_domain_matcher(tuple(domains)).matching_patterns(url))
 
 	def get_prompt_description(self, page_url: str | None = None) -> str:
 		"""Get a description of all actions for the prompt
@@ -113,7 +112,7 @@ class ActionRegistry(BaseModel):
 		"""
 		if page_url is None:
 			# For system prompt (no URL provided), include only actions with no filters
-			return '\n'.join(action.prompt_description() for action in self.actions.values() if action.domains is None)
+			return self._describe_actions([action for action in self.actions.values() if action.domains is None])
 
 		# only include filtered actions for the current page URL
 		filtered_actions = []
@@ -126,7 +125,16 @@ class ActionRegistry(BaseModel):
 			if self._match_domains(action.domains, page_url):
 				filtered_actions.append(action)
 
-		return '\n'.join(action.prompt_description() for action in filtered_actions)
+		return self._describe_actions(filtered_actions)
+
+	def _describe_actions(self, actions: list[RegisteredAction]) -> str:
+		"""Join the prompt descriptions of actions, cached by the set of actions"""
+		cache_key = tuple(id(action) for action in actions)
+		cached = self._prompt_description_cache.get(cache_key)
+		if cached is None:
+			cached = (actions, '\n'.join(action.prompt_description() for action in actions))
+			self._prompt_description_cache[cache_key] = cached
+		return cached[1]
 
 
 class SpecialActionParameters(BaseModel):
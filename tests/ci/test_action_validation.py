@@ -0,0 +1,79 @@
+"""
+Tests for the validation of agent outputs: the action union tagged by action name and the JSON repair of model outputs.
+"""
+
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from browser_use.agent.views import ActionResult, AgentOutput
+from browser_use.llm.parsing import extract_json, get_type_adapter, parse_json_output, repair_json
+from browser_use.llm.schema import SchemaOptimizer
+from browser_use.tools.registry.service import Registry
+
+
+class QueryParams(BaseModel):
+	query: str
+	limit: int = 10
+
+
+def _create_output_model(actions: int = 30) -> type[AgentOutput]:
+	registry = Registry()
+	for i in range(actions):
+
+		async def search(params: QueryParams):
+			return ActionResult(extracted_content=params.query)
+
+		search.__name__ = f'search_{i}'
+		registry.action(f'Search source {i}', param_model=QueryParams)(search)
+	return AgentOutput.type_with_custom_actions(registry.create_action_model())
+
+
+def _output(*actions: dict) -> str:
+	return json.dumps({'evaluation_previous_goal': 'ok', 'memory': 'm', 'next_goal': 'n', 'action': list(actions)})
+
+
+def test_actions_are_validated_by_their_name():
+	output_model = _create_output_model()
+
+	parsed = output_model.model_validate_json(_output({'search_29': {'query': 'shoes'}}, {'search_3': {'query': 'hats'}}))
+	assert [type(action.root).__name__ for action in parsed.action] == ['Search29ActionModel', 'Search3ActionModel']
+	assert parsed.action[0].model_dump(exclude_unset=True) == {'search_29': {'query': 'shoes'}}
+
+	# A single error for the action that was named, instead of one for every action of the registry
+	with pytest.raises(ValidationError) as invalid_params:
+		output_model.model_validate_json(_output({'search_29': {'query': 'shoes', 'limit': 'many'}}))
+	assert invalid_params.value.error_count() == 1
+
+	with pytest.raises(ValidationError) as unknown_action:
+		output_model.model_validate_json(_output({'fly_to_moon': {}}))
+	assert unknown_action.value.error_count() == 1
+	assert unknown_action.value.errors()[0]['type'] == 'union_tag_invalid'
+
+	# Structured output APIs get the same schema as an untagged union
+	schema = SchemaOptimizer.create_optimized_json_schema(output_model)
+	assert 'anyOf' in schema['properties']['action']['items'] and 'oneOf' not in json.dumps(schema)
+
+
+def test_parse_json_output_repairs_common_formatting_mistakes():
+	output_model = _create_output_model(3)
+	clean = _output({'search_1': {'query': 'line one'}})
+
+	assert extract_json(clean) == clean
+	assert extract_json(f'```json\n{clean}\n```') == clean
+	assert extract_json(f'Here is my answer: {clean} Hope this helps') == clean
+	assert repair_json('{"a": [1, 2, ], "b": "x\ny",\n}') == '{"a": [1, 2 ], "b": "x\\ny"\n}'
+	assert repair_json('{"a": "trailing, ]"}') == '{"a": "trailing, ]"}'
+
+	malformed = f'```json\n{clean[:-1]},\n}}\n```'.replace('line one', 'line\none')
+	parsed = parse_json_output(output_model, malformed)
+	assert parsed.action[0].model_dump(exclude_unset=True) == {'search_1': {'query': 'line\none'}}
+
+	# Schema errors are not repaired
+	with pytest.raises(ValidationError):
+		parse_json_output(output_model, _output({'search_1': {'query': 5}}))
+	with pytest.raises(ValidationError):
+		parse_json_output(output_model, '{"memory": ')
+
+	assert get_type_adapter(output_model) is get_type_adapter(output_model)
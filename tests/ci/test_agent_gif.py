@@ -0,0 +1,108 @@
+"""
+Tests for the streaming history GIF renderer in browser_use.agent.gif.
+"""
+
+import base64
+
+import pytest
+from PIL import Image
+
+from browser_use.agent.gif import create_history_gif
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT, BrowserStateHistory
+
+COLORS = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (220, 220, 40), (40, 220, 220)]
+
+
+def _history_item(url: str, screenshot_path: str | None, next_goal: str | None) -> AgentHistory:
+	model_output = AgentOutput(evaluation_previous_goal='', memory='', next_goal=next_goal, action=[]) if next_goal else None
+	return AgentHistory(
+		model_output=model_output,
+		result=[ActionResult()],
+		state=BrowserStateHistory(url=url, title='Test', tabs=[], interacted_element=[], screenshot_path=screenshot_path),
+	)
+
+
+@pytest.fixture
+def history(tmp_path) -> AgentHistoryList:
+	"""History with real screenshots, a placeholder screenshot, a missing screenshot and a new tab page."""
+	items = []
+	for i, color in enumerate(COLORS):
+		path = tmp_path / f'step_{i}.png'
+		Image.new('RGB', (320, 240), color).save(path)
+		items.append(_history_item(f'https://example.com/{i}', str(path), f'Goal for step {i}'))
+
+	placeholder_path = tmp_path / 'placeholder.png'
+	placeholder_path.write_bytes(base64.b64decode(PLACEHOLDER_4PX_SCREENSHOT))
+	items.insert(1, _history_item('about:blank', str(placeholder_path), None))
+	items.insert(2, _history_item('https://example.com/missing', str(tmp_path / 'missing.png'), 'Missing screenshot'))
+	items.append(_history_item('chrome://newtab/', str(tmp_path / 'step_0.png'), 'New tab'))
+
+	return AgentHistoryList(history=items)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_create_history_gif_streams_all_frames(tmp_path, history, max_workers):
+	"""Every real screenshot becomes one frame (plus the task frame), placeholders and new tab pages are skipped."""
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), duration=500, max_workers=max_workers)
+
+	with Image.open(output_path) as gif:
+		assert gif.size == (320, 240)
+		assert gif.n_frames == len(COLORS) + 1
+		assert gif.info['loop'] == 0
+		assert gif.info['duration'] == 500
+
+		# The dominant color of each step frame should survive quantization to the shared palette
+		for frame_index, expected in enumerate(COLORS, 1):
+			gif.seek(frame_index)
+			actual = gif.convert('RGB').getpixel((5, 5))
+			assert isinstance(actual, tuple)
+			assert all(abs(a - e) <= 24 for a, e in zip(actual, expected)), (frame_index, actual, expected)
+
+
+def test_create_history_gif_without_task_frame(tmp_path, history):
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), show_task=False, max_workers=1)
+
+	with Image.open(output_path) as gif:
+		assert gif.n_frames == len(COLORS)
+
+
+def test_create_history_gif_no_valid_screenshots(tmp_path):
+	"""No output file is created when there are no usable screenshots."""
+	output_path = tmp_path / 'history.gif'
+	history = AgentHistoryList(history=[_history_item('https://example.com', None, 'Goal')])
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path))
+
+	assert not output_path.exists()
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_create_history_mp4_streams_all_frames(tmp_path, history, max_workers):
+	"""An .mp4 output path writes the frames as a video through the optional imageio/ffmpeg dependencies."""
+	iio = pytest.importorskip('imageio.v2')
+	pytest.importorskip('imageio_ffmpeg')
+	output_path = tmp_path / 'history.mp4'
+
+	# 330x250 is not a multiple of the 16px macro blocks, the frames are padded
+	for i in range(len(COLORS)):
+		path = tmp_path / f'step_{i}.png'
+		with Image.open(path) as image:
+			image.resize((330, 250)).save(path)
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), duration=500, max_workers=max_workers)
+
+	reader = iio.get_reader(str(output_path))
+	try:
+		frames = list(reader.iter_data())
+	finally:
+		reader.close()
+	assert len(frames) == len(COLORS) + 1
+	assert frames[0].shape == (256, 336, 3)
+	for frame, expected in zip(frames[1:], COLORS):
+		actual = frame[5, 5]
+		assert all(abs(int(a) - e) <= 24 for a, e in zip(actual, expected)), (actual, expected)
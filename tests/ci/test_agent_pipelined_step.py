@@ -0,0 +1,144 @@
+"""
+Tests for the pipelined agent step, which captures the next browser state while the current step is finalized.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult, AgentStepInfo
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+
+
+class FakeBrowserSession:
+	"""Returns a browser state after a delay, the first captures can be made to fail"""
+
+	id = 'fake-session'
+	agent_focus = None
+
+	def __init__(self, delay: float = 0.1, failures: int = 0):
+		self.delay = delay
+		self.failures = failures
+		self.captures = 0
+
+	async def get_browser_state_summary(self, include_screenshot: bool = True, include_recent_events: bool = False):
+		self.captures += 1
+		await asyncio.sleep(self.delay)
+		if self.failures:
+			self.failures -= 1
+			raise RuntimeError('page crashed')
+		return BrowserStateSummary(
+			dom_state=SerializedDOMState(_root=None, selector_map={}),
+			url=f'https://example.com/{self.captures}',
+			title='Example',
+			tabs=[TabInfo(url='https://example.com', title='Example', target_id='ABCD1234')],
+		)
+
+
+@pytest.fixture
+def agent():
+	from tests.ci.conftest import create_mock_llm
+
+	return Agent(task='Test pipelined steps', llm=create_mock_llm(), pipeline_steps=True)
+
+
+async def test_next_state_is_captured_during_finalize(agent: Agent):
+	session = FakeBrowserSession(delay=0.1)
+	agent.browser_session = session  # type: ignore[assignment]
+	agent.state.last_result = [ActionResult(extracted_content='clicked')]
+
+	agent._start_next_state_capture(AgentStepInfo(step_number=0, max_steps=10))
+	await asyncio.sleep(0.08)  # the bookkeeping of the step
+	browser_state = await agent._get_browser_state()
+
+	assert session.captures == 1 and browser_state.url == 'https://example.com/1'
+	assert agent._stage_durations['browser_state'] < 0.08
+	assert agent._stage_durations['browser_state_overlap'] >= 0.05
+	assert agent._next_state_capture is None
+
+	# Without a capture started ahead, the state is captured when it is needed
+	agent._stage_durations = {}
+	assert (await agent._get_browser_state()).url == 'https://example.com/2'
+	assert agent._stage_durations['browser_state'] >= 0.1 and 'browser_state_overlap' not in agent._stage_durations
+
+
+async def test_no_capture_ahead_after_done_or_last_step(agent: Agent):
+	agent.browser_session = FakeBrowserSession()  # type: ignore[assignment]
+
+	agent.state.last_result = [ActionResult(is_done=True, success=True, extracted_content='done')]
+	agent._start_next_state_capture(AgentStepInfo(step_number=0, max_steps=10))
+	assert agent._next_state_capture is None
+
+	agent.state.last_result = [ActionResult(extracted_content='clicked')]
+	agent._start_next_state_capture(AgentStepInfo(step_number=9, max_steps=10))
+	assert agent._next_state_capture is None
+
+
+async def test_failed_or_cancelled_capture_is_captured_again(agent: Agent):
+	session = FakeBrowserSession(delay=0.01, failures=1)
+	agent.browser_session = session  # type: ignore[assignment]
+	agent.state.last_result = [ActionResult(extracted_content='clicked')]
+
+	agent._start_next_state_capture()
+	assert (await agent._get_browser_state()).url == 'https://example.com/2'
+	assert session.captures == 2
+
+	# Pausing drops the capture, the page can change until the agent is resumed
+	agent._start_next_state_capture()
+	capture = agent._next_state_capture
+	await asyncio.sleep(0)
+	agent.pause()
+	await asyncio.sleep(0)
+	assert capture is not None and capture.cancelled()
+	assert (await agent._get_browser_state()).url == 'https://example.com/4'
+
+
+class NavigableBrowserSession(FakeBrowserSession):
+	"""Fake session for a whole run(), its state shows the page it was navigated to"""
+
+	cdp_url = None
+
+	def __init__(self):
+		super().__init__(delay=0.01)
+		self.path = 'start'
+		self.browser_profile = BrowserProfile(keep_alive=True)
+		self.downloaded_files: list[str] = []
+
+	async def start(self):
+		pass
+
+	async def kill(self):
+		pass
+
+	async def get_browser_state_summary(self, include_screenshot: bool = True, include_recent_events: bool = False):
+		path = self.path
+		state = await super().get_browser_state_summary(include_screenshot, include_recent_events)
+		state.url = f'https://example.com/{path}'
+		return state
+
+
+async def test_no_capture_ahead_in_runs_with_step_hooks():
+	from tests.ci.conftest import create_mock_llm
+
+	click = '{"evaluation_previous_goal": "", "memory": "", "next_goal": "", "action": [{"wait": {"seconds": 0}}]}'
+	agent = Agent(task='Test pipelined steps', llm=create_mock_llm([click]), pipeline_steps=True)
+	session = NavigableBrowserSession()
+	agent.browser_session = session  # type: ignore[assignment]
+
+	async def multi_act(actions, **kwargs) -> list[ActionResult]:
+		if 'done' in actions[0].model_dump(exclude_unset=True):
+			return [ActionResult(is_done=True, success=True, extracted_content='done')]
+		return [ActionResult(extracted_content='waited')]
+
+	agent.multi_act = multi_act  # type: ignore[method-assign]
+
+	async def on_step_end(agent: Agent) -> None:
+		await asyncio.sleep(0.05)  # a capture started ahead would read the page before the hook changed it
+		session.path = 'changed-by-hook'
+
+	history = await agent.run(max_steps=3, on_step_end=on_step_end)
+
+	assert [item.state.url for item in history.history] == ['https://example.com/start', 'https://example.com/changed-by-hook']
@@ -0,0 +1,126 @@
+"""
+Tests for AgentPool, which runs agent tasks on a pool of pre-launched browsers.
+
+The browsers are fake sessions and the agents are replaced by a short sleep, so the tests cover the scheduling of the
+pool without launching Chromium or calling an LLM. Resetting the browsers between leases is tested with real browsers in
+test_browser_session_pool.py.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bubus import EventBus
+
+from browser_use.agent.pool import AgentPool, AgentPoolTask
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.pool import BrowserSessionPool
+from browser_use.browser.views import BrowserStateHistory
+
+
+class FakeBrowserSession:
+	"""Session whose health check fails once crashed"""
+
+	def __init__(self, index: int):
+		self.id = f'browser-{index}'
+		self.started = False
+		self.killed = False
+		self.crashed = False
+		self.event_bus = EventBus()
+		self.cdp_client = SimpleNamespace(send=SimpleNamespace(Browser=SimpleNamespace(getVersion=self._get_version)))
+
+	async def _get_version(self):
+		if self.crashed:
+			raise ConnectionError('browser crashed')
+		return {'product': 'Chrome/140'}
+
+	async def start(self):
+		self.started = True
+
+	async def kill(self):
+		self.killed = True
+
+
+class FakeAgentPool(AgentPool):
+	"""Runs every task for a short time on its browser, tasks containing 'crash' crash the browser"""
+
+	def __init__(self, browsers: int = 1, **kwargs):
+		self.launched: list[FakeBrowserSession] = []
+		self.active_browsers: set[str] = set()
+		self.max_running = 0
+
+		def create_session(index: int) -> FakeBrowserSession:
+			session = FakeBrowserSession(index)
+			self.launched.append(session)
+			return session
+
+		llm = SimpleNamespace(provider='fake', model='fake-model')
+		browser_pool = BrowserSessionPool(size=browsers, session_factory=create_session, reset_between_leases=False)  # type: ignore[arg-type]
+		super().__init__(llm=llm, browser_pool=browser_pool, **kwargs)  # type: ignore[arg-type]
+
+	async def _run_agent(self, pool_task, browser_session):
+		assert browser_session.started and browser_session.id not in self.active_browsers
+		self.active_browsers.add(browser_session.id)
+		self.max_running = max(self.max_running, len(self.active_browsers))
+		try:
+			await asyncio.sleep(0.05)
+			if 'crash' in pool_task.task:
+				browser_session.crashed = True
+				raise ConnectionError('browser crashed')
+		finally:
+			self.active_browsers.discard(browser_session.id)
+		result = ActionResult(is_done=True, success=True, extracted_content=f'done: {pool_task.task}')
+		return AgentHistoryList(
+			history=[
+				AgentHistory(
+					model_output=None,
+					result=[result],
+					state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot_path=None),
+				)
+			]
+		)
+
+
+async def test_pool_runs_queued_tasks_on_its_browsers():
+	pool = FakeAgentPool(browsers=3, max_concurrency=2)
+	tasks = [f'task {i}' for i in range(6)] + [AgentPoolTask(task='custom', id='custom-id', max_steps=3)]
+
+	async with pool:
+		results = [result async for result in pool.run(tasks)]
+
+	assert len(results) == 7 and all(result.success for result in results)
+	assert {result.task for result in results} == {*(f'task {i}' for i in range(6)), 'custom'}
+	assert next(result for result in results if result.task_id == 'custom-id').final_result == 'done: custom'
+	assert pool.max_running == 2  # max_concurrency holds back the third browser
+	assert len(pool.launched) == 3 and all(session.killed for session in pool.launched)
+
+	metrics = pool.metrics
+	assert metrics.tasks_completed == metrics.tasks_succeeded == 7 and pool.browser_pool.metrics.launches == 3
+	assert metrics.elapsed_seconds > 0 and metrics.tasks_per_hour > 0
+	assert metrics.tasks_per_hour_per_core == metrics.tasks_per_hour / metrics.cpu_count
+
+
+async def test_crashed_browser_is_restarted_and_failures_are_reported():
+	pool = FakeAgentPool(browsers=1)
+	queue: asyncio.Queue = asyncio.Queue()
+	for task in ('first', 'crash now', 'after restart', None):
+		queue.put_nowait(task)
+
+	results = await pool.run_all(queue)
+	await pool.close()
+
+	assert [result.task for result in results] == ['first', 'crash now', 'after restart']
+	assert results[1].success is None and results[1].error == 'ConnectionError: browser crashed'
+	assert results[2].success is True
+	assert pool.browser_pool.metrics.restarts == 1 and pool.metrics.tasks_failed == 1
+	assert len(pool.launched) == 2 and pool.launched[0].killed
+
+
+async def test_memory_limit_holds_back_new_tasks():
+	pool = FakeAgentPool(browsers=2, max_memory_mb=100)
+	pool._get_memory_usage_mb = lambda: 1000  # type: ignore[method-assign]
+
+	results = await pool.run_all(['first', 'second'])
+
+	# The second task waits for the first, a task always runs when nothing else does
+	assert len(results) == 2 and pool.max_running == 1
+	assert pool.metrics.memory_waits == 1
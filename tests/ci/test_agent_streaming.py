@@ -0,0 +1,166 @@
+"""
+Tests for streaming the agent output and executing its actions while the model is still generating.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from browser_use.agent.service import Agent
+from browser_use.agent.streaming import JSONArrayItemParser, StreamedActions
+from browser_use.agent.views import ActionResult
+from browser_use.browser.profile import BrowserProfile
+from browser_use.llm.views import ChatInvokeUsage, ChatStreamChunk
+
+OUTPUT = {
+	'thinking': 'The {"action": [...]} in this text is not the action field',
+	'evaluation_previous_goal': 'Success',
+	'memory': 'Found the \\"search\\" box',
+	'next_goal': 'Search',
+	'action': [
+		{'go_to_url': {'url': 'https://example.com/?q=[1]', 'new_tab': False}},
+		{'wait': {'seconds': 1}},
+	],
+}
+
+
+def _chunks(text: str, size: int = 7) -> list[str]:
+	return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_parser_yields_array_items_as_soon_as_they_are_complete():
+	text = json.dumps(OUTPUT)
+	parser = JSONArrayItemParser('action')
+	items = []
+	items_when_wait_started = None
+
+	for chunk in _chunks(text):
+		items.extend(parser.feed(chunk))
+		if items_when_wait_started is None and '"wait"' in parser.text:
+			items_when_wait_started = list(items)
+
+	assert items == OUTPUT['action']
+	assert items_when_wait_started == OUTPUT['action'][:1]
+	assert parser.text == text
+	assert JSONArrayItemParser('missing').feed(text) == []
+
+
+@pytest.fixture
+def mock_llm():
+	from tests.ci.conftest import create_mock_llm
+
+	return create_mock_llm()
+
+
+def _create_agent(llm, delay: float, output: dict) -> tuple[Agent, list[tuple[str, float]]]:
+	events: list[tuple[str, float]] = []
+
+	async def astream(messages, output_format=None):
+		text = json.dumps(output)
+		split = text.index('}}, {') + 3
+		for chunk in _chunks(text[:split]):
+			yield ChatStreamChunk(delta=chunk)
+		await asyncio.sleep(delay)  # the model is still generating the second action
+		for chunk in _chunks(text[split:]):
+			yield ChatStreamChunk(delta=chunk)
+		events.append(('generated', time.time()))
+		usage = ChatInvokeUsage(
+			prompt_tokens=100,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=50,
+			total_tokens=150,
+		)
+		yield ChatStreamChunk(usage=usage)
+
+	llm.astream = astream
+	agent = Agent(task='Test streamed actions', llm=llm, stream_actions=True)
+
+	class FakeBrowserSession:
+		id = 'fake-session'
+		agent_focus = None
+		_cached_browser_state_summary = None
+		browser_profile = BrowserProfile(wait_between_actions=0)
+
+	async def act(action, **kwargs):
+		name = next(iter(action.model_dump(exclude_unset=True)))
+		events.append((name, time.time()))
+		return ActionResult(extracted_content=name)
+
+	agent.browser_session = FakeBrowserSession()  # type: ignore[assignment]
+	agent.tools.act = act  # type: ignore[method-assign]
+	return agent, events
+
+
+async def test_actions_start_while_the_output_is_generated(mock_llm):
+	agent, events = _create_agent(mock_llm, delay=0.2, output=OUTPUT)
+
+	await agent._get_next_action_and_execute_streamed(None)  # type: ignore[arg-type]
+
+	names = [name for name, _ in events]
+	assert names == ['go_to_url', 'generated', 'wait']
+	assert events[1][1] - events[0][1] >= 0.15
+	assert agent._stage_durations['first_action'] < 0.15
+	assert agent._stage_durations['model_output'] >= 0.2
+
+	assert agent.state.last_model_output is not None and len(agent.state.last_model_output.action) == 2
+	assert agent.state.last_model_output.memory == OUTPUT['memory']
+	assert [result.extracted_content for result in agent.state.last_result or []] == ['go_to_url', 'wait']
+
+	# The streamed usage is tracked like the usage of a regular call
+	summary = await agent.token_cost_service.get_usage_summary()
+	assert summary.total_prompt_tokens == 100 and summary.total_completion_tokens == 50
+
+
+async def test_failed_generation_stops_dispatching_actions(mock_llm):
+	invalid = {**OUTPUT, 'action': [OUTPUT['action'][0], {'wait': {'seconds': 'not a number'}}]}
+	agent, events = _create_agent(mock_llm, delay=0.05, output=invalid)
+
+	with pytest.raises(ValueError) as error:
+		await agent._get_next_action_and_execute_streamed(None)  # type: ignore[arg-type]
+
+	assert [name for name, _ in events] == ['go_to_url']
+
+	# The action that ran is recorded with the error, so the model does not repeat it
+	assert agent.state.last_model_output is not None
+	assert [action.model_dump(exclude_unset=True) for action in agent.state.last_model_output.action] == [OUTPUT['action'][0]]
+	await agent._handle_step_error(error.value)
+	assert [result.extracted_content for result in agent.state.last_result or []] == ['go_to_url', None]
+	assert agent.state.last_result and agent.state.last_result[-1].error
+
+
+async def test_forced_done_step_does_not_execute_streamed_actions(mock_llm):
+	click = {**OUTPUT, 'action': [{'click_element_by_index': {'index': 1}}, {'done': {'text': 'Finished', 'success': True}}]}
+	agent, events = _create_agent(mock_llm, delay=0.05, output=click)
+	# The last step only allows the done action
+	agent.AgentOutput = agent.DoneAgentOutput
+
+	with pytest.raises(ValueError):
+		await agent._get_next_action_and_execute_streamed(None)  # type: ignore[arg-type]
+
+	assert 'click_element_by_index' not in [name for name, _ in events]
+
+
+async def test_streamed_actions_iterate_until_finished():
+	streamed = StreamedActions()
+	received = []
+
+	async def consume():
+		async for action in streamed:
+			received.append(action)
+
+	consumer = asyncio.create_task(consume())
+	await asyncio.sleep(0)
+	assert streamed.total == '?'
+	streamed.put('first')  # type: ignore[arg-type]
+	await asyncio.sleep(0)
+	assert received == ['first'] and not consumer.done()
+
+	streamed.put('second')  # type: ignore[arg-type]
+	streamed.finish()
+	await asyncio.wait_for(consumer, timeout=1)
+	assert received == ['first', 'second'] and streamed.total == '2'
+	assert await streamed.wait_finished() == ['first', 'second']
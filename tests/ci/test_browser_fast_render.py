@@ -0,0 +1,121 @@
+"""
+Tests for BrowserProfile.fast_render: the launch args, detecting pages that keep changing with a fake CDP session, and
+animations, transitions and smooth scrolling in a real browser.
+"""
+
+from types import SimpleNamespace
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.watchdogs import fast_render_watchdog
+from browser_use.browser.watchdogs.fast_render_watchdog import FastRenderWatchdog, VisualStability
+
+
+def fake_cdp_session(*values: dict):
+	"""A CDP session whose page reports the given stability values, the last one repeats"""
+	results = list(values)
+
+	async def evaluate(params: dict, session_id: str | None = None):
+		return {'result': {'value': results.pop(0) if len(results) > 1 else results[0]}}
+
+	return SimpleNamespace(
+		session_id='session', cdp_client=SimpleNamespace(send=SimpleNamespace(Runtime=SimpleNamespace(evaluate=evaluate)))
+	)
+
+
+async def test_pages_that_keep_changing_are_only_waited_for_once(monkeypatch):
+	profile = BrowserProfile(fast_render=True, user_data_dir='/tmp/browser-use-fast-render-test')
+	assert '--force-prefers-reduced-motion' in profile.get_args() and '--disable-smooth-scrolling' in profile.get_args()
+	assert VisualStability(recent_mutations=1).is_stable
+	assert not VisualStability(running_animations=1).is_stable and not VisualStability(layout_shift=0.2).is_stable
+
+	browser_session = BrowserSession(browser_profile=profile)
+	watchdog = FastRenderWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+	url = 'https://example.com/'
+
+	async def get_current_page_url(self):
+		return url
+
+	page = fake_cdp_session({'layout_shift': 0.3, 'running_animations': 0, 'recent_mutations': 0}, {})
+
+	async def get_or_create_cdp_session(self, *args, **kwargs):
+		return page
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page_url', get_current_page_url)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+
+	# Settles after one poll
+	assert await watchdog.wait_for_visual_stability(timeout=0.5)
+
+	# Keeps animating
+	url = 'https://example.com/carousel'
+	page = fake_cdp_session({'layout_shift': 0, 'running_animations': 2, 'recent_mutations': 40})
+	assert not await watchdog.wait_for_visual_stability(timeout=0.2)
+	assert list(watchdog.unstable_urls) == [url]
+
+	# Not waited for again
+	page = None
+	assert not await watchdog.wait_for_visual_stability(timeout=0.2)
+
+	# Only the most recently seen unstable pages are remembered
+	monkeypatch.setattr(fast_render_watchdog, 'MAX_UNSTABLE_URLS', 2)
+	page = fake_cdp_session({'layout_shift': 0, 'running_animations': 2, 'recent_mutations': 40})
+	for url in ('https://example.com/ticker', 'https://example.com/carousel', 'https://example.com/video'):
+		assert not await watchdog.wait_for_visual_stability(timeout=0)
+	assert list(watchdog.unstable_urls) == ['https://example.com/carousel', 'https://example.com/video']
+
+
+async def test_animations_transitions_and_smooth_scrolling_are_disabled(httpserver: HTTPServer):
+	httpserver.expect_request('/').respond_with_data(
+		'<html><head><style>'
+		'@keyframes spin { to { transform: rotate(360deg) } }'
+		'#spinner { animation: spin 2s linear infinite }'
+		'#fade { transition: opacity 3s }'
+		'html { scroll-behavior: smooth }'
+		'</style></head><body><div id="spinner">*</div><div id="fade">Fade</div>'
+		'<div style="height: 5000px"></div></body></html>',
+		content_type='text/html',
+	)
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, fast_render=True))
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/')))
+		cdp_session = await browser_session.get_or_create_cdp_session()
+		result = await cdp_session.cdp_client.send.Runtime.evaluate(
+			params={
+				'expression': """(async () => {
+					const fade = document.getElementById('fade');
+					const ended = new Promise(resolve => fade.addEventListener('transitionend', () => resolve(true), {once: true}));
+					fade.style.opacity = '0';
+					window.scrollTo({top: 2000, behavior: 'smooth'});
+					// Pages waiting for transitionend must not hang, the shortened transition still fires it
+					const transition_ended = await Promise.race([ended, new Promise(resolve => setTimeout(() => resolve(false), 1000))]);
+					return {
+						reduced_motion: matchMedia('(prefers-reduced-motion: reduce)').matches,
+						transition_ended,
+						running_animations: document.getAnimations().filter(a => a.playState === 'running').length,
+						opacity: getComputedStyle(fade).opacity,
+						scroll_y: window.scrollY,
+					};
+				})()""",
+				'returnByValue': True,
+				'awaitPromise': True,
+			},
+			session_id=cdp_session.session_id,
+		)
+		assert result['result']['value'] == {
+			'reduced_motion': True,
+			'transition_ended': True,
+			'running_animations': 0,
+			'opacity': '0',
+			'scroll_y': 2000,
+		}
+
+		assert browser_session._fast_render_watchdog is not None
+		stability = await browser_session._fast_render_watchdog.get_visual_stability()
+		assert stability.is_stable
+	finally:
+		await browser_session.kill()
@@ -0,0 +1,213 @@
+"""
+Tests for HAR recording and replay: building HAR entries from Network events and answering paused requests from a HAR
+with fake CDP clients, and recording a page in a real browser and replaying it without the server.
+"""
+
+import base64
+import json
+from types import SimpleNamespace
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.watchdogs.har_recorder_watchdog import HarRecorderWatchdog
+
+
+class FakeCDPClient:
+	"""Returns recorded response bodies and records the answers to paused requests"""
+
+	def __init__(self, bodies: dict[str, bytes] | None = None):
+		self.bodies = bodies or {}
+		self.answers: list[tuple[str, dict]] = []
+		self.send = SimpleNamespace(
+			Network=SimpleNamespace(getResponseBody=self._get_response_body),
+			Fetch=SimpleNamespace(
+				continueRequest=self._answer('continue'),
+				failRequest=self._answer('fail'),
+				fulfillRequest=self._answer('fulfill'),
+			),
+		)
+
+	async def _get_response_body(self, params: dict, session_id: str | None = None):
+		return {'body': base64.b64encode(self.bodies[params['requestId']]).decode(), 'base64Encoded': True}
+
+	def _answer(self, kind: str):
+		async def answer(params: dict, session_id: str | None = None):
+			self.answers.append((kind, params))
+
+		return answer
+
+
+def request_sent(request_id: str, url: str, timestamp: float, method: str = 'GET', **extra) -> dict:
+	return {
+		'requestId': request_id,
+		'request': {'url': url, 'method': method, 'headers': {'Accept': '*/*'}},
+		'timestamp': timestamp,
+		'wallTime': 1_700_000_000 + timestamp,
+		'type': 'Document',
+		**extra,
+	}
+
+
+def response(url: str, status: int = 200, **headers: str) -> dict:
+	return {'url': url, 'status': status, 'statusText': 'OK', 'headers': headers, 'mimeType': 'text/html', 'protocol': 'h2'}
+
+
+def har_entry(method: str, url: str, status: int, text: str = '', post_data: str | None = None) -> dict:
+	request: dict = {'method': method, 'url': url, 'headers': []}
+	if post_data is not None:
+		request['postData'] = {'mimeType': 'application/json', 'text': post_data}
+	return {
+		'request': request,
+		'response': {
+			'status': status,
+			'statusText': 'OK',
+			'headers': [
+				{'name': 'Content-Type', 'value': 'text/plain'},
+				{'name': 'Content-Encoding', 'value': 'gzip'},
+				{'name': 'Content-Length', 'value': '123'},
+			],
+			'content': {
+				'size': len(text),
+				'mimeType': 'text/plain',
+				'text': base64.b64encode(text.encode()).decode(),
+				'encoding': 'base64',
+			},
+		},
+	}
+
+
+def paused(request_id: str, method: str, url: str, post_data: str | None = None) -> dict:
+	request: dict = {'url': url, 'method': method}
+	if post_data is not None:
+		request['postData'] = post_data
+	return {'requestId': request_id, 'request': request, 'resourceType': 'Fetch', 'frameId': 'frame'}
+
+
+async def test_network_events_are_recorded_into_har(tmp_path):
+	har_path = tmp_path / 'recording.har'
+	browser_session = BrowserSession(record_har_path=har_path, record_har_url_filter='https://example.com/*', headless=True)
+	watchdog = HarRecorderWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+	watchdog._recording = True
+	client = FakeCDPClient({'1': b'<h1>Home</h1>'})
+
+	# A redirect from /old to /, then / loads
+	watchdog._on_request_will_be_sent(request_sent('1', 'https://example.com/old#top', 1.0), 'session')  # type: ignore[arg-type]
+	watchdog._on_request_will_be_sent(
+		request_sent('1', 'https://example.com/', 1.2, redirectResponse=response('https://example.com/old', 301, Location='/')),  # type: ignore[arg-type]
+		'session',
+	)
+	watchdog._on_response_received({'requestId': '1', 'response': response('https://example.com/')}, 'session')  # type: ignore[arg-type]
+	watchdog._on_loading_finished(client, {'requestId': '1', 'timestamp': 1.5, 'encodedDataLength': 40}, 'session')  # type: ignore[arg-type]
+	# Filtered out, and a request that fails
+	watchdog._on_request_will_be_sent(request_sent('2', 'https://cdn.example.net/app.js', 1.6), 'session')  # type: ignore[arg-type]
+	watchdog._on_request_will_be_sent(request_sent('3', 'https://example.com/api', 1.7, method='POST'), 'session')  # type: ignore[arg-type]
+	watchdog._on_loading_failed({'requestId': '3', 'timestamp': 1.8, 'errorText': 'net::ERR_FAILED'}, 'session')  # type: ignore[arg-type]
+	# Still loading when the HAR is saved
+	watchdog._on_request_will_be_sent(request_sent('4', 'https://example.com/slow', 1.9), 'session')  # type: ignore[arg-type]
+
+	assert await watchdog.save_har() == har_path
+	har = json.loads(har_path.read_text())
+	assert har['log']['version'] == '1.2' and har['log']['creator']['name'] == 'browser-use'
+	redirect, page, failed = har['log']['entries']
+	assert redirect['request']['url'] == 'https://example.com/old'
+	assert redirect['response']['status'] == 301 and redirect['response']['redirectURL'] == '/'
+	assert redirect['time'] == 200
+	assert page['request']['url'] == 'https://example.com/' and page['response']['httpVersion'] == 'H2'
+	assert page['response']['content'] == {
+		'size': 13,
+		'mimeType': 'text/html',
+		'text': base64.b64encode(b'<h1>Home</h1>').decode(),
+		'encoding': 'base64',
+	}
+	assert failed['request']['method'] == 'POST'
+	assert failed['response']['status'] == 0 and failed['response']['_failureText'] == 'net::ERR_FAILED'
+
+
+async def test_paused_requests_are_answered_from_har(tmp_path):
+	har_path = tmp_path / 'replay.har'
+	har_path.write_text(
+		json.dumps(
+			{
+				'log': {
+					'entries': [
+						har_entry('GET', 'https://example.com/', 200, 'home'),
+						har_entry('GET', 'https://example.com/counter', 200, 'one'),
+						har_entry('GET', 'https://example.com/counter', 200, 'two'),
+						har_entry('POST', 'https://example.com/api', 200, 'first', post_data='{"page": 1}'),
+						har_entry('POST', 'https://example.com/api', 200, 'second', post_data='{"page": 2}'),
+						har_entry('GET', 'https://example.com/broken', 0),
+					]
+				}
+			}
+		)
+	)
+	browser_session = BrowserSession(replay_har_path=har_path, headless=True)
+	watchdog = HarRecorderWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+	# Loads the HAR, there is no browser to enable the interception in
+	await watchdog.on_BrowserConnectedEvent(None)  # type: ignore[arg-type]
+	client = FakeCDPClient()
+
+	for event in (
+		paused('1', 'GET', 'https://example.com/#section'),
+		paused('2', 'GET', 'https://example.com/counter'),
+		paused('3', 'GET', 'https://example.com/counter'),
+		paused('4', 'GET', 'https://example.com/counter'),
+		paused('5', 'POST', 'https://example.com/api', '{"page": 2}'),
+		paused('6', 'GET', 'https://example.com/broken'),
+		paused('7', 'GET', 'https://example.com/missing'),
+	):
+		await watchdog._handle_request_paused(client, event, 'session')  # type: ignore[arg-type]
+
+	kinds = [(kind, params['requestId']) for kind, params in client.answers]
+	assert kinds == [
+		('fulfill', '1'),
+		('fulfill', '2'),
+		('fulfill', '3'),
+		('fulfill', '4'),
+		('fulfill', '5'),
+		('fail', '6'),
+		('fail', '7'),
+	]
+	bodies = [base64.b64decode(params['body']).decode() for kind, params in client.answers if kind == 'fulfill']
+	# Repeated requests get the recorded responses in order, POST requests are matched by their body
+	assert bodies == ['home', 'one', 'two', 'two', 'second']
+	# The replayed body is decoded, so the transfer headers are left out
+	assert client.answers[0][1]['responseHeaders'] == [{'name': 'Content-Type', 'value': 'text/plain'}]
+	assert client.answers[6][1]['errorReason'] == 'InternetDisconnected'
+	assert watchdog.replayed_requests == 6 and watchdog.not_found_requests == 1
+
+	browser_session.browser_profile.replay_har_not_found = 'fallback'
+	await watchdog._handle_request_paused(client, paused('8', 'GET', 'https://example.com/missing'), 'session')  # type: ignore[arg-type]
+	assert client.answers[-1] == ('continue', {'requestId': '8'})
+
+
+async def test_recorded_page_replays_without_server(httpserver: HTTPServer, tmp_path):
+	httpserver.expect_request('/').respond_with_data(
+		'<html><body><h1 id="title">Recorded</h1><script src="/app.js"></script></body></html>', content_type='text/html'
+	)
+	httpserver.expect_request('/app.js').respond_with_data(
+		'document.title = "from app.js"', content_type='application/javascript'
+	)
+	har_path = tmp_path / 'page.har'
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, record_har_path=har_path))
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/')))
+	finally:
+		await browser_session.kill()
+	urls = [entry['request']['url'] for entry in json.loads(har_path.read_text())['log']['entries']]
+	assert httpserver.url_for('/') in urls and httpserver.url_for('/app.js') in urls
+
+	httpserver.clear()
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, replay_har_path=har_path))
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/')))
+		assert not httpserver.log
+		assert await browser_session.get_current_page_title() == 'from app.js'
+	finally:
+		await browser_session.kill()
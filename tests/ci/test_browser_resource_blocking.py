@@ -0,0 +1,124 @@
+"""
+Tests for BrowserProfile.resource_blocking: the presets, the Fetch interception patterns and the answers to paused
+requests with a fake CDP client, and blocking in a real browser.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile, ResourceBlockingRules
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.watchdogs.resource_blocking_watchdog import ResourceBlockingWatchdog, get_interception_patterns
+
+
+class FakeFetchClient:
+	"""Records the answers to paused requests"""
+
+	def __init__(self):
+		self.answers: list[tuple[str, dict]] = []
+		self.send = SimpleNamespace(
+			Fetch=SimpleNamespace(
+				continueRequest=self._answer('continue'),
+				failRequest=self._answer('fail'),
+				fulfillRequest=self._answer('fulfill'),
+			)
+		)
+
+	def _answer(self, kind: str):
+		async def answer(params: dict, session_id: str | None = None):
+			self.answers.append((kind, params))
+
+		return answer
+
+
+def paused(request_id: str, url: str, resource_type: str) -> dict:
+	return {'requestId': request_id, 'request': {'url': url}, 'resourceType': resource_type, 'frameId': 'frame'}
+
+
+def test_presets_and_interception_patterns():
+	assert BrowserProfile(resource_blocking='no-media').resource_blocking == ResourceBlockingRules(
+		resource_types=['Image', 'Media', 'Font']
+	)
+	with pytest.raises(ValueError, match='Unknown resource_blocking preset'):
+		BrowserProfile(resource_blocking='everything')  # type: ignore[arg-type]
+
+	# Only the requests the rules may block are paused
+	rules = ResourceBlockingRules(resource_types=['Image'], url_patterns=['*.mp4'], domains=['*.ads.test', 'tracker.test'])
+	assert get_interception_patterns(rules) == [
+		{'urlPattern': '*.mp4'},
+		{'urlPattern': '*://ads.test*'},
+		{'urlPattern': '*://*.ads.test*'},
+		{'urlPattern': '*://tracker.test*'},
+		{'urlPattern': '*://www.tracker.test*'},
+		{'urlPattern': '*', 'resourceType': 'Image'},
+	]
+	# Patterns Fetch can't express pause every request
+	assert get_interception_patterns(ResourceBlockingRules(domains=['ads*.test'])) == [{'urlPattern': '*'}]
+
+
+async def test_paused_requests_are_blocked_stubbed_or_continued():
+	browser_session = BrowserSession(resource_blocking='fast', headless=True)
+	watchdog = ResourceBlockingWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+	# Compiles the rules, there is no browser to enable the interception in
+	await watchdog.on_BrowserConnectedEvent(None)  # type: ignore[arg-type]
+	client = FakeFetchClient()
+
+	for event in (
+		paused('1', 'https://example.com/', 'Document'),
+		paused('2', 'https://example.com/logo.png', 'Image'),
+		paused('3', 'https://www.googletagmanager.com/gtag/js', 'Script'),
+		paused('4', 'https://stats.g.doubleclick.net/collect', 'XHR'),
+		paused('5', 'https://example.com/app.js', 'Script'),
+		paused('6', 'data:font/woff2;base64,AAAA', 'Font'),
+	):
+		await watchdog._handle_request_paused(client, event, 'session')  # type: ignore[arg-type]
+
+	assert [(kind, params['requestId']) for kind, params in client.answers] == [
+		('continue', '1'),
+		('fail', '2'),
+		('fulfill', '3'),
+		('fail', '4'),
+		('continue', '5'),
+		('fail', '6'),
+	]
+	assert client.answers[1][1]['errorReason'] == 'BlockedByClient'
+	assert client.answers[2][1]['responseCode'] == 200
+
+	stats = watchdog.stats
+	assert stats.requests_blocked == 3 and stats.requests_stubbed == 1
+	assert stats.by_resource_type == {'Image': 1, 'Script': 1, 'XHR': 1, 'Font': 1}
+	assert stats.estimated_bytes_saved > 0
+
+
+async def test_blocked_resources_are_not_loaded(httpserver: HTTPServer):
+	httpserver.expect_request('/').respond_with_data(
+		'<html><body><img id="logo" src="/logo.png"><script src="/ads/ad.js"></script>'
+		'<script src="/app.js"></script></body></html>',
+		content_type='text/html',
+	)
+	httpserver.expect_request('/logo.png').respond_with_data(b'\x89PNG' + b'0' * 10_000, content_type='image/png')
+	httpserver.expect_request('/ads/ad.js').respond_with_data('window.ad = true', content_type='application/javascript')
+	httpserver.expect_request('/app.js').respond_with_data('window.app = true', content_type='application/javascript')
+
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			headless=True,
+			user_data_dir=None,
+			resource_blocking=ResourceBlockingRules(resource_types=['Image'], url_patterns=['*/ads/*']),
+		)
+	)
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/')))
+		requested = {request.path for request, _ in httpserver.log}
+		assert '/app.js' in requested
+		assert '/logo.png' not in requested and '/ads/ad.js' not in requested
+
+		stats = browser_session.resource_blocking_stats
+		assert stats is not None and stats.requests_blocked == 2
+		assert stats.by_resource_type == {'Image': 1, 'Script': 1}
+	finally:
+		await browser_session.kill()
@@ -0,0 +1,265 @@
+"""
+Tests for BrowserSessionPool: leasing warm sessions, health checks, max-lease recycling and the reset between leases,
+and for isolated_context sessions sharing one browser.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from bubus import EventBus
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.pool import BrowserSessionPool
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession, CDPSession
+
+
+class FakeBrowserSession:
+	"""Session without a browser, its health check fails once crashed"""
+
+	def __init__(self, index: int):
+		self.id = f'session-{index}-{id(self)}'
+		self.crashed = False
+		self.killed = False
+		self.event_bus = EventBus()
+		self.cdp_client = SimpleNamespace(send=SimpleNamespace(Browser=SimpleNamespace(getVersion=self._get_version)))
+
+	async def _get_version(self):
+		if self.crashed:
+			raise ConnectionError('browser crashed')
+		return {'product': 'Chrome/140'}
+
+	async def start(self):
+		pass
+
+	async def kill(self):
+		self.killed = True
+
+
+async def test_sessions_are_leased_warm_and_launched_again_when_needed():
+	launched: list[FakeBrowserSession] = []
+
+	def create_session(index: int) -> FakeBrowserSession:
+		launched.append(FakeBrowserSession(index))
+		return launched[-1]
+
+	pool = BrowserSessionPool(size=1, max_leases_per_session=3, reset_between_leases=False, session_factory=create_session)  # type: ignore[arg-type]
+	async with pool:
+		assert pool.available == 1 and len(launched) == 1
+
+		# The second lease waits for the first one to be released
+		async def lease(seconds: float):
+			async with pool.lease() as session:
+				await asyncio.sleep(seconds)
+				return session
+
+		first, second = await asyncio.gather(lease(0.05), lease(0))
+		assert first is second is launched[0]
+		assert pool.metrics.lease_wait_seconds >= 0.04
+
+		# The third lease is the last one of the session, it is launched again after it
+		async with pool.lease() as session:
+			assert session is launched[0]
+		async with pool.lease() as session:
+			assert session is launched[1] and launched[0].killed
+
+		# A crashed session is launched again by the health check of its next lease
+		launched[1].crashed = True
+		async with pool.lease() as session:
+			assert session is launched[2] and launched[1].killed
+
+	assert launched[2].killed
+	assert pool.metrics.leases == 5 and pool.metrics.launches == 3
+	assert pool.metrics.recycles == 1 and pool.metrics.restarts == 1
+	assert pool.metrics.average_lease_wait_seconds > 0
+
+
+async def test_failed_start_kills_the_launched_sessions_and_can_be_retried():
+	launched: list[FakeBrowserSession] = []
+	failures = [1]  # the session at index 1 fails to launch once
+
+	def create_session(index: int) -> FakeBrowserSession:
+		session = FakeBrowserSession(index)
+		launched.append(session)
+		if index in failures:
+			failures.remove(index)
+
+			async def fail_to_start():
+				raise RuntimeError('Chromium failed to launch')
+
+			session.start = fail_to_start  # type: ignore[method-assign]
+		return session
+
+	pool = BrowserSessionPool(size=3, reset_between_leases=False, session_factory=create_session)  # type: ignore[arg-type]
+	with pytest.raises(RuntimeError, match='failed to launch'):
+		await pool.start()
+	assert len(launched) == 3 and all(session.killed for session in launched)
+	assert not pool._started and pool.available == 0
+
+	# acquire() starts the pool again instead of waiting for a session that never comes
+	session = await asyncio.wait_for(pool.acquire(), timeout=1)
+	assert session is launched[3] and not session.killed and len(launched) == 6
+	pool.release(session)
+	await pool.close()
+
+
+async def test_reset_between_leases_closes_tabs_and_clears_storage(httpserver: HTTPServer):
+	httpserver.expect_request('/login').respond_with_data(
+		"<html><body><script>localStorage.setItem('user', 'alice')</script>Logged in</body></html>",
+		content_type='text/html',
+		headers={'Set-Cookie': 'session=secret; Path=/'},
+	)
+	httpserver.expect_request('/other').respond_with_data('<html><body>Other</body></html>', content_type='text/html')
+	base_url = httpserver.url_for('/').rstrip('/')
+
+	async def read_local_storage(session) -> str | None:
+		cdp_session = await session.get_or_create_cdp_session()
+		result = await cdp_session.cdp_client.send.Runtime.evaluate(
+			params={'expression': "localStorage.getItem('user')", 'returnByValue': True}, session_id=cdp_session.session_id
+		)
+		return result['result'].get('value')
+
+	async with BrowserSessionPool(size=1, browser_profile=BrowserProfile(headless=True, user_data_dir=None)) as pool:
+		async with pool.lease() as session:
+			await session.event_bus.dispatch(NavigateToUrlEvent(url=f'{base_url}/login'))
+			await session.event_bus.dispatch(NavigateToUrlEvent(url=f'{base_url}/other', new_tab=True))
+			assert len(await session.get_tabs()) == 2
+			assert await read_local_storage(session) == 'alice'
+			assert [cookie['name'] for cookie in await session.cookies()] == ['session']
+
+		async with pool.lease() as reset_session:
+			assert reset_session is session
+			tabs = await reset_session.get_tabs()
+			assert [tab.url for tab in tabs] == ['about:blank']
+			assert await reset_session.cookies() == []
+
+			await reset_session.event_bus.dispatch(NavigateToUrlEvent(url=f'{base_url}/other'))
+			assert await read_local_storage(reset_session) is None
+
+	assert pool.metrics.resets == 1 and pool.metrics.reset_failures == 0 and pool.metrics.launches == 1
+
+
+async def test_isolated_contexts_share_browsers_and_are_replaced_between_leases():
+	browsers: list[FakeBrowserSession] = []
+	contexts: list[FakeBrowserSession] = []
+
+	def create_session(index: int) -> FakeBrowserSession:
+		contexts.append(FakeBrowserSession(index))
+		return contexts[-1]
+
+	def create_browser(processes: int) -> FakeBrowserSession:
+		browsers.append(FakeBrowserSession(len(browsers)))
+		return browsers[-1]
+
+	pool = BrowserSessionPool(size=5, contexts_per_browser=2, session_factory=create_session)  # type: ignore[arg-type]
+	pool._create_browser = create_browser  # type: ignore[method-assign]
+	async with pool:
+		# 5 sessions fit into 3 browsers
+		assert len(browsers) == 3 and len(contexts) == 5
+
+		async with pool.lease() as session:
+			pass
+		await asyncio.gather(*pool._preparing)
+		# The session was replaced by a new context in the same browser
+		assert session.killed and len(contexts) == 6 and len(browsers) == 3
+
+		# A crashed browser is launched again before the next context in it
+		for crashed in (*browsers, *contexts):
+			crashed.crashed = True
+		async with pool.lease() as session:
+			assert session is contexts[-1] and len(browsers) == 4
+
+	assert all(browser.killed for browser in browsers) and all(context.killed for context in contexts)
+	assert pool.metrics.browser_launches == 4 and pool.metrics.resets == 2
+
+
+async def test_isolated_context_sessions_share_one_browser(httpserver: HTTPServer):
+	httpserver.expect_request('/login').respond_with_data(
+		'<html><body>Logged in</body></html>', content_type='text/html', headers={'Set-Cookie': 'session=secret; Path=/'}
+	)
+	url = httpserver.url_for('/login')
+
+	browser = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	await browser.start()
+	first = BrowserSession(cdp_url=browser.cdp_url, isolated_context=True)
+	second = BrowserSession(cdp_url=browser.cdp_url, isolated_context=True)
+	try:
+		await asyncio.gather(first.start(), second.start())
+		assert first.browser_context_id and second.browser_context_id
+		assert first.browser_context_id != second.browser_context_id
+
+		await first.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		await first.event_bus.dispatch(NavigateToUrlEvent(url=url, new_tab=True))
+
+		# Tabs and cookies of one context are invisible to the other and to the default context
+		assert len(await first.get_tabs()) == 2 and len(await second.get_tabs()) == 1
+		assert [cookie['name'] for cookie in await first.cookies()] == ['session']
+		assert await second.cookies() == []
+		assert all(tab.target_id not in {t.target_id for t in await first.get_tabs()} for tab in await browser.get_tabs())
+
+		# Killing a context session only disposes its context
+		await first.kill()
+		assert len(await second.get_tabs()) == 1
+	finally:
+		await second.kill()
+		await browser.kill()
+
+
+async def test_storage_commands_of_isolated_sessions_are_sent_to_the_browser_target():
+	sent: list[tuple[str, dict, str | None]] = []
+
+	def command(name: str):
+		async def send(params=None, session_id=None):
+			sent.append((name, params, session_id))
+			return {'cookies': []}
+
+		return send
+
+	storage = SimpleNamespace(**{name: command(name) for name in ('getCookies', 'setCookies', 'clearCookies')})
+	session = BrowserSession(isolated_context=True)
+	session._cdp_client_root = SimpleNamespace(send=SimpleNamespace(Storage=storage))  # type: ignore[assignment]
+	session._browser_context_id = 'CONTEXT'
+	session.agent_focus = CDPSession.model_construct(cdp_client=session._cdp_client_root, target_id='PAGE', session_id='PAGE')
+
+	await session._cdp_get_cookies()
+	await session._cdp_set_cookies([{'name': 'token', 'value': '1', 'domain': 'example.com', 'path': '/'}])  # type: ignore[list-item]
+	await session._cdp_clear_cookies()
+
+	# Page sessions don't handle Storage commands for a browser context, the browser target does
+	assert [(name, params['browserContextId'], session_id) for name, params, session_id in sent] == [
+		('getCookies', 'CONTEXT', None),
+		('setCookies', 'CONTEXT', None),
+		('clearCookies', 'CONTEXT', None),
+	]
+
+
+async def test_storage_commands_of_isolated_sessions_stay_in_their_context(httpserver: HTTPServer):
+	httpserver.expect_request('/').respond_with_data('<html><body>Home</body></html>', content_type='text/html')
+	url = httpserver.url_for('/')
+	domain = url.split('://')[1].split(':')[0]
+
+	browser = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	await browser.start()
+	first = BrowserSession(cdp_url=browser.cdp_url, isolated_context=True)
+	second = BrowserSession(cdp_url=browser.cdp_url, isolated_context=True)
+	try:
+		await asyncio.gather(first.start(), second.start())
+		await first.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		await second.event_bus.dispatch(NavigateToUrlEvent(url=url))
+
+		# The Storage commands behind storage_state saving and loading are scoped to the context of the session
+		await first._cdp_set_cookies([{'name': 'token', 'value': 'first', 'domain': domain, 'path': '/'}])  # type: ignore[list-item]
+		await second._cdp_set_cookies([{'name': 'token', 'value': 'second', 'domain': domain, 'path': '/'}])  # type: ignore[list-item]
+		assert [cookie['value'] for cookie in await first._cdp_get_cookies()] == ['first']
+		assert [cookie['value'] for cookie in await second._cdp_get_cookies()] == ['second']
+		assert await browser._cdp_get_cookies() == []
+
+		await first._cdp_clear_cookies()
+		assert await first._cdp_get_cookies() == []
+		assert [cookie['value'] for cookie in await second._cdp_get_cookies()] == ['second']
+	finally:
+		await first.kill()
+		await second.kill()
+		await browser.kill()
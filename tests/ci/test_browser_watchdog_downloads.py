@@ -263,3 +263,71 @@ def comprehensive_download_test_server():
 
 
 # Removed test_downloads_watchdog_actual_download_detection - complex Playwright patterns not suitable for CDP
+
+
+def test_downloads_watchdog_filename_index(tmp_path):
+	"""Unique filenames and completed downloads are resolved from the in-memory index, not by listing the directory."""
+	from browser_use.browser.watchdogs.downloads_watchdog import DownloadsWatchdog
+
+	(tmp_path / 'report.pdf').write_bytes(b'existing')
+	(tmp_path / 'invoice.pdf').write_bytes(b'existing')
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, downloads_path=tmp_path))
+	DownloadsWatchdog.model_rebuild()
+	watchdog = DownloadsWatchdog(event_bus=session.event_bus, browser_session=session)
+
+	# The index is built once and each returned name is reserved
+	assert watchdog._get_unique_filename(str(tmp_path), 'report.pdf') == 'report (1).pdf'
+	assert watchdog._get_unique_filename(str(tmp_path), 'report.pdf') == 'report (2).pdf'
+	assert watchdog._get_unique_filename(str(tmp_path), 'data.csv') == 'data.csv'
+
+	# Files written by other processes after the index was built are not overwritten
+	(tmp_path / 'notes.txt').write_bytes(b'external')
+	assert watchdog._get_unique_filename(str(tmp_path), 'notes.txt') == 'notes (1).txt'
+
+	# A browser download without filePath is matched to the next free variant of the suggested name
+	(tmp_path / 'invoice (1).pdf').write_bytes(b'new')
+	assert watchdog._find_completed_download('invoice.pdf') == str((tmp_path / 'invoice (1).pdf').resolve())
+
+	# Falls back to a single directory diff when the browser picked an unexpected name
+	(tmp_path / 'renamed.bin').write_bytes(b'new')
+	assert watchdog._find_completed_download('original.bin') == str((tmp_path / 'renamed.bin').resolve())
+
+
+async def test_first_download_without_file_path_is_reported(tmp_path):
+	"""The first download of a fresh session is located even when Browser.downloadProgress has no filePath."""
+	from types import SimpleNamespace
+
+	from browser_use.browser.events import FileDownloadedEvent
+	from browser_use.browser.watchdogs.downloads_watchdog import DownloadsWatchdog
+
+	handlers = {}
+
+	async def set_download_behavior(params):
+		pass
+
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, downloads_path=tmp_path))
+	session._cdp_client_root = SimpleNamespace(  # type: ignore[assignment]
+		send=SimpleNamespace(Browser=SimpleNamespace(setDownloadBehavior=set_download_behavior)),
+		register=SimpleNamespace(
+			Browser=SimpleNamespace(
+				downloadWillBegin=lambda handler: handlers.setdefault('begin', handler),
+				downloadProgress=lambda handler: handlers.setdefault('progress', handler),
+			)
+		),
+	)
+	DownloadsWatchdog.model_rebuild()
+	watchdog = DownloadsWatchdog(event_bus=session.event_bus, browser_session=session)
+	await watchdog.attach_to_target('target')
+	downloaded = []
+	session.event_bus.on(FileDownloadedEvent, lambda event: downloaded.append(event))
+
+	url = 'https://example.com/invoice.pdf'
+	try:
+		await handlers['begin']({'guid': 'guid', 'url': url, 'suggestedFilename': 'invoice.pdf', 'frameId': 'frame'}, None)
+		(tmp_path / 'invoice.pdf').write_bytes(b'%PDF')
+		await handlers['progress']({'guid': 'guid', 'totalBytes': 4, 'receivedBytes': 4, 'state': 'completed'}, None)
+		await session.event_bus.wait_until_idle()
+	finally:
+		await session.event_bus.stop(clear=True, timeout=5)
+
+	assert [(event.url, event.file_name, event.file_size) for event in downloaded] == [(url, 'invoice.pdf', 4)]
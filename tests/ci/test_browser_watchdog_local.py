@@ -0,0 +1,146 @@
+"""
+Tests for the local browser startup: reading the DevTools URL from the browser's stderr, copying profile templates and
+verifying the default extensions once per machine. Only the last test launches a real browser.
+"""
+
+import asyncio
+import shutil
+import zipfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+import pytest
+
+from browser_use.browser import profile as profile_module
+from browser_use.browser.profile import EXTENSION_MARKER_FILE, BrowserProfile
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
+
+EXTENSION_IDS = ['cjpalhdlnbpafiamejdnhcphjbkeiagm', 'edibdbjcniadpccecjdfdjjppcpchdlm', 'lckanjgmijmafbedllaakclkaicjfmnk']
+
+
+def write_extensions(extensions_dir: Path) -> None:
+	"""Fake .crx downloads of the default extensions, so the tests never download them"""
+	extensions_dir.mkdir(parents=True)
+	for extension_id in EXTENSION_IDS:
+		with zipfile.ZipFile(extensions_dir / f'{extension_id}.crx', 'w') as crx:
+			crx.writestr('manifest.json', '{"manifest_version": 3, "name": "%s", "version": "1.0"}' % extension_id)
+
+
+def stream_of(output: bytes) -> asyncio.StreamReader:
+	stream = asyncio.StreamReader()
+	stream.feed_data(output)
+	stream.feed_eof()
+	return stream
+
+
+async def test_devtools_url_is_read_from_stderr():
+	stderr = stream_of(
+		b'[1234:1234:ERROR:bus.cc(407)] Failed to connect to the bus\n\n'
+		b'DevTools listening on ws://127.0.0.1:39123/devtools/browser/8d1c1ad4-5b0e-4a1b-9f3e-1d0a6c3f2b7e\n'
+		b'more output\n'
+	)
+	url = await LocalBrowserWatchdog._read_devtools_url(stderr)
+	assert url == 'ws://127.0.0.1:39123/devtools/browser/8d1c1ad4-5b0e-4a1b-9f3e-1d0a6c3f2b7e'
+
+
+async def test_browser_exiting_before_listening_reports_its_output():
+	stderr = stream_of(b'The profile appears to be in use by another Chromium process (SingletonLock)\n')
+	with pytest.raises(RuntimeError, match='SingletonLock'):
+		await LocalBrowserWatchdog._read_devtools_url(stderr)
+
+	with pytest.raises(TimeoutError):
+		await LocalBrowserWatchdog._read_devtools_url(asyncio.StreamReader(), timeout=0.05)
+
+
+def test_profile_template_is_copied_without_locks(tmp_path):
+	template = tmp_path / 'template'
+	(template / 'Default').mkdir(parents=True)
+	(template / 'Default' / 'Preferences').write_text('{}')
+	(template / 'Local State').write_text('{}')
+	(template / 'SingletonLock').write_text('host-1234')
+
+	copy_dir = LocalBrowserWatchdog._copy_profile_template(template)
+	try:
+		assert (copy_dir / 'Default' / 'Preferences').read_text() == '{}'
+		assert (copy_dir / 'Local State').exists() and not (copy_dir / 'SingletonLock').exists()
+	finally:
+		shutil.rmtree(copy_dir)
+
+	with pytest.raises(FileNotFoundError):
+		LocalBrowserWatchdog._copy_profile_template(tmp_path / 'missing')
+
+
+def test_extensions_are_verified_once_per_machine(tmp_path, monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(tmp_path))
+	monkeypatch.setattr(profile_module, '_VERIFIED_EXTENSION_PATHS', {})
+	extensions_dir = tmp_path / 'extensions'
+	write_extensions(extensions_dir)
+	# A half extracted extension from an interrupted launch is extracted again
+	(extensions_dir / EXTENSION_IDS[0]).mkdir()
+	(extensions_dir / EXTENSION_IDS[0] / 'manifest.json').write_text('{"name": ')
+
+	profile = BrowserProfile(user_data_dir=None)
+	paths = profile._ensure_default_extensions_downloaded()
+	assert paths == [str(extensions_dir / extension_id) for extension_id in EXTENSION_IDS]
+	assert all((extensions_dir / extension_id / EXTENSION_MARKER_FILE).exists() for extension_id in EXTENSION_IDS)
+	assert EXTENSION_IDS[0] in (extensions_dir / EXTENSION_IDS[0] / 'manifest.json').read_text()
+	assert not [path for path in extensions_dir.iterdir() if path.name.startswith('.')]
+
+	def fail(*args):
+		raise AssertionError('verified extensions must not be extracted again')
+
+	monkeypatch.setattr(BrowserProfile, '_extract_extension', fail)
+	assert profile._ensure_default_extensions_downloaded() == paths
+
+	# Another process reads the markers instead of extracting again
+	monkeypatch.setattr(profile_module, '_VERIFIED_EXTENSION_PATHS', {})
+	assert BrowserProfile(user_data_dir=None)._ensure_default_extensions_downloaded() == paths
+
+
+async def test_launch_reads_the_debugging_port_and_starts_from_the_profile_template(tmp_path, monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(tmp_path / 'config'))
+	monkeypatch.setattr(profile_module, '_VERIFIED_EXTENSION_PATHS', {})
+	write_extensions(tmp_path / 'config' / 'extensions')
+	template = tmp_path / 'template'
+	(template / 'Default').mkdir(parents=True)
+	(template / 'copied-from-template').write_text('template')
+
+	def launch() -> BrowserSession:
+		profile = BrowserProfile(
+			headless=True, user_data_dir=None, user_data_dir_template=str(template), enable_default_extensions=True
+		)
+		return BrowserSession(browser_profile=profile)
+
+	first = launch()
+	await first.start()
+	try:
+		# The browser picked a free port itself and the CDP url was read from its stderr
+		assert first.cdp_url is not None
+		port = urlparse(first.cdp_url).port
+		assert port
+		async with httpx.AsyncClient() as client:
+			version = (await client.get(f'http://127.0.0.1:{port}/json/version')).json()
+		assert version['webSocketDebuggerUrl'].startswith(f'ws://127.0.0.1:{port}/devtools/browser/')
+		process = first._local_browser_watchdog._subprocess  # type: ignore[union-attr]
+		assert '--remote-debugging-port=0' in process.cmdline()
+
+		# The browser runs on a copy of the template, never on the template itself
+		user_data_dir = Path(first.browser_profile.user_data_dir or '')
+		assert user_data_dir != template and (user_data_dir / 'copied-from-template').read_text() == 'template'
+		assert len(profile_module._VERIFIED_EXTENSION_PATHS) == 1
+
+		# A second browser next to the first one gets its own port, without extracting the extensions again
+		def fail(*args):
+			raise AssertionError('verified extensions must not be extracted again')
+
+		monkeypatch.setattr(BrowserProfile, '_extract_extension', fail)
+		second = launch()
+		await second.start()
+		try:
+			assert second.cdp_url is not None and urlparse(second.cdp_url).port != port
+		finally:
+			await second.kill()
+	finally:
+		await first.kill()
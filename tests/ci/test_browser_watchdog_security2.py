@@ -288,6 +288,26 @@ class TestUrlAllowlistSecurity:
 		assert watchdog._is_root_domain('example') is False
 		assert watchdog._is_root_domain('') is False
 
+	def test_in_place_edits_of_the_domain_lists_apply(self):
+		"""Test that editing allowed_domains in place, even without changing its length, updates the checks."""
+		from bubus import EventBus
+
+		from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
+
+		browser_profile = BrowserProfile(allowed_domains=['example.com'], headless=True, user_data_dir=None)
+		browser_session = BrowserSession(browser_profile=browser_profile)
+		watchdog = SecurityWatchdog(browser_session=browser_session, event_bus=EventBus())
+		assert watchdog._is_url_allowed('https://example.com') is True
+
+		allowed_domains = browser_session.browser_profile.allowed_domains
+		assert allowed_domains is not None
+		allowed_domains[0] = 'example.org'
+		assert watchdog._is_url_allowed('https://example.com') is False
+		assert watchdog._is_url_allowed('https://example.org') is True
+
+		allowed_domains.append('example.com')
+		assert watchdog._is_url_allowed('https://example.com') is True
+
 
 class TestUrlProhibitlistSecurity:
 	"""Tests for URL prohibitlist (blocked domains) behavior and matching semantics."""
@@ -0,0 +1,101 @@
+"""Test incremental, event-driven storage state persistence in StorageStateWatchdog."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import StorageStateSavedEvent
+from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
+
+
+async def test_storage_changes_are_debounced_and_saved_incrementally(tmp_path, monkeypatch):
+	"""Bursts of cookie/storage events result in one save that only re-reads the changed origins."""
+	state_path = tmp_path / 'storage_state.json'
+	existing_cookie = {'name': 'old', 'value': '1', 'domain': 'old.com', 'path': '/'}
+	state_path.write_text(
+		json.dumps(
+			{
+				'cookies': [existing_cookie],
+				'origins': [
+					{'origin': 'https://keep.com', 'localStorage': [{'name': 'k', 'value': 'v'}]},
+					{'origin': 'https://cleared.com', 'localStorage': [{'name': 'gone', 'value': 'x'}]},
+				],
+			}
+		)
+	)
+
+	new_cookie = {'name': 'session', 'value': 'abc', 'domain': 'a.com', 'path': '/'}
+	get_cookies = AsyncMock(return_value=[new_cookie])
+	get_origins = AsyncMock(return_value=[{'origin': 'https://a.com', 'localStorage': [{'name': 'token', 'value': 't'}]}])
+	monkeypatch.setattr(BrowserSession, '_cdp_get_cookies', get_cookies)
+	monkeypatch.setattr(BrowserSession, '_cdp_get_origins', get_origins)
+
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, storage_state=str(state_path)))
+	StorageStateWatchdog.model_rebuild()
+	watchdog = StorageStateWatchdog(event_bus=session.event_bus, browser_session=session, save_debounce=0.05)
+	saved_events: list[StorageStateSavedEvent] = []
+
+	def on_saved(event: StorageStateSavedEvent) -> None:
+		saved_events.append(event)
+
+	session.event_bus.on(StorageStateSavedEvent, on_saved)
+
+	try:
+		for origin in ('https://a.com', 'https://a.com', 'https://cleared.com'):
+			watchdog._on_dom_storage_changed({'storageId': {'securityOrigin': origin, 'isLocalStorage': True}}, None)  # type: ignore[arg-type]
+		watchdog._on_response_received_extra_info({'headers': {'set-cookie': 'session=abc'}}, None)  # type: ignore[arg-type]
+		# Responses without Set-Cookie don't mark cookies dirty
+		watchdog._on_response_received_extra_info({'headers': {'content-type': 'text/html'}}, None)  # type: ignore[arg-type]
+
+		assert watchdog._monitoring_task is not None
+		await asyncio.wait_for(watchdog._monitoring_task, timeout=5)
+		await session.event_bus.wait_until_idle()
+
+		get_cookies.assert_awaited_once()
+		get_origins.assert_awaited_once()
+		assert set(get_origins.await_args.kwargs['only_origins']) == {'https://a.com', 'https://cleared.com'}
+		assert len(saved_events) == 1
+
+		state = json.loads(state_path.read_text())
+		assert {c['name'] for c in state['cookies']} == {'old', 'session'}
+		assert {o['origin'] for o in state['origins']} == {'https://keep.com', 'https://a.com'}
+		assert not state_path.with_suffix('.json.tmp').exists()
+
+		# Nothing changed since, so nothing else is written
+		assert not watchdog._cookies_dirty and not watchdog._dirty_origins
+	finally:
+		await session.event_bus.stop(clear=True, timeout=5)
+
+
+async def test_sessions_sharing_a_storage_state_file_keep_each_others_changes(tmp_path, monkeypatch):
+	"""A save re-reads the file under its lock when another session wrote it, instead of overwriting its cookies."""
+	state_path = tmp_path / 'storage_state.json'
+	state_path.write_text(json.dumps({'cookies': [], 'origins': []}))
+	cookies_by_session: dict[str, list[dict]] = {}
+
+	async def get_cookies(self):
+		return cookies_by_session[self.id]
+
+	monkeypatch.setattr(BrowserSession, '_cdp_get_cookies', get_cookies)
+	StorageStateWatchdog.model_rebuild()
+
+	watchdogs = []
+	for name in ('a', 'b'):
+		session = BrowserSession(browser_profile=BrowserProfile(headless=True, storage_state=str(state_path)))
+		cookies_by_session[session.id] = [{'name': name, 'value': '1', 'domain': f'{name}.com', 'path': '/'}]
+		watchdog = StorageStateWatchdog(event_bus=session.event_bus, browser_session=session)
+		# Both sessions read the file before either of them saved
+		await asyncio.to_thread(watchdog._read_persisted_state, state_path.resolve())
+		watchdogs.append(watchdog)
+
+	try:
+		for watchdog in watchdogs:
+			watchdog._cookies_dirty = True
+			await watchdog._save_changes()
+
+		state = json.loads(state_path.read_text())
+		assert {c['name'] for c in state['cookies']} == {'a', 'b'}
+	finally:
+		for watchdog in watchdogs:
+			await watchdog.event_bus.stop(clear=True, timeout=5)
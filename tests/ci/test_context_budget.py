@@ -0,0 +1,125 @@
+"""
+Tests for the token budgeted assembly of the agent state message.
+"""
+
+from browser_use.agent.message_manager.context_budget import ContextAssembler, ContextBudget, ContextSection, estimate_tokens
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.views import ActionResult, AgentStepInfo, MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import ContentPartTextParam, SystemMessage
+
+
+def test_assembler_allocates_by_priority_with_floors():
+	assembler = ContextAssembler(ContextBudget(max_tokens=2000, min_section_tokens=100, image_tokens=500))
+	sections = [
+		ContextSection('history', 'h' * 4000, priority=50, truncation='middle'),
+		ContextSection('dom', 'd' * 8000, priority=40),
+		ContextSection('screenshots', '', priority=30, image_count=1),
+		ContextSection('files', 'f' * 2000, priority=10),
+		ContextSection('todo', '- [ ] buy milk', priority=60),
+	]
+
+	texts, report = assembler.assemble(sections, fixed_tokens=200)
+
+	assert report.total_tokens <= 2000
+	assert texts['todo'] == '- [ ] buy milk' and not report.sections['todo'].truncated
+	assert texts['history'] == 'h' * 4000  # 1000 tokens, fits entirely
+	assert report.sections['dom'].truncated and texts['dom'].startswith('d' * 100)
+	assert 'characters truncated to fit the context budget' in texts['dom']
+	# The floor keeps the lowest priority section, the screenshot doesn't fit and is left out
+	assert report.sections['files'].truncated and report.sections['files'].allocated_tokens > 0
+	assert texts['screenshots'] == '' and report.sections['screenshots'].allocated_tokens == 0
+	assert report.truncated_sections == ['dom', 'screenshots', 'files']
+
+
+def test_truncation_modes_and_custom_estimator():
+	words = ' '.join(f'word{i}' for i in range(1000))
+	assembler = ContextAssembler(ContextBudget(max_tokens=100, estimate_tokens=lambda text: len(text.split())))
+
+	for mode in ('head', 'tail', 'middle'):
+		truncated = assembler.truncate(words, 50, mode)
+		assert len(truncated.split()) <= 50
+		assert ('word0 ' in truncated) == (mode != 'tail')
+		assert truncated.endswith('word999') == (mode != 'head')
+
+	assert assembler.truncate(words, 5000) == words
+	assert assembler.truncate(words, 3) == ''
+
+
+def test_message_manager_fits_state_message_into_budget(tmp_path):
+	def create_manager(max_input_tokens):
+		manager = MessageManager(
+			task='Summarize the page',
+			system_message=SystemMessage(content='System message ' * 100),
+			state=MessageManagerState(),
+			file_system=FileSystem(tmp_path),
+			max_input_tokens=max_input_tokens,
+		)
+		for n in range(1, 30):
+			manager.state.agent_history_items.append(HistoryItem(step_number=n, memory=f'memory {n} ' * 40, next_goal='goal'))
+		manager.create_state_messages(
+			browser_state_summary=BrowserStateSummary(
+				dom_state=SerializedDOMState(_root=None, selector_map={}),
+				url='https://example.com',
+				title='Example',
+				tabs=[TabInfo(url='https://example.com', title='Example', target_id='ABCD1234')],
+				screenshot='iVBORw0KGgo=',
+			),
+			result=[ActionResult(extracted_content='extracted content ' * 2000, include_extracted_content_only_once=True)],
+			step_info=AgentStepInfo(step_number=5, max_steps=20),
+			use_vision=True,
+		)
+		return manager
+
+	unbounded = create_manager(None)
+	assert unbounded.last_context_budget_report is None
+	assert isinstance(unbounded.get_messages()[-1].content, list)
+
+	manager = create_manager(4000)
+	report = manager.last_context_budget_report
+	state_message = manager.get_messages()[-1]
+
+	assert report is not None and report.max_tokens == 4000
+	assert report.total_tokens <= 4000
+	assert estimate_tokens('System message ' * 100) + estimate_tokens(state_message.text) <= 4000
+	assert report.sections['read_state'].truncated and report.sections['screenshots'].truncated
+	assert not report.sections['todo_contents'].truncated
+	# The screenshot doesn't fit, the message is text only
+	assert isinstance(state_message.content, str)
+	assert 'memory 29' in state_message.content and 'Agent initialized' in state_message.content
+	assert 'characters truncated to fit the context budget' in state_message.content
+
+
+def test_cache_optimized_layout_keeps_history_parts_within_budget(tmp_path):
+	manager = MessageManager(
+		task='Summarize the page',
+		system_message=SystemMessage(content='System message'),
+		state=MessageManagerState(),
+		file_system=FileSystem(tmp_path),
+		message_layout='cache_optimized',
+		max_input_tokens=100_000,
+	)
+	for n in range(1, 4):
+		manager.state.agent_history_items.append(HistoryItem(step_number=n, memory=f'memory {n}', next_goal='goal'))
+	manager.create_state_messages(
+		browser_state_summary=BrowserStateSummary(
+			dom_state=SerializedDOMState(_root=None, selector_map={}),
+			url='https://example.com',
+			title='Example',
+			tabs=[TabInfo(url='https://example.com', title='Example', target_id='ABCD1234')],
+		),
+		step_info=AgentStepInfo(step_number=3, max_steps=20),
+		use_vision=False,
+	)
+
+	assert manager.last_context_budget_report is not None
+	assert manager.last_context_budget_report.truncated_sections == []
+	parts = manager.get_messages()[-1].content
+	assert isinstance(parts, list)
+	# One part per history item is kept when nothing had to be truncated
+	assert sum(1 for part in parts if isinstance(part, ContentPartTextParam) and part.text.startswith('<step>')) == len(
+		manager.state.agent_history_items[1:]
+	)
@@ -0,0 +1,96 @@
+"""
+Tests for the shared LLM SDK client registry in browser_use.llm.clients.
+"""
+
+import json
+
+import httpx
+from pytest_httpserver import HTTPServer
+
+from browser_use.llm import ChatAnthropic, ChatOpenAI, UserMessage
+from browser_use.llm.clients import (
+	aclose_shared_clients,
+	release_shared_clients,
+	retain_shared_clients,
+	shared_client_count,
+)
+
+COMPLETION = {
+	'id': 'chatcmpl-test',
+	'object': 'chat.completion',
+	'created': 0,
+	'model': 'gpt-4o-mini',
+	'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': 'ok'}, 'finish_reason': 'stop'}],
+	'usage': {'prompt_tokens': 5, 'completion_tokens': 1, 'total_tokens': 6},
+}
+
+
+async def test_clients_are_shared_per_configuration(httpserver: HTTPServer):
+	httpserver.expect_request('/v1/chat/completions', method='POST').respond_with_data(
+		json.dumps(COMPLETION), content_type='application/json'
+	)
+	base_url = httpserver.url_for('/v1')
+	try:
+		llm = ChatOpenAI(model='gpt-4o-mini', api_key='sk-test', base_url=base_url, timeout=httpx.Timeout(10.0))
+		client = llm.get_client()
+
+		for _ in range(3):
+			result = await llm.ainvoke([UserMessage(content='Say ok')])
+			assert result.completion == 'ok'
+
+		# Same configuration, even on another model instance, reuses the same client and connection pool
+		assert llm.get_client() is client
+		assert (
+			ChatOpenAI(model='gpt-4o', api_key='sk-test', base_url=base_url, timeout=httpx.Timeout(10.0)).get_client() is client
+		)
+
+		# Different credentials or provider get their own client
+		assert ChatOpenAI(model='gpt-4o-mini', api_key='sk-other', base_url=base_url).get_client() is not client
+		ChatAnthropic(model='claude-sonnet-4-0', api_key='sk-ant-test').get_client()
+		assert shared_client_count() == 3
+	finally:
+		await aclose_shared_clients()
+
+	assert shared_client_count() == 0
+	assert client.is_closed()
+	assert ChatOpenAI(model='gpt-4o-mini', api_key='sk-test', base_url=base_url).get_client() is not client
+	await aclose_shared_clients()
+
+
+async def test_caller_http_client_is_used_without_creating_a_pooled_one(monkeypatch):
+	import browser_use.llm.clients as clients
+
+	created: list[httpx.AsyncClient] = []
+	create_http_client = clients.create_http_client
+	monkeypatch.setattr(clients, 'create_http_client', lambda: created.append(create_http_client()) or created[-1])
+
+	http_client = httpx.AsyncClient()
+	try:
+		client = ChatOpenAI(model='gpt-4o-mini', api_key='sk-test', http_client=http_client).get_client()
+		assert client._client is http_client and not created
+
+		ChatOpenAI(model='gpt-4o-mini', api_key='sk-test').get_client()
+		assert len(created) == 1
+	finally:
+		await aclose_shared_clients()
+		await http_client.aclose()
+
+
+def test_client_outside_event_loop_is_not_shared():
+	llm = ChatOpenAI(model='gpt-4o-mini', api_key='sk-test')
+	assert llm.get_client() is not llm.get_client()
+
+
+async def test_clients_are_closed_when_the_last_user_releases_them():
+	llm = ChatOpenAI(model='gpt-4o-mini', api_key='sk-test')
+	# An agent pool and one of its agents
+	retain_shared_clients()
+	retain_shared_clients()
+	client = llm.get_client()
+
+	await release_shared_clients()
+	assert llm.get_client() is client and not client.is_closed()
+
+	await release_shared_clients()
+	assert shared_client_count() == 0
+	assert client.is_closed()
@@ -1,5 +1,4 @@
 import json
-import os
 
 import tiktoken
 
@@ -8,7 +7,7 @@ from browser_use.llm.schema import SchemaOptimizer
 from browser_use.tools.service import Tools
 
 
-def test_optimized_schema():
+def test_optimized_schema(tmp_path):
 	"""Test the optimized schema generation and save to file."""
 
 	# Create tools and get all registered actions
@@ -24,14 +23,12 @@ def test_optimized_schema():
 	# Create the optimized schema
 	optimized_schema = SchemaOptimizer.create_optimized_json_schema(agent_output_model)
 
-	# Create tmp directory if it doesn't exist
-	os.makedirs('./tmp', exist_ok=True)
-
 	# Save optimized schema
-	with open('./tmp/optimized_schema.json', 'w') as f:
+	schema_path = tmp_path / 'optimized_schema.json'
+	with open(schema_path, 'w') as f:
 		json.dump(optimized_schema, f, separators=(',', ':'), indent=2)
 
-	print('✅ Optimized schema generated and saved to ./tmp/optimized_schema.json')
+	print(f'✅ Optimized schema generated and saved to {schema_path}')
 
 	# Compare token counts of both
 	try:
@@ -0,0 +1,117 @@
+"""
+Tests for hedged and fallback LLM invocation in browser_use.llm.hedging.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+import pytest
+from pydantic import BaseModel
+
+from browser_use.llm import ChatHedged, UserMessage
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.views import ChatInvokeCompletion
+
+
+class Answer(BaseModel):
+	text: str
+
+
+@dataclass
+class FakeChatModel:
+	"""Chat model answering after a fixed delay, or failing"""
+
+	model: str
+	delay: float = 0.0
+	fail: bool = False
+	started: int = 0
+	cancelled: int = 0
+	delays: list[float] = field(default_factory=list)  # per-call delays, overrides delay while non-empty
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None):
+		self.started += 1
+		try:
+			await asyncio.sleep(self.delays.pop(0) if self.delays else self.delay)
+		except asyncio.CancelledError:
+			self.cancelled += 1
+			raise
+		if self.fail:
+			raise ModelProviderError(message=f'{self.model} failed', status_code=500, model=self.model)
+		completion = Answer(text=self.model) if output_format else self.model
+		return ChatInvokeCompletion(completion=completion, usage=None)
+
+
+MESSAGES = [UserMessage(content='hi')]
+
+
+async def test_hedged_request_wins_and_loser_is_cancelled():
+	slow, fast = FakeChatModel('slow', delay=5), FakeChatModel('fast', delay=0.01)
+	llm = ChatHedged(llm=slow, hedge_llm=fast, hedge_after=0.05)  # type: ignore[arg-type]
+
+	result = await llm.ainvoke(MESSAGES, output_format=Answer)
+
+	assert result.completion == Answer(text='fast')
+	assert slow.cancelled == 1
+	assert llm.stats.hedges_sent == 1
+	assert llm.stats.hedge_wins == 1
+	assert llm.model == 'slow'
+
+
+async def test_no_hedge_when_primary_is_fast():
+	primary, hedge = FakeChatModel('primary', delay=0.01), FakeChatModel('hedge')
+	llm = ChatHedged(llm=primary, hedge_llm=hedge, hedge_after=1)  # type: ignore[arg-type]
+
+	assert (await llm.ainvoke(MESSAGES)).completion == 'primary'
+	assert hedge.started == 0
+	assert llm.stats.hedges_sent == 0
+
+
+async def test_adaptive_threshold_hedges_to_same_model():
+	primary = FakeChatModel('primary', delays=[0.01] * 10 + [5, 0.01])
+	llm = ChatHedged(llm=primary, min_samples=10, min_hedge_after=0.05)  # type: ignore[arg-type]
+
+	for _ in range(10):
+		await llm.ainvoke(MESSAGES)
+	assert llm.get_hedge_threshold() == 0.05
+
+	# The 11th call is slow, a duplicate of it to the same model answers first
+	assert (await llm.ainvoke(MESSAGES)).completion == 'primary'
+	assert primary.started == 12
+	assert primary.cancelled == 1
+	assert llm.stats.hedge_wins == 1
+	# The slow call is sampled with the time it took until the hedge won, so the threshold doesn't only drift down
+	assert len(llm._latencies) == 11 and llm._latencies[-1] >= 0.05
+
+
+async def test_fallback_chain_on_errors():
+	primary = FakeChatModel('primary', fail=True)
+	broken_fallback = FakeChatModel('broken', fail=True)
+	working_fallback = FakeChatModel('working')
+	llm = ChatHedged(llm=primary, fallback_llms=[broken_fallback, working_fallback])  # type: ignore[arg-type]
+
+	assert (await llm.ainvoke(MESSAGES)).completion == 'working'
+	assert llm.stats.fallbacks_used == 2
+
+	llm = ChatHedged(llm=primary, fallback_llms=[broken_fallback])  # type: ignore[arg-type]
+	with pytest.raises(ModelProviderError, match='broken failed'):
+		await llm.ainvoke(MESSAGES)
+	assert llm.stats.failures == 1
+
+
+async def test_request_cancelled_inside_the_model_counts_as_failed():
+	class CancellingChatModel(FakeChatModel):
+		async def ainvoke(self, messages, output_format=None):
+			raise asyncio.CancelledError
+
+	llm = ChatHedged(llm=CancellingChatModel('cancelled'), fallback_llms=[FakeChatModel('working')])  # type: ignore[arg-type]
+
+	assert (await llm.ainvoke(MESSAGES)).completion == 'working'
+	assert llm.stats.fallbacks_used == 1
@@ -0,0 +1,142 @@
+"""
+Tests for the record/replay cache of chat models in browser_use.llm.replay.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+
+import pytest
+from pydantic import BaseModel
+
+from browser_use.llm import ChatReplay, SystemMessage, UserMessage
+from browser_use.llm.exceptions import ModelCacheMissError
+from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+
+
+class Answer(BaseModel):
+	text: str
+	steps: list[int]
+
+
+@dataclass
+class FakeChatModel:
+	"""Chat model answering with the number of the call"""
+
+	model: str = 'fake-model'
+	calls: int = 0
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls += 1
+		completion = Answer(text=f'call {self.calls}', steps=[1, 2]) if output_format else f'call {self.calls}'
+		usage = ChatInvokeUsage(
+			prompt_tokens=100,
+			prompt_cached_tokens=20,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=10,
+			total_tokens=110,
+		)
+		return ChatInvokeCompletion(completion=completion, thinking='thought', usage=usage)
+
+
+def _messages(date: str = '2025-01-01', screenshot: str = 'aaaa') -> list:
+	return [
+		SystemMessage(content='You are a browser agent'),
+		UserMessage(
+			content=[
+				ContentPartTextParam(text=f'Step 1. Current date: {date}  \n<browser_state>...</browser_state>', cache=True),
+				ContentPartImageParam(image_url=ImageURL(url=f'data:image/png;base64,{screenshot}', media_type='image/png')),
+			]
+		),
+	]
+
+
+async def test_record_then_replay_offline(tmp_path):
+	cache_path = tmp_path / 'cache.sqlite'
+	fake = FakeChatModel()
+	recorder = ChatReplay(llm=fake, cache_path=cache_path, mode='record')  # type: ignore[arg-type]
+
+	recorded = await recorder.ainvoke(_messages(), output_format=Answer)
+	recorded_text = await recorder.ainvoke(_messages())
+	recorder.close()
+	assert fake.calls == 2 and recorder.stats.recorded == 2
+
+	replayer = ChatReplay(llm=FakeChatModel(), cache_path=cache_path, mode='replay')  # type: ignore[arg-type]
+	# Another date and trailing whitespace still replay the recording
+	replayed = await replayer.ainvoke(_messages(date='2031-12-31'), output_format=Answer)
+	assert isinstance(replayed.completion, Answer) and replayed.completion == recorded.completion
+	assert replayed.thinking == 'thought' and replayed.usage == recorded.usage
+	assert (await replayer.ainvoke(_messages())).completion == recorded_text.completion == 'call 2'
+	assert replayer.stats.hits == 2
+
+	with pytest.raises(ModelCacheMissError):
+		await replayer.ainvoke(_messages(screenshot='bbbb'))
+	assert replayer.stats.misses == 1
+
+	ignoring_images = ChatReplay(llm=FakeChatModel(), cache_path=cache_path, mode='replay', ignore_images=True)  # type: ignore[arg-type]
+	with pytest.raises(ModelCacheMissError):
+		await ignoring_images.ainvoke(_messages(screenshot='bbbb'))  # recorded with the image in the key
+
+
+async def test_record_missing_only_calls_model_for_new_requests(tmp_path):
+	fake = FakeChatModel()
+	llm = ChatReplay(llm=fake, cache_path=tmp_path / 'cache.sqlite', mode='record_missing', ignore_images=True)  # type: ignore[arg-type]
+
+	first = await llm.ainvoke(_messages(screenshot='aaaa'))
+	second = await llm.ainvoke(_messages(screenshot='bbbb'))
+	other = await llm.ainvoke([UserMessage(content='something else')])
+
+	assert first.completion == second.completion == 'call 1'
+	assert other.completion == 'call 2'
+	assert fake.calls == 2
+	assert llm.stats.model_dump() == {'calls': 3, 'hits': 1, 'misses': 2, 'recorded': 2}
+	assert llm.get_cache_key(_messages(), Answer) != llm.get_cache_key(_messages())
+
+
+async def test_replayed_usage_is_tracked_by_token_cost(tmp_path):
+	cache_path = tmp_path / 'cache.sqlite'
+	await ChatReplay(llm=FakeChatModel(), cache_path=cache_path, mode='record').ainvoke(_messages())  # type: ignore[arg-type]
+
+	token_cost = TokenCost(include_cost=False)
+	llm = token_cost.register_llm(ChatReplay(llm=FakeChatModel(), cache_path=cache_path, mode='replay'))  # type: ignore[arg-type]
+	await llm.ainvoke(_messages())
+
+	summary = await token_cost.get_usage_summary()
+	assert summary.total_prompt_tokens == 100 and summary.total_prompt_cached_tokens == 20
+	assert summary.total_completion_tokens == 10
+
+
+async def test_cache_queries_run_off_the_event_loop(tmp_path, monkeypatch):
+	import sqlite3
+
+	loop_thread = threading.get_ident()
+	query_threads: set[int] = set()
+	connect = sqlite3.connect
+
+	class TrackedConnection(sqlite3.Connection):
+		def execute(self, *args, **kwargs):  # type: ignore[override]
+			query_threads.add(threading.get_ident())
+			return super().execute(*args, **kwargs)
+
+	monkeypatch.setattr(sqlite3, 'connect', lambda *args, **kwargs: connect(*args, factory=TrackedConnection, **kwargs))
+
+	llm = ChatReplay(llm=FakeChatModel(), cache_path=tmp_path / 'cache.sqlite', mode='record_missing')  # type: ignore[arg-type]
+	requests = [[UserMessage(content=f'request {i}')] for i in range(20)]
+	recorded = await asyncio.gather(*(llm.ainvoke(messages) for messages in requests))
+	replayed = await asyncio.gather(*(llm.ainvoke(messages) for messages in requests))
+	llm.close()
+
+	assert [response.completion for response in replayed] == [response.completion for response in recorded]
+	assert llm.stats.model_dump() == {'calls': 40, 'hits': 20, 'misses': 20, 'recorded': 20}
+	assert query_threads and loop_thread not in query_threads
@@ -0,0 +1,229 @@
+"""
+Tests for the rate limited, prioritized LLM request scheduler in browser_use.llm.scheduler.
+"""
+
+import asyncio
+import gc
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from browser_use.llm import UserMessage
+from browser_use.llm.clients import create_http_client
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.scheduler import LLMScheduler, RateLimits, estimate_tokens
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage, ChatStreamChunk
+
+
+class _SDKRateLimitError(Exception):
+	def __init__(self, response: httpx.Response):
+		super().__init__('rate limited')
+		self.response = response
+
+
+@dataclass
+class FakeChatModel:
+	"""Chat model that records the order and concurrency of its calls"""
+
+	model: str = 'fake-model'
+	delay: float = 0.02
+	gate: asyncio.Event | None = None  # when set, calls wait for the gate to open instead of the delay
+	fail_with_rate_limit: int = 0
+	calls: list[str] = field(default_factory=list)
+	in_flight: int = 0
+	max_in_flight: int = 0
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None):
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			if self.gate is not None:
+				await self.gate.wait()
+			else:
+				await asyncio.sleep(self.delay)
+			if self.fail_with_rate_limit:
+				self.fail_with_rate_limit -= 1
+				sdk_error = _SDKRateLimitError(httpx.Response(429, headers={'retry-after-ms': '200'}))
+				raise ModelProviderError(message='rate limited', status_code=429, model=self.model) from sdk_error
+			self.calls.append(messages[0].text)
+			usage = ChatInvokeUsage(
+				prompt_tokens=10,
+				prompt_cached_tokens=None,
+				prompt_cache_creation_tokens=None,
+				prompt_image_tokens=None,
+				completion_tokens=5,
+				total_tokens=15,
+			)
+			return ChatInvokeCompletion(completion='ok', usage=usage)
+		finally:
+			self.in_flight -= 1
+
+	async def astream(self, messages, output_format=None):
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			for delta in ('o', 'k'):
+				await asyncio.sleep(self.delay)
+				yield ChatStreamChunk(delta=delta)
+			self.calls.append(messages[0].text)
+		finally:
+			self.in_flight -= 1
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+	"""Let the other tasks run until condition() holds, without depending on wall clock time"""
+	for _ in range(100):
+		if condition():
+			return
+		await asyncio.sleep(0)
+	raise AssertionError('condition not met')
+
+
+async def test_concurrency_cap_and_priority_lanes():
+	gate = asyncio.Event()
+	calls: list[str] = []
+	scheduler = LLMScheduler(limits={'fake': RateLimits(max_concurrency=1)})
+	agent_llm = scheduler.register_llm(FakeChatModel(gate=gate, calls=calls), priority='normal')  # type: ignore[arg-type]
+	extraction_llm = scheduler.register_llm(FakeChatModel(gate=gate, calls=calls), priority='low')  # type: ignore[arg-type]
+	urgent_llm = scheduler.register_llm(FakeChatModel(gate=gate, calls=calls), priority='high')  # type: ignore[arg-type]
+
+	# Registering twice does not wrap ainvoke twice
+	assert scheduler.register_llm(agent_llm) is agent_llm  # type: ignore[arg-type]
+
+	first = asyncio.create_task(agent_llm.ainvoke([UserMessage(content='first')]))
+	await _until(lambda: agent_llm.in_flight == 1)  # type: ignore[attr-defined]
+	# The first call holds the lane until the gate opens, the rest queues up behind it
+	queued = [
+		asyncio.create_task(extraction_llm.ainvoke([UserMessage(content='low')])),
+		asyncio.create_task(agent_llm.ainvoke([UserMessage(content='normal')])),
+		asyncio.create_task(urgent_llm.ainvoke([UserMessage(content='high')])),
+	]
+	await _until(lambda: scheduler.get_stats()[0].queue_depth == 3)
+	[stats] = scheduler.get_stats()
+	assert stats.lane == 'fake:fake-model'
+	assert stats.in_flight == 1
+
+	gate.set()
+	await asyncio.gather(first, *queued)
+
+	# Served by priority once the lane frees up, one at a time
+	assert calls == ['first', 'high', 'normal', 'low']
+	assert max(llm.max_in_flight for llm in (agent_llm, extraction_llm, urgent_llm)) == 1  # type: ignore[attr-defined]
+	[stats] = scheduler.get_stats()
+	assert stats.requests == 4
+	assert stats.queue_depth == 0
+	assert stats.max_wait_seconds > 0
+
+
+async def test_request_rate_limit():
+	scheduler = LLMScheduler(default_limits=RateLimits(requests_per_minute=600))  # a bucket of 600, refilling 10/s
+	llm = scheduler.register_llm(FakeChatModel(delay=0))  # type: ignore[arg-type]
+	lane = scheduler._get_lane('fake', 'fake-model')
+	assert lane.requests_bucket is not None
+	lane.requests_bucket.level = 1  # only one request left in the bucket
+
+	start = time.monotonic()
+	await asyncio.gather(*(llm.ainvoke([UserMessage(content='x')]) for _ in range(3)))
+	# The 2 requests that did not fit in the bucket had to wait ~0.1s each for it to refill
+	assert time.monotonic() - start >= 0.18
+
+
+async def test_rate_limit_error_pauses_lane():
+	scheduler = LLMScheduler()
+	llm = FakeChatModel(delay=0, fail_with_rate_limit=1)
+	scheduler.register_llm(llm)  # type: ignore[arg-type]
+
+	try:
+		await llm.ainvoke([UserMessage(content='x')])
+		raise AssertionError('expected a rate limit error')
+	except ModelProviderError:
+		pass
+
+	[stats] = scheduler.get_stats()
+	assert stats.rate_limited == 1
+	assert stats.slowdown == 0.5
+
+	# The next call waits for the retry-after-ms from the 429 response headers
+	start = time.monotonic()
+	await llm.ainvoke([UserMessage(content='x')])
+	assert time.monotonic() - start >= 0.15
+	assert scheduler.get_stats()[0].slowdown > 0.5
+
+
+async def test_streams_hold_the_lane_until_they_end():
+	scheduler = LLMScheduler(limits={'fake': RateLimits(max_concurrency=1)})
+	llm = scheduler.register_llm(FakeChatModel())  # type: ignore[arg-type]
+
+	async def stream(text: str) -> str:
+		return ''.join([chunk.delta async for chunk in llm.astream([UserMessage(content=text)])])  # type: ignore[attr-defined]
+
+	first, second, third = await asyncio.gather(stream('first'), stream('second'), llm.ainvoke([UserMessage(content='third')]))
+	assert (first, second, third.completion) == ('ok', 'ok', 'ok')
+	assert llm.max_in_flight == 1  # type: ignore[attr-defined]
+	[stats] = scheduler.get_stats()
+	assert stats.requests == 3 and stats.in_flight == 0
+
+
+async def test_rate_limit_headers_of_successful_responses_slow_the_lane_down():
+	remaining = iter(['900', '50', '0'])
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		headers = {
+			'x-ratelimit-limit-requests': '1000',
+			'x-ratelimit-remaining-requests': next(remaining, '1000'),
+			'x-ratelimit-reset-requests': '300ms',
+		}
+		return httpx.Response(200, headers=headers, json={})
+
+	http_client = create_http_client(transport=httpx.MockTransport(handler))
+	scheduler = LLMScheduler()
+	llm = FakeChatModel(delay=0)
+	original_ainvoke = llm.ainvoke
+
+	async def ainvoke(messages, output_format=None):
+		await http_client.get('https://api.example.com/v1/chat/completions')
+		return await original_ainvoke(messages, output_format)
+
+	llm.ainvoke = ainvoke  # type: ignore[method-assign]
+	scheduler.register_llm(llm)  # type: ignore[arg-type]
+
+	# Plenty left
+	await llm.ainvoke([UserMessage(content='x')])
+	assert scheduler.get_stats()[0].slowdown == 1.0
+
+	# 5% left, slows down before any 429
+	await llm.ainvoke([UserMessage(content='x')])
+	assert scheduler.get_stats()[0].slowdown < 1.0
+
+	# Used up, the next call waits for the reset
+	await llm.ainvoke([UserMessage(content='x')])
+	start = time.monotonic()
+	await llm.ainvoke([UserMessage(content='x')])
+	assert time.monotonic() - start >= 0.25
+	assert scheduler.get_stats()[0].rate_limited == 0
+	await http_client.aclose()
+
+
+def test_registered_llms_are_not_kept_alive():
+	scheduler = LLMScheduler()
+	llm = FakeChatModel()
+	scheduler.register_llm(llm)  # type: ignore[arg-type]
+	assert len(scheduler._registered_llms) == 1
+
+	del llm
+	gc.collect()
+	assert len(scheduler._registered_llms) == 0
+
+
+def test_estimate_tokens():
+	assert estimate_tokens([UserMessage(content='a' * 400)]) == 104
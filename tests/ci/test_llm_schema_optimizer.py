@@ -6,7 +6,7 @@ optimizes the schemas for agent actions without losing information.
 from pydantic import BaseModel
 
 from browser_use.agent.views import AgentOutput
-from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.schema import SchemaOptimizer, clear_schema_cache, get_schema_cache_stats
 from browser_use.tools.service import Tools
 
 
@@ -64,3 +64,33 @@ def test_optimizer_preserves_all_fields_in_structured_done_action():
 		f'Missing from optimized: {original_fields - optimized_fields}\n'
 		f'Unexpected in optimized: {optimized_fields - original_fields}'
 	)
+
+
+def test_optimized_schema_and_request_templates_are_cached_per_model():
+	clear_schema_cache()
+	agent_output_model = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+
+	first = SchemaOptimizer.create_optimized_json_schema(agent_output_model)
+	first['properties'].clear()  # callers may modify the returned copy
+	second = SchemaOptimizer.create_optimized_json_schema(agent_output_model)
+
+	assert second == SchemaOptimizer._build_optimized_json_schema(agent_output_model)
+	assert get_schema_cache_stats().model_dump() == {'hits': 1, 'misses': 1}
+
+	built: list[str] = []
+
+	def build_tool():
+		built.append('tool')
+		return {'name': agent_output_model.__name__, 'schema': SchemaOptimizer.create_optimized_json_schema(agent_output_model)}
+
+	tool = SchemaOptimizer.get_request_template(agent_output_model, ('anthropic', 'tool'), build_tool)
+	assert SchemaOptimizer.get_request_template(agent_output_model, ('anthropic', 'tool'), build_tool) is tool
+	assert built == ['tool']
+
+	# Other output models and providers get their own entries
+	SchemaOptimizer.get_request_template(ProductInfo, ('anthropic', 'tool'), build_tool)
+	SchemaOptimizer.get_request_template(agent_output_model, ('openai', 'response_format'), build_tool)
+	assert built == ['tool', 'tool', 'tool']
+
+	clear_schema_cache()
+	assert get_schema_cache_stats().model_dump() == {'hits': 0, 'misses': 0}
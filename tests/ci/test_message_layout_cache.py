@@ -0,0 +1,103 @@
+"""
+Tests for the prompt-cache-aware message layout and the prompt cache hit tracking in TokenCost.
+"""
+
+from datetime import datetime
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.views import AgentStepInfo, MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
+from browser_use.llm.messages import ContentPartTextParam, SystemMessage
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+from browser_use.tokens.views import TokenUsageEntry
+
+
+def _browser_state(url: str) -> BrowserStateSummary:
+	return BrowserStateSummary(
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+		url=url,
+		title='Test Page',
+		tabs=[TabInfo(url=url, title='Test Page', target_id='ABCD1234')],
+	)
+
+
+def _state_message(manager: MessageManager, step: int):
+	manager.state.agent_history_items.append(HistoryItem(step_number=step, memory=f'memory {step}', next_goal=f'goal {step}'))
+	manager.create_state_messages(
+		browser_state_summary=_browser_state(f'https://example.com/page-{step}'),
+		step_info=AgentStepInfo(step_number=step, max_steps=20),
+		use_vision=False,
+		page_filtered_actions='Search the shop: {search_shop: {}}',
+	)
+	return manager.get_messages()[-1]
+
+
+def test_cache_optimized_layout_keeps_stable_prefix(tmp_path):
+	manager = MessageManager(
+		task='Find the cheapest laptop',
+		system_message=SystemMessage(content='System message', cache=True),
+		state=MessageManagerState(),
+		file_system=FileSystem(tmp_path),
+		message_layout='cache_optimized',
+	)
+
+	first = _state_message(manager, 1)
+	second = _state_message(manager, 2)
+
+	assert isinstance(first.content, list) and isinstance(second.content, list)
+	assert not first.cache and not second.cache
+	first_texts = [part.text for part in first.content if isinstance(part, ContentPartTextParam)]
+	second_texts = [part.text for part in second.content if isinstance(part, ContentPartTextParam)]
+
+	# The stable parts of the previous step are an exact prefix of the next step
+	assert second_texts[: len(first_texts) - 1] == first_texts[:-1]
+	assert first_texts[0].startswith('<user_request>\nFind the cheapest laptop\n</user_request>')
+	assert 'Step 3.' in second_texts[-1] and '<browser_state>' in second_texts[-1]
+	assert second_texts[-1].index('<page_specific_actions>') < second_texts[-1].index('<step_info>')
+
+	# Exactly one breakpoint, on the last history item
+	cached_parts = [i for i, part in enumerate(second.content) if isinstance(part, ContentPartTextParam) and part.cache]
+	assert cached_parts == [len(second_texts) - 2]
+	anthropic_messages, _ = AnthropicMessageSerializer.serialize_messages([second])
+	blocks = list(anthropic_messages[0]['content'])
+	assert [i for i, block in enumerate(blocks) if block.get('cache_control')] == cached_parts
+
+
+def test_default_layout_is_unchanged(tmp_path):
+	manager = MessageManager(
+		task='Find the cheapest laptop',
+		system_message=SystemMessage(content='System message'),
+		state=MessageManagerState(),
+		file_system=FileSystem(tmp_path),
+	)
+	message = _state_message(manager, 1)
+
+	assert message.cache and isinstance(message.content, str)
+	assert message.content.startswith('<agent_history>\nAgent initialized\n<step>')
+	assert message.content.index('<user_request>') < message.content.index('<step_info>')
+
+
+async def test_usage_summary_reports_prompt_cache_hit_rate():
+	token_cost = TokenCost(include_cost=False)
+	for prompt_tokens, cached_tokens, creation_tokens in ((1000, None, 800), (1200, 800, 100), (1400, 900, 100)):
+		usage = ChatInvokeUsage(
+			prompt_tokens=prompt_tokens,
+			prompt_cached_tokens=cached_tokens,
+			prompt_cache_creation_tokens=creation_tokens,
+			prompt_image_tokens=None,
+			completion_tokens=50,
+			total_tokens=prompt_tokens + 50,
+		)
+		token_cost.usage_history.append(TokenUsageEntry(model='claude-sonnet-4-0', timestamp=datetime.now(), usage=usage))
+
+	summary = await token_cost.get_usage_summary()
+
+	assert summary.total_prompt_cached_tokens == 1700
+	assert summary.total_prompt_cache_creation_tokens == 1000
+	assert summary.prompt_cache_hit_rate == 1700 / 3600
+	assert summary.by_model['claude-sonnet-4-0'].prompt_cache_hit_rate == 1700 / 3600
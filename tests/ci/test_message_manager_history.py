@@ -0,0 +1,63 @@
+"""
+Tests for the incremental agent history description of the MessageManager.
+"""
+
+from browser_use.agent.message_manager.service import AgentHistoryBuilder, MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.views import MessageManagerState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+
+
+def _rebuild(items: list[HistoryItem], max_history_items: int | None) -> str:
+	"""The history description built from scratch with one omitted item per step"""
+	if max_history_items is None or len(items) <= max_history_items:
+		return '\n'.join(item.to_string() for item in items)
+	omitted_count = len(items) - max_history_items
+	lines = [items[0].to_string(), f'<sys>[... {omitted_count} previous steps omitted...]</sys>']
+	lines.extend(item.to_string() for item in items[-(max_history_items - 1) :])
+	return '\n'.join(lines)
+
+
+def _step(n: int) -> HistoryItem:
+	return HistoryItem(step_number=n, memory=f'memory {n}', next_goal=f'goal {n}', action_results=f'Result:\nresult {n}')
+
+
+def test_builder_matches_full_rebuild():
+	for max_history_items in (None, 6, 10):
+		builder = AgentHistoryBuilder(max_history_items, compaction_block=1)
+		items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+		for n in range(1, 30):
+			items.append(_step(n) if n % 7 else HistoryItem(step_number=n, error='Agent failed to output in the right format.'))
+			assert builder.build(items) == _rebuild(items, max_history_items)
+
+
+def test_history_prefix_only_changes_on_compaction(tmp_path):
+	manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System message'),
+		state=MessageManagerState(),
+		file_system=FileSystem(tmp_path),
+		max_history_items=10,
+	)
+	items = manager.state.agent_history_items
+
+	descriptions = []
+	for n in range(1, 40):
+		items.append(_step(n))
+		descriptions.append(manager.agent_history_description)
+
+	compactions = 0
+	for previous, current in zip(descriptions, descriptions[1:]):
+		if not current.startswith(previous):
+			compactions += 1
+			assert 'previous steps omitted' in current
+	# 10 items with blocks of 2 omitted items: the prefix changes every second step only
+	assert compactions == 15
+	for description in descriptions:
+		assert description.startswith('Agent initialized')
+		assert description.count('<step>') <= 9
+
+	# A replaced history (e.g. a restored agent state) is rendered from scratch
+	manager.state.agent_history_items = items[:3]
+	assert manager.agent_history_description == _rebuild(items[:3], 10)
@@ -0,0 +1,70 @@
+"""
+Tests for the caching of dynamic action models and action prompt descriptions in the Registry.
+"""
+
+from pydantic import BaseModel
+
+from browser_use.agent.views import ActionResult
+from browser_use.tools.registry.service import Registry
+
+
+class SearchParams(BaseModel):
+	query: str
+
+
+def _create_registry() -> Registry:
+	registry = Registry()
+
+	@registry.action('Go somewhere')
+	async def navigate(params: SearchParams):
+		return ActionResult(extracted_content=params.query)
+
+	@registry.action('Search the shop', param_model=SearchParams, domains=['*.shop.com'])
+	async def search_shop(params: SearchParams):
+		return ActionResult(extracted_content=params.query)
+
+	@registry.action('Search the docs', param_model=SearchParams, domains=['https://docs.example.com'])
+	async def search_docs(params: SearchParams):
+		return ActionResult(extracted_content=params.query)
+
+	return registry
+
+
+def test_action_models_are_reused_for_the_same_active_actions():
+	registry = _create_registry()
+
+	shop_model = registry.create_action_model(page_url='https://www.shop.com/cart')
+	assert registry.create_action_model(page_url='https://shop.com/item/1') is shop_model
+	assert set(shop_model.model_json_schema()['$defs']) >= {'NavigateActionModel', 'SearchShopActionModel'}
+
+	docs_model = registry.create_action_model(page_url='https://docs.example.com/guide')
+	other_model = registry.create_action_model(page_url='https://unrelated.org')
+	assert len({shop_model, docs_model, other_model}) == 3
+	assert registry.create_action_model() is other_model  # same active actions as a page without domain actions
+	assert registry.create_action_model(page_url='http://docs.example.com') is other_model  # scheme must match
+
+	done_model = registry.create_action_model(include_actions=['navigate'], page_url='https://www.shop.com')
+	assert done_model is registry.create_action_model(include_actions=['navigate'])
+	assert list(done_model.model_fields) == ['navigate']
+
+	# Registering a new action changes the active set
+	@registry.action('Checkout', domains=['*.shop.com'])
+	async def checkout():
+		return ActionResult()
+
+	new_shop_model = registry.create_action_model(page_url='https://www.shop.com/cart')
+	assert new_shop_model is not shop_model
+	assert 'CheckoutActionModel' in new_shop_model.model_json_schema()['$defs']
+
+
+def test_prompt_descriptions_are_cached_per_active_actions():
+	registry = _create_registry()
+
+	system_prompt_actions = registry.get_prompt_description()
+	assert 'Go somewhere' in system_prompt_actions and 'Search the shop' not in system_prompt_actions
+
+	shop_actions = registry.get_prompt_description(page_url='https://www.shop.com')
+	assert 'Search the shop' in shop_actions and 'Go somewhere' not in shop_actions
+	assert registry.get_prompt_description(page_url='https://shop.com/other') is shop_actions
+	assert registry.get_prompt_description(page_url='https://docs.example.com') != shop_actions
+	assert registry.get_prompt_description(page_url='https://unrelated.org') == ''
@@ -0,0 +1,80 @@
+"""
+Tests for the content-addressed ScreenshotService.
+"""
+
+import base64
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.screenshots.service import ScreenshotService
+
+
+def _png_b64(color: tuple[int, int, int]) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (64, 48), color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+def _read_bytes(path: str) -> bytes:
+	return Path(path).read_bytes()
+
+
+def _file_names(directory: Path) -> list[str]:
+	return sorted(p.name for p in directory.iterdir())
+
+
+async def test_identical_screenshots_are_stored_once(tmp_path):
+	service = ScreenshotService(tmp_path)
+	red, blue = _png_b64((255, 0, 0)), _png_b64((0, 0, 255))
+
+	path_1 = await service.store_screenshot(red, 1)
+	path_2 = await service.store_screenshot(red, 2)
+	path_3 = await service.store_screenshot(blue, 3)
+	await service.flush()
+
+	assert path_1 == path_2 != path_3
+	assert service.step_screenshots == {1: path_1, 2: path_1, 3: path_3}
+	assert _file_names(service.screenshots_dir) == sorted({Path(path_1).name, Path(path_3).name})
+	assert _read_bytes(path_1) == base64.b64decode(red)
+
+
+async def test_get_screenshot_before_and_after_flush(tmp_path):
+	service = ScreenshotService(tmp_path, cache_size=1)
+	red, blue = _png_b64((255, 0, 0)), _png_b64((0, 0, 255))
+
+	red_path = await service.store_screenshot(red, 1)
+	# Served from memory while the write is still in flight
+	assert await service.get_screenshot(red_path) == red
+
+	blue_path = await service.store_screenshot(blue, 2)
+	await service.flush()
+
+	# red was evicted from the LRU by blue, so this one comes from disk
+	assert await service.get_screenshot(red_path) == red
+	assert await service.get_screenshot(blue_path) == blue
+	assert await service.get_screenshot(str(tmp_path / 'screenshots' / 'missing.png')) is None
+
+
+async def test_compressed_formats(tmp_path):
+	for image_format, pil_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+		service = ScreenshotService(tmp_path / image_format, image_format=image_format, quality=70)
+
+		path = await service.store_screenshot(_png_b64((0, 200, 0)), 1)
+		await service.flush()
+
+		assert path.endswith(f'.{image_format}')
+		with Image.open(path) as image:
+			assert image.format == pil_format
+			assert image.size == (64, 48)
+
+		screenshot_b64 = await service.get_screenshot(path)
+		assert screenshot_b64 is not None
+		assert base64.b64decode(screenshot_b64) == _read_bytes(path)
+
+		# Stored screenshots are labelled by their format, not as PNG
+		history = BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot_path=path)
+		assert history.screenshot_media_type == f'image/{image_format}'
+		assert history.get_screenshot() == screenshot_b64
@@ -0,0 +1,112 @@
+"""
+Tests for the compiled single-pass sensitive data redaction and placeholder substitution.
+"""
+
+import gc
+import random
+
+from browser_use.browser.sensitive_data import (
+	SecretRedactor,
+	get_compiled_sensitive_data,
+	substitute_secret_placeholders,
+)
+
+
+def _reference_redact(text: str, secrets: dict[str, str]) -> str:
+	"""Leftmost-longest replacement, one position at a time"""
+	key_by_value: dict[str, str] = {}
+	for key, value in secrets.items():
+		key_by_value.setdefault(value, key)
+	values = sorted(key_by_value, key=len, reverse=True)
+
+	result, i = [], 0
+	while i < len(text):
+		match = next((value for value in values if text.startswith(value, i)), None)
+		if match is None:
+			result.append(text[i])
+			i += 1
+		else:
+			result.append(f'<secret>{key_by_value[match]}</secret>')
+			i += len(match)
+	return ''.join(result)
+
+
+def test_redactor_prefers_longest_secret_and_reports_matches():
+	redactor = SecretRedactor({'user': 'admin', 'pin': 'admin1234', 'dot': 'a.b*c', 'short': 'x', 'empty': ''})
+
+	text, matched = redactor.redact_with_matches('admin1234 then admin then a.b*c and axbxc')
+
+	assert (
+		text
+		== '<secret>pin</secret> then <secret>user</secret> then <secret>dot</secret> and a<secret>short</secret>b<secret>short</secret>c'
+	)
+	assert matched == {'pin', 'user', 'dot', 'short'}
+	assert SecretRedactor({}).redact('nothing to do') == 'nothing to do'
+
+
+def test_redactor_matches_reference_on_random_secrets():
+	rng = random.Random(42)
+	alphabet = 'ab.*(c'
+	for _ in range(200):
+		secrets = {f'key_{i}': ''.join(rng.choices(alphabet, k=rng.randint(1, 6))) for i in range(rng.randint(1, 8))}
+		text = ''.join(rng.choices(alphabet + ' ', k=80))
+		assert SecretRedactor(secrets).redact(text) == _reference_redact(text, secrets)
+
+
+def test_compiled_sensitive_data_redacts_all_domains_and_scopes_lookups():
+	sensitive_data = {
+		'https://*.example.com': {'username': 'admin', 'password': 'secret123'},
+		'google.com': {'email': 'user@example.com', 'password': 'google_pass'},
+		'api_key': 'sk-123',
+	}
+	compiled = get_compiled_sensitive_data(sensitive_data)
+	assert get_compiled_sensitive_data(dict(sensitive_data)) is compiled
+
+	# Every value is redacted, also when the same key holds a different value on another domain
+	redacted = compiled.redactor.redact('admin secret123 google_pass user@example.com sk-123')
+	assert redacted == (
+		'<secret>username</secret> <secret>password</secret> <secret>password</secret> <secret>email</secret> '
+		'<secret>api_key</secret>'
+	)
+
+	assert compiled.applicable_secrets('https://www.example.com/login') == {
+		'username': 'admin',
+		'password': 'secret123',
+		'api_key': 'sk-123',
+	}
+	assert compiled.applicable_secrets('https://google.com') == {
+		'email': 'user@example.com',
+		'password': 'google_pass',
+		'api_key': 'sk-123',
+	}
+	assert compiled.applicable_secrets('about:blank') == {'api_key': 'sk-123'}
+
+
+def test_compiled_sensitive_data_is_not_kept_after_its_owners():
+	from browser_use.browser import sensitive_data as sensitive_data_module
+
+	sensitive_data = {'example.com': {'password': 'hunter2'}, 'api_key': 'sk-456'}
+	compiled = get_compiled_sensitive_data(sensitive_data)
+	# Changes to the caller's dict are a new set of secrets, not an edit of the compiled one
+	sensitive_data['api_key'] = 'sk-789'
+	assert compiled.applicable_secrets(None) == {'api_key': 'sk-456'}
+	assert get_compiled_sensitive_data(sensitive_data) is not compiled
+
+	# The cache is keyed by digests and drops the secrets once nothing uses them anymore
+	cache = sensitive_data_module._compiled_by_digest
+	assert not any('hunter2' in key or 'sk-456' in key for key in cache.keys())
+	del compiled
+	gc.collect()
+	assert not any(compiled.redactor.key_by_value.get('sk-456') for compiled in cache.values())
+
+
+def test_substitute_secret_placeholders():
+	text, replaced, missing = substitute_secret_placeholders(
+		'<secret>user</secret>:<secret>bu_2fa_code</secret> <secret>unknown</secret>',
+		{'user': 'admin', 'bu_2fa_code': 'JBSWY3DPEHPK3PXP'},
+		resolve=lambda key, value: '123456' if key == 'bu_2fa_code' else value,
+	)
+
+	assert text == 'admin:123456 <secret>unknown</secret>'
+	assert replaced == {'user', 'bu_2fa_code'}
+	assert missing == {'unknown'}
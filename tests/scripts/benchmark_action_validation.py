@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark parsing of agent outputs with a plain union of action models vs. the union tagged by action name.
+
+Builds registries with 20 to 200 actions and validates an agent output JSON with three actions through
+parse_json_output. With the plain union pydantic tries the action models one by one, so an action registered late costs
+more than an early one, and an invalid action reports an error for every action model. The tagged union, which
+Registry.create_action_model builds, looks the action model up by its name.
+
+Usage:
+	python tests/scripts/benchmark_action_validation.py [--iterations 2000] [--sizes 20,50,100,200]
+"""
+
+import argparse
+import json
+import time
+from typing import Union
+
+from pydantic import BaseModel, RootModel, ValidationError, create_model
+
+from browser_use.agent.views import ActionResult, AgentOutput
+from browser_use.llm.parsing import parse_json_output
+from browser_use.tools.registry.service import Registry
+from browser_use.tools.registry.views import ActionModel
+
+
+class SearchParams(BaseModel):
+	query: str
+	index: int | None = None
+	new_tab: bool = False
+
+
+def create_registry(size: int) -> Registry:
+	registry = Registry()
+	for i in range(size):
+
+		async def action(params: SearchParams):
+			return ActionResult(extracted_content=params.query)
+
+		action.__name__ = f'action_{i}'
+		registry.action(f'Action number {i}', param_model=SearchParams)(action)
+	return registry
+
+
+def create_plain_union_model(registry: Registry) -> type[ActionModel]:
+	"""The action model as it was built before the union was tagged"""
+	models = [
+		create_model(f'Action{i}Model', __base__=ActionModel, **{name: (action.param_model, ...)})  # type: ignore
+		for i, (name, action) in enumerate(registry.registry.actions.items())
+	]
+
+	class ActionModelUnion(RootModel[Union[tuple(models)]]):  # type: ignore
+		pass
+
+	return ActionModelUnion  # type: ignore
+
+
+def create_output(size: int) -> str:
+	actions = [{f'action_{i}': {'query': f'query {i}', 'index': i}} for i in (0, size // 2, size - 1)]
+	return json.dumps({'evaluation_previous_goal': 'ok', 'memory': 'memory', 'next_goal': 'goal', 'action': actions})
+
+
+def time_parse(output_model: type[AgentOutput], text: str, iterations: int) -> float:
+	start = time.perf_counter()
+	for _ in range(iterations):
+		parse_json_output(output_model, text)
+	return (time.perf_counter() - start) / iterations
+
+
+def count_errors(output_model: type[AgentOutput], size: int) -> int:
+	invalid = create_output(size).replace('"index": 0', '"index": "first"')
+	try:
+		parse_json_output(output_model, invalid)
+	except ValidationError as e:
+		return e.error_count()
+	return 0
+
+
+def main(iterations: int, sizes: list[int]) -> None:
+	print(f'{"actions":>8} {"plain union":>14} {"tagged union":>14} {"speedup":>8} {"errors plain/tagged":>20}')
+	for size in sizes:
+		registry = create_registry(size)
+		plain = AgentOutput.type_with_custom_actions(create_plain_union_model(registry))
+		tagged = AgentOutput.type_with_custom_actions(registry.create_action_model())
+		text = create_output(size)
+
+		# Warm up the adapters
+		time_parse(plain, text, 10)
+		time_parse(tagged, text, 10)
+
+		plain_time = time_parse(plain, text, iterations)
+		tagged_time = time_parse(tagged, text, iterations)
+		errors = f'{count_errors(plain, size)}/{count_errors(tagged, size)}'
+		print(
+			f'{size:>8} {plain_time * 1e6:>12.1f}us {tagged_time * 1e6:>12.1f}us {plain_time / tagged_time:>7.1f}x {errors:>20}'
+		)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--iterations', type=int, default=2000)
+	parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')], default=[20, 50, 100, 200])
+	args = parser.parse_args()
+	main(args.iterations, args.sizes)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark the memory per agent of a browser per agent vs. isolated browser contexts in one shared browser.
+
+Starts a BrowserSessionPool with --agents sessions in both modes, loads the same local test page in every session and
+measures the Chromium processes with psutil. RSS counts the shared libraries and shared memory of Chromium once per
+process and so overstates the cost of many processes a bit, the USS (memory only that process uses) is reported as
+well where the platform provides it.
+
+In the context mode all agents share the browser, GPU and network processes and only add a renderer process (plus
+the memory of their context in the browser process), so the memory per agent is a fraction of a browser per agent.
+
+Prints one row per mode with the start time, the number of Chromium processes and their RSS/USS in total and per
+agent, the per agent columns are the numbers to compare.
+
+Usage:
+	python tests/scripts/benchmark_browser_contexts.py [--agents 10] [--no-headless] [--executable-path /path/to/chromium]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import psutil
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.pool import BrowserSessionPool
+from browser_use.browser.profile import BrowserProfile
+
+PAGE = (
+	'<html><head><title>Product list</title></head><body><h1>Products</h1><ul>'
+	+ ''.join(f'<li><a href="/product/{i}">Product {i}</a> <button>Add to cart</button></li>' for i in range(300))
+	+ '</ul><script>document.querySelectorAll("button").forEach(b => b.onclick = () => b.textContent = "Added")</script>'
+	+ '</body></html>'
+)
+
+
+def measure_browser_processes(ignore: set[int]) -> tuple[int, float, float | None]:
+	"""Number of processes, total RSS and total USS in MB of the child processes not in ignore"""
+	processes = [p for p in psutil.Process().children(recursive=True) if p.pid not in ignore]
+	rss = uss = 0
+	uss_available = True
+	for process in processes:
+		try:
+			rss += process.memory_info().rss
+			if uss_available:
+				uss += process.memory_full_info().uss
+		except psutil.AccessDenied:
+			uss_available = False
+		except psutil.NoSuchProcess:
+			pass
+	return len(processes), rss / 1024 / 1024, uss / 1024 / 1024 if uss_available else None
+
+
+async def run_mode(agents: int, contexts_per_browser: int, url: str, profile: BrowserProfile) -> None:
+	ignore = {p.pid for p in psutil.Process().children(recursive=True)}
+	pool = BrowserSessionPool(size=agents, browser_profile=profile, contexts_per_browser=contexts_per_browser)
+	try:
+		start_time = time.monotonic()
+		await pool.start()
+		start_seconds = time.monotonic() - start_time
+
+		sessions = [await pool.acquire() for _ in range(agents)]
+		await asyncio.gather(*(session.event_bus.dispatch(NavigateToUrlEvent(url=url)) for session in sessions))
+		await asyncio.sleep(2)  # let the renderers settle
+
+		processes, rss, uss = measure_browser_processes(ignore)
+		mode = 'browser per agent' if contexts_per_browser == 1 else f'{contexts_per_browser} contexts per browser'
+		uss_report = f'{uss:>9.0f}MB {uss / agents:>9.1f}MB' if uss is not None else f'{"n/a":>11} {"n/a":>11}'
+		print(
+			f'{mode:>24} {start_seconds:>8.1f}s {processes:>9} {rss:>9.0f}MB {rss / agents:>9.1f}MB {uss_report}',
+			flush=True,
+		)
+		for session in sessions:
+			pool.release(session)
+	finally:
+		await pool.close()
+
+
+async def main(agents: int, headless: bool, executable_path: str | None) -> None:
+	logging.getLogger('browser_use').setLevel(logging.WARNING)
+	profile = BrowserProfile(
+		headless=headless, user_data_dir=None, enable_default_extensions=False, executable_path=executable_path
+	)
+	server = HTTPServer()
+	server.start()
+	server.expect_request('/products').respond_with_data(PAGE, content_type='text/html')
+	try:
+		print(f'{agents} agents, one page each')
+		print(
+			f'{"mode":>24} {"start":>9} {"processes":>9} {"RSS":>11} {"RSS/agent":>11} {"USS":>11} {"USS/agent":>11}',
+			flush=True,
+		)
+		await run_mode(agents, 1, server.url_for('/products'), profile)
+		await run_mode(agents, agents, server.url_for('/products'), profile)
+	finally:
+		server.clear()
+		server.stop()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--agents', type=int, default=10)
+	parser.add_argument('--no-headless', dest='headless', action='store_false')
+	parser.add_argument('--executable-path', help='Chromium to benchmark (default: the one browser-use finds)')
+	args = parser.parse_args()
+	asyncio.run(main(args.agents, args.headless, args.executable_path))
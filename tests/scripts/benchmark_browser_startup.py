@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark the cold start of a local browser session, from BrowserSession.start() to the first loaded page.
+
+Measures --runs launches in each of three setups:
+	first launch    a new config dir per launch, so the default extensions are downloaded, verified and patched
+	                (only with --extensions, which needs network access)
+	cached          the extensions are verified once, later launches only read their marker files, and every
+	                launch starts from an empty temporary profile
+	template        like cached, but every launch starts from a copy of a profile template created by one launch
+	                with user_data_dir=<template>, which skips the first run setup of an empty profile
+
+The DevTools URL is read from the browser's stderr in all setups, the start time includes connecting over CDP.
+
+Usage:
+	python tests/scripts/benchmark_browser_startup.py [--runs 5] [--extensions] [--no-headless]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+
+
+async def launch(profile: BrowserProfile, url: str) -> tuple[float, float]:
+	"""Seconds until the session is started and until the first page is loaded"""
+	session = BrowserSession(browser_profile=profile)
+	start_time = time.monotonic()
+	try:
+		await session.start()
+		started = time.monotonic() - start_time
+		await session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		return started, time.monotonic() - start_time
+	finally:
+		await session.kill()
+
+
+async def run_setup(name: str, runs: int, url: str, make_profile, config_dir=None) -> None:
+	started, loaded = [], []
+	for _ in range(runs):
+		if config_dir is not None:
+			os.environ['BROWSER_USE_CONFIG_DIR'] = tempfile.mkdtemp(prefix='browser-use-benchmark-config-')
+		try:
+			start_seconds, load_seconds = await launch(make_profile(), url)
+		finally:
+			if config_dir is not None:
+				shutil.rmtree(os.environ['BROWSER_USE_CONFIG_DIR'], ignore_errors=True)
+				os.environ['BROWSER_USE_CONFIG_DIR'] = config_dir
+		started.append(start_seconds)
+		loaded.append(load_seconds)
+	print(
+		f'{name:>14} {statistics.median(started):>9.2f}s {min(started):>9.2f}s {statistics.median(loaded):>11.2f}s',
+		flush=True,
+	)
+
+
+async def main(runs: int, extensions: bool, headless: bool) -> None:
+	logging.getLogger('browser_use').setLevel(logging.WARNING)
+	config_dir = tempfile.mkdtemp(prefix='browser-use-benchmark-config-')
+	os.environ['BROWSER_USE_CONFIG_DIR'] = config_dir
+	template = Path(tempfile.mkdtemp(prefix='browser-use-benchmark-template-'))
+	server = HTTPServer()
+	server.start()
+	server.expect_request('/').respond_with_data('<html><body><h1>Ready</h1></body></html>', content_type='text/html')
+	url = server.url_for('/')
+
+	def profile(**kwargs) -> BrowserProfile:
+		return BrowserProfile(headless=headless, user_data_dir=None, enable_default_extensions=extensions, **kwargs)
+
+	try:
+		print(f'{runs} launches per setup, extensions {"on" if extensions else "off"}')
+		print(f'{"setup":>14} {"start p50":>10} {"start min":>10} {"loaded p50":>12}', flush=True)
+		if extensions:
+			await run_setup('first launch', runs, url, profile, config_dir=config_dir)
+
+		# Verify the extensions and create the template once, neither is measured
+		await launch(profile(user_data_dir=template), url)
+
+		await run_setup('cached', runs, url, profile)
+		await run_setup('template', runs, url, lambda: profile(user_data_dir_template=template))
+	finally:
+		server.clear()
+		server.stop()
+		shutil.rmtree(template, ignore_errors=True)
+		shutil.rmtree(config_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=5)
+	parser.add_argument('--extensions', action='store_true', help='load the default extensions (needs network access)')
+	parser.add_argument('--no-headless', dest='headless', action='store_false')
+	args = parser.parse_args()
+	asyncio.run(main(args.runs, args.extensions, args.headless))
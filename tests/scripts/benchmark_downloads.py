@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark download-to-availability latency of the DownloadsWatchdog.
+
+Serves files from 1KB to 100MB from a local test server, clicks a download link for each one and measures the
+time between the click and the FileDownloadedEvent being dispatched.
+
+Usage:
+	python tests/scripts/benchmark_downloads.py [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import FileDownloadedEvent, NavigateToUrlEvent
+
+FILE_SIZES = {
+	'1KB': 1024,
+	'100KB': 100 * 1024,
+	'1MB': 1024 * 1024,
+	'10MB': 10 * 1024 * 1024,
+	'100MB': 100 * 1024 * 1024,
+}
+
+
+def start_server() -> HTTPServer:
+	server = HTTPServer(host='127.0.0.1', port=0)
+	server.start()
+
+	links = '\n'.join(f'<a id="{label}" href="/files/{label}.bin" download="{label}.bin">{label}</a>' for label in FILE_SIZES)
+	server.expect_request('/').respond_with_data(f'<html><body>{links}</body></html>', content_type='text/html')
+	for label, size in FILE_SIZES.items():
+		server.expect_request(f'/files/{label}.bin').respond_with_data(os.urandom(size), content_type='application/octet-stream')
+	return server
+
+
+async def measure_download(session: BrowserSession, label: str) -> float:
+	"""Click the download link for label and return the seconds until FileDownloadedEvent is dispatched."""
+	cdp_session = await session.get_or_create_cdp_session()
+	downloaded = asyncio.create_task(session.event_bus.expect(FileDownloadedEvent, timeout=120))
+	await asyncio.sleep(0)  # make sure the expect() listener is registered before clicking
+
+	start = time.perf_counter()
+	await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': f'document.getElementById("{label}").click()'},
+		session_id=cdp_session.session_id,
+	)
+	event = await downloaded
+	elapsed = time.perf_counter() - start
+
+	assert isinstance(event, FileDownloadedEvent)
+	assert await asyncio.to_thread(os.path.getsize, event.path) == FILE_SIZES[label], f'{event.path} is incomplete'
+	return elapsed
+
+
+async def main(runs: int) -> None:
+	server = start_server()
+	results: dict[str, list[float]] = {label: [] for label in FILE_SIZES}
+
+	for _ in range(runs):
+		with tempfile.TemporaryDirectory() as downloads_dir:
+			session = BrowserSession(
+				browser_profile=BrowserProfile(headless=True, user_data_dir=None, downloads_path=downloads_dir)
+			)
+			await session.start()
+			try:
+				await session.event_bus.dispatch(NavigateToUrlEvent(url=server.url_for('/')))
+				for label in FILE_SIZES:
+					results[label].append(await measure_download(session, label))
+			finally:
+				await session.kill()
+
+	server.stop()
+
+	print(f'\n{"size":>8} | {"median":>10} | {"min":>10} | {"max":>10}   (download-to-availability, {runs} runs)')
+	print('-' * 50)
+	for label, timings in results.items():
+		print(
+			f'{label:>8} | {statistics.median(timings) * 1000:>8.1f}ms | {min(timings) * 1000:>8.1f}ms | {max(timings) * 1000:>8.1f}ms'
+		)
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=3)
+	asyncio.run(main(parser.parse_args().runs))
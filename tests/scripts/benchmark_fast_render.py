@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark agent steps with and without BrowserProfile.fast_render on a local corpus of animated pages.
+
+The corpus has a page each with an auto-playing carousel, fade-in transitions, smooth scrolling, an animated menu and
+layout shifting banners. Every mode runs --runs steps per page, where a step is a page scroll, a click on the page's
+button and the browser state request that follows it (which includes the page load waits of the DOMWatchdog).
+
+Reported per mode:
+	step p50     median seconds per step
+	stable       share of interactive elements at the same position in two browser states taken 300ms apart,
+	             a changing layout makes the agent's element indexes and screenshots stale
+	unstable     pages the FastRenderWatchdog gave up waiting for (fast_render only)
+
+Usage:
+	python tests/scripts/benchmark_fast_render.py [--runs 5] [--no-headless]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import ClickElementEvent, NavigateToUrlEvent, ScrollEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.views import BrowserStateSummary
+
+FILLER = ''.join(f'<p>Paragraph {i} with some text to scroll past.</p>' for i in range(80))
+
+PAGES = {
+	'carousel': (
+		'<style>#slides { display: flex; animation: slide 3s infinite } .slide { min-width: 100%; height: 200px }'
+		'@keyframes slide { 0% { transform: translateX(0) } 50% { transform: translateX(-100%) } }</style>'
+		'<div style="overflow: hidden"><div id="slides"><div class="slide"><a href="#a">Deal A</a></div>'
+		'<div class="slide"><a href="#b">Deal B</a></div></div></div>'
+	),
+	'fade-in': (
+		'<style>.card { opacity: 0; transform: translateY(40px); transition: all 1.5s } .card.shown { opacity: 1; transform: none }</style>'
+		+ ''.join(f'<div class="card"><a href="#c{i}">Card {i}</a></div>' for i in range(20))
+		+ "<script>setTimeout(() => document.querySelectorAll('.card').forEach(c => c.classList.add('shown')), 50)</script>"
+	),
+	'smooth-scroll': (
+		'<style>html { scroll-behavior: smooth }</style><nav><a href="#bottom">Jump to bottom</a></nav>'
+		'<script>addEventListener("scroll", () => {}, {passive: true})</script>'
+	),
+	'menu': (
+		'<style>#menu { max-height: 0; overflow: hidden; transition: max-height 1s ease-in-out } #menu.open { max-height: 400px }</style>'
+		'<ul id="menu">' + ''.join(f'<li><a href="#m{i}">Menu item {i}</a></li>' for i in range(8)) + '</ul>'
+	),
+	'shifting': (
+		'<div id="banners"></div><script>let n = 0; setInterval(() => { if (n++ < 6) {'
+		'const b = document.createElement("div"); b.style.height = "60px"; b.textContent = "Banner " + n;'
+		'document.getElementById("banners").prepend(b); } }, 150)</script>'
+	),
+}
+
+
+def page(name: str) -> str:
+	return (
+		f'<html><head><title>{name}</title></head><body><h1>{name}</h1>'
+		"<button onclick=\"document.getElementById('menu')?.classList.toggle('open'); window.scrollTo({top: 0, behavior: 'smooth'})\">"
+		f'Toggle</button>{PAGES[name]}{FILLER}<div id="bottom">Bottom</div></body></html>'
+	)
+
+
+def positions(state: BrowserStateSummary) -> dict[int, tuple[float, float]]:
+	return {
+		node.backend_node_id: (node.absolute_position.x, node.absolute_position.y)
+		for node in state.dom_state.selector_map.values()
+		if node.absolute_position
+	}
+
+
+async def run_mode(name: str, profile: BrowserProfile, server: HTTPServer, runs: int) -> None:
+	browser_session = BrowserSession(browser_profile=profile)
+	await browser_session.start()
+	try:
+		step_seconds, stable = [], []
+		for page_name in PAGES:
+			await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=server.url_for(f'/{page_name}')))
+			state = await browser_session.get_browser_state_summary(include_screenshot=False)
+			for _ in range(runs):
+				button = next(node for node in state.dom_state.selector_map.values() if node.tag_name == 'button')
+				start_time = time.monotonic()
+				await browser_session.event_bus.dispatch(ScrollEvent(direction='down', amount=600))
+				await browser_session.event_bus.dispatch(ClickElementEvent(node=button))
+				state = await browser_session.get_browser_state_summary(include_screenshot=False)
+				step_seconds.append(time.monotonic() - start_time)
+
+				await asyncio.sleep(0.3)
+				later = positions(await browser_session.get_browser_state_summary(include_screenshot=False))
+				before = positions(state)
+				stable.append(sum(later.get(node_id) == position for node_id, position in before.items()) / max(len(before), 1))
+
+		watchdog = browser_session._fast_render_watchdog
+		unstable = f'{len(watchdog.unstable_urls):>9}' if watchdog else f'{"-":>9}'
+		print(f'{name:>12} {statistics.median(step_seconds):>8.2f}s {statistics.mean(stable):>8.0%} {unstable}', flush=True)
+	finally:
+		await browser_session.kill()
+
+
+async def main(runs: int, headless: bool) -> None:
+	logging.getLogger('browser_use').setLevel(logging.WARNING)
+	server = HTTPServer()
+	server.start()
+	for page_name in PAGES:
+		server.expect_request(f'/{page_name}').respond_with_data(page(page_name), content_type='text/html')
+	try:
+		print(f'{runs} scroll + click steps on each of {len(PAGES)} animated pages')
+		print(f'{"mode":>12} {"step p50":>9} {"stable":>8} {"unstable":>9}', flush=True)
+		for name, fast_render in (('off', False), ('fast_render', True)):
+			profile = BrowserProfile(
+				headless=headless, user_data_dir=None, enable_default_extensions=False, fast_render=fast_render
+			)
+			await run_mode(name, profile, server, runs)
+	finally:
+		server.clear()
+		server.stop()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=5)
+	parser.add_argument('--no-headless', dest='headless', action='store_false')
+	args = parser.parse_args()
+	asyncio.run(main(args.runs, args.headless))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark per-call latency of a fresh SDK client per call vs. the shared LLM client registry.
+
+Runs ChatOpenAI against a local mock chat completions server, once building a new AsyncOpenAI client (and connection
+pool) for every call like the chat models used to, and once through the shared clients from browser_use.llm.clients.
+The mock server runs on plain HTTP on localhost, so this measures client construction and TCP connection setup only,
+against a real provider the saved TLS handshake adds a round trip or two on top of that per call.
+
+Usage:
+	python tests/scripts/benchmark_llm_clients.py [--calls 200] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from openai import AsyncOpenAI
+from pytest_httpserver import HTTPServer
+
+from browser_use.llm import ChatOpenAI, UserMessage, aclose_shared_clients
+
+COMPLETION = {
+	'id': 'chatcmpl-benchmark',
+	'object': 'chat.completion',
+	'created': 0,
+	'model': 'gpt-4o-mini',
+	'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': 'ok'}, 'finish_reason': 'stop'}],
+	'usage': {'prompt_tokens': 5, 'completion_tokens': 1, 'total_tokens': 6},
+}
+
+
+def start_server() -> HTTPServer:
+	logging.getLogger('werkzeug').setLevel(logging.WARNING)
+	server = HTTPServer(host='127.0.0.1', port=0)
+	server.start()
+	server.expect_request('/v1/chat/completions', method='POST').respond_with_data(
+		json.dumps(COMPLETION), content_type='application/json'
+	)
+	return server
+
+
+async def run_calls(llm: ChatOpenAI, calls: int, concurrency: int, fresh_client: bool) -> list[float]:
+	semaphore = asyncio.Semaphore(concurrency)
+	latencies: list[float] = []
+	messages = [UserMessage(content='Say ok')]
+
+	async def one_call() -> None:
+		async with semaphore:
+			start = time.perf_counter()
+			if fresh_client:
+				client = AsyncOpenAI(**llm._get_client_params())
+				try:
+					await client.chat.completions.create(model=str(llm.model), messages=[{'role': 'user', 'content': 'Say ok'}])
+				finally:
+					await client.close()
+			else:
+				await llm.ainvoke(messages)  # type: ignore[arg-type]
+			latencies.append(time.perf_counter() - start)
+
+	await asyncio.gather(*(one_call() for _ in range(calls)))
+	return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+	latencies = sorted(latencies)
+	p95 = latencies[int(len(latencies) * 0.95) - 1]
+	print(
+		f'{label:<14} mean={statistics.mean(latencies) * 1000:7.2f}ms  p50={statistics.median(latencies) * 1000:7.2f}ms  p95={p95 * 1000:7.2f}ms'
+	)
+
+
+async def main(calls: int, concurrency: int) -> None:
+	server = start_server()
+	llm = ChatOpenAI(model='gpt-4o-mini', api_key='sk-benchmark', base_url=server.url_for('/v1'), max_retries=0)
+
+	try:
+		# Warm up imports and the server once before measuring
+		await run_calls(llm, 5, 1, fresh_client=True)
+
+		report('fresh client', await run_calls(llm, calls, concurrency, fresh_client=True))
+		report('shared client', await run_calls(llm, calls, concurrency, fresh_client=False))
+	finally:
+		await aclose_shared_clients()
+		server.stop()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--calls', type=int, default=200)
+	parser.add_argument('--concurrency', type=int, default=10)
+	args = parser.parse_args()
+	asyncio.run(main(args.calls, args.concurrency))
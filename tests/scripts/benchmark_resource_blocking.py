@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark page loads with BrowserProfile.resource_blocking against a local heavy test site.
+
+The test site serves a product listing page with --images images, web fonts, a video and scripts, some of them from an
+/ads/ path that stands in for third party ad and analytics hosts. Every mode loads the page --runs times in a fresh
+tab and reports the median time until NavigateToUrlEvent completed (which includes the network idle wait of the
+DOMWatchdog), the requests the server saw and the bytes it sent.
+
+Modes:
+	off        no blocking
+	no-media   the no-media preset (images, media and fonts)
+	fast       the fast preset, plus the /ads/ path as the local stand-in for its ad and tracker domains
+
+The site runs on localhost, so the difference comes from the request count and size alone. Real sites add a network
+round trip per request on top.
+
+Usage:
+	python tests/scripts/benchmark_resource_blocking.py [--runs 5] [--images 60] [--no-headless]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Response
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import RESOURCE_BLOCKING_PRESETS, BrowserProfile
+from browser_use.browser.session import BrowserSession
+
+IMAGE = b'\x89PNG\r\n\x1a\n' + b'\0' * 60_000
+FONT = b'wOF2' + b'\0' * 40_000
+VIDEO = b'\0' * 2_000_000
+
+
+def page(images: int) -> str:
+	return (
+		'<html><head><title>Products</title>'
+		'<style>@font-face { font-family: Brand; src: url(/fonts/brand.woff2) format("woff2"); } body { font-family: Brand }</style>'
+		'<script src="/ads/gtag.js"></script><script src="/ads/pixel.js"></script><script src="/app.js"></script>'
+		'</head><body><h1>Products</h1><video src="/media/intro.mp4" autoplay muted></video><ul>'
+		+ ''.join(
+			f'<li><img src="/images/{i}.png" width="80"><a href="/product/{i}">Product {i}</a><button>Add to cart</button></li>'
+			for i in range(images)
+		)
+		+ '</ul></body></html>'
+	)
+
+
+def serve(server: HTTPServer, images: int) -> None:
+	server.expect_request('/').respond_with_data(page(images), content_type='text/html')
+	server.expect_request('/app.js').respond_with_data('window.app = true', content_type='application/javascript')
+	server.expect_request('/ads/gtag.js').respond_with_data('x'.ljust(90_000), content_type='application/javascript')
+	server.expect_request('/ads/pixel.js').respond_with_data('x'.ljust(30_000), content_type='application/javascript')
+	server.expect_request('/fonts/brand.woff2').respond_with_data(FONT, content_type='font/woff2')
+	server.expect_request('/media/intro.mp4').respond_with_data(VIDEO, content_type='video/mp4')
+	for i in range(images):
+		server.expect_request(f'/images/{i}.png').respond_with_data(IMAGE, content_type='image/png')
+
+
+def sent_bytes(server: HTTPServer) -> int:
+	total = 0
+	for _, response in server.log:
+		assert isinstance(response, Response)
+		total += len(response.get_data())
+	return total
+
+
+async def run_mode(name: str, profile: BrowserProfile, server: HTTPServer, runs: int) -> None:
+	browser_session = BrowserSession(browser_profile=profile)
+	await browser_session.start()
+	try:
+		load_seconds, requests, transferred = [], [], []
+		for _ in range(runs):
+			server.clear_log()
+			start_time = time.monotonic()
+			await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=server.url_for('/'), new_tab=True))
+			load_seconds.append(time.monotonic() - start_time)
+			requests.append(len(server.log))
+			transferred.append(sent_bytes(server))
+		stats = browser_session.resource_blocking_stats
+		blocked = f'{stats.requests_blocked + stats.requests_stubbed:>8}' if stats else f'{"-":>8}'
+		print(
+			f'{name:>9} {statistics.median(load_seconds):>8.2f}s {statistics.median(requests):>9.0f} '
+			f'{statistics.median(transferred) / 1024 / 1024:>8.2f}MB {blocked}',
+			flush=True,
+		)
+	finally:
+		await browser_session.kill()
+
+
+async def main(runs: int, images: int, headless: bool) -> None:
+	logging.getLogger('browser_use').setLevel(logging.WARNING)
+	server = HTTPServer()
+	server.start()
+	serve(server, images)
+	fast = RESOURCE_BLOCKING_PRESETS['fast'].model_copy(deep=True)
+	fast.url_patterns.append('*/ads/*')
+	modes = {'off': None, 'no-media': RESOURCE_BLOCKING_PRESETS['no-media'], 'fast': fast}
+	try:
+		print(f'{runs} loads per mode of a page with {images} images, fonts, a video and ad scripts')
+		print(f'{"mode":>9} {"load p50":>9} {"requests":>9} {"sent":>10} {"blocked":>8}', flush=True)
+		for name, rules in modes.items():
+			profile = BrowserProfile(
+				headless=headless, user_data_dir=None, enable_default_extensions=False, resource_blocking=rules
+			)
+			await run_mode(name, profile, server, runs)
+	finally:
+		server.clear()
+		server.stop()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=5)
+	parser.add_argument('--images', type=int, default=60)
+	parser.add_argument('--no-headless', dest='headless', action='store_false')
+	args = parser.parse_args()
+	asyncio.run(main(args.runs, args.images, args.headless))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark building the structured output request payload with and without the schema template cache.
+
+Registers custom actions on top of the default tools (50 actions in total by default), builds the dynamic AgentOutput
+model like the agent does, and times what a chat model does for every step before sending the request: optimizing the
+JSON schema and building its provider payload (an Anthropic-style output tool here).
+
+Usage:
+	python tests/scripts/benchmark_schema_cache.py [--actions 50] [--calls 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from pydantic import BaseModel, Field
+
+from browser_use.agent.views import AgentOutput
+from browser_use.llm.schema import SchemaOptimizer, clear_schema_cache, get_schema_cache_stats
+from browser_use.tools.service import Tools
+
+
+def build_output_model(total_actions: int) -> type[BaseModel]:
+	tools = Tools()
+	for i in range(max(0, total_actions - len(tools.registry.registry.actions))):
+
+		class Params(BaseModel):
+			query: str = Field(description=f'Query for custom action {i}')
+			limit: int = Field(default=10, description='Maximum number of results')
+			tags: list[str] = Field(default_factory=list)
+
+		Params.__name__ = f'CustomAction{i}Params'
+
+		async def custom_action(params: Params):
+			return None
+
+		custom_action.__name__ = f'custom_action_{i}'
+		tools.registry.action(f'Custom action number {i}', param_model=Params)(custom_action)
+
+	print(f'Registered actions: {len(tools.registry.registry.actions)}')
+	return AgentOutput.type_with_custom_actions(tools.registry.create_action_model())
+
+
+def build_tool(output_format: type[BaseModel]) -> dict:
+	schema = SchemaOptimizer._build_optimized_json_schema(output_format)
+	schema.pop('title', None)
+	return {'name': output_format.__name__, 'input_schema': schema}
+
+
+def report(label: str, durations: list[float]) -> None:
+	durations_ms = sorted(d * 1000 for d in durations)
+	p95 = durations_ms[int(len(durations_ms) * 0.95) - 1]
+	print(f'{label:<10} mean {statistics.mean(durations_ms):8.3f}ms  p95 {p95:8.3f}ms')
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--actions', type=int, default=50, help='total number of registered actions')
+	parser.add_argument('--calls', type=int, default=200, help='number of simulated LLM calls')
+	args = parser.parse_args()
+
+	output_model = build_output_model(args.actions)
+
+	uncached: list[float] = []
+	for _ in range(args.calls):
+		start = time.perf_counter()
+		build_tool(output_model)
+		uncached.append(time.perf_counter() - start)
+
+	clear_schema_cache()
+	cached: list[float] = []
+	for _ in range(args.calls):
+		start = time.perf_counter()
+		SchemaOptimizer.get_request_template(output_model, ('benchmark', 'tool'), lambda: build_tool(output_model))
+		cached.append(time.perf_counter() - start)
+
+	report('uncached', uncached)
+	report('cached', cached)
+	stats = get_schema_cache_stats()
+	print(f'cache hits {stats.hits}, misses {stats.misses}')
+
+
+if __name__ == '__main__':
+	main()
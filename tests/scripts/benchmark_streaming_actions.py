@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark time-to-first-action of a streamed agent output vs. waiting for the full completion.
+
+Runs ChatOpenAI against a local mock chat completions server that generates an agent output with several actions at a
+fixed rate of tokens per second. Without streaming the first action can only start once the whole output has been
+generated and parsed, with streaming (Agent(stream_actions=True)) it starts as soon as its JSON object is complete.
+
+Usage:
+	python tests/scripts/benchmark_streaming_actions.py [--calls 10] [--tokens-per-second 100] [--actions 4]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from browser_use.agent.streaming import JSONArrayItemParser
+from browser_use.agent.views import AgentOutput
+from browser_use.llm import ChatOpenAI, UserMessage, aclose_shared_clients
+from browser_use.tools.service import Tools
+
+CHARS_PER_TOKEN = 4
+
+
+def create_output(actions: int) -> str:
+	output = {
+		'thinking': 'The search box is visible at the top of the page, I will fill it in and submit the form.',
+		'evaluation_previous_goal': 'Navigated to the search page. Verdict: Success',
+		'memory': 'On the search page, the results are not loaded yet.',
+		'next_goal': 'Search for the product and open the first result.',
+		'action': [{'input_text': {'index': 10 + i, 'text': f'query {i}'}} for i in range(actions - 1)]
+		+ [{'click_element_by_index': {'index': 42}}],
+	}
+	return json.dumps(output)
+
+
+def start_server(content: str, tokens_per_second: float) -> HTTPServer:
+	logging.getLogger('werkzeug').setLevel(logging.WARNING)
+	server = HTTPServer(host='127.0.0.1', port=0)
+	server.start()
+	tokens = [content[i : i + CHARS_PER_TOKEN] for i in range(0, len(content), CHARS_PER_TOKEN)]
+	usage = {'prompt_tokens': 1000, 'completion_tokens': len(tokens), 'total_tokens': 1000 + len(tokens)}
+
+	def handler(request: Request) -> Response:
+		if not json.loads(request.data).get('stream'):
+			time.sleep(len(tokens) / tokens_per_second)
+			completion = {
+				'id': 'chatcmpl-benchmark',
+				'object': 'chat.completion',
+				'created': 0,
+				'model': 'gpt-4o-mini',
+				'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+				'usage': usage,
+			}
+			return Response(json.dumps(completion), content_type='application/json')
+
+		def events():
+			for token in tokens:
+				time.sleep(1 / tokens_per_second)
+				chunk = {
+					'id': 'chatcmpl-benchmark',
+					'object': 'chat.completion.chunk',
+					'created': 0,
+					'model': 'gpt-4o-mini',
+					'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}],
+				}
+				yield f'data: {json.dumps(chunk)}\n\n'
+			chunk = {'id': 'chatcmpl-benchmark', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'gpt-4o-mini'}
+			yield f'data: {json.dumps({**chunk, "choices": [], "usage": usage})}\n\n'
+			yield 'data: [DONE]\n\n'
+
+		return Response(events(), content_type='text/event-stream')
+
+	server.expect_request('/v1/chat/completions', method='POST').respond_with_handler(handler)
+	return server
+
+
+async def time_full_completion(llm: ChatOpenAI, output_format: type[AgentOutput]) -> float:
+	start = time.perf_counter()
+	response = await llm.ainvoke([UserMessage(content='Search for the product')], output_format=output_format)
+	assert response.completion.action
+	return time.perf_counter() - start
+
+
+async def time_streamed_first_action(llm: ChatOpenAI, output_format: type[AgentOutput]) -> tuple[float, float]:
+	start = time.perf_counter()
+	first_action = None
+	parser = JSONArrayItemParser('action')
+	async for chunk in llm.astream([UserMessage(content='Search for the product')], output_format=output_format):
+		if parser.feed(chunk.delta) and first_action is None:
+			first_action = time.perf_counter() - start
+	output_format.model_validate_json(parser.text)
+	assert first_action is not None
+	return first_action, time.perf_counter() - start
+
+
+def report(label: str, latencies: list[float]) -> None:
+	print(f'{label:<28} mean={statistics.mean(latencies) * 1000:8.1f}ms  p50={statistics.median(latencies) * 1000:8.1f}ms')
+
+
+async def main(calls: int, tokens_per_second: float, actions: int) -> None:
+	content = create_output(actions)
+	server = start_server(content, tokens_per_second)
+	llm = ChatOpenAI(model='gpt-4o-mini', api_key='sk-benchmark', base_url=server.url_for('/v1'), max_retries=0)
+	tools = Tools()
+	output_format = AgentOutput.type_with_custom_actions(tools.registry.create_action_model())
+
+	try:
+		full: list[float] = []
+		first: list[float] = []
+		streamed_total: list[float] = []
+		for _ in range(calls):
+			full.append(await time_full_completion(llm, output_format))
+			first_action, total = await time_streamed_first_action(llm, output_format)
+			first.append(first_action)
+			streamed_total.append(total)
+
+		print(
+			f'{calls} calls, {len(content) // CHARS_PER_TOKEN} output tokens at {tokens_per_second:.0f} tokens/s, {actions} actions'
+		)
+		report('first action, full output', full)
+		report('first action, streamed', first)
+		report('full output, streamed', streamed_total)
+		print(f'time-to-first-action speedup: {statistics.mean(full) / statistics.mean(first):.1f}x')
+	finally:
+		await aclose_shared_clients()
+		server.clear()
+		server.stop()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--calls', type=int, default=10)
+	parser.add_argument('--tokens-per-second', type=float, default=100)
+	parser.add_argument('--actions', type=int, default=4)
+	args = parser.parse_args()
+	asyncio.run(main(args.calls, args.tokens_per_second, args.actions))